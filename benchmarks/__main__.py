@@ -0,0 +1,279 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark suite: SCP03 and SCP11a handshakes per second, secured APDU latency and throughput for payloads up to
+the largest extended length command in S8 and S16 modes with AES-128/192/256 session keys, and byte[] <-> bytes
+conversion in openscp.utils, for both backends.
+
+Cards are in-process security domain emulators without latency, and the time spent inside them is subtracted, so
+results are host-side cost only: argument handling, JPype crossings and secure messaging. Results can be written as
+JSON and compared with a saved baseline; the exit status is 1 if a result regressed by more than the threshold.
+Requires ``cryptography`` for the emulator.
+Run from the project root: python -m benchmarks [--json results.json] [--baseline baseline.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from benchmarks.common import PAYLOAD_SIZES, format_table, measure
+from benchmarks.simulated_card import (OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID, SD_KEY_VERSION, SimulatedCard,
+                                       oce_certificate, oce_private_key_bytes, sd_public_key_bytes)
+from openscp import (AesAlg, Apdu, Backend, Scp03KeySet, Scp11Credentials, ScpMode, SecurityDomainEmulator,
+                     SecurityDomainSession, SmartCardConnection)
+
+# Largest command data which still fits an extended length secured APDU with padding and a 16-byte C-MAC
+MAX_SECURED_PAYLOAD = 65503
+SECURED_PAYLOAD_SIZES = [0, 16, 64, 200, 1024, 4096, 16384, MAX_SECURED_PAYLOAD]
+DEFAULT_THRESHOLD = 0.25
+
+# SCP03 session keys have the length of the static keys
+SCP03_KEY_SETS = {alg: Scp03KeySet(0x01, 0x40 + i, bytes(range(alg.value)), bytes(range(1, alg.value + 1)),
+                                   bytes(range(2, alg.value + 2)))
+                  for i, alg in enumerate(AesAlg)}
+
+
+class Result(NamedTuple):
+    """Single benchmark result"""
+
+    value: float
+    unit: str
+    higher_is_better: bool
+
+
+class TimedCard(SmartCardConnection):
+    """Connection accumulating the time spent in the card, so that it can be subtracted"""
+
+    def __init__(self, card: SmartCardConnection) -> None:
+        self._card = card
+        self.card_time = 0.0
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        start = time.perf_counter()
+        try:
+            return self._card.send_and_receive(apdu)
+        finally:
+            self.card_time += time.perf_counter() - start
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._card.is_extended_length_apdu_supported()
+
+    def close_connection(self) -> None:
+        self._card.close_connection()
+
+
+class Suite:
+    """Runs benchmarks and collects results by name"""
+
+    def __init__(self, min_time: float, rounds: int, warm_up: float) -> None:
+        """
+        :param min_time: seconds per measurement round
+        :param rounds: measurement rounds per benchmark, the fastest is reported
+        :param warm_up: seconds of untimed runs before measuring, so that the JVM compiles the code
+        """
+        self.results: Dict[str, Result] = {}
+        self._min_time = min_time
+        self._rounds = rounds
+        self._warm_up = warm_up
+
+    def host_time(self, operation: Callable[[], object], card: TimedCard) -> float:
+        """
+        :param operation: benchmarked operation
+        :param card: connection the operation uses
+        :return: best seconds per operation, excluding time in the card
+        """
+        deadline = time.perf_counter() + self._warm_up
+        while time.perf_counter() < deadline:
+            operation()
+        best = float("inf")
+        for _ in range(self._rounds):
+            card.card_time = 0.0
+            count = 0
+            start = time.perf_counter()
+            while True:
+                operation()
+                count += 1
+                elapsed = time.perf_counter() - start
+                if elapsed >= self._min_time:
+                    break
+            best = min(best, (elapsed - card.card_time) / count)
+        return best
+
+    def warm_up_backend(self, backend: Backend, seconds: float) -> None:
+        """
+        Run handshakes and secured commands of all kinds, so that the JVM has compiled the code paths before the
+        first measurement instead of during the first benchmarks
+
+        :param backend: backend to warm up
+        :param seconds: how long to run
+        """
+        credentials = _scp11_credentials(AesAlg.AES_128)
+        payloads = [os.urandom(size) for size in (0, 16, 200)]
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for scp_mode in ScpMode:
+                for key_set in SCP03_KEY_SETS.values():
+                    session = SecurityDomainSession(SecurityDomainEmulator([key_set]), backend)
+                    session.authenticate_scp03(key_set, scp_mode)
+                    for payload in payloads:
+                        session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, payload))
+            SecurityDomainSession(SimulatedCard(), backend).authenticate_scp11(credentials, ScpMode.S8)
+
+    def handshakes(self, backend: Backend) -> None:
+        for alg, key_set in SCP03_KEY_SETS.items():
+            card = TimedCard(SecurityDomainEmulator([key_set]))
+            seconds = self.host_time(
+                lambda: SecurityDomainSession(card, backend).authenticate_scp03(key_set, ScpMode.S8), card)
+            self._add(f"handshake/scp03/{alg.name}/{backend.name}", 1 / seconds, "handshakes/s", True)
+        for alg in AesAlg:
+            credentials = _scp11_credentials(alg)
+            card = TimedCard(SimulatedCard())
+            seconds = self.host_time(
+                lambda: SecurityDomainSession(card, backend).authenticate_scp11(credentials, ScpMode.S8), card)
+            self._add(f"handshake/scp11a/{alg.name}/{backend.name}", 1 / seconds, "handshakes/s", True)
+
+    def secured_apdus(self, backend: Backend, sizes: Sequence[int]) -> None:
+        for scp_mode in ScpMode:
+            for alg, key_set in SCP03_KEY_SETS.items():
+                card = TimedCard(SecurityDomainEmulator([key_set], extended_length=True))
+                session = SecurityDomainSession(card, backend)
+                session.authenticate_scp03(key_set, scp_mode)
+                for size in sizes:
+                    apdu = Apdu(0x80, 0xE2, 0x00, 0x00, os.urandom(size))
+                    try:
+                        session.send_and_receive(apdu)
+                    except Exception:
+                        continue  # Payload not supported by the backend
+                    seconds = self.host_time(lambda: session.send_and_receive(apdu), card)
+                    name = f"apdu/{scp_mode.name}/{alg.name}/{size}/{backend.name}"
+                    self._add(f"{name}/latency", seconds * 1e6, "us", False)
+                    if size:
+                        # Command and response payloads are both processed
+                        self._add(f"{name}/throughput", 2 * size / seconds / 1e6, "MB/s", True)
+
+    def conversion(self, sizes: Sequence[int]) -> None:
+        from openscp.utils import _java_bytes_to_python_bytes, _python_bytes_to_java_bytes
+        for size in sizes:
+            payload = os.urandom(size)
+            java_payload = _python_bytes_to_java_bytes(payload)
+            self._add(f"conversion/python_to_java/{size}",
+                      measure(lambda: _python_bytes_to_java_bytes(payload), self._rounds) * 1e6, "us", False)
+            self._add(f"conversion/java_to_python/{size}",
+                      measure(lambda: _java_bytes_to_python_bytes(java_payload), self._rounds) * 1e6, "us", False)
+
+    def _add(self, name: str, value: float, unit: str, higher_is_better: bool) -> None:
+        self.results[name] = Result(value, unit, higher_is_better)
+        print(f"{name}: {value:.2f} {unit}", file=sys.stderr)
+
+
+def _scp11_credentials(alg: AesAlg) -> Scp11Credentials:
+    return Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                            [oce_certificate()], oce_private_key_bytes(), alg)
+
+
+def compare(results: Dict[str, Result], baseline: Dict[str, Result], threshold: float) -> List[List[str]]:
+    """
+    :param results: current results
+    :param baseline: saved results
+    :param threshold: relative change considered significant
+    :return: comparison table rows of results present in both, regressions marked
+    """
+    rows = []
+    for name, result in results.items():
+        saved = baseline.get(name)
+        if saved is None or not saved.value:
+            continue
+        change = result.value / saved.value - 1
+        better = change if result.higher_is_better else -change
+        status = "REGRESSION" if better < -threshold else "improved" if better > threshold else ""
+        rows.append([name, f"{saved.value:.2f}", f"{result.value:.2f}", result.unit, f"{change * 100:+.1f}%",
+                     status])
+    return rows
+
+
+def load(path: str) -> Dict[str, Result]:
+    """
+    :param path: JSON file written with --json
+    :return: results by name
+    """
+    with open(path) as f:
+        return {name: Result(**result) for name, result in json.load(f)["results"].items()}
+
+
+def save(path: str, results: Dict[str, Result]) -> None:
+    """
+    :param path: JSON file to write
+    :param results: results by name
+    :return: None
+    """
+    document = {
+        "environment": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                        "platform": platform.platform(), "machine": platform.machine(),
+                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")},
+        "results": {name: result._asdict() for name, result in results.items()},
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser("python -m benchmarks", description="Handshake and secured APDU benchmark suite")
+    parser.add_argument("--backends", nargs="+", default=[backend.name for backend in Backend],
+                        choices=[backend.name for backend in Backend])
+    parser.add_argument("--groups", nargs="+", default=["handshake", "apdu", "conversion"],
+                        choices=["handshake", "apdu", "conversion"])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SECURED_PAYLOAD_SIZES,
+                        help="secured command payload sizes in bytes")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per measurement round")
+    parser.add_argument("--rounds", type=int, default=3, help="measurement rounds, the fastest is reported")
+    parser.add_argument("--warm-up", type=float, default=1.0, help="seconds of untimed runs per benchmark")
+    parser.add_argument("--backend-warm-up", type=float, default=5.0,
+                        help="seconds of mixed untimed runs per backend before its first benchmark")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare with results saved with --json")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change reported as a regression or improvement")
+    options = parser.parse_args(argv)
+
+    suite = Suite(options.min_time, options.rounds, options.warm_up)
+    for backend in [Backend[name] for name in options.backends]:
+        if options.groups != ["conversion"]:
+            suite.warm_up_backend(backend, options.backend_warm_up)
+        if "handshake" in options.groups:
+            suite.handshakes(backend)
+        if "apdu" in options.groups:
+            suite.secured_apdus(backend, options.sizes)
+    if "conversion" in options.groups and Backend.JAVA.name in options.backends:
+        suite.conversion(PAYLOAD_SIZES)
+
+    print(format_table(["benchmark", "value", "unit"],
+                       [[name, f"{result.value:.2f}", result.unit] for name, result in suite.results.items()]))
+    if options.json:
+        save(options.json, suite.results)
+    if options.baseline:
+        rows = compare(suite.results, load(options.baseline), options.threshold)
+        print()
+        print(format_table(["benchmark", "baseline", "current", "unit", "change", ""], rows))
+        if any(row[-1] == "REGRESSION" for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Command APDU allocation benchmark
+
+Compares the immutable tuple-based Apdu with the former class with a per-instance ``__dict__``: memory per instance,
+construction time, and round trips of a repeated plain command against an in-process emulator, built anew for every
+call or taken from an ApduTemplate, which reuses the Apdu, and as a baseline with mutable data, which disables reuse.
+The Java backend reuses the Java counterpart of an equal command unless the data is mutable. Requires ``cryptography``
+for the emulator.
+Run from the project root: python -m benchmarks.apdu
+"""
+
+import argparse
+import os
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks.common import PAYLOAD_SIZES, format_table, measure
+from openscp import Apdu, ApduTemplate, Backend, SecurityDomainEmulator, SecurityDomainSession
+
+INSTANCES = 10000
+
+
+class _LegacyApdu:
+    def __init__(self, cla: int, ins: int, p1: int, p2: int, data: bytes, le: int = 0x00, force_add_le: bool = False):
+        self.cla = cla
+        self.ins = ins
+        self.p1 = p1
+        self.p2 = p2
+        self.data = data
+        self.le = le
+        self.force_add_le = force_add_le
+
+
+def _bytes_per_instance(create: Callable[[int], object]) -> float:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        instances = [create(i) for i in range(INSTANCES)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (after - before) / INSTANCES
+
+
+def allocation() -> List[str]:
+    data = b"\x01\x02"
+    legacy_size = _bytes_per_instance(lambda i: _LegacyApdu(0x80, 0xE2, i & 0xFF, 0x00, data))
+    size = _bytes_per_instance(lambda i: Apdu(0x80, 0xE2, i & 0xFF, 0x00, data))
+    legacy_time = measure(lambda: _LegacyApdu(0x80, 0xE2, 0x00, 0x00, data))
+    time = measure(lambda: Apdu(0x80, 0xE2, 0x00, 0x00, data))
+    return [f"{legacy_size:.0f}", f"{size:.0f}", f"{legacy_time * 1e9:.0f}", f"{time * 1e9:.0f}"]
+
+
+def round_trips(backend: Backend, sizes: List[int], rounds: int) -> List[List[str]]:
+    session = SecurityDomainSession(SecurityDomainEmulator(), backend)
+    template = ApduTemplate(0x80, 0xE2)
+    rows = []
+    for size in sizes:
+        if size > session.max_command_data_size():
+            continue
+        data = os.urandom(size)
+        # Commands with mutable data are never reused, as every command was before
+        variants = {
+            "uncached": lambda: session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, bytearray(data))),
+            "new": lambda: session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, data)),
+            "template": lambda: session.send_and_receive(template(0x00, 0x00, data)),
+        }
+        for send in variants.values():
+            for _ in range(1000):
+                send()
+        # Variants are measured in turns, so that GC and JIT activity is spread over all of them
+        best = dict.fromkeys(variants, float("inf"))
+        for _ in range(rounds):
+            for name, send in variants.items():
+                best[name] = min(best[name], measure(send, repeat=1))
+        rows.append([backend.name, str(size), *(f"{best[name] * 1e6:.1f}" for name in variants),
+                     f"x{best['uncached'] / best['template']:.2f}"])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Command APDU allocation benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=PAYLOAD_SIZES[:3],
+                        help="data sizes in bytes, at most 255")
+    parser.add_argument("--rounds", type=int, default=5, help="measurements per variant, the fastest is reported")
+    options = parser.parse_args()
+    print(format_table(["old, B", "new, B", "old init, ns", "new init, ns"], [allocation()]))
+    print()
+    rows = [row for backend in Backend for row in round_trips(backend, options.sizes, options.rounds)]
+    print(format_table(["backend", "bytes", "uncached, us", "new Apdu, us", "template, us", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
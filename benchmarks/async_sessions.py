@@ -0,0 +1,86 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Many cards driven from one event loop
+
+Authenticates with SCP03 and sends a few secured commands to simulated cards answering after a fixed latency, one
+card after another and all cards concurrently through AsyncSecurityDomainSession, for both backends. Requires
+``cryptography`` for the simulated card.
+Run from the project root: python -m benchmarks.async_sessions
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks.common import format_table
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import Apdu, AsyncSecurityDomainSession, AsyncSmartCardConnection, Backend, ScpMode
+
+
+class SlowCard(AsyncSmartCardConnection):
+    """Simulated card answering every APDU after a fixed delay"""
+
+    def __init__(self, latency: float) -> None:
+        self._card = SimulatedCard()
+        self._latency = latency
+
+    async def send_and_receive(self, apdu: bytes) -> bytes:
+        await asyncio.sleep(self._latency)
+        return self._card.send_and_receive(apdu)
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return False
+
+    async def close_connection(self) -> None:
+        pass
+
+
+async def use_card(backend: Backend, latency: float, commands: int) -> None:
+    async with AsyncSecurityDomainSession(SlowCard(latency), backend) as session:
+        await session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+        for i in range(commands):
+            await session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, bytes(16)))
+
+
+async def run(backend: Backend, cards: int, latency: float, commands: int) -> List[str]:
+    # The first session starts the JVM for the Java backend
+    await use_card(backend, 0, 1)
+
+    start = time.perf_counter()
+    for _ in range(cards):
+        await use_card(backend, latency, commands)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(use_card(backend, latency, commands) for _ in range(cards)))
+    concurrent = time.perf_counter() - start
+    return [backend.name, str(cards), f"{sequential * 1e3:.0f}", f"{concurrent * 1e3:.0f}",
+            f"x{sequential / concurrent:.1f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Concurrent asyncio sessions benchmark")
+    parser.add_argument("--cards", type=int, default=32, help="number of simulated cards")
+    parser.add_argument("--latency", type=float, default=0.005, help="card response delay in seconds")
+    parser.add_argument("--commands", type=int, default=10, help="secured commands per card")
+    options = parser.parse_args()
+    rows = [asyncio.run(run(backend, options.cards, options.latency, options.commands)) for backend in Backend]
+    print(format_table(["backend", "cards", "sequential, ms", "concurrent, ms", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
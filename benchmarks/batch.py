@@ -0,0 +1,65 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Batched versus one-by-one secured APDU execution
+
+Authenticates with SCP03 to an in-process simulated card and sends the same commands through a send_and_receive
+loop and through send_many, for both backends. Requires ``cryptography`` for the simulated card.
+Run from the project root: python -m benchmarks.batch
+"""
+
+import argparse
+from typing import List
+
+from benchmarks.common import format_table, measure
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import Apdu, Backend, ScpMode, SecurityDomainSession
+
+
+def open_session(backend: Backend) -> SecurityDomainSession:
+    session = SecurityDomainSession(SimulatedCard(), backend)
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+    return session
+
+
+def run(backend: Backend, commands: int, payload: int) -> List[str]:
+    session = open_session(backend)
+    capdus = [Apdu(0x80, 0xE2, 0x00, 0x00, bytes(payload)) for _ in range(commands)]
+
+    def loop() -> None:
+        for capdu in capdus:
+            session.send_and_receive(capdu)
+
+    def batch() -> None:
+        results = session.send_many(capdus)
+        assert len(results) == commands and all(result.ok for result in results)
+
+    loop_time = measure(loop, repeat=3) / commands
+    batch_time = measure(batch, repeat=3) / commands
+    return [backend.name, str(payload), f"{loop_time * 1e6:.1f}", f"{batch_time * 1e6:.1f}",
+            f"x{loop_time / batch_time:.2f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Batched APDU execution benchmark")
+    parser.add_argument("--commands", type=int, default=200, help="commands per batch")
+    parser.add_argument("--payloads", type=int, nargs="+", default=[0, 64, 200], help="command data sizes in bytes")
+    options = parser.parse_args()
+    rows = [run(backend, options.commands, payload) for backend in Backend for payload in options.payloads]
+    print(format_table(["backend", "bytes", "loop, us/cmd", "send_many, us/cmd", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
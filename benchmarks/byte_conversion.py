@@ -0,0 +1,81 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark of byte[] <-> bytes conversion helpers from openscp.utils
+
+Compares the bulk conversion paths against the former per-element implementations.
+Run from the project root: python -m benchmarks.byte_conversion
+"""
+
+import argparse
+import os
+from typing import Any, List
+
+from benchmarks.common import PAYLOAD_SIZES, format_table, measure
+from openscp.utils import _java_bytes_to_python_bytes, _python_bytes_to_java_bytes, _start_jvm_if_needed
+
+
+def _legacy_java_bytes_to_python_bytes(java_bytes: Any) -> bytes:
+    python_bytes_array = [java_bytes[i] & 0xFF for i in range(java_bytes.length)]
+    python_bytes_str = ["{:02X}".format(python_bytes_array[i]) for i in range(len(python_bytes_array))]
+    return bytes.fromhex("".join(python_bytes_str))
+
+
+def _legacy_python_bytes_to_java_bytes(value: bytes) -> Any:
+    import java.io
+    baos = java.io.ByteArrayOutputStream()
+    baos.write(value, 0, len(value))
+    return baos.toByteArray()
+
+
+def run(sizes: List[int]) -> List[dict]:
+    _start_jvm_if_needed()
+    results = []
+    for size in sizes:
+        payload = os.urandom(size)
+        java_payload = _python_bytes_to_java_bytes(payload)
+        assert _java_bytes_to_python_bytes(java_payload) == payload
+        assert _legacy_java_bytes_to_python_bytes(java_payload) == payload
+        results.append({
+            "size": size,
+            "java_to_python_legacy": measure(lambda: _legacy_java_bytes_to_python_bytes(java_payload), repeat=3),
+            "java_to_python": measure(lambda: _java_bytes_to_python_bytes(java_payload)),
+            "python_to_java_legacy": measure(lambda: _legacy_python_bytes_to_java_bytes(payload)),
+            "python_to_java": measure(lambda: _python_bytes_to_java_bytes(payload)),
+        })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("byte[] <-> bytes conversion micro-benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=PAYLOAD_SIZES, help="payload sizes in bytes")
+    options = parser.parse_args()
+    rows = []
+    for result in run(options.sizes):
+        rows.append([
+            result["size"],
+            f"{result['java_to_python_legacy'] * 1e6:.2f}",
+            f"{result['java_to_python'] * 1e6:.2f}",
+            f"x{result['java_to_python_legacy'] / result['java_to_python']:.0f}",
+            f"{result['python_to_java_legacy'] * 1e6:.2f}",
+            f"{result['python_to_java'] * 1e6:.2f}",
+            f"x{result['python_to_java_legacy'] / result['python_to_java']:.1f}",
+        ])
+    header = ["bytes", "j2p old, us", "j2p new, us", "speedup", "p2j old, us", "p2j new, us", "speedup"]
+    print(format_table(header, rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+SD certificate validation throughput
+
+Validates the certificate bundles of a fleet of cards, every one signed by the same intermediate CA, with a fresh
+CertificateValidator - every certificate is verified - and again with the memoized signature checks, as later sessions
+do. Reports bundles per second by fleet size and thread count. Requires ``cryptography``.
+Run from the project root: python -m benchmarks.certificate_validation
+"""
+
+import argparse
+import datetime
+import time
+from typing import List
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from benchmarks.common import format_table
+from openscp import CertificateValidator, ScpCertificate
+
+_NOT_BEFORE = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+_NOT_AFTER = datetime.datetime(2100, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def certificate(subject_key: ec.EllipticCurvePrivateKey, subject: str, issuer_key: ec.EllipticCurvePrivateKey,
+                issuer: str, ca: bool) -> ScpCertificate:
+    encoded = x509.CertificateBuilder() \
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)])) \
+        .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)])) \
+        .public_key(subject_key.public_key()) \
+        .serial_number(x509.random_serial_number()) \
+        .not_valid_before(_NOT_BEFORE) \
+        .not_valid_after(_NOT_AFTER) \
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True) \
+        .add_extension(x509.KeyUsage(digital_signature=False, content_commitment=False, key_encipherment=False,
+                                     data_encipherment=False, key_agreement=not ca, key_cert_sign=ca, crl_sign=False,
+                                     encipher_only=False, decipher_only=False), critical=True) \
+        .sign(issuer_key, hashes.SHA256()) \
+        .public_bytes(serialization.Encoding.DER)
+    # The public key isn't used by the validator, which takes it from the certificate
+    return ScpCertificate(encoded, b"")
+
+
+def rate(validator: CertificateValidator, bundles: List[List[ScpCertificate]], threads: int) -> float:
+    start = time.perf_counter()
+    results = validator.validate_many(bundles, max_workers=threads)
+    elapsed = time.perf_counter() - start
+    if any(result.error is not None for result in results):
+        raise AssertionError("Valid bundle rejected")
+    return len(bundles) / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("SD certificate validation throughput")
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 1000], help="fleet sizes")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4], help="validate_many() thread counts")
+    options = parser.parse_args()
+    root_key = ec.generate_private_key(ec.SECP256R1())
+    intermediate_key = ec.generate_private_key(ec.SECP256R1())
+    root = certificate(root_key, "CA-KLOC", root_key, "CA-KLOC", True)
+    intermediate = certificate(intermediate_key, "Intermediate", root_key, "CA-KLOC", True)
+    rows = []
+    for cards in options.cards:
+        bundles = [[intermediate, certificate(ec.generate_private_key(ec.SECP256R1()), f"SD {card}",
+                                              intermediate_key, "Intermediate", False)]
+                   for card in range(cards)]
+        for threads in options.threads:
+            validator = CertificateValidator([root.get_encoded()], max_entries=2 * cards)
+            cold = rate(validator, bundles, threads)
+            memoized = rate(validator, bundles, threads)
+            rows.append([str(cards), str(threads), f"{cold:.0f}", f"{memoized:.0f}", f"x{memoized / cold:.1f}"])
+    print(format_table(["cards", "threads", "first validation, bundles/s", "memoized, bundles/s", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
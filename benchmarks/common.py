@@ -0,0 +1,43 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import timeit
+from typing import Callable, List, Sequence
+
+PAYLOAD_SIZES = [5, 16, 64, 256, 1024, 4096, 16384, 65536]
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Measure the best per-call execution time of a function
+
+    :param func: function to measure, called without arguments
+    :param repeat: number of measurement rounds, the fastest one is reported
+    :return: seconds per call
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def format_table(header: Sequence[str], rows: List[Sequence[str]]) -> str:
+    """
+    :param header: column names
+    :param rows: table rows, one cell per column
+    :return: plain text table with right-aligned columns
+    """
+    widths = [max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))]
+    lines = ["  ".join(str(cell).rjust(width) for cell, width in zip(row, widths)) for row in [header, *rows]]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
@@ -0,0 +1,119 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+SecurityDomainSession throughput with several threads and scaling
+
+Threads share one session with every Concurrency mode that serializes calls, sending single commands, batches and
+lazy streams. Then every thread gets an independent session, and the throughput is reported by thread count with the
+speedup over one thread. Thread safety is checked by tests/test_concurrency.py. Cards are in-process security domain
+emulators with a fixed I/O delay; with ``--latency 0`` throughput is bound by host-side CPU time and the speedup shows
+how much of it runs outside the GIL. Requires ``cryptography`` for the emulator.
+Run from the project root: python -m benchmarks.concurrency
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Callable, List
+
+from benchmarks.common import format_table
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, Backend, Concurrency, Scp03KeySet, ScpMode, SecurityDomainEmulator,
+                     SecurityDomainSession)
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+
+def open_session(backend: Backend, concurrency: Concurrency, latency: float) -> SecurityDomainSession:
+    session = SecurityDomainSession(SecurityDomainEmulator([KEY_SET], latency=latency), backend,
+                                    concurrency=concurrency)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    return session
+
+
+def exchange(session: SecurityDomainSession, step: int) -> int:
+    payload = os.urandom(1 + step % 200)
+    apdu = Apdu(0x80, 0xE2, 0x00, 0x00, payload)
+    if step % 10 == 3:
+        for _ in session.stream([apdu] * 3):
+            pass
+        return 3
+    if step % 10 == 7:
+        session.send_many([apdu] * 3)
+        return 3
+    session.send_and_receive(apdu)
+    return 1
+
+
+def run_threads(threads: int, work: Callable[[int], int]) -> float:
+    counts = [0] * threads
+    errors: List[BaseException] = []
+
+    def target(index: int) -> None:
+        try:
+            counts[index] = work(index)
+        except BaseException as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=target, args=(index,)) for index in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return sum(counts) / elapsed
+
+
+def shared(backend: Backend, concurrency: Concurrency, threads: int, rounds: int, latency: float) -> List[str]:
+    session = open_session(backend, concurrency, latency)
+    rate = run_threads(threads, lambda index: sum(exchange(session, index + i) for i in range(rounds)))
+    return [backend.name, concurrency.name, str(threads), f"{rate:.0f}"]
+
+
+def independent(backend: Backend, thread_counts: List[int], rounds: int, latency: float) -> List[List[str]]:
+    rows = []
+    single = 0.0
+    for threads in thread_counts:
+        sessions = [open_session(backend, Concurrency.LOCK, latency) for _ in range(threads)]
+        rate = run_threads(threads, lambda index: sum(exchange(sessions[index], i) for i in range(rounds)))
+        single = single or rate / threads
+        rows.append([backend.name, str(threads), f"{rate:.0f}", f"{rate / single:.2f}"])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("SecurityDomainSession throughput with several threads")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="thread counts")
+    parser.add_argument("--rounds", type=int, default=200, help="rounds per thread")
+    parser.add_argument("--latency", type=float, default=0.001, help="card I/O delay in seconds")
+    options = parser.parse_args()
+    # Starts the JVM outside of measurements
+    open_session(Backend.JAVA, Concurrency.NONE, 0)
+
+    rows = [shared(backend, concurrency, max(options.threads), options.rounds, options.latency)
+            for backend in Backend for concurrency in (Concurrency.LOCK, Concurrency.QUEUE)]
+    print(format_table(["backend", "concurrency", "threads", "commands/s"], rows))
+    print()
+    rows = [row for backend in Backend for row in independent(backend, options.threads, options.rounds,
+                                                              options.latency)]
+    print(format_table(["backend", "threads", "commands/s", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handshake setup cost with loose key arguments versus prepared credentials
+
+Measures the work an SCP03 or SCP11a authentication does before its first APDU - argument checks, key parsing and
+conversion to backend objects - by authenticating over a connection which aborts on the first APDU. Keys are passed
+one by one (with the parsed key cache disabled and enabled) and as prepared Scp03KeySet / Scp11Credentials objects,
+for both backends. A complete handshake with prepared credentials against an in-process simulated card is measured
+for scale. Requires ``cryptography`` for the simulated card.
+Run from the project root: python -m benchmarks.credentials
+"""
+
+import argparse
+from typing import Callable, List
+
+from benchmarks.common import format_table, measure
+from benchmarks.simulated_card import (DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID,
+                                       SD_KEY_VERSION, SimulatedCard, oce_certificate, oce_private_key_bytes,
+                                       sd_public_key_bytes)
+from openscp import (AesAlg, Backend, Scp03KeySet, Scp11Credentials, ScpMode, SecurityDomainSession,
+                     SmartCardConnection, get_key_cache)
+
+PK_SD_ECKA = sd_public_key_bytes()
+SK_OCE_ECKA = oce_private_key_bytes()
+CERT_CHAIN_OCE_ECKA = [oce_certificate()]
+
+Authentication = Callable[[SecurityDomainSession], None]
+
+
+class AbortingConnection(SmartCardConnection):
+    """Connection failing on the first APDU, so that only the handshake setup is executed"""
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        raise ConnectionAbortedError()
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return False
+
+    def close_connection(self) -> None:
+        pass
+
+
+def scp03_loose(session: SecurityDomainSession) -> None:
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+
+
+def scp11_loose(session: SecurityDomainSession) -> None:
+    session.authenticate_scp11(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, PK_SD_ECKA,
+                               CERT_CHAIN_OCE_ECKA, SK_OCE_ECKA, AesAlg.AES_128, ScpMode.S8)
+
+
+def prepared_authentication(protocol: str) -> Authentication:
+    if protocol == "SCP03":
+        key_set = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+        return lambda session: session.authenticate_scp03(key_set, ScpMode.S8)
+    credentials = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, PK_SD_ECKA,
+                                   CERT_CHAIN_OCE_ECKA, SK_OCE_ECKA, AesAlg.AES_128)
+    return lambda session: session.authenticate_scp11(credentials, ScpMode.S8)
+
+
+def setup_only(backend: Backend, authenticate: Authentication) -> Callable[[], None]:
+    session = SecurityDomainSession(AbortingConnection(), backend)
+
+    def run() -> None:
+        try:
+            authenticate(session)
+        except Exception:
+            pass
+    return run
+
+
+def run(backend: Backend, protocol: str, rounds: int) -> List[str]:
+    loose = setup_only(backend, scp03_loose if protocol == "SCP03" else scp11_loose)
+    prepared_handshake = prepared_authentication(protocol)
+    prepared = setup_only(backend, prepared_handshake)
+
+    # The JVM compiles the handshake code during the first thousands of runs
+    for _ in range(2000):
+        loose()
+        prepared()
+
+    # Variants are measured in turns, so that GC and JIT activity is spread over all of them
+    key_cache = get_key_cache()
+    max_size = key_cache.max_size
+    uncached = cached = prepared_time = float("inf")
+    for _ in range(rounds):
+        key_cache.max_size = 0
+        try:
+            uncached = min(uncached, measure(loose, repeat=1))
+        finally:
+            key_cache.max_size = max_size
+        cached = min(cached, measure(loose, repeat=1))
+        prepared_time = min(prepared_time, measure(prepared, repeat=1))
+    handshake = measure(lambda: prepared_handshake(SecurityDomainSession(SimulatedCard(), backend)), repeat=3)
+    return [backend.name, protocol, f"{uncached * 1e6:.0f}", f"{cached * 1e6:.0f}", f"{prepared_time * 1e6:.0f}",
+            f"{handshake * 1e6:.0f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Prepared credentials benchmark")
+    parser.add_argument("--protocols", nargs="+", default=["SCP03", "SCP11"], choices=["SCP03", "SCP11"])
+    parser.add_argument("--rounds", type=int, default=5, help="measurements per variant, the fastest is reported")
+    options = parser.parse_args()
+    rows = [run(backend, protocol, options.rounds) for backend in Backend for protocol in options.protocols]
+    print(format_table(["backend", "protocol", "setup loose, us", "setup loose + key cache, us", "setup prepared, us",
+                        "full handshake, us"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Key diversification throughput
+
+Derives the static SCP03 key sets of a fleet of cards from master keys with diversify_key_sets() and, as the
+baseline, one card at a time with a few AES calls per key, as a caller of the library would without it. Reports key
+sets per second by method, master key length and fleet size. Requires ``cryptography``.
+Run from the project root: python -m benchmarks.diversification
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, List
+
+from benchmarks.common import format_table
+from openscp import AesAlg, DiversificationMethod, Scp03KeySet, diversify_key_sets
+from openscp.scp_state import _aes_ecb, derive_key
+
+
+def one_by_one(master: Scp03KeySet, data: List[bytes], method: DiversificationMethod) -> List[Scp03KeySet]:
+    master_keys = (master.enc_key, master.mac_key, master.dek_key)
+    if method is DiversificationMethod.KDF3:
+        return [Scp03KeySet(master.key_id, master.key_version,
+                            *(derive_key(key, constant, card, len(key) * 8)
+                              for key, constant in zip(master_keys, (1, 2, 3))))
+                for card in data]
+    return [Scp03KeySet(master.key_id, master.key_version,
+                        *(_aes_ecb(key, card[-6:] + bytes((0xF0, constant)) + card[-6:] + bytes((0x0F, constant)))
+                          for key, constant in zip(master_keys, (1, 2, 3))))
+            for card in data]
+
+
+def best_rate(func: Callable[[], List[Scp03KeySet]], cards: int, repeat: int = 3) -> float:
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    return cards / min(elapsed)
+
+
+def run(method: DiversificationMethod, alg: AesAlg, cards: int) -> List[str]:
+    master = Scp03KeySet(0x01, 0x30, os.urandom(alg.value), os.urandom(alg.value), os.urandom(alg.value))
+    # Key diversification data of INITIALIZE UPDATE responses
+    data = [os.urandom(10) for _ in range(cards)]
+    baseline = one_by_one(master, data, method)
+    batched = diversify_key_sets(master, data, method)
+    if [key_set.enc_key for key_set in baseline] != [key_set.enc_key for key_set in batched]:
+        raise AssertionError("Batched keys don't match")
+    baseline_rate = best_rate(lambda: one_by_one(master, data, method), cards)
+    batched_rate = best_rate(lambda: diversify_key_sets(master, data, method), cards)
+    return [method.name, alg.name, str(cards), f"{baseline_rate:.0f}", f"{batched_rate:.0f}",
+            f"x{batched_rate / baseline_rate:.1f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Key diversification throughput")
+    parser.add_argument("--cards", type=int, nargs="+", default=[100, 10000], help="fleet sizes")
+    options = parser.parse_args()
+    rows = [run(method, alg, cards) for method in DiversificationMethod for alg in AesAlg for cards in options.cards
+            if method is DiversificationMethod.KDF3 or alg is AesAlg.AES_128]
+    print(format_table(["method", "master keys", "cards", "one by one, sets/s", "batched, sets/s", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+SCP11a handshake latency with and without pre-generated ephemeral key pairs
+
+Runs SCP11a handshakes one after another against a simulated card with a fixed I/O delay, during which the pool
+refills in the background, first with the ephemeral key pool disabled and then enabled, for both backends. Reports
+the mean and median handshake time and the pool hits and misses. Requires ``cryptography`` for the simulated card.
+Run from the project root: python -m benchmarks.ephemeral_pool
+"""
+
+import argparse
+import statistics
+import time
+from typing import List
+
+from benchmarks.common import format_table
+from benchmarks.simulated_card import (OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID, SD_KEY_VERSION, SimulatedCard,
+                                       oce_certificate, oce_private_key_bytes, sd_public_key_bytes)
+from openscp import (AesAlg, Backend, Scp11Credentials, ScpMode, SecurityDomainSession, SmartCardConnection,
+                     get_ephemeral_key_pool)
+
+
+class SlowCard(SmartCardConnection):
+    """Simulated card behind a reader with a fixed I/O delay"""
+
+    def __init__(self, latency: float) -> None:
+        self._card = SimulatedCard()
+        self._latency = latency
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        time.sleep(self._latency)
+        return self._card.send_and_receive(apdu)
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return False
+
+    def close_connection(self) -> None:
+        pass
+
+
+def run(backend: Backend, capacity: int, handshakes: int, latency: float) -> List[str]:
+    credentials = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                                   [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+    pool = get_ephemeral_key_pool()
+    pool.capacity = capacity
+    # The first handshake starts the JVM, prepares credentials and registers the curve with the pool
+    SecurityDomainSession(SlowCard(0), backend).authenticate_scp11(credentials, ScpMode.S8)
+    time.sleep(0.5)
+    before = pool.stats()
+    durations = []
+    for _ in range(handshakes):
+        session = SecurityDomainSession(SlowCard(latency), backend)
+        start = time.perf_counter()
+        session.authenticate_scp11(credentials, ScpMode.S8)
+        durations.append(time.perf_counter() - start)
+    after = pool.stats()
+    pool.capacity = 0
+    return [backend.name, str(capacity), f"{statistics.mean(durations) * 1e3:.2f}",
+            f"{statistics.median(durations) * 1e3:.2f}", str(after.hits - before.hits),
+            str(after.misses - before.misses)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("SCP11a handshake latency with pre-generated ephemeral key pairs")
+    parser.add_argument("--handshakes", type=int, default=100, help="handshakes per configuration")
+    parser.add_argument("--latency", type=float, default=0.002, help="card I/O delay per command in seconds")
+    parser.add_argument("--capacity", type=int, default=8, help="pool capacity when enabled")
+    options = parser.parse_args()
+    rows = [run(backend, capacity, options.handshakes, options.latency)
+            for backend in Backend for capacity in (0, options.capacity)]
+    print(format_table(["backend", "pool capacity", "mean, ms", "median, ms", "hits", "misses"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+ProcessFarm provisioning throughput
+
+Provisions simulated cards, each job authenticating a fresh SCP03 session and sending a personalization script,
+first with a SessionPool in this process and then with a ProcessFarm of a growing number of worker processes. The
+JVM start and warm-up of workers is excluded. Cards are in-process security domain emulators with a fixed I/O delay,
+so throughput is bound by host-side CPU time as soon as enough readers run in parallel. Requires ``cryptography``
+for the emulator.
+Run from the project root: python -m benchmarks.farm
+"""
+
+import argparse
+import os
+import time
+from typing import Hashable, List
+
+from benchmarks.common import format_table
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, Backend, CommandScript, ProcessFarm, Scp03KeySet, ScpMode, SecurityDomainEmulator,
+                     SecurityDomainSession, SessionPool, SmartCardConnection)
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+LATENCY = 0.001
+# STORE DATA-like personalization commands
+SCRIPT = CommandScript(tuple(Apdu(0x80, 0xE2, 0x00, block, bytes(range(200))) for block in range(8)))
+
+
+# Module-level, so that worker processes can unpickle them
+def connect(key: Hashable) -> SmartCardConnection:
+    return SecurityDomainEmulator([KEY_SET], latency=LATENCY)
+
+
+def authenticate(session: SecurityDomainSession) -> None:
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+
+
+def in_process(backend: Backend, jobs: int, threads: int) -> List[str]:
+    with SessionPool(connect, authenticate, backend, max_workers=threads) as pool:
+        # Starts the JVM for the Java backend outside of measurements
+        pool.submit(-1, SCRIPT).result()
+        start = time.perf_counter()
+        futures = [pool.submit(card, SCRIPT) for card in range(jobs)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+    return [backend.name, "-", str(threads), f"{jobs / elapsed:.1f}", "-"]
+
+
+def farm(backend: Backend, jobs: int, workers: int, threads: int) -> List[str]:
+    with ProcessFarm(connect, authenticate, backend, workers=workers, threads_per_worker=threads,
+                     enable_metrics=True) as process_farm:
+        process_farm.wait_ready()
+        start = time.perf_counter()
+        failed = sum(1 for result in process_farm.stream((card, SCRIPT) for card in range(jobs)) if not result.ok)
+        elapsed = time.perf_counter() - start
+        metrics = process_farm.metrics()
+        handshakes = process_farm.collect_metrics().handshakes["SCP03"]["total"].count
+    if failed or handshakes != jobs:
+        raise AssertionError(f"{failed} jobs failed, {handshakes} handshakes")
+    return [backend.name, str(workers), str(threads), f"{jobs / elapsed:.1f}", f"{metrics.average_warm_up:.2f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("ProcessFarm provisioning throughput")
+    parser.add_argument("--jobs", type=int, default=200, help="number of cards to provision")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}),
+                        help="worker process counts")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--backend", choices=[backend.name for backend in Backend], nargs="+",
+                        default=[backend.name for backend in Backend])
+    options = parser.parse_args()
+    rows = []
+    for backend in (Backend[name] for name in options.backend):
+        rows.append(in_process(backend, options.jobs, options.threads))
+        rows.extend(farm(backend, options.jobs, workers, options.threads) for workers in options.workers)
+    print(format_table(["backend", "workers", "threads", "cards/s", "warm-up, s"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Import time regression benchmark
+
+Measures in fresh processes how long importing openscp takes and checks that it loads neither JPype nor the JVM
+nor optional dependencies. Exits with status 1 on a regression, so it can run in CI.
+Run from the project root: python -m benchmarks.import_time
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchmarks.common import format_table
+
+# Modules that must not be loaded by the statement, regardless of timing
+_FORBIDDEN_MODULES = ["jpype", "cryptography", "smartcard", "openscp.utils", "openscp.java_session",
+                      "openscp.native_session"]
+
+SCENARIOS = {
+    "import openscp": "import openscp",
+    "enums": "from openscp import AesAlg, ScpMode",
+    "public API": "from openscp import Apdu, Backend, SecurityDomainSession, SmartCardConnection",
+    "JVM configuration": "from openscp import JvmConfig, configure_jvm; configure_jvm(JvmConfig())",
+}
+
+_CHILD_TEMPLATE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+started = "jpype" in sys.modules and sys.modules["jpype"].isJVMStarted()
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules), "jvm_started": started}}))
+"""
+
+
+def measure_statement(statement: str, runs: int) -> Dict[str, object]:
+    samples: List[float] = []
+    loaded: List[str] = []
+    jvm_started = False
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, "-c", _CHILD_TEMPLATE.format(statement=statement)],
+                                 stdout=subprocess.PIPE, check=True)
+        result = json.loads(process.stdout)
+        samples.append(result["seconds"])
+        loaded = [module for module in _FORBIDDEN_MODULES if module in result["modules"]]
+        jvm_started = jvm_started or result["jvm_started"]
+    return {"seconds": statistics.median(samples), "forbidden_modules": loaded, "jvm_started": jvm_started}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Import time regression benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="fresh processes per scenario, median is reported")
+    parser.add_argument("--max-ms", type=float, default=50.0, help="fail if any scenario is slower")
+    parser.add_argument("--json", help="write results to this file")
+    options = parser.parse_args()
+
+    results = {name: measure_statement(statement, options.runs) for name, statement in SCENARIOS.items()}
+    rows = []
+    failed = False
+    for name, result in results.items():
+        ok = (result["seconds"] * 1000 <= options.max_ms and not result["forbidden_modules"]
+              and not result["jvm_started"])
+        failed = failed or not ok
+        rows.append([name,
+                     f"{result['seconds'] * 1000:.1f}",
+                     ", ".join(result["forbidden_modules"]) or "-",
+                     "yes" if result["jvm_started"] else "no",
+                     "ok" if ok else "REGRESSION"])
+    print(format_table(["scenario", "median, ms", "unexpected modules", "JVM", "status"], rows))
+    if options.json:
+        with open(options.json, "w") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cold start benchmark: JVM startup and time to the first authenticated APDU in fresh processes
+
+Every configuration runs in new Python processes, so JVM startup, class loading and JIT state are never shared.
+Run from the project root: python -m benchmarks.jvm_startup
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from benchmarks.common import format_table
+from openscp.jvm import FAST_STARTUP_JIT_OPTIONS, JvmConfig, generate_cds_archive
+
+_CHILD_FLAG = "--child"
+_NATIVE = "native"
+
+
+def child(backend: str) -> None:
+    start = time.perf_counter()
+    import openscp
+    import openscp.jvm
+    from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+    imported = time.perf_counter()
+    jvm_started = imported
+    if backend != _NATIVE:
+        openscp.jvm.start_jvm()
+        jvm_started = time.perf_counter()
+    session = openscp.SecurityDomainSession(SimulatedCard(), openscp.Backend(backend))
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, openscp.ScpMode.S8)
+    authenticated = time.perf_counter()
+    session.send_and_receive(openscp.Apdu(0x80, 0xCA, 0x00, 0x66, b"", 0x00, True))
+    first_apdu = time.perf_counter()
+    print(json.dumps({"import": imported - start,
+                      "jvm_start": jvm_started - imported,
+                      "authenticate": authenticated - jvm_started,
+                      "first_apdu": first_apdu - start}))
+
+
+def run_configuration(config: JvmConfig, backend: str, runs: int) -> Dict[str, float]:
+    environ = dict(os.environ)
+    environ.update(config.to_environment())
+    samples: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        process = subprocess.run([sys.executable, "-m", "benchmarks.jvm_startup", _CHILD_FLAG, backend],
+                                 env=environ, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+        for name, value in json.loads(process.stdout.decode().strip().splitlines()[-1]).items():
+            samples.setdefault(name, []).append(value)
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+
+def main() -> None:
+    if len(sys.argv) == 3 and sys.argv[1] == _CHILD_FLAG:
+        child(sys.argv[2])
+        return
+    parser = argparse.ArgumentParser("Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per configuration, median is reported")
+    parser.add_argument("--cds", help="existing CDS archive, a temporary one is generated if absent")
+    parser.add_argument("--json", help="write results to this file")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cds_archive = options.cds
+        if not cds_archive:
+            cds_archive = os.path.join(temp_dir, "openscp.jsa")
+            generate_cds_archive(cds_archive, JvmConfig())
+        configurations = [
+            ("java: default", JvmConfig(), "java"),
+            ("java: fast JIT", JvmConfig(jit_options=FAST_STARTUP_JIT_OPTIONS), "java"),
+            ("java: CDS", JvmConfig(cds_archive=cds_archive), "java"),
+            ("java: CDS + fast JIT", JvmConfig(cds_archive=cds_archive, jit_options=FAST_STARTUP_JIT_OPTIONS), "java"),
+            ("native", JvmConfig(), _NATIVE),
+        ]
+        results = {name: run_configuration(config, backend, options.runs) for name, config, backend in configurations}
+
+    rows = [[name,
+             f"{result['import'] * 1000:.0f}",
+             f"{result['jvm_start'] * 1000:.0f}",
+             f"{result['authenticate'] * 1000:.0f}",
+             f"{result['first_apdu'] * 1000:.0f}"] for name, result in results.items()]
+    print(format_table(["configuration", "import, ms", "JVM start, ms", "SCP03, ms", "first APDU, ms"], rows))
+    if options.json:
+        with open(options.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cost of hot-path instrumentation
+
+Measures secured GET DATA round trips against an in-process simulated card with metrics disabled and enabled, for
+both backends, and the cost of the enabled check which disabled instrumentation comes down to. Instrumented code
+checks the flag three times per command. Requires ``cryptography`` for the simulated card.
+Run from the project root: python -m benchmarks.metrics
+"""
+
+import argparse
+import timeit
+from typing import List
+
+from benchmarks.common import format_table, measure
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import Apdu, Backend, Scp03KeySet, ScpMode, SecurityDomainSession, get_metrics
+
+CHECKS_PER_COMMAND = 3
+
+
+def run(backend: Backend, rounds: int) -> List[str]:
+    metrics = get_metrics()
+    session = SecurityDomainSession(SimulatedCard(), backend)
+    session.authenticate_scp03(Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY), ScpMode.S8)
+    apdu = Apdu(0x80, 0xCA, 0x00, 0x66, b"")
+
+    def command() -> None:
+        session.send_and_receive(apdu)
+
+    for _ in range(2000):
+        command()
+
+    # Variants are measured in turns, so that GC and JIT activity is spread over all of them
+    disabled = enabled = float("inf")
+    for _ in range(rounds):
+        disabled = min(disabled, measure(command, repeat=1))
+        metrics.enable()
+        try:
+            enabled = min(enabled, measure(command, repeat=1))
+        finally:
+            metrics.disable()
+    metrics.reset()
+    timer = timeit.Timer("metrics.enabled", globals={"metrics": metrics})
+    number, _ = timer.autorange()
+    check = min(timer.repeat(repeat=5, number=number)) / number * CHECKS_PER_COMMAND
+    return [backend.name, f"{disabled * 1e6:.1f}", f"{enabled * 1e6:.1f}", f"{(enabled - disabled) * 1e6:.1f}",
+            f"{check * 1e9:.0f}", f"{check / disabled * 100:.2f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Instrumentation benchmark")
+    parser.add_argument("--rounds", type=int, default=5, help="measurements per variant, the fastest is reported")
+    options = parser.parse_args()
+    rows = [run(backend, options.rounds) for backend in Backend]
+    print(format_table(["backend", "disabled, us", "enabled, us", "enabled overhead, us", "disabled checks, ns",
+                        "disabled checks, %"], rows))
+
+
+if __name__ == "__main__":
+    main()
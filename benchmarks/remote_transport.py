@@ -0,0 +1,94 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Remote reader transport throughput
+
+Serves an emulated card, which answers at once unless given a latency, through ConnectionServer on localhost, over
+TCP and a Unix domain socket, and sends batches of plain APDUs with RemoteConnection: one command at a time and
+pipelined with transmit_many(). Also times SCP03 sessions opening a new connection each, as a hand-written transport
+would, against sessions taking one from a RemoteConnectionPool. Requires ``cryptography``.
+Run from the project root: python -m benchmarks.remote_transport
+"""
+
+import argparse
+import functools
+import os
+import tempfile
+import time
+from typing import List, Optional, Sequence
+
+from benchmarks.common import format_table
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import Apdu, Backend, ConnectionServer, RemoteConnection, RemoteConnectionPool, Scp03KeySet, ScpMode, \
+    SecurityDomainEmulator, SecurityDomainSession
+from openscp.remote import Address
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+
+def commands_per_second(address: Address, commands: Sequence[bytes], pipelined: bool) -> float:
+    connection = RemoteConnection(address)
+    try:
+        start = time.perf_counter()
+        if pipelined:
+            connection.transmit_many(commands)
+        else:
+            for command in commands:
+                connection.send_and_receive(command)
+        return len(commands) / (time.perf_counter() - start)
+    finally:
+        connection.close_connection()
+
+
+def session_milliseconds(address: Address,
+                         sessions: int,
+                         pool: Optional[RemoteConnectionPool] = None) -> float:
+    start = time.perf_counter()
+    for _ in range(sessions):
+        connection = pool.acquire() if pool is not None else RemoteConnection(address)
+        try:
+            session = SecurityDomainSession(connection, Backend.NATIVE)
+            session.authenticate_scp03(KEY_SET, ScpMode.S8)
+            session.send_and_receive(Apdu(0x80, 0xCA, 0x00, 0x66, b""))
+        finally:
+            connection.close_connection()
+    return (time.perf_counter() - start) * 1000 / sessions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("Remote reader transport throughput")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the card takes per command")
+    parser.add_argument("--commands", type=int, default=500, help="plain APDUs per batch")
+    parser.add_argument("--sessions", type=int, default=100, help="SCP03 sessions per transport")
+    options = parser.parse_args()
+    commands = [Apdu(0x80, 0xCA, 0x00, 0x66, os.urandom(32)).to_bytes() for _ in range(options.commands)]
+    directory = tempfile.mkdtemp()
+    rows: List[List[str]] = []
+    for transport, server_options in (("TCP", {}), ("Unix", {"path": os.path.join(directory, "reader.sock")})):
+        card_factory = functools.partial(SecurityDomainEmulator, [KEY_SET], latency=options.latency)
+        with ConnectionServer(card_factory, **server_options) as server:
+            one_by_one = commands_per_second(server.address, commands, False)
+            pipelined = commands_per_second(server.address, commands, True)
+            connecting = session_milliseconds(server.address, options.sessions)
+            with RemoteConnectionPool(server.address) as pool:
+                pooled = session_milliseconds(server.address, options.sessions, pool)
+        rows.append([transport, f"{one_by_one:.0f}", f"{pipelined:.0f}", f"{connecting:.2f}", f"{pooled:.2f}"])
+    os.rmdir(directory)
+    print(format_table(["transport", "one by one, APDU/s", "pipelined, APDU/s", "session, new connection, ms",
+                        "session, pooled connection, ms"], rows))
+
+
+if __name__ == "__main__":
+    main()
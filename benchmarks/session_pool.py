@@ -0,0 +1,94 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+SessionPool throughput
+
+Runs many jobs on random cards of a SessionPool for both backends. Some jobs fail on purpose, so that their sessions
+are evicted and authenticated again. Cards are simulated in-process with a fixed I/O delay. Correctness under this
+load is checked by tests/test_pool.py. Requires ``cryptography`` for the simulated card.
+Run from the project root: python -m benchmarks.session_pool
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import List
+
+from benchmarks.common import format_table
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import Apdu, Backend, ScpMode, SecurityDomainSession, SessionPool
+
+
+class InjectedFailure(Exception):
+    """Job failure requested by the benchmark"""
+
+
+def authenticate(session: SecurityDomainSession) -> None:
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+
+
+def job(session: SecurityDomainSession, commands: int, fail: bool) -> int:
+    for _ in range(commands):
+        session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, os.urandom(random.randint(0, 200))))
+    if fail:
+        raise InjectedFailure()
+    return commands
+
+
+def run(backend: Backend, cards: int, jobs: int, workers: int, commands: int, latency: float,
+        failure_rate: float) -> List[str]:
+    # Starts the JVM for the Java backend outside of measurements
+    authenticate(SecurityDomainSession(SimulatedCard(), backend))
+
+    pool = SessionPool(lambda key: SimulatedCard(latency=latency), authenticate, backend, max_workers=workers,
+                       idle_timeout=60)
+    with pool:
+        start = time.perf_counter()
+        futures = [pool.submit(random.randrange(cards),
+                               lambda session, fail=random.random() < failure_rate: job(session, commands, fail))
+                   for _ in range(jobs)]
+        failed = 0
+        for future in futures:
+            try:
+                future.result()
+            except InjectedFailure:
+                failed += 1
+        elapsed = time.perf_counter() - start
+        metrics = pool.metrics()
+
+    return [backend.name, str(workers), f"{jobs / elapsed:.0f}", str(metrics.handshakes), str(failed),
+            f"{metrics.handshakes_per_second:.1f}", f"{metrics.average_handshake_time * 1e3:.1f}",
+            f"{metrics.average_queue_wait * 1e3:.1f}", f"{metrics.max_queue_wait * 1e3:.1f}"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("SessionPool throughput")
+    parser.add_argument("--cards", type=int, default=16, help="number of simulated cards")
+    parser.add_argument("--jobs", type=int, default=400, help="number of jobs")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="pool thread counts")
+    parser.add_argument("--commands", type=int, default=5, help="secured commands per job")
+    parser.add_argument("--latency", type=float, default=0.002, help="reader I/O delay in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="share of jobs failing on purpose")
+    options = parser.parse_args()
+    rows = [run(backend, options.cards, options.jobs, workers, options.commands, options.latency,
+                options.failure_rate)
+            for backend in Backend for workers in options.workers]
+    print(format_table(["backend", "workers", "jobs/s", "handshakes", "failed jobs", "handshakes/s",
+                        "handshake, ms", "avg wait, ms", "max wait, ms"], rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Security domain emulator with fixed keys for benchmarks: SCP03 key set :data:`KEY_VERSION` and SCP11a key
+:data:`SD_KEY` with a self-signed certificate. Application commands are echoed back. Requires ``cryptography``.
+"""
+
+import datetime
+import functools
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from openscp.credentials import Scp03KeySet
+from openscp.emulator import Scp11SdKey, SecurityDomainEmulator
+from openscp.scp_mode import ScpMode
+
+KEY_VERSION = 0x30
+ENC_KEY = bytes(range(0x40, 0x50))
+MAC_KEY = bytes(range(0x50, 0x60))
+DEK_KEY = bytes(range(0x60, 0x70))
+
+SD_KEY_ID = 0x11
+SD_KEY_VERSION = 0x01
+OCE_KEY_ID = 0x10
+OCE_KEY_VERSION = 0x01
+SD_KEY = ec.derive_private_key(0x5D5D5D5D, ec.SECP256R1())
+OCE_KEY = ec.derive_private_key(0x0CE0CE0C, ec.SECP256R1())
+
+
+def sd_public_key_bytes() -> bytes:
+    """
+    :return: PK.SD.ECKA in X.509 SubjectPublicKeyInfo encoding
+    """
+    return SD_KEY.public_key().public_bytes(serialization.Encoding.DER,
+                                            serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+def oce_private_key_bytes() -> bytes:
+    """
+    :return: SK.OCE.ECKA in PKCS#8 encoding
+    """
+    return OCE_KEY.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                                 serialization.NoEncryption())
+
+
+def oce_certificate() -> bytes:
+    """
+    :return: self-signed CERT.OCE.ECKA in DER encoding, the card trusts :data:`OCE_KEY` without checking it
+    """
+    return _self_signed_certificate(OCE_KEY, "OCE")
+
+
+def sd_certificate(sd_key: ec.EllipticCurvePrivateKey = SD_KEY) -> bytes:
+    """
+    :param sd_key: SK.SD.ECKA
+    :return: self-signed CERT.SD.ECKA in DER encoding, returned by the card from its certificate store
+    """
+    return _self_signed_certificate(sd_key, "SD")
+
+
+@functools.lru_cache(maxsize=None)
+def _self_signed_certificate(private_key: ec.EllipticCurvePrivateKey, common_name: str) -> bytes:
+    name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, common_name)])
+    now = datetime.datetime(2025, 1, 1)
+    certificate = (x509.CertificateBuilder()
+                   .subject_name(name)
+                   .issuer_name(name)
+                   .public_key(private_key.public_key())
+                   .serial_number(1)
+                   .not_valid_before(now)
+                   .not_valid_after(now + datetime.timedelta(days=3650))
+                   .sign(private_key, hashes.SHA256()))
+    return certificate.public_bytes(serialization.Encoding.DER)
+
+
+class SimulatedCard(SecurityDomainEmulator):
+    """Security domain emulator holding the keys above"""
+
+    def __init__(self,
+                 scp_mode: ScpMode = ScpMode.S8,
+                 extended: bool = False,
+                 sd_key: ec.EllipticCurvePrivateKey = SD_KEY,
+                 latency: float = 0.0) -> None:
+        """
+        :param scp_mode: SCP mode of SCP11 sessions
+        :param extended: report extended length APDU support
+        :param sd_key: SK.SD.ECKA
+        :param latency: seconds added to every command
+        """
+        super().__init__([_scp03_key_set()], [_scp11_key(sd_key)], scp_mode, extended, latency)
+
+
+@functools.lru_cache(maxsize=None)
+def _scp03_key_set() -> Scp03KeySet:
+    return Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+
+@functools.lru_cache(maxsize=None)
+def _scp11_key(sd_key: ec.EllipticCurvePrivateKey) -> Scp11SdKey:
+    private_key_bytes = sd_key.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                                             serialization.NoEncryption())
+    return Scp11SdKey(SD_KEY_ID, SD_KEY_VERSION, private_key_bytes, [sd_certificate(sd_key)])
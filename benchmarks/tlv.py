@@ -0,0 +1,132 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+BER-TLV parsing and building benchmark
+
+Compares the lazy memoryview parser and the single-buffer builder with the copying helpers (decode_tlv_list and nested
+encode_tlv calls) on a certificate store, as returned by GET DATA BF21, and a GET STATUS dump of applications.
+Operations: walking every data object, finding the first data object at a tag path, and building the encoded data.
+Walking small data objects costs about the same either way, views pay off for large values and partial parsing.
+Run from the project root: python -m benchmarks.tlv
+"""
+
+import argparse
+import os
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+from benchmarks.common import format_table, measure
+from openscp.tlv import Tlv, TlvBuilder, decode_tlv_list, encode_tlv, find_tlv, iter_tlv
+
+# Certificate: serial number, CA key identifier, subject, key usage, dates, public key and signature
+_CERTIFICATE_FIELDS = [(0x93, 16), (0x42, 20), (0x5F20, 20), (0x95, 2), (0x5F25, 4), (0x5F24, 4), (0x53, 8)]
+_PUBLIC_KEY_FIELDS = [(0xB0, 65), (0xF0, 1)]
+_SIGNATURE = (0x5F37, 72)
+# Application entry: AID, life cycle state, privileges, executable load file and security domain AIDs
+_APPLICATION_FIELDS = [(0x4F, 16), (0x9F70, 1), (0xC5, 3), (0xC4, 16), (0xCC, 16)]
+
+# GlobalPlatform public keys use tags B0 and F0 for primitive data objects, so the tag encoding doesn't tell which data
+# objects are constructed
+CONSTRUCTED_TAGS = frozenset([0xBF21, 0x7F21, 0x7F49, 0xE3])
+
+# Data object layout: tag and either a value size or the nested layout
+Layout = Sequence[Tuple[int, object]]
+
+
+def certificate_store(count: int) -> Layout:
+    certificate = [*_CERTIFICATE_FIELDS, (0x7F49, _PUBLIC_KEY_FIELDS), _SIGNATURE]
+    return [(0xBF21, [(0x7F21, certificate)] * count)]
+
+
+def application_status(count: int) -> Layout:
+    return [(0xE3, _APPLICATION_FIELDS)] * count
+
+
+def build_legacy(layout: Layout, values: Callable[[int], bytes]) -> bytes:
+    return b"".join(encode_tlv(tag, build_legacy(content, values) if isinstance(content, list) else values(content))
+                    for tag, content in layout)
+
+
+def build(layout: Layout, values: Callable[[int], bytes]) -> bytearray:
+    builder = TlvBuilder()
+
+    def add(items: Layout) -> None:
+        for tag, content in items:
+            if isinstance(content, list):
+                builder.begin(tag)
+                add(content)
+                builder.end()
+            else:
+                builder.add(tag, values(content))
+
+    add(layout)
+    return builder.build()
+
+
+def walk_legacy(data: bytes) -> int:
+    count = 0
+    for tag, value, _ in decode_tlv_list(data):
+        count += 1
+        if tag in CONSTRUCTED_TAGS:
+            count += walk_legacy(value)
+    return count
+
+
+def walk(objects: Iterator[Tlv]) -> int:
+    count = 0
+    for tlv in objects:
+        count += 1
+        if tlv.tag in CONSTRUCTED_TAGS:
+            count += walk(tlv.children())
+    return count
+
+
+def find_legacy(data: bytes, path: Sequence[int]) -> bytes:
+    for tag in path:
+        data = next(value for actual_tag, value, _ in decode_tlv_list(data) if actual_tag == tag)
+    return data
+
+
+def run(name: str, layout: Layout, path: Sequence[int]) -> List[List[str]]:
+    values = {size: os.urandom(size) for size in range(1, 128)}.__getitem__
+    encoded = build_legacy(layout, values)
+    assert bytes(build(layout, values)) == encoded
+    assert walk(iter_tlv(encoded)) == walk_legacy(encoded)
+    assert bytes(find_tlv(encoded, *path).value) == find_legacy(encoded, path)  # type: ignore[union-attr]
+    operations = [
+        ("walk", lambda: walk_legacy(encoded), lambda: walk(iter_tlv(encoded))),
+        ("find", lambda: find_legacy(encoded, path), lambda: find_tlv(encoded, *path)),
+        ("build", lambda: build_legacy(layout, values), lambda: build(layout, values)),
+    ]
+    rows = []
+    for operation, legacy, new in operations:
+        legacy_time = measure(legacy, repeat=3)
+        new_time = measure(new, repeat=3)
+        rows.append([name, f"{len(encoded)}", operation, f"{legacy_time * 1e3:.2f}", f"{new_time * 1e3:.2f}",
+                     f"x{legacy_time / new_time:.2f}"])
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("BER-TLV benchmark")
+    parser.add_argument("--certificates", type=int, default=200, help="certificates in the certificate store")
+    parser.add_argument("--applications", type=int, default=2000, help="applications in the GET STATUS dump")
+    options = parser.parse_args()
+    rows = run("certificate store", certificate_store(options.certificates), [0xBF21, 0x7F21, 0x7F49, 0xB0])
+    rows += run("GET STATUS", application_status(options.applications), [0xE3, 0xCC])
+    print(format_table(["data", "bytes", "operation", "copying, ms", "lazy, ms", "speedup"], rows))
+
+
+if __name__ == "__main__":
+    main()
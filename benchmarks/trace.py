@@ -0,0 +1,83 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+APDU trace recording overhead and replay speed
+
+Sends secured commands through an SCP03 session to an emulated card, which answers at once, without a trace
+recorder, with a TracedConnection below the session and with the session recording as well, storing only lengths
+and status words or whole payloads. Then replays the recorded transport traffic of plain commands against a new
+emulator. Requires ``cryptography``.
+Run from the project root: python -m benchmarks.trace
+"""
+
+import argparse
+import os
+import tempfile
+from typing import List, Optional
+
+from benchmarks.common import format_table, measure
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import Apdu, Backend, Scp03KeySet, ScpMode, SecurityDomainEmulator, SecurityDomainSession, \
+    SmartCardConnection, TraceRecorder, TracedConnection, replay_trace
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+
+def command_microseconds(data_size: int, recorder: Optional[TraceRecorder], session_level: bool) -> float:
+    connection: SmartCardConnection = SecurityDomainEmulator([KEY_SET])
+    if recorder is not None:
+        connection = TracedConnection(connection, recorder)
+    session = SecurityDomainSession(connection, Backend.NATIVE,
+                                    trace_recorder=recorder if session_level else None)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    command = Apdu(0x80, 0xE2, 0x00, 0x00, os.urandom(data_size))
+    return measure(lambda: session.send_and_receive(command)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser("APDU trace recording overhead and replay speed")
+    parser.add_argument("--data-size", type=int, default=64, help="command data bytes")
+    parser.add_argument("--commands", type=int, default=10000, help="plain APDUs recorded for replay")
+    options = parser.parse_args()
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "apdu.trace")
+    rows: List[List[str]] = []
+    baseline = command_microseconds(options.data_size, None, False)
+    rows.append(["none", "-", f"{baseline:.1f}", "-", "-", "-"])
+    for levels, session_level in (("transport", False), ("transport + session", True)):
+        for payloads in (False, True):
+            with TraceRecorder(path, payloads) as recorder:
+                duration = command_microseconds(options.data_size, recorder, session_level)
+            stats = recorder.stats()
+            rows.append([levels, "yes" if payloads else "no", f"{duration:.1f}", f"{duration - baseline:+.1f}",
+                         f"{stats.bytes_written / max(stats.records, 1):.0f}", str(stats.dropped)])
+    print(format_table(["recorded", "payloads", "command, us", "overhead, us", "bytes per record", "dropped"], rows))
+
+    command = Apdu(0x80, 0xCA, 0x00, 0x66, os.urandom(options.data_size)).to_bytes()
+    with TraceRecorder(path, payloads=True) as recorder:
+        connection = TracedConnection(SecurityDomainEmulator([KEY_SET]), recorder)
+        for _ in range(options.commands):
+            connection.send_and_receive(command)
+    result = replay_trace(path, SecurityDomainEmulator([KEY_SET]))
+    print()
+    print(format_table(["replayed commands", "mismatches", "recorded, APDU/s", "replayed, APDU/s"],
+                       [[str(result.commands), str(result.mismatches), f"{result.commands / result.recorded:.0f}",
+                         f"{result.commands / result.replayed:.0f}"]]))
+    os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    main()
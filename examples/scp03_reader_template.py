@@ -30,7 +30,8 @@ class Scp03ReaderTemplate:
 
     class Connection(SmartCardConnection):
         def send_and_receive(self, apdu: bytes) -> bytes:
-            # Call here 'transmitPlainChannel()' method of your eSE Reader class to send & receive raw APDU
+            # Call here 'transmitPlainChannel()' method of your eSE Reader class to send & receive raw APDU,
+            # or use a bundled connection instead of this class: openscp.PcscReaders or openscp.RemoteConnection
             try:
                 return transmitPlainChannel(apdu)
             except:  # Use here exception specific to your eSE Reader class implementation
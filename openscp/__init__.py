@@ -12,18 +12,205 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from openscp.aes_alg import AesAlg
-from openscp.apdu import Apdu
-from openscp.connection import SmartCardConnection
-from openscp.scp_certificate import ScpCertificate
-from openscp.scp_mode import ScpMode
-from openscp.session import SecurityDomainSession
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# Public names are imported on first access (PEP 562), so that a bare "import openscp" neither loads JPype nor
+# starts the JVM nor imports optional dependencies
+_LAZY_ATTRIBUTES = {
+    "AesAlg": "openscp.aes_alg",
+    "Apdu": "openscp.apdu",
+    "ApduError": "openscp.exceptions",
+    "ApduTemplate": "openscp.apdu",
+    "AsyncSecurityDomainSession": "openscp.aio",
+    "AsyncSmartCardConnection": "openscp.aio",
+    "Backend": "openscp.backend",
+    "CacheStats": "openscp.key_cache",
+    "CertificateCache": "openscp.certificate_cache",
+    "CertificateValidationError": "openscp.exceptions",
+    "CertificateValidationResult": "openscp.certificate_validation",
+    "CertificateValidator": "openscp.certificate_validation",
+    "Chaining": "openscp.streaming",
+    "ChannelLostError": "openscp.exceptions",
+    "CommandResult": "openscp.batch",
+    "CommandScript": "openscp.farm",
+    "CommandStats": "openscp.metrics",
+    "Concurrency": "openscp.concurrency",
+    "ConnectionServer": "openscp.remote",
+    "DiversificationMethod": "openscp.diversification",
+    "EphemeralKeyPool": "openscp.ephemeral_pool",
+    "EphemeralKeyPoolStats": "openscp.ephemeral_pool",
+    "ErrorPolicy": "openscp.batch",
+    "FarmMetrics": "openscp.farm",
+    "FarmResult": "openscp.farm",
+    "GetResponseConnection": "openscp.get_response",
+    "BadResponseError": "openscp.exceptions",
+    "JvmConfig": "openscp.jvm",
+    "KeyCache": "openscp.key_cache",
+    "ManagedSession": "openscp.managed",
+    "ManagedSessionStats": "openscp.managed",
+    "Metrics": "openscp.metrics",
+    "MetricsSnapshot": "openscp.metrics",
+    "OperationCancelledError": "openscp.exceptions",
+    "PcscConnection": "openscp.pcsc",
+    "PcscReaders": "openscp.pcsc",
+    "PhaseStats": "openscp.metrics",
+    "RemoteConnection": "openscp.remote",
+    "RemoteConnectionPool": "openscp.remote",
+    "ReplayResult": "openscp.trace",
+    "ResponseApdu": "openscp.apdu",
+    "PoolMetrics": "openscp.pool",
+    "ProcessFarm": "openscp.farm",
+    "SmartCardConnection": "openscp.connection",
+    "ScpCertificate": "openscp.scp_certificate",
+    "ScpError": "openscp.exceptions",
+    "ScpMode": "openscp.scp_mode",
+    "Scp03KeySet": "openscp.credentials",
+    "Scp11Credentials": "openscp.credentials",
+    "Scp11SdKey": "openscp.emulator",
+    "SecurityDomainSession": "openscp.session",
+    "SecurityDomainEmulator": "openscp.emulator",
+    "SessionLease": "openscp.pool",
+    "SessionPool": "openscp.pool",
+    "StreamProgress": "openscp.streaming",
+    "StreamResult": "openscp.streaming",
+    "TraceDirection": "openscp.trace",
+    "TraceLevel": "openscp.trace",
+    "TraceReader": "openscp.trace",
+    "TraceRecord": "openscp.trace",
+    "TraceRecorder": "openscp.trace",
+    "TraceStats": "openscp.trace",
+    "TracedConnection": "openscp.trace",
+    "TransportStats": "openscp.connection",
+    "WorkerLostError": "openscp.exceptions",
+    "configure_jvm": "openscp.jvm",
+    "diversify_key_set": "openscp.diversification",
+    "diversify_key_sets": "openscp.diversification",
+    "get_ephemeral_key_pool": "openscp.ephemeral_pool",
+    "get_key_cache": "openscp.key_cache",
+    "get_metrics": "openscp.metrics",
+    "replay_trace": "openscp.trace",
+    "warm_up": "openscp.jvm",
+}
 
 __all__ = [
     "AesAlg",
     "Apdu",
+    "ApduError",
+    "ApduTemplate",
+    "AsyncSecurityDomainSession",
+    "AsyncSmartCardConnection",
+    "Backend",
+    "BadResponseError",
+    "CacheStats",
+    "CertificateCache",
+    "CertificateValidationError",
+    "CertificateValidationResult",
+    "CertificateValidator",
+    "Chaining",
+    "ChannelLostError",
+    "CommandResult",
+    "CommandScript",
+    "CommandStats",
+    "Concurrency",
+    "ConnectionServer",
+    "DiversificationMethod",
+    "EphemeralKeyPool",
+    "EphemeralKeyPoolStats",
+    "ErrorPolicy",
+    "FarmMetrics",
+    "FarmResult",
+    "GetResponseConnection",
+    "JvmConfig",
+    "KeyCache",
+    "ManagedSession",
+    "ManagedSessionStats",
+    "Metrics",
+    "MetricsSnapshot",
+    "OperationCancelledError",
+    "PcscConnection",
+    "PcscReaders",
+    "PhaseStats",
+    "RemoteConnection",
+    "RemoteConnectionPool",
+    "ReplayResult",
+    "ResponseApdu",
+    "PoolMetrics",
+    "ProcessFarm",
     "SmartCardConnection",
     "ScpCertificate",
+    "ScpError",
     "ScpMode",
-    "SecurityDomainSession"
+    "Scp03KeySet",
+    "Scp11Credentials",
+    "Scp11SdKey",
+    "SecurityDomainSession",
+    "SecurityDomainEmulator",
+    "SessionLease",
+    "SessionPool",
+    "StreamProgress",
+    "StreamResult",
+    "TraceDirection",
+    "TraceLevel",
+    "TraceReader",
+    "TraceRecord",
+    "TraceRecorder",
+    "TraceStats",
+    "TracedConnection",
+    "TransportStats",
+    "WorkerLostError",
+    "configure_jvm",
+    "diversify_key_set",
+    "diversify_key_sets",
+    "get_ephemeral_key_pool",
+    "get_key_cache",
+    "get_metrics",
+    "replay_trace",
+    "warm_up"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from openscp.aes_alg import AesAlg
+    from openscp.aio import AsyncSecurityDomainSession, AsyncSmartCardConnection
+    from openscp.apdu import Apdu, ApduTemplate, ResponseApdu
+    from openscp.backend import Backend
+    from openscp.batch import CommandResult, ErrorPolicy
+    from openscp.certificate_cache import CertificateCache
+    from openscp.certificate_validation import CertificateValidationResult, CertificateValidator
+    from openscp.concurrency import Concurrency
+    from openscp.connection import SmartCardConnection, TransportStats
+    from openscp.credentials import Scp03KeySet, Scp11Credentials
+    from openscp.diversification import DiversificationMethod, diversify_key_set, diversify_key_sets
+    from openscp.emulator import Scp11SdKey, SecurityDomainEmulator
+    from openscp.ephemeral_pool import EphemeralKeyPool, EphemeralKeyPoolStats, get_ephemeral_key_pool
+    from openscp.exceptions import (ApduError, BadResponseError, CertificateValidationError, ChannelLostError,
+                                    OperationCancelledError, ScpError, WorkerLostError)
+    from openscp.farm import CommandScript, FarmMetrics, FarmResult, ProcessFarm
+    from openscp.get_response import GetResponseConnection
+    from openscp.jvm import JvmConfig, configure_jvm, warm_up
+    from openscp.key_cache import CacheStats, KeyCache, get_key_cache
+    from openscp.managed import ManagedSession, ManagedSessionStats
+    from openscp.metrics import CommandStats, Metrics, MetricsSnapshot, PhaseStats, get_metrics
+    from openscp.pcsc import PcscConnection, PcscReaders
+    from openscp.pool import PoolMetrics, SessionLease, SessionPool
+    from openscp.remote import ConnectionServer, RemoteConnection, RemoteConnectionPool
+    from openscp.scp_certificate import ScpCertificate
+    from openscp.scp_mode import ScpMode
+    from openscp.session import SecurityDomainSession
+    from openscp.streaming import Chaining, StreamProgress, StreamResult
+    from openscp.trace import (ReplayResult, TraceDirection, TraceLevel, TraceReader, TraceRecord, TraceRecorder,
+                               TraceStats, TracedConnection, replay_trace)
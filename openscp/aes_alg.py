@@ -14,15 +14,10 @@
 
 from enum import Enum
 
-from openscp.utils import _start_jvm_if_needed
-
-_start_jvm_if_needed()
-import com.samsung.openscp
-
 
 class AesAlg(Enum):
     """AES algorithm, which defines AES session keys size"""
 
-    AES_128 = com.samsung.openscp.AesAlg.AES_128
-    AES_192 = com.samsung.openscp.AesAlg.AES_192
-    AES_256 = com.samsung.openscp.AesAlg.AES_256
+    AES_128 = 16
+    AES_192 = 24
+    AES_256 = 32
@@ -0,0 +1,292 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import concurrent.futures
+import functools
+import threading
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Iterable, List, Optional, TypeVar, Union
+
+import openscp.aes_alg
+import openscp.apdu
+import openscp.scp_mode
+from openscp.backend import Backend
+from openscp.batch import CommandResult, ErrorPolicy
+from openscp.certificate_cache import CardId, CertificateCache
+from openscp.connection import SmartCardConnection
+from openscp.credentials import Scp03KeySet, Scp11Credentials
+from openscp.exceptions import OperationCancelledError, ScpError
+from openscp.scp_certificate import ScpCertificate
+from openscp.session import SecurityDomainSession
+from openscp.streaming import Chaining, StreamProgress, StreamResult, StreamSource
+
+if TYPE_CHECKING:
+    from openscp.certificate_validation import CertificateValidator
+    from openscp.trace import TraceRecorder
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 32
+
+_default_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_default_executor_lock = threading.Lock()
+
+
+class AsyncSmartCardConnection(ABC):
+    """Asynchronous smart card connection interface, counterpart of :class:`openscp.SmartCardConnection`"""
+
+    @abstractmethod
+    async def send_and_receive(self, apdu: bytes) -> bytes:
+        """
+        APDU processing callback. Will be awaited on the session's event loop when library code will need
+        communicate with a smart card.
+
+        :param apdu: Command APDU bytes
+        :return: Response APDU bytes
+        """
+        raise NotImplementedError("Abstract method is not implemented")
+
+    @abstractmethod
+    def is_extended_length_apdu_supported(self) -> bool:
+        """
+        Will be called from a worker thread after authentication to choose the APDU size to use.
+
+        :return: is extended APDU length supported by a smart card
+        """
+        raise NotImplementedError("Abstract method is not implemented")
+
+    @abstractmethod
+    async def close_connection(self) -> None:
+        """
+        Smart card connection closure callback. Will be awaited by :meth:`AsyncSecurityDomainSession.close`.
+
+        :return: None
+        """
+        raise NotImplementedError("Abstract method is not implemented")
+
+
+class _ConnectionBridge(SmartCardConnection):
+    """Synchronous connection used by the session on a worker thread, forwarding APDUs to the event loop"""
+
+    def __init__(self, connection: AsyncSmartCardConnection) -> None:
+        self._connection = connection
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Optional[concurrent.futures.Future] = None
+        self._cancelled = False
+        # Without it, an exchange submitted while the operation is being cancelled would never be cancelled
+        self._lock = threading.Lock()
+
+    def begin(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        # Called on the event loop thread, unblocks the worker thread waiting for the transport
+        with self._lock:
+            self._cancelled = True
+            pending = self._pending
+        if pending is not None:
+            pending.cancel()
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        with self._lock:
+            if self._cancelled or self._loop is None:
+                raise OperationCancelledError("Operation was cancelled")
+            future = asyncio.run_coroutine_threadsafe(self._connection.send_and_receive(apdu), self._loop)
+            self._pending = future
+        try:
+            return future.result()
+        except concurrent.futures.CancelledError as e:
+            raise OperationCancelledError("Operation was cancelled") from e
+        finally:
+            self._pending = None
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._connection.is_extended_length_apdu_supported()
+
+    def close_connection(self) -> None:
+        pass
+
+
+class AsyncSecurityDomainSession:
+    """
+    asyncio facade of :class:`openscp.SecurityDomainSession` working over :class:`AsyncSmartCardConnection`.
+
+    Session operations run on worker threads, which are busy only while an operation is in progress, and every APDU
+    is sent by awaiting the connection on the event loop the operation was awaited from. Operations of one session
+    are serialized. Cancelling an operation cancels the pending APDU exchange; if the command may have reached the
+    card, the secure channel state is unknown afterwards and the session must be authenticated again.
+    """
+
+    def __init__(self,
+                 connection: AsyncSmartCardConnection,
+                 backend: Backend = Backend.JAVA,
+                 executor: Optional[concurrent.futures.Executor] = None,
+                 certificate_cache: Optional[CertificateCache] = None,
+                 card_id: Optional[CardId] = None,
+                 certificate_validator: Optional["CertificateValidator"] = None,
+                 trace_recorder: Optional["TraceRecorder"] = None) -> None:
+        """
+        :param connection: :class:`AsyncSmartCardConnection` interface implementation
+        :param backend: SCP implementation to use
+        :param executor: executor running session operations, a shared thread pool of
+                         :data:`DEFAULT_MAX_WORKERS` threads is used if absent. Must not be used by the connection
+                         itself, otherwise its threads can all block waiting for the connection.
+        :param certificate_cache: see :class:`openscp.SecurityDomainSession`
+        :param card_id: see :class:`openscp.SecurityDomainSession`
+        :param certificate_validator: see :class:`openscp.SecurityDomainSession`
+        :param trace_recorder: see :class:`openscp.SecurityDomainSession`
+        """
+        self._connection = connection
+        self._backend = backend
+        self._certificate_cache = certificate_cache
+        self._card_id = card_id
+        self._certificate_validator = certificate_validator
+        self._trace_recorder = trace_recorder
+        self._executor = executor or _get_default_executor()
+        self._bridge = _ConnectionBridge(connection)
+        self._session: Optional[SecurityDomainSession] = None
+        self._lock = asyncio.Lock()
+        self._interrupted = False
+
+    async def authenticate_scp03(self,
+                                 key_id: Union[int, Scp03KeySet],
+                                 key_version: Union[int, openscp.scp_mode.ScpMode, None] = None,
+                                 enc_key: Optional[bytes] = None,
+                                 mac_key: Optional[bytes] = None,
+                                 dek_key: Optional[bytes] = None,
+                                 scp_mode: Optional[openscp.scp_mode.ScpMode] = None) -> None:
+        """
+        See :meth:`openscp.SecurityDomainSession.authenticate_scp03`
+        """
+        await self._run(lambda session: session.authenticate_scp03(key_id, key_version, enc_key, mac_key, dek_key,
+                                                                   scp_mode),
+                        authenticates=True)
+
+    async def authenticate_scp11(self,
+                                 sd_key_id: Union[int, Scp11Credentials],
+                                 sd_key_version: Union[int, openscp.scp_mode.ScpMode, None] = None,
+                                 oce_key_id: Optional[int] = None,
+                                 oce_key_version: Optional[int] = None,
+                                 pk_sd_ecka_bytes: Optional[bytes] = None,
+                                 cert_chain_oce_ecka: Optional[List[bytes]] = None,
+                                 sk_oce_ecka_bytes: Optional[bytes] = None,
+                                 session_keys_alg: Optional[openscp.aes_alg.AesAlg] = None,
+                                 scp_mode: Optional[openscp.scp_mode.ScpMode] = None) -> None:
+        """
+        See :meth:`openscp.SecurityDomainSession.authenticate_scp11`
+        """
+        await self._run(lambda session: session.authenticate_scp11(sd_key_id, sd_key_version, oce_key_id,
+                                                                   oce_key_version, pk_sd_ecka_bytes,
+                                                                   cert_chain_oce_ecka, sk_oce_ecka_bytes,
+                                                                   session_keys_alg, scp_mode),
+                        authenticates=True)
+
+    async def get_certificate_bundle(self, sd_key_id: int, sd_key_version: int) -> List[ScpCertificate]:
+        """
+        See :meth:`openscp.SecurityDomainSession.get_certificate_bundle`
+        """
+        return await self._run(lambda session: session.get_certificate_bundle(sd_key_id, sd_key_version))
+
+    async def send_and_receive(self, capdu: openscp.apdu.Apdu) -> bytes:
+        """
+        See :meth:`openscp.SecurityDomainSession.send_and_receive`
+        """
+        return await self._run(lambda session: session.send_and_receive(capdu))
+
+    async def send_many(self,
+                        capdus: Iterable[openscp.apdu.Apdu],
+                        error_policy: ErrorPolicy = ErrorPolicy.STOP) -> List[CommandResult]:
+        """
+        See :meth:`openscp.SecurityDomainSession.send_many`
+        """
+        capdus = list(capdus)
+        return await self._run(lambda session: session.send_many(capdus, error_policy))
+
+    async def send_stream(self,
+                          cla: int,
+                          ins: int,
+                          p1: int,
+                          p2: int,
+                          source: StreamSource,
+                          chaining: Chaining = Chaining.BLOCK_NUMBER,
+                          block_size: Optional[int] = None,
+                          progress: Optional[Callable[[StreamProgress], None]] = None) -> StreamResult:
+        """
+        See :meth:`openscp.SecurityDomainSession.send_stream`. The source is read and progress is reported on the
+        worker thread.
+        """
+        return await self._run(
+            lambda session: session.send_stream(cla, ins, p1, p2, source, chaining, block_size, progress))
+
+    async def close(self) -> None:
+        """
+        Close the connection. Waits for the operation in progress, if any.
+
+        :return: None
+        """
+        async with self._lock:
+            await self._connection.close_connection()
+
+    async def __aenter__(self) -> "AsyncSecurityDomainSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def _run(self, operation: Callable[[SecurityDomainSession], T], authenticates: bool = False) -> T:
+        async with self._lock:
+            if self._interrupted and not authenticates:
+                raise ScpError("Previous operation was cancelled, the session must be authenticated again")
+            loop = asyncio.get_running_loop()
+            self._bridge.begin(loop)
+            if self._interrupted:
+                # The secure channel state is unknown, so it must not be used to wrap the new handshake
+                self._session = None
+            job = self._executor.submit(functools.partial(self._call, operation))
+            future = asyncio.wrap_future(job)
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if job.cancel():
+                    raise
+                self._interrupted = True
+                self._bridge.cancel()
+                # The lock is held until the worker thread leaves the session, so the next operation can't interleave
+                try:
+                    await future
+                except Exception:
+                    pass
+                raise
+            if authenticates:
+                self._interrupted = False
+            return result
+
+    def _call(self, operation: Callable[[SecurityDomainSession], T]) -> T:
+        # The session is created on a worker thread, because the Java backend may need to start the JVM
+        if self._session is None:
+            self._session = SecurityDomainSession(self._bridge, self._backend, self._certificate_cache, self._card_id,
+                                                  certificate_validator=self._certificate_validator,
+                                                  trace_recorder=self._trace_recorder)
+        return operation(self._session)
+
+
+def _get_default_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _default_executor
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = concurrent.futures.ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS,
+                                                                      thread_name_prefix="openscp-async")
+        return _default_executor
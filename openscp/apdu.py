@@ -12,31 +12,243 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-class Apdu:
-    """Data holder class for ISO 7816 Command APDU representation"""
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from openscp.exceptions import ApduError, BadResponseError
+
+_SHORT_APDU_MAX_LENGTH = 0xFF
+_EXTENDED_APDU_MAX_LENGTH = 0xFFFF
+_SHORT_LE_MAX = 0x100
+_EXTENDED_LE_MAX = 0x10000
+_AES_BLOCK_SIZE = 16
+
+SW_OK = 0x9000
+SW1_HAS_MORE_DATA = 0x61
+SW1_WRONG_LE = 0x6C
+_SW1_WARNINGS = (0x62, 0x63)
+
+
+class Apdu(NamedTuple):
+    """Data holder class for ISO 7816 Command APDU representation. Instances are immutable."""
 
     cla: int
+    """CAPDU class byte (CLA)"""
+
     ins: int
+    """CAPDU instruction byte (INS)"""
+
     p1: int
+    """CAPDU parameter #1 byte (P1)"""
+
     p2: int
+    """CAPDU parameter #2 byte (P2)"""
+
     data: bytes
-    le: int
-    force_add_le: bool
+    """CAPDU data bytes, a mutable buffer must not be modified while the command is in use"""
+
+    le: int = 0x00
+    """response length expected (Le), 256 or 65536 for the maximum"""
+
+    force_add_le: bool = False
+    """force addition of 0x00 Le byte to the resulting CAPDU bytes"""
+
+    def to_bytes(self, extended: Optional[bool] = None) -> bytes:
+        """
+        Encode the command, ISO/IEC 7816-3 cases 1 to 4.
+
+        :param extended: use extended length fields, by default only if data or Le don't fit short ones
+        :return: Command APDU bytes
+
+        :raises: ValueError if data or Le is too long
+        """
+        if extended is None:
+            extended = len(self.data) > _SHORT_APDU_MAX_LENGTH or self.le > _SHORT_LE_MAX
+        return _encode_apdu(self.cla, self.ins, self.p1, self.p2, self.data, self.le, self.force_add_le, extended)
+
+    @classmethod
+    def from_bytes(cls, apdu: bytes) -> "Apdu":
+        """
+        Decode a command, ISO/IEC 7816-3 cases 1 to 4 with short or extended length fields.
+        Le of 0x00 (0x0000 if extended) is decoded as 256 (65536).
+
+        :param apdu: Command APDU bytes
+        :return: decoded command
+
+        :raises: ValueError if the length fields don't match the command length
+        """
+        if len(apdu) < 4:
+            raise ValueError("Command APDU is too short")
+        cla, ins, p1, p2 = apdu[:4]
+        body_length = len(apdu) - 4
+        if body_length == 0:
+            return cls(cla, ins, p1, p2, b"")
+        if body_length == 1:
+            return cls(cla, ins, p1, p2, b"", apdu[4] or _SHORT_LE_MAX)
+        if apdu[4] != 0 or body_length == 2:
+            length = apdu[4]
+            if body_length == 1 + length:
+                return cls(cla, ins, p1, p2, bytes(apdu[5:]))
+            if body_length == 2 + length and length:
+                return cls(cla, ins, p1, p2, bytes(apdu[5:-1]), apdu[-1] or _SHORT_LE_MAX)
+            raise ValueError("Wrong Lc")
+        length = (apdu[5] << 8) | apdu[6]
+        if body_length == 3:
+            return cls(cla, ins, p1, p2, b"", length or _EXTENDED_LE_MAX)
+        if length and body_length == 3 + length:
+            return cls(cla, ins, p1, p2, bytes(apdu[7:]))
+        if length and body_length == 5 + length:
+            return cls(cla, ins, p1, p2, bytes(apdu[7:-2]), ((apdu[-2] << 8) | apdu[-1]) or _EXTENDED_LE_MAX)
+        raise ValueError("Wrong Lc")
+
+    def __repr__(self) -> str:
+        return (f"Apdu(cla=0x{self.cla:02X}, ins=0x{self.ins:02X}, p1=0x{self.p1:02X}, p2=0x{self.p2:02X}, "
+                f"data={bytes(self.data).hex().upper()!r}, le={self.le}, force_add_le={self.force_add_le})")
+
+
+class ResponseApdu(NamedTuple):
+    """ISO 7816 Response APDU. The data field is a view over the received bytes, not a copy."""
+
+    data: memoryview
+    """RAPDU data bytes"""
+
+    sw: int
+    """status word (SW1 and SW2)"""
+
+    @classmethod
+    def from_bytes(cls, rapdu: bytes) -> "ResponseApdu":
+        """
+        :param rapdu: Response APDU bytes, a mutable buffer must not be modified while the response is in use
+        :return: response viewing the data field of rapdu
+
+        :raises: BadResponseError if rapdu is shorter than the status word
+        """
+        if len(rapdu) < 2:
+            raise BadResponseError("Invalid APDU response data")
+        return cls(memoryview(rapdu)[:-2], (rapdu[-2] << 8) | rapdu[-1])
+
+    @property
+    def sw1(self) -> int:
+        return self.sw >> 8
+
+    @property
+    def sw2(self) -> int:
+        return self.sw & 0xFF
+
+    @property
+    def is_success(self) -> bool:
+        """SW is 9000"""
+        return self.sw == SW_OK
 
-    def __init__(self, cla: int, ins: int, p1: int, p2: int, data: bytes, le: int = 0x00, force_add_le: bool = False):
+    @property
+    def is_warning(self) -> bool:
+        """SW1 is 62 or 63: processed with a warning, e.g. 63CX for failed verification with X retries left"""
+        return self.sw >> 8 in _SW1_WARNINGS
+
+    @property
+    def has_more_data(self) -> bool:
+        """SW1 is 61: SW2 bytes are available with GET RESPONSE"""
+        return self.sw >> 8 == SW1_HAS_MORE_DATA
+
+    @property
+    def is_wrong_le(self) -> bool:
+        """SW1 is 6C: the command must be repeated with Le set to SW2"""
+        return self.sw >> 8 == SW1_WRONG_LE
+
+    def check(self) -> memoryview:
+        """
+        :return: data field of a successful response
+
+        :raises: ApduError if SW isn't 9000
+        """
+        if self.sw != SW_OK:
+            raise ApduError(self.sw)
+        return self.data
+
+    def to_bytes(self) -> bytes:
+        """
+        :return: Response APDU bytes
+        """
+        return b"".join((self.data, self.sw.to_bytes(2, "big")))
+
+    def __repr__(self) -> str:
+        return f"ResponseApdu(data={bytes(self.data).hex().upper()!r}, sw=0x{self.sw:04X})"
+
+
+class ApduTemplate:
+    """Command with fixed CLA, INS and Le. Builds commands from P1, P2 and data, reusing recently built ones."""
+
+    __slots__ = ("cla", "ins", "le", "force_add_le", "_cache", "_cache_size")
+
+    def __init__(self, cla: int, ins: int, le: int = 0x00, force_add_le: bool = False, cache_size: int = 64):
         """
         :param cla: CAPDU class byte (CLA)
         :param ins: CAPDU instruction byte (INS)
-        :param p1: CAPDU parameter #1 byte (P1)
-        :param p2: CAPDU parameter #2 byte (P2)
-        :param data: CAPDU data bytes
         :param le: response length expected (Le)
         :param force_add_le: force addition of 0x00 Le byte to the resulting CAPDU bytes
+        :param cache_size: number of commands kept for reuse, 0 to disable
         """
         self.cla = cla
         self.ins = ins
-        self.p1 = p1
-        self.p2 = p2
-        self.data = data
         self.le = le
         self.force_add_le = force_add_le
+        self._cache: Dict[Tuple[int, int, bytes], Apdu] = {}
+        self._cache_size = cache_size
+
+    def __call__(self, p1: int, p2: int, data: bytes = b"") -> Apdu:
+        """
+        :param p1: CAPDU parameter #1 byte (P1)
+        :param p2: CAPDU parameter #2 byte (P2)
+        :param data: CAPDU data bytes, commands with data other than ``bytes`` are not reused
+        :return: command, the same object as for a recent call with equal arguments
+        """
+        if type(data) is not bytes:
+            return Apdu(self.cla, self.ins, p1, p2, data, self.le, self.force_add_le)
+        key = (p1, p2, data)
+        apdu = self._cache.get(key)
+        if apdu is None:
+            apdu = Apdu(self.cla, self.ins, p1, p2, data, self.le, self.force_add_le)
+            if self._cache_size:
+                if len(self._cache) >= self._cache_size:
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = apdu
+        return apdu
+
+
+def _encode_apdu(cla: int, ins: int, p1: int, p2: int, data: bytes, le: int, force_add_le: bool,
+                 extended: bool) -> bytes:
+    add_le = le > 0 or force_add_le
+    if extended:
+        if len(data) > _EXTENDED_APDU_MAX_LENGTH:
+            raise ValueError("Length must be no greater than 65535")
+        if le > _EXTENDED_LE_MAX:
+            raise ValueError("Le must be no greater than 65536")
+        header = bytes((cla, ins, p1, p2, 0x00))
+        if not data:
+            return header + (le & 0xFFFF).to_bytes(2, "big") if add_le else header[:4]
+        apdu = header + len(data).to_bytes(2, "big") + data
+        return apdu + (le & 0xFFFF).to_bytes(2, "big") if add_le else apdu
+    if len(data) > _SHORT_APDU_MAX_LENGTH:
+        raise ValueError("Length must be no greater than 255")
+    if le > _SHORT_LE_MAX:
+        raise ValueError("Le must be no greater than 256")
+    if not data:
+        return bytes((cla, ins, p1, p2, le & 0xFF)) if add_le else bytes((cla, ins, p1, p2))
+    apdu = bytes((cla, ins, p1, p2, len(data))) + data
+    return apdu + bytes((le & 0xFF,)) if add_le else apdu
+
+
+def _secured_apdu_extended(apdu: Apdu, mac_size: int, encrypt: bool, extended_supported: bool) -> bool:
+    # Whether the secured command needs extended length fields. Checked before the secure channel counters advance:
+    # a command rejected afterwards would desynchronize the channel. Secure messaging can't use command chaining,
+    # extended length is used only when the command doesn't fit.
+    length = len(apdu.data)
+    if encrypt and length:
+        length = (length // _AES_BLOCK_SIZE + 1) * _AES_BLOCK_SIZE
+    extended = length + mac_size > _SHORT_APDU_MAX_LENGTH and extended_supported
+    max_length = _EXTENDED_APDU_MAX_LENGTH if extended else _SHORT_APDU_MAX_LENGTH
+    if length + mac_size > max_length:
+        raise ValueError(f"Secured command data must be no longer than {max_length} bytes with padding and MAC")
+    max_le = _EXTENDED_LE_MAX if extended else _SHORT_LE_MAX
+    if apdu.le > max_le:
+        raise ValueError(f"Le must be no greater than {max_le}")
+    return extended
@@ -0,0 +1,25 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import Enum
+
+
+class Backend(Enum):
+    """SCP implementation used by :class:`openscp.SecurityDomainSession`"""
+
+    JAVA = "java"
+    """OpenSCP Java library running in an embedded JVM through JPype"""
+
+    NATIVE = "native"
+    """Pure Python implementation based on the ``cryptography`` package, doesn't need a JVM"""
@@ -0,0 +1,85 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from enum import Enum
+from typing import Callable, Generator, Iterable, Iterator, NamedTuple, Tuple
+
+from openscp.apdu import Apdu
+
+SW_OK = 0x9000
+
+# Sends a sequence of Command APDUs through a session backend and yields every command with its response data and
+# status word, without raising on error status words
+Exchange = Callable[[Iterable[Apdu]], Generator[Tuple[Apdu, bytes, int], None, None]]
+
+
+class ErrorPolicy(Enum):
+    """What a batch does when a command completes with an error status word"""
+
+    STOP = "stop"
+    """Report the failed command and don't send the rest"""
+
+    CONTINUE = "continue"
+    """Report the failed command and send the rest"""
+
+
+class CommandResult(NamedTuple):
+    """Outcome of a single command of a batch"""
+
+    index: int
+    """position of the command in the batch"""
+
+    apdu: Apdu
+    """Command APDU"""
+
+    data: bytes
+    """Response APDU data, empty if the command failed"""
+
+    sw: int
+    """Response APDU status word"""
+
+    duration: float
+    """seconds spent on the command: wrapping, card round trip and unwrapping"""
+
+    @property
+    def ok(self) -> bool:
+        """is the status word 9000"""
+        return self.sw == SW_OK
+
+
+def stream_results(exchange: Exchange,
+                   capdus: Iterable[Apdu],
+                   error_policy: ErrorPolicy = ErrorPolicy.STOP) -> Iterator[CommandResult]:
+    """
+    :param exchange: backend exchange function
+    :param capdus: Command APDUs, consumed lazily
+    :param error_policy: what to do after a command completes with an error status word
+    :return: iterator over results in the order of commands
+    """
+    responses = exchange(capdus)
+    clock = time.perf_counter
+    try:
+        index = 0
+        start = clock()
+        for capdu, data, sw in responses:
+            duration = clock() - start
+            yield CommandResult(index, capdu, data, sw, duration)
+            if sw != SW_OK and error_policy is ErrorPolicy.STOP:
+                break
+            index += 1
+            # Time spent by the consumer between results isn't attributed to the next command
+            start = clock()
+    finally:
+        responses.close()
@@ -0,0 +1,238 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from openscp.key_cache import CacheStats
+from openscp.scp_certificate import ScpCertificate
+
+# Card identity, e.g. CIN, IIN + CIN or a serial number read before authentication
+CardId = Union[str, bytes]
+
+DEFAULT_MAX_ENTRIES = 256
+
+_FORMAT_VERSION = 1
+
+
+class _Entry(NamedTuple):
+    stored_at: float
+    certificates: Tuple[Tuple[bytes, bytes], ...]
+
+
+class CertificateCache:
+    """
+    Cache of SD certificate bundles returned by GET DATA (certificate store), keyed by card identity and SD key
+    reference. Entries are kept in memory and, if a directory is given, on disk, so that they survive restarts and
+    are shared by processes.
+    """
+
+    def __init__(self,
+                 ttl: Optional[float] = None,
+                 directory: Optional[str] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        :param ttl: seconds, entries older than that are ignored and dropped. Never expire if absent.
+        :param directory: on-disk tier location, created if needed. Memory only if absent.
+        :param max_entries: maximum number of entries in memory, least recently used ones are dropped first
+        """
+        self._ttl = ttl
+        self._directory = directory
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[bytes, int, int], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, card_id: CardId, sd_key_id: int, sd_key_version: int) -> Optional[List[ScpCertificate]]:
+        """
+        :param card_id: card identity
+        :param sd_key_id: security domain SCP key identifier
+        :param sd_key_version: security domain SCP key version number
+        :return: cached certificates, None if absent or expired
+        """
+        key = (_card_digest(card_id), sd_key_id, sd_key_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None and self._directory is not None:
+            entry = self._read(key)
+            if entry is not None:
+                self._remember(key, entry)
+        with self._lock:
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return [ScpCertificate(encoded, public_key) for encoded, public_key in entry.certificates]
+
+    def put(self, card_id: CardId, sd_key_id: int, sd_key_version: int, certificates: List[ScpCertificate]) -> None:
+        """
+        :param card_id: card identity
+        :param sd_key_id: security domain SCP key identifier
+        :param sd_key_version: security domain SCP key version number
+        :param certificates: certificates returned by the card
+        :return: None
+        """
+        key = (_card_digest(card_id), sd_key_id, sd_key_version)
+        entry = _Entry(time.time(), tuple((bytes(certificate.get_encoded()), bytes(certificate.get_public_key()))
+                                          for certificate in certificates))
+        self._remember(key, entry)
+        if self._directory is not None:
+            self._write(key, entry)
+
+    def contains_public_key(self, card_id: CardId, sd_key_id: int, sd_key_version: int, public_key: bytes) -> bool:
+        """
+        :param card_id: card identity
+        :param sd_key_id: security domain SCP key identifier
+        :param sd_key_version: security domain SCP key version number
+        :param public_key: encoded public key (X.509 SubjectPublicKeyInfo)
+        :return: is the public key one of the cached certificate keys, the cache counters are not updated
+        """
+        key = (_card_digest(card_id), sd_key_id, sd_key_version)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None and self._directory is not None:
+            entry = self._read(key)
+        return entry is not None and any(cached == bytes(public_key) for _, cached in entry.certificates)
+
+    def invalidate(self,
+                   card_id: CardId,
+                   sd_key_id: Optional[int] = None,
+                   sd_key_version: Optional[int] = None) -> None:
+        """
+        Drop the certificates of a card from both tiers
+
+        :param card_id: card identity
+        :param sd_key_id: security domain SCP key identifier, all keys of the card if absent
+        :param sd_key_version: security domain SCP key version number, all keys of the card if absent
+        :return: None
+        """
+        card = _card_digest(card_id)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == card]:
+                if sd_key_id is None or sd_key_version is None or key[1:] == (sd_key_id, sd_key_version):
+                    del self._entries[key]
+        if self._directory is None:
+            return
+        if sd_key_id is None or sd_key_version is None:
+            shutil.rmtree(os.path.join(self._directory, card.hex()), ignore_errors=True)
+        else:
+            _remove_file(self._path((card, sd_key_id, sd_key_version)))
+
+    def clear(self) -> None:
+        """
+        Drop all certificates from both tiers, counters are kept
+
+        :return: None
+        """
+        with self._lock:
+            self._entries.clear()
+        if self._directory is not None:
+            for name in os.listdir(self._directory):
+                if _is_card_directory(name):
+                    shutil.rmtree(os.path.join(self._directory, name), ignore_errors=True)
+
+    def stats(self) -> CacheStats:
+        """
+        :return: counters of lookups in both tiers and of the memory tier size
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries), self._max_entries)
+
+    def _expired(self, entry: _Entry) -> bool:
+        return self._ttl is not None and time.time() - entry.stored_at > self._ttl
+
+    def _remember(self, key: Tuple[bytes, int, int], entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > max(self._max_entries, 0):
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _path(self, key: Tuple[bytes, int, int]) -> str:
+        card, sd_key_id, sd_key_version = key
+        return os.path.join(self._directory, card.hex(), f"{sd_key_id:02X}-{sd_key_version:02X}.json")
+
+    def _read(self, key: Tuple[bytes, int, int]) -> Optional[_Entry]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+            if content["version"] != _FORMAT_VERSION:
+                return None
+            entry = _Entry(content["stored_at"], tuple((base64.b64decode(certificate["encoded"]),
+                                                        base64.b64decode(certificate["public_key"]))
+                                                       for certificate in content["certificates"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if self._expired(entry):
+            _remove_file(path)
+            return None
+        return entry
+
+    def _write(self, key: Tuple[bytes, int, int], entry: _Entry) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        content = {
+            "version": _FORMAT_VERSION,
+            "stored_at": entry.stored_at,
+            "certificates": [{"encoded": base64.b64encode(encoded).decode("ascii"),
+                              "public_key": base64.b64encode(public_key).decode("ascii")}
+                             for encoded, public_key in entry.certificates]
+        }
+        # Written to a temporary file and renamed, so that concurrent readers never see a partial entry
+        descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(content, file)
+            os.replace(temporary_path, path)
+        except BaseException:
+            _remove_file(temporary_path)
+            raise
+
+
+def _card_digest(card_id: CardId) -> bytes:
+    # str and bytes identities are kept apart, digests make any identity a safe file name
+    prefix = b"s" if isinstance(card_id, str) else b"b"
+    value = card_id.encode("utf-8") if isinstance(card_id, str) else bytes(card_id)
+    return hashlib.sha256(prefix + value).digest()[:16]
+
+
+def _is_card_directory(name: str) -> bool:
+    # Only directories named by _card_digest are removed, the directory may be shared with other files
+    return len(name) == 32 and all(character in "0123456789abcdef" for character in name)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,287 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import datetime
+import time
+from typing import Any, Callable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+from openscp.exceptions import BadResponseError, CertificateValidationError
+from openscp.key_cache import CacheStats, KeyCache
+from openscp.metrics import PHASE_CERTIFICATE_VALIDATION, get_metrics
+from openscp.native_session import _TAG_GP_CERTIFICATE, _parse_gp_certificate_public_key
+from openscp.scp_certificate import ScpCertificate
+from openscp.tlv import iter_tlv, unpack_tlv_value
+
+DEFAULT_MAX_ENTRIES = 1024
+
+_TAG_GP_KEY_USAGE = 0x95
+_TAG_GP_EFFECTIVE_DATE = 0x5F25
+_TAG_GP_EXPIRATION_DATE = 0x5F24
+_TAG_GP_SIGNATURE = 0x5F37
+
+# GlobalPlatform key usage qualifiers, '82' for signature verification and '0080' for key agreement
+_GP_KEY_USAGE_MASK = 0x82
+_GP_KEY_USAGE_SIGNATURE_VERIFICATION = 0x82
+_GP_KEY_USAGE_KEY_AGREEMENT = 0x80
+
+_metrics = get_metrics()
+
+
+class CertificateValidationResult(NamedTuple):
+    """Outcome of the validation of one certificate bundle by :meth:`CertificateValidator.validate_many`"""
+
+    public_key: Optional[bytes]
+    """SD public key (PK.SD.ECKA) as X.509 SubjectPublicKeyInfo, None if the bundle is not valid"""
+
+    error: Optional[CertificateValidationError]
+    """why the bundle is not valid, None if it is"""
+
+    duration: float
+    """seconds spent validating the bundle"""
+
+
+class _Certificate(NamedTuple):
+    public_key: ec.EllipticCurvePublicKey
+    public_key_bytes: bytes
+    not_before: Optional[datetime.datetime]
+    not_after: Optional[datetime.datetime]
+    can_sign: bool
+    can_agree: bool
+    issuer: bytes
+
+
+class CertificateValidator:
+    """
+    Validates SCP11 SD certificate bundles, as returned by :meth:`openscp.SecurityDomainSession.get_certificate_bundle`,
+    against trusted CA-KLOC / CA-KLCC certificates. The first certificate of a bundle must be signed by a trust anchor,
+    every following one by the previous one, and the last one is the SD certificate (PK.SD.ECKA). Certificates are
+    X.509 or GlobalPlatform SCP11 ones, with ECDSA signatures; a bundle may start with the trust anchor itself.
+
+    Every certificate is checked for its signature, key usage (certificate signing for all but the last one, which
+    X.509 certificates must state with CA basic constraints, key agreement for the last one) and validity period.
+    Signature checks are memoized in a thread-safe LRU cache keyed by the certificate digest, so they run once per
+    distinct certificate; validity is checked on every validation.
+    """
+
+    def __init__(self, trust_anchors: Iterable[bytes], max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """
+        :param trust_anchors: encoded CA-KLOC / CA-KLCC certificates (X.509 or GlobalPlatform SCP11)
+        :param max_entries: maximum number of memoized certificates, 0 disables memoization
+
+        :raises: :class:`openscp.exceptions.CertificateValidationError` if a trust anchor is malformed
+        """
+        self._anchor_encodings: Set[bytes] = set()
+        anchors: List[_Certificate] = []
+        for encoded in trust_anchors:
+            encoded = bytes(encoded)
+            try:
+                anchors.append(_parse(encoded)[0])
+            except (ValueError, BadResponseError) as e:
+                raise CertificateValidationError(f"Trust anchor is malformed: {e}") from None
+            self._anchor_encodings.add(encoded)
+        self._anchors = tuple(anchors)
+        self._verified = KeyCache(max_entries)
+
+    def validate(self,
+                 certificates: Sequence[ScpCertificate],
+                 at: Optional[datetime.datetime] = None) -> bytes:
+        """
+        :param certificates: certificate bundle, the SD certificate last
+        :param at: time the certificates must be valid at, now if absent
+        :return: SD public key (PK.SD.ECKA) as X.509 SubjectPublicKeyInfo, to authenticate with
+
+        :raises: :class:`openscp.exceptions.CertificateValidationError` if the bundle is not valid
+        """
+        started = _metrics._start() if _metrics.enabled else None
+        try:
+            return self._validate([bytes(certificate.get_encoded()) for certificate in certificates],
+                                  at or datetime.datetime.now(datetime.timezone.utc))
+        finally:
+            if started is not None:
+                _metrics._stop(PHASE_CERTIFICATE_VALIDATION, started)
+
+    def validate_many(self,
+                      bundles: Iterable[Sequence[ScpCertificate]],
+                      at: Optional[datetime.datetime] = None,
+                      max_workers: Optional[int] = None) -> List[CertificateValidationResult]:
+        """
+        Validate certificate bundles of many cards on a thread pool. Certificates shared by the bundles, e.g. the
+        ones of intermediate CAs, are verified once.
+
+        :param bundles: certificate bundles, the SD certificate last in each
+        :param at: time the certificates must be valid at, now if absent
+        :param max_workers: threads validating the bundles, see :class:`concurrent.futures.ThreadPoolExecutor`
+        :return: results in the order of the bundles
+        """
+        at = at or datetime.datetime.now(datetime.timezone.utc)
+        bundles = list(bundles)
+        if max_workers == 1 or len(bundles) < 2:
+            return [self._validate_result(bundle, at) for bundle in bundles]
+        with concurrent.futures.ThreadPoolExecutor(max_workers, "openscp-certificates") as executor:
+            return list(executor.map(lambda bundle: self._validate_result(bundle, at), bundles))
+
+    def clear(self) -> None:
+        """
+        Drop all memoized certificates, counters are kept
+
+        :return: None
+        """
+        self._verified.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        :return: counters of the memoized certificates: hits are certificates whose signature wasn't checked again
+        """
+        return self._verified.stats()
+
+    def _validate_result(self,
+                         certificates: Sequence[ScpCertificate],
+                         at: datetime.datetime) -> CertificateValidationResult:
+        start = time.perf_counter()
+        try:
+            public_key = self.validate(certificates, at)
+        except CertificateValidationError as e:
+            return CertificateValidationResult(None, e, time.perf_counter() - start)
+        return CertificateValidationResult(public_key, None, time.perf_counter() - start)
+
+    def _validate(self, chain: List[bytes], at: datetime.datetime) -> bytes:
+        if chain and chain[0] in self._anchor_encodings and len(chain) > 1:
+            chain = chain[1:]
+        if not chain:
+            raise CertificateValidationError("Certificate bundle is empty")
+        issuers = self._anchors
+        for position, encoded in enumerate(chain):
+            certificate = self._verify(position, encoded, issuers)
+            if certificate.not_before is not None and at < certificate.not_before:
+                raise CertificateValidationError(f"Certificate {position} is not valid yet")
+            if certificate.not_after is not None and at > certificate.not_after:
+                raise CertificateValidationError(f"Certificate {position} has expired")
+            if position < len(chain) - 1 and not certificate.can_sign:
+                raise CertificateValidationError(f"Certificate {position} may not sign certificates")
+            if position == len(chain) - 1 and not certificate.can_agree:
+                raise CertificateValidationError(f"Certificate {position} may not be used for key agreement")
+            issuers = (certificate,)
+        return certificate.public_key_bytes
+
+    def _verify(self, position: int, encoded: bytes, issuers: Tuple[_Certificate, ...]) -> _Certificate:
+        certificate = self._verified.get_or_create("sd-certificate", (encoded,),
+                                                   lambda: _verify(position, encoded, issuers))
+        # A certificate memoized in another chain was signed by another issuer
+        if any(certificate.issuer == issuer.public_key_bytes for issuer in issuers):
+            return certificate
+        return _verify(position, encoded, issuers)
+
+
+def _verify(position: int, encoded: bytes, issuers: Tuple[_Certificate, ...]) -> _Certificate:
+    try:
+        certificate, signed, signature, hash_algorithm = _parse(encoded)
+    except (ValueError, BadResponseError) as e:
+        raise CertificateValidationError(f"Certificate {position} is malformed: {e}") from None
+    for issuer in issuers:
+        try:
+            issuer.public_key.verify(signature, signed, ec.ECDSA(hash_algorithm or _curve_hash(issuer.public_key)))
+        except (InvalidSignature, ValueError):
+            continue
+        return certificate._replace(issuer=issuer.public_key_bytes)
+    raise CertificateValidationError(f"Certificate {position} is not signed by a trusted issuer")
+
+
+def _parse(encoded: bytes) -> Tuple[_Certificate, bytes, bytes, Optional[hashes.HashAlgorithm]]:
+    # Certificate without issuer, signed data, DER signature and its hash algorithm (None if given by the issuer curve)
+    if encoded[:2] == _TAG_GP_CERTIFICATE.to_bytes(2, "big"):
+        return _parse_gp(encoded)
+    certificate = x509.load_der_x509_certificate(encoded)
+    public_key = certificate.public_key()
+    if not isinstance(public_key, ec.EllipticCurvePublicKey):
+        raise ValueError("SCP11 requires EC keys")
+    # Only a CA may issue certificates, as stated by basic constraints, while an absent key usage doesn't restrict
+    # the key
+    can_sign = _extension(certificate, x509.BasicConstraints, lambda constraints: constraints.ca, False)
+    can_sign &= _extension(certificate, x509.KeyUsage, lambda usage: usage.key_cert_sign, True)
+    can_agree = _extension(certificate, x509.KeyUsage, lambda usage: usage.key_agreement, True)
+    hash_algorithm = certificate.signature_hash_algorithm
+    if hash_algorithm is None:
+        raise ValueError("Unsupported signature algorithm")
+    return (_Certificate(public_key, _public_key_bytes(public_key), certificate.not_valid_before_utc,
+                         certificate.not_valid_after_utc, can_sign, can_agree, b""),
+            certificate.tbs_certificate_bytes, certificate.signature, hash_algorithm)
+
+
+def _parse_gp(encoded: bytes) -> Tuple[_Certificate, bytes, bytes, Optional[hashes.HashAlgorithm]]:
+    value = unpack_tlv_value(_TAG_GP_CERTIFICATE, encoded)
+    fields = {}
+    signed_end = len(value)
+    for tlv in iter_tlv(value):
+        fields[tlv.tag] = bytes(tlv.value)
+        if tlv.tag == _TAG_GP_SIGNATURE:
+            signed_end = tlv.offset
+    if _TAG_GP_SIGNATURE not in fields:
+        raise BadResponseError("Signature is absent")
+    if _TAG_GP_KEY_USAGE not in fields:
+        raise BadResponseError("Key usage is absent")
+    # r || s, as opposed to the DER sequence of X.509
+    signature = fields[_TAG_GP_SIGNATURE]
+    size = len(signature) // 2
+    if not signature or len(signature) != 2 * size:
+        raise BadResponseError("Malformed signature")
+    public_key = _parse_gp_certificate_public_key(encoded)
+    usage = int.from_bytes(fields[_TAG_GP_KEY_USAGE], "big") & _GP_KEY_USAGE_MASK
+    not_before = _gp_date(fields.get(_TAG_GP_EFFECTIVE_DATE), datetime.time.min)
+    not_after = _gp_date(fields.get(_TAG_GP_EXPIRATION_DATE), datetime.time.max)
+    # The signature covers the data objects preceding it
+    return (_Certificate(public_key, _public_key_bytes(public_key), not_before, not_after,
+                         usage == _GP_KEY_USAGE_SIGNATURE_VERIFICATION, usage == _GP_KEY_USAGE_KEY_AGREEMENT, b""),
+            value[:signed_end], encode_dss_signature(int.from_bytes(signature[:size], "big"),
+                                                     int.from_bytes(signature[size:], "big")), None)
+
+
+def _gp_date(value: Optional[bytes], time_of_day: datetime.time) -> Optional[datetime.datetime]:
+    # YYYYMMDD in BCD, the whole day in UTC
+    if value is None:
+        return None
+    try:
+        date = datetime.datetime.strptime(value.hex(), "%Y%m%d").date()
+    except ValueError:
+        raise BadResponseError("Malformed date") from None
+    return datetime.datetime.combine(date, time_of_day, datetime.timezone.utc)
+
+
+def _extension(certificate: x509.Certificate,
+               extension_type: type,
+               allows: Callable[[Any], bool],
+               absent: bool) -> bool:
+    try:
+        return bool(allows(certificate.extensions.get_extension_for_class(extension_type).value))
+    except x509.ExtensionNotFound:
+        return absent
+
+
+def _curve_hash(public_key: ec.EllipticCurvePublicKey) -> hashes.HashAlgorithm:
+    key_size = public_key.curve.key_size
+    if key_size <= 256:
+        return hashes.SHA256()
+    if key_size <= 384:
+        return hashes.SHA384()
+    return hashes.SHA512()
+
+
+def _public_key_bytes(public_key: ec.EllipticCurvePublicKey) -> bytes:
+    return public_key.public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
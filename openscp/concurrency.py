@@ -0,0 +1,67 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import queue
+import threading
+from enum import Enum
+from typing import Any, Callable, Optional, Tuple
+
+_Call = Tuple["concurrent.futures.Future[Any]", Callable[..., Any], Tuple[Any, ...]]
+
+
+class Concurrency(Enum):
+    """How :class:`openscp.SecurityDomainSession` handles calls from several threads"""
+
+    LOCK = "lock"
+    """Calls hold a lock of the session, others wait for it in no particular order"""
+
+    QUEUE = "queue"
+    """Calls are queued to a thread of the session and run in the order of arrival. Only that thread uses the
+    connection, e.g. for readers bound to the thread which opened them."""
+
+    NONE = "none"
+    """No synchronization, the caller guarantees that one thread at a time uses the session"""
+
+
+class _SessionThread:
+    """Runs the calls of a session in the order of arrival"""
+
+    def __init__(self) -> None:
+        self._calls: "queue.SimpleQueue[Optional[_Call]]" = queue.SimpleQueue()
+        thread = threading.Thread(target=_serve, args=(self._calls,), name="openscp-session", daemon=True)
+        thread.start()
+        self.ident = thread.ident
+
+    def call(self, function: Callable[..., Any], *args: Any) -> Any:
+        future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+        self._calls.put((future, function, args))
+        return future.result()
+
+    def stop(self) -> None:
+        self._calls.put(None)
+
+
+def _serve(calls: "queue.SimpleQueue[Optional[_Call]]") -> None:
+    while True:
+        call = calls.get()
+        if call is None:
+            return
+        future, function, args = call
+        try:
+            future.set_result(function(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        # The thread must not keep the session alive while waiting for the next call
+        del call, future, function, args
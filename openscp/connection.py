@@ -12,19 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any
-
-from openscp.utils import _start_jvm_if_needed, _java_bytes_to_python_bytes
-
-from jpype import JImplements, JOverride
-
+import threading
+import time
 from abc import ABC, abstractmethod
+from typing import Iterable, NamedTuple
 
-_start_jvm_if_needed()
-import com.samsung.openscp
 
-
-@JImplements(com.samsung.openscp.SmartCardConnection)
 class SmartCardConnection(ABC):
     """Smart card connection interface, which library user should implement using real connection to the eSE chip"""
 
@@ -56,19 +49,86 @@ class SmartCardConnection(ABC):
         """
         raise NotImplementedError("Abstract method is not implemented")
 
-    @JOverride  # type: ignore[misc]
-    # apdu: byte[] (Java primitive)
-    def sendAndReceive(self, apdu: Any) -> bytes:
-        """Java interface callback implementation. DO NOT override"""
-        apdu_in_python_bytes = _java_bytes_to_python_bytes(apdu)
-        return self.send_and_receive(apdu_in_python_bytes)
-
-    @JOverride  # type: ignore[misc]
-    def isExtendedLengthApduSupported(self) -> bool:
-        """Java interface callback implementation. DO NOT override"""
-        return self.is_extended_length_apdu_supported()
-
-    @JOverride  # type: ignore[misc]
-    def close(self) -> None:
-        """Java interface callback implementation. DO NOT override"""
-        return self.close_connection()
+
+class TransportStats(NamedTuple):
+    """Counters of the APDU exchanges of a bundled transport, e.g. :class:`openscp.RemoteConnection`"""
+
+    commands: int
+    """APDUs exchanged, including failed ones"""
+
+    errors: int
+    """APDUs whose exchange failed in the transport, error status words aren't counted"""
+
+    total: float
+    """seconds, from sending the command to receiving the response, of successful exchanges"""
+
+    min: float
+    """seconds, the fastest exchange, 0 if there were none"""
+
+    max: float
+    """seconds, the slowest exchange"""
+
+    bytes_sent: int
+    """Command APDU bytes"""
+
+    bytes_received: int
+    """Response APDU bytes"""
+
+    @property
+    def average(self) -> float:
+        """mean latency of successful exchanges, 0 if there were none"""
+        succeeded = self.commands - self.errors
+        return self.total / succeeded if succeeded else 0.0
+
+
+class _TransportCounters:
+    """Thread-safe counters behind :class:`TransportStats`"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._commands = 0
+        self._errors = 0
+        self._total = 0.0
+        self._min = 0.0
+        self._max = 0.0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+
+    def record(self, start: float, sent: int, received: int) -> None:
+        duration = time.perf_counter() - start
+        with self._lock:
+            if self._commands == self._errors or duration < self._min:
+                self._min = duration
+            if duration > self._max:
+                self._max = duration
+            self._commands += 1
+            self._total += duration
+            self._bytes_sent += sent
+            self._bytes_received += received
+
+    def record_error(self, sent: int) -> None:
+        with self._lock:
+            self._commands += 1
+            self._errors += 1
+            self._bytes_sent += sent
+
+    def stats(self) -> TransportStats:
+        with self._lock:
+            return TransportStats(self._commands, self._errors, self._total, self._min, self._max, self._bytes_sent,
+                                  self._bytes_received)
+
+
+def _merge_transport_stats(stats: Iterable[TransportStats]) -> TransportStats:
+    merged = TransportStats(0, 0, 0.0, 0.0, 0.0, 0, 0)
+    for item in stats:
+        # min is only meaningful for counters with successful exchanges
+        if item.commands == item.errors:
+            minimum = merged.min
+        elif merged.commands == merged.errors:
+            minimum = item.min
+        else:
+            minimum = min(merged.min, item.min)
+        merged = TransportStats(merged.commands + item.commands, merged.errors + item.errors, merged.total + item.total,
+                                minimum, max(merged.max, item.max), merged.bytes_sent + item.bytes_sent,
+                                merged.bytes_received + item.bytes_received)
+    return merged
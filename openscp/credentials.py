@@ -0,0 +1,197 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Any, Callable, Iterable, Tuple, TypeVar
+
+from openscp.aes_alg import AesAlg
+
+T = TypeVar("T")
+
+# Sets a field in __init__, bypassing the immutability check of __setattr__, which costs more than the whole
+# construction otherwise
+_initialize = object.__setattr__
+
+
+class _PreparedCredentials:
+    __slots__ = ("_prepared", "_lock")
+
+    def __init__(self) -> None:
+        _initialize(self, "_prepared", {})
+        _initialize(self, "_lock", threading.Lock())
+
+    def _prepare(self, backend: str, factory: Callable[[], T]) -> T:
+        # Backend objects are created once per credentials object and are immutable, so they are shared freely
+        prepared = self._prepared.get(backend)
+        if prepared is None:
+            with self._lock:
+                prepared = self._prepared.get(backend)
+                if prepared is None:
+                    prepared = self._prepared[backend] = factory()
+        return prepared
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if hasattr(self, name):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class Scp03KeySet(_PreparedCredentials):
+    """
+    Static SCP03 keys of a security domain key set. Immutable, converted for a session backend on first use and
+    shareable between sessions and threads.
+    """
+
+    __slots__ = ("_key_id", "_key_version", "_enc_key", "_mac_key", "_dek_key")
+
+    def __init__(self, key_id: int, key_version: int, enc_key: bytes, mac_key: bytes, dek_key: bytes) -> None:
+        """
+        :param key_id: SCP key identifier
+        :param key_version: SCP key version number
+        :param enc_key: static secure channel encryption key
+        :param mac_key: static secure channel message authentication code key
+        :param dek_key: static data encryption key
+        """
+        super().__init__()
+        _initialize(self, "_key_id", key_id)
+        _initialize(self, "_key_version", key_version)
+        _initialize(self, "_enc_key", bytes(enc_key))
+        _initialize(self, "_mac_key", bytes(mac_key))
+        _initialize(self, "_dek_key", bytes(dek_key))
+
+    @property
+    def key_id(self) -> int:
+        """SCP key identifier"""
+        return self._key_id
+
+    @property
+    def key_version(self) -> int:
+        """SCP key version number"""
+        return self._key_version
+
+    @property
+    def enc_key(self) -> bytes:
+        """static secure channel encryption key"""
+        return self._enc_key
+
+    @property
+    def mac_key(self) -> bytes:
+        """static secure channel message authentication code key"""
+        return self._mac_key
+
+    @property
+    def dek_key(self) -> bytes:
+        """static data encryption key"""
+        return self._dek_key
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Backend objects aren't picklable, a copy in another process prepares its own
+        return Scp03KeySet, (self._key_id, self._key_version, self._enc_key, self._mac_key, self._dek_key)
+
+    def __repr__(self) -> str:
+        return f"Scp03KeySet(key_id=0x{self._key_id:02X}, key_version=0x{self._key_version:02X})"
+
+
+class Scp11Credentials(_PreparedCredentials):
+    """
+    SCP11 keys and OCE certificate chain. Immutable, converted for a session backend on first use and shareable
+    between sessions and threads.
+    """
+
+    __slots__ = ("_sd_key_id", "_sd_key_version", "_oce_key_id", "_oce_key_version", "_pk_sd_ecka_bytes",
+                 "_cert_chain_oce_ecka", "_sk_oce_ecka_bytes", "_session_keys_alg")
+
+    def __init__(self,
+                 sd_key_id: int,
+                 sd_key_version: int,
+                 oce_key_id: int,
+                 oce_key_version: int,
+                 pk_sd_ecka_bytes: bytes,
+                 cert_chain_oce_ecka: Iterable[bytes],
+                 sk_oce_ecka_bytes: bytes,
+                 session_keys_alg: AesAlg) -> None:
+        """
+        :param sd_key_id: security domain SCP key identifier of associated SK.SD.ECKA
+        :param sd_key_version: security domain SCP key version number of associated SK.SD.ECKA
+        :param oce_key_id: off-card entity SCP key identifier of associated SK.OCE.ECKA
+        :param oce_key_version: off-card entity SCP key version number of associated SK.OCE.ECKA
+        :param pk_sd_ecka_bytes: public key of the SD used for key agreement in encoded form (PK.SD.ECKA)
+        :param cert_chain_oce_ecka: certificate chain including the certificate containing the public key of the OCE
+                                    used for key agreement in encoded form (CERT.OCE.ECKA)
+        :param sk_oce_ecka_bytes: private key of the OCE used for key agreement in encoded form (SK.OCE.ECKA)
+        :param session_keys_alg: AES algorithm for session keys that will be generated
+        """
+        super().__init__()
+        _initialize(self, "_sd_key_id", sd_key_id)
+        _initialize(self, "_sd_key_version", sd_key_version)
+        _initialize(self, "_oce_key_id", oce_key_id)
+        _initialize(self, "_oce_key_version", oce_key_version)
+        _initialize(self, "_pk_sd_ecka_bytes", bytes(pk_sd_ecka_bytes))
+        _initialize(self, "_cert_chain_oce_ecka", tuple(bytes(certificate) for certificate in cert_chain_oce_ecka))
+        _initialize(self, "_sk_oce_ecka_bytes", bytes(sk_oce_ecka_bytes) if sk_oce_ecka_bytes else b"")
+        _initialize(self, "_session_keys_alg", session_keys_alg)
+
+    @property
+    def sd_key_id(self) -> int:
+        """security domain SCP key identifier"""
+        return self._sd_key_id
+
+    @property
+    def sd_key_version(self) -> int:
+        """security domain SCP key version number"""
+        return self._sd_key_version
+
+    @property
+    def oce_key_id(self) -> int:
+        """off-card entity SCP key identifier"""
+        return self._oce_key_id
+
+    @property
+    def oce_key_version(self) -> int:
+        """off-card entity SCP key version number"""
+        return self._oce_key_version
+
+    @property
+    def pk_sd_ecka_bytes(self) -> bytes:
+        """PK.SD.ECKA in encoded form"""
+        return self._pk_sd_ecka_bytes
+
+    @property
+    def cert_chain_oce_ecka(self) -> Tuple[bytes, ...]:
+        """CERT.OCE.ECKA chain in encoded form"""
+        return self._cert_chain_oce_ecka
+
+    @property
+    def sk_oce_ecka_bytes(self) -> bytes:
+        """SK.OCE.ECKA in encoded form, empty for SCP11b"""
+        return self._sk_oce_ecka_bytes
+
+    @property
+    def session_keys_alg(self) -> AesAlg:
+        """AES algorithm for session keys"""
+        return self._session_keys_alg
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Backend objects aren't picklable, a copy in another process prepares its own
+        return Scp11Credentials, (self._sd_key_id, self._sd_key_version, self._oce_key_id, self._oce_key_version,
+                                  self._pk_sd_ecka_bytes, self._cert_chain_oce_ecka, self._sk_oce_ecka_bytes,
+                                  self._session_keys_alg)
+
+    def __repr__(self) -> str:
+        return (f"Scp11Credentials(sd_key_id=0x{self._sd_key_id:02X}, sd_key_version=0x{self._sd_key_version:02X}, "
+                f"oce_key_id=0x{self._oce_key_id:02X}, oce_key_version=0x{self._oce_key_version:02X}, "
+                f"session_keys_alg={self._session_keys_alg.name})")
@@ -0,0 +1,161 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from enum import Enum
+from typing import Callable, Dict, List, Sequence
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from openscp.credentials import Scp03KeySet
+
+_BLOCK_SIZE = 16
+# Cards diversified per pass, keeps the buffers of a pass small enough for the CPU caches
+_CHUNK_SIZE = 4096
+# Derivation constants of the ENC, MAC and DEK keys
+_CONSTANTS = (0x01, 0x02, 0x03)
+_EMV_DATA_LENGTH = 6
+_AES_KEY_LENGTHS = (16, 24, 32)
+_CMAC_PADDING = b"\x80"
+_CMAC_R = 0x87
+
+
+class DiversificationMethod(Enum):
+    """How the static SCP03 keys of a card are derived from master keys and the card's diversification data"""
+
+    EMV_CPS_11 = "emv-cps-1.1"
+    """EMV CPS 1.1: the master key encrypts ``data[-6:] || F0 || n || data[-6:] || 0F || n`` in ECB mode, with n
+    1, 2 and 3 for the ENC, MAC and DEK keys. Derives 16-byte keys."""
+
+    KDF3 = "kdf3"
+    """SCP03 key derivation function keyed by the master key, with derivation constant 1, 2 and 3 for the ENC, MAC
+    and DEK keys and the diversification data as context. Keys have the length of the master keys."""
+
+
+def diversify_key_sets(master: Scp03KeySet,
+                       diversification_data: Sequence[bytes],
+                       method: DiversificationMethod = DiversificationMethod.KDF3) -> List[Scp03KeySet]:
+    """
+    Derive the static SCP03 keys of many cards at once. Every master key encrypts the data of all cards in a few
+    AES calls over contiguous buffers, instead of a few calls per card.
+
+    :param master: master keys, key identifier and version are kept in derived key sets
+    :param diversification_data: per card, e.g. the key diversification data of the INITIALIZE UPDATE response,
+                                 the CIN, the IIN or CPLC fields
+    :param method: diversification method
+    :return: key set of every card, in the order of diversification data
+
+    :raises: ValueError if a master key isn't an AES key or diversification data is shorter than 6 bytes for
+             :attr:`DiversificationMethod.EMV_CPS_11`
+    """
+    derive = _emv_cps_11 if method is DiversificationMethod.EMV_CPS_11 else _kdf3
+    master_keys = (master.enc_key, master.mac_key, master.dek_key)
+    if any(len(key) not in _AES_KEY_LENGTHS for key in master_keys):
+        raise ValueError("Master keys must be 16, 24 or 32 bytes long")
+    if method is DiversificationMethod.EMV_CPS_11 and any(len(data) < _EMV_DATA_LENGTH
+                                                          for data in diversification_data):
+        raise ValueError(f"EMV CPS 1.1 diversification data must have at least {_EMV_DATA_LENGTH} bytes")
+    key_sets: List[Scp03KeySet] = []
+    for start in range(0, len(diversification_data), _CHUNK_SIZE):
+        chunk = [bytes(data) for data in diversification_data[start:start + _CHUNK_SIZE]]
+        enc_keys, mac_keys, dek_keys = (derive(key, constant, chunk) for key, constant in zip(master_keys, _CONSTANTS))
+        key_sets.extend(Scp03KeySet(master.key_id, master.key_version, enc_key, mac_key, dek_key)
+                        for enc_key, mac_key, dek_key in zip(enc_keys, mac_keys, dek_keys))
+    return key_sets
+
+
+def diversify_key_set(master: Scp03KeySet,
+                      diversification_data: bytes,
+                      method: DiversificationMethod = DiversificationMethod.KDF3) -> Scp03KeySet:
+    """
+    Derive the static SCP03 keys of a card, see :func:`diversify_key_sets`
+
+    :param master: master keys
+    :param diversification_data: diversification data of the card
+    :param method: diversification method
+    :return: key set of the card
+    """
+    return diversify_key_sets(master, [diversification_data], method)[0]
+
+
+def _emv_cps_11(key: bytes, constant: int, chunk: List[bytes]) -> List[bytes]:
+    left = bytes((0xF0, constant))
+    right = bytes((0x0F, constant))
+    buffer = b"".join([piece for data in chunk for piece in (data[-_EMV_DATA_LENGTH:], left,
+                                                             data[-_EMV_DATA_LENGTH:], right)])
+    derived = _encryptor(key)(buffer)
+    return [derived[offset:offset + _BLOCK_SIZE] for offset in range(0, len(derived), _BLOCK_SIZE)]
+
+
+def _kdf3(key: bytes, constant: int, chunk: List[bytes]) -> List[bytes]:
+    # Contexts of equal length are MACed together, one block column at a time
+    groups: Dict[int, List[int]] = {}
+    for index, context in enumerate(chunk):
+        groups.setdefault(len(context), []).append(index)
+    keys: List[bytes] = [b""] * len(chunk)
+    encrypt = _encryptor(key)
+    for length, indices in groups.items():
+        derived = _kdf3_group(encrypt, constant, [chunk[index] for index in indices], length, len(key))
+        for index, derived_key in zip(indices, derived):
+            keys[index] = derived_key
+    return keys
+
+
+def _kdf3_group(encrypt: Callable[[bytes], bytes], constant: int, contexts: List[bytes], context_length: int,
+                key_length: int) -> List[bytes]:
+    count = len(contexts)
+    k1 = _double(encrypt(bytes(_BLOCK_SIZE)))
+    k2 = _double(k1)
+    complete = context_length % _BLOCK_SIZE == 0
+    if not complete:
+        padding = _CMAC_PADDING + bytes(_BLOCK_SIZE - 1 - context_length % _BLOCK_SIZE)
+        contexts = [context + padding for context in contexts]
+    columns = [b"".join([context[offset:offset + _BLOCK_SIZE] for context in contexts])
+               for offset in range(0, len(contexts[0]), _BLOCK_SIZE)]
+    subkey = k1 if complete else k2
+    last = len(columns) - 1
+    outputs = []
+    for counter in range(1, (key_length + _BLOCK_SIZE - 1) // _BLOCK_SIZE + 1):
+        # The first block - label, separator, length and counter - is the same for all cards
+        first = bytes(11) + bytes((constant, 0x00)) + (key_length * 8).to_bytes(2, "big") + bytes((counter,))
+        if not columns:
+            outputs.append(encrypt(_xor(first, subkey)) * count)
+            continue
+        chain = encrypt(first)
+        states = encrypt(_xor(columns[0], (_xor(chain, subkey) if last == 0 else chain) * count))
+        for column in columns[1:last]:
+            states = encrypt(_xor(states, column))
+        if last:
+            states = encrypt(_xor(_xor(states, columns[last]), subkey * count))
+        outputs.append(states)
+    if len(outputs) == 1:
+        derived = outputs[0]
+        return [derived[offset:offset + key_length] for offset in range(0, len(derived), _BLOCK_SIZE)]
+    return [b"".join([output[offset:offset + _BLOCK_SIZE] for output in outputs])[:key_length]
+            for offset in range(0, count * _BLOCK_SIZE, _BLOCK_SIZE)]
+
+
+def _encryptor(key: bytes) -> Callable[[bytes], bytes]:
+    # ECB encrypts whole blocks independently, so one encryptor serves any number of calls
+    return Cipher(algorithms.AES(key), modes.ECB()).encryptor().update  # type: ignore[no-any-return]
+
+
+def _double(block: bytes) -> bytes:
+    value = int.from_bytes(block, "big") << 1
+    if value >> (_BLOCK_SIZE * 8):
+        value ^= _CMAC_R
+    return (value & ((1 << (_BLOCK_SIZE * 8)) - 1)).to_bytes(_BLOCK_SIZE, "big")
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "big") ^ int.from_bytes(b, "big")).to_bytes(len(a), "big")
@@ -0,0 +1,399 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hmac
+import os
+import time
+from typing import Callable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+import openscp.connection
+from openscp.apdu import Apdu
+from openscp.credentials import Scp03KeySet
+from openscp.native_session import _parse_certificate
+from openscp.scp_mode import ScpMode
+from openscp.scp_state import (INS_EXTERNAL_AUTHENTICATE, INS_INITIALIZE_UPDATE, INS_INTERNAL_AUTHENTICATE,
+                               INS_MUTUAL_AUTHENTICATE, INS_PERFORM_SECURITY_OPERATION, KID_SCP11B, SW_OK,
+                               SessionKeys, _DERIVATION_CARD_CRYPTOGRAM, _DERIVATION_HOST_CRYPTOGRAM,
+                               _SCP11_KEY_TYPE_AES, _SCP11_KEY_USAGE, _aes_cbc_decrypt, _aes_cbc_encrypt, _aes_cmac,
+                               _aes_ecb, _x963_kdf, derive_key, derive_session_keys)
+from openscp.tlv import decode_tlv_list, encode_tlv
+
+# Handles a command which isn't part of the secure channel protocol, after secure messaging has been removed:
+# returns response data and status word
+CommandHandler = Callable[[Apdu], Tuple[bytes, int]]
+
+SW_WRONG_LENGTH = 0x6700
+SW_AUTHENTICATION_FAILED = 0x6300
+SW_SECURITY_STATUS_NOT_SATISFIED = 0x6982
+SW_CONDITIONS_NOT_SATISFIED = 0x6985
+SW_WRONG_DATA = 0x6A80
+SW_REFERENCE_NOT_FOUND = 0x6A88
+
+_CLA_CHAINING = 0x10
+_CLA_SECURE_MESSAGING = 0x04
+_INS_SELECT = 0xA4
+_INS_GET_DATA = 0xCA
+_INS_GET_RESPONSE = 0xC0
+_TAG_CERTIFICATE_STORE = 0xBF21
+_TAG_CONTROL_REFERENCE = 0xA6
+_TAG_KEY_IDENTIFICATION = 0x83
+_TAG_EPK = 0x5F49
+_TAG_RECEIPT = 0x86
+_TAG_KEY_LENGTH = 0x81
+
+# Security level bits of EXTERNAL AUTHENTICATE P1
+_LEVEL_C_MAC = 0x01
+_LEVEL_C_DECRYPTION = 0x02
+_LEVEL_R_MAC = 0x10
+_LEVEL_R_ENCRYPTION = 0x20
+_SCP11_SECURITY_LEVEL = 0x33
+
+# i parameter: R-MAC and R-ENCRYPTION supported, pseudo-random card challenge; S16 mode
+_I_PARAMETER = 0x70
+_I_PARAMETER_S16 = 0x01
+
+_SHORT_RESPONSE_MAX_LENGTH = 0x100
+
+
+class Scp11SdKey(NamedTuple):
+    """SCP11 key of the emulated security domain"""
+
+    key_id: int
+    """0x11 (SCP11a), 0x13 (SCP11b) or 0x15 (SCP11c)"""
+
+    key_version: int
+
+    private_key_bytes: bytes
+    """SK.SD.ECKA in PKCS#8 DER form"""
+
+    certificates: Sequence[bytes]
+    """certificate store content returned by GET DATA, CERT.SD.ECKA last"""
+
+
+class SecurityDomainEmulator(openscp.connection.SmartCardConnection):
+    """
+    In-process GlobalPlatform security domain: SCP03 (INITIALIZE UPDATE, EXTERNAL AUTHENTICATE) and SCP11a/b/c
+    (PERFORM SECURITY OPERATION, MUTUAL and INTERNAL AUTHENTICATE) with any security level, certificate store GET DATA,
+    command chaining, GET RESPONSE and extended length. OCE certificates are not verified. Commands other than these
+    are passed to the handler, which by default returns their data. Not thread-safe, like a card.
+    Requires the ``cryptography`` package.
+    """
+
+    def __init__(self,
+                 scp03_key_sets: Iterable[Scp03KeySet] = (),
+                 scp11_keys: Iterable[Scp11SdKey] = (),
+                 scp11_mode: ScpMode = ScpMode.S8,
+                 extended_length: bool = False,
+                 latency: float = 0.0,
+                 ins_latency: Optional[Mapping[int, float]] = None,
+                 handler: Optional[CommandHandler] = None) -> None:
+        """
+        :param scp03_key_sets: SCP03 key sets, INITIALIZE UPDATE selects one by key version, the first one for 0
+        :param scp11_keys: SCP11 keys, selected by key identifier and version
+        :param scp11_mode: MAC size of SCP11 sessions, SCP03 sessions take it from the host challenge length
+        :param extended_length: support extended length APDUs
+        :param latency: seconds added to every command, e.g. the round trip to a real card
+        :param ins_latency: seconds added to commands with the instruction, e.g. ECDH on a real card
+        :param handler: handles application commands
+        """
+        self._scp03_key_sets = list(scp03_key_sets)
+        self._scp11_keys = {(key.key_id, key.key_version): _LoadedScp11Key(key) for key in scp11_keys}
+        self._scp11_mac_size = scp11_mode.value
+        self._extended_length = extended_length
+        self._latency = latency
+        self._ins_latency = dict(ins_latency or {})
+        self._handler = handler or _echo
+        self._pending_response = b""
+        self._chained_data = b""
+        self._oce_certificates: List[bytes] = []
+        self._pk_oce_ecka: Optional[ec.EllipticCurvePublicKey] = None
+        self._scp03_context: Optional[Tuple[bytes, SessionKeys]] = None
+        self._channel: Optional[_SecureChannel] = None
+
+    @property
+    def secure_channel_open(self) -> bool:
+        """is a secure channel session established"""
+        return self._channel is not None
+
+    def reset(self) -> None:
+        """
+        Drop the secure channel and pending data, as a card reset does
+
+        :return: None
+        """
+        self._pending_response = b""
+        self._chained_data = b""
+        self._oce_certificates = []
+        self._pk_oce_ecka = None
+        self._scp03_context = None
+        self._channel = None
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        delay = self._latency + self._ins_latency.get(apdu[1], 0.0) if len(apdu) > 1 else self._latency
+        if delay:
+            time.sleep(delay)
+        try:
+            command = _parse_command(apdu, self._extended_length)
+        except ValueError:
+            return _sw(SW_WRONG_LENGTH)
+        data, sw = self._process(command, apdu)
+        return self._respond(data, sw)
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._extended_length
+
+    def close_connection(self) -> None:
+        self.reset()
+
+    def _process(self, command: Apdu, raw: bytes) -> Tuple[bytes, int]:
+        if command.ins == _INS_GET_RESPONSE:
+            return self._get_response()
+        self._pending_response = b""
+        if command.cla & _CLA_SECURE_MESSAGING:
+            return self._process_secured(command, raw)
+        if command.cla & _CLA_CHAINING:
+            self._chained_data += command.data
+            return b"", SW_OK
+        if self._chained_data:
+            command = Apdu(command.cla, command.ins, command.p1, command.p2, self._chained_data + command.data)
+            self._chained_data = b""
+        if command.ins == _INS_SELECT:
+            self.reset()
+            return self._handler(command)
+        if command.ins == INS_INITIALIZE_UPDATE:
+            return self._initialize_update(command)
+        if command.ins == INS_PERFORM_SECURITY_OPERATION:
+            return self._perform_security_operation(command)
+        if command.ins in (INS_MUTUAL_AUTHENTICATE, INS_INTERNAL_AUTHENTICATE):
+            return self._scp11_authenticate(command)
+        return self._dispatch(command)
+
+    def _process_secured(self, command: Apdu, raw: bytes) -> Tuple[bytes, int]:
+        if command.ins == INS_EXTERNAL_AUTHENTICATE and self._scp03_context is not None:
+            return self._external_authenticate(command, raw)
+        channel = self._channel
+        if channel is None:
+            return b"", SW_SECURITY_STATUS_NOT_SATISFIED
+        data = channel.unwrap(command, raw)
+        if data is None:
+            # The card closes the session on a secure messaging error
+            self._channel = None
+            return b"", SW_SECURITY_STATUS_NOT_SATISFIED
+        if command.cla & _CLA_CHAINING:
+            self._chained_data += data
+            return channel.wrap(b"", SW_OK), SW_OK
+        if self._chained_data:
+            data, self._chained_data = self._chained_data + data, b""
+        cla = command.cla & ~_CLA_SECURE_MESSAGING
+        response, sw = self._dispatch(Apdu(cla, command.ins, command.p1, command.p2, data))
+        return channel.wrap(response, sw), sw
+
+    def _dispatch(self, command: Apdu) -> Tuple[bytes, int]:
+        if command.ins == _INS_GET_DATA and (command.p1 << 8 | command.p2) == _TAG_CERTIFICATE_STORE:
+            return self._get_certificate_store(command.data)
+        return self._handler(command)
+
+    def _initialize_update(self, command: Apdu) -> Tuple[bytes, int]:
+        self._channel = None
+        key_version = command.p1
+        key_set = next((key_set for key_set in self._scp03_key_sets
+                        if key_version in (0, key_set.key_version)), None)
+        if key_set is None:
+            return b"", SW_REFERENCE_NOT_FOUND
+        host_challenge = command.data
+        if len(host_challenge) not in (ScpMode.S8.value, ScpMode.S16.value):
+            return b"", SW_WRONG_DATA
+        mac_size = len(host_challenge)
+        card_challenge = os.urandom(mac_size)
+        context = host_challenge + card_challenge
+        keys = derive_session_keys(key_set.enc_key, key_set.mac_key, key_set.dek_key, context)
+        card_cryptogram = derive_key(keys.smac, _DERIVATION_CARD_CRYPTOGRAM, context, mac_size * 8)
+        self._scp03_context = (context, keys)
+        i_parameter = _I_PARAMETER | (_I_PARAMETER_S16 if mac_size == ScpMode.S16.value else 0)
+        key_information = bytes([key_set.key_version, 0x03, i_parameter])
+        return bytes(10) + key_information + card_challenge + card_cryptogram, SW_OK
+
+    def _external_authenticate(self, command: Apdu, raw: bytes) -> Tuple[bytes, int]:
+        assert self._scp03_context is not None
+        context, keys = self._scp03_context
+        self._scp03_context = None
+        # Host and card challenges have the size of the MAC
+        mac_size = len(context) // 2
+        channel = _SecureChannel(keys.senc, keys.smac, keys.srmac, bytes(16), mac_size, command.p1 | _LEVEL_C_MAC)
+        host_cryptogram = channel.unwrap(command, raw, decrypt=False)
+        if host_cryptogram is None or not hmac.compare_digest(
+                host_cryptogram, derive_key(keys.smac, _DERIVATION_HOST_CRYPTOGRAM, context, mac_size * 8)):
+            return b"", SW_AUTHENTICATION_FAILED
+        self._channel = channel
+        return b"", SW_OK
+
+    def _perform_security_operation(self, command: Apdu) -> Tuple[bytes, int]:
+        self._channel = None
+        self._oce_certificates.append(command.data)
+        if command.p2 & 0x80:  # More certificates of the chain follow
+            return b"", SW_OK
+        try:
+            certificate = _parse_certificate(self._oce_certificates[-1])
+            public_key = serialization.load_der_public_key(certificate.get_public_key())
+        except ValueError:
+            return b"", SW_WRONG_DATA
+        finally:
+            self._oce_certificates = []
+        if not isinstance(public_key, ec.EllipticCurvePublicKey):
+            return b"", SW_WRONG_DATA
+        self._pk_oce_ecka = public_key
+        return b"", SW_OK
+
+    def _scp11_authenticate(self, command: Apdu) -> Tuple[bytes, int]:
+        self._channel = None
+        key = self._scp11_keys.get((command.p2, command.p1))
+        if key is None:
+            return b"", SW_REFERENCE_NOT_FOUND
+        if (command.ins == INS_INTERNAL_AUTHENTICATE) != (key.key_id == KID_SCP11B):
+            return b"", SW_CONDITIONS_NOT_SATISFIED
+        try:
+            objects = {tag: value for tag, value, _ in decode_tlv_list(command.data)}
+            control_reference = {tag: value for tag, value, _ in decode_tlv_list(objects[_TAG_CONTROL_REFERENCE])}
+            key_length = control_reference[_TAG_KEY_LENGTH][0]
+            epk_oce_ecka = ec.EllipticCurvePublicKey.from_encoded_point(key.private_key.curve, objects[_TAG_EPK])
+        except (KeyError, IndexError, ValueError):
+            return b"", SW_WRONG_DATA
+        pk_oce_ecka = epk_oce_ecka if key.key_id == KID_SCP11B else self._pk_oce_ecka
+        if pk_oce_ecka is None:
+            return b"", SW_CONDITIONS_NOT_SATISFIED
+        esk_sd_ecka = ec.generate_private_key(key.private_key.curve)
+        epk_sd_ecka = encode_tlv(_TAG_EPK, esk_sd_ecka.public_key().public_bytes(
+            serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint))
+        shared_secret = (esk_sd_ecka.exchange(ec.ECDH(), epk_oce_ecka)
+                         + key.private_key.exchange(ec.ECDH(), pk_oce_ecka))
+        shared_info = _SCP11_KEY_USAGE + _SCP11_KEY_TYPE_AES + bytes([key_length])
+        keys = _x963_kdf(shared_secret, shared_info, key_length * 5)
+        receipt_key, senc, smac, srmac = [keys[i * key_length:(i + 1) * key_length] for i in range(4)]
+        receipt = _aes_cmac(receipt_key, command.data + epk_sd_ecka)
+        self._channel = _SecureChannel(senc, smac, srmac, receipt, self._scp11_mac_size, _SCP11_SECURITY_LEVEL)
+        return epk_sd_ecka + encode_tlv(_TAG_RECEIPT, receipt), SW_OK
+
+    def _get_certificate_store(self, data: bytes) -> Tuple[bytes, int]:
+        # Without a key reference, the store of the first key is returned
+        key = next(iter(self._scp11_keys.values()), None)
+        if data:
+            try:
+                reference = {tag: value for tag, value, _ in decode_tlv_list(data)}
+                identification = {tag: value for tag, value, _ in
+                                  decode_tlv_list(reference[_TAG_CONTROL_REFERENCE])}[_TAG_KEY_IDENTIFICATION]
+                key = self._scp11_keys.get((identification[0], identification[1]))
+            except (KeyError, IndexError, ValueError):
+                return b"", SW_WRONG_DATA
+        if key is None:
+            return b"", SW_REFERENCE_NOT_FOUND
+        return key.certificate_store, SW_OK
+
+    def _get_response(self) -> Tuple[bytes, int]:
+        data, self._pending_response = self._pending_response, b""
+        return data, SW_OK
+
+    def _respond(self, data: bytes, sw: int) -> bytes:
+        # Responses longer than a short APDU allows are returned in parts with 61xx and GET RESPONSE
+        if len(data) <= _SHORT_RESPONSE_MAX_LENGTH or self._extended_length or sw != SW_OK:
+            return data + _sw(sw)
+        self._pending_response = data[_SHORT_RESPONSE_MAX_LENGTH:]
+        remaining = min(len(self._pending_response), _SHORT_RESPONSE_MAX_LENGTH) & 0xFF
+        return data[:_SHORT_RESPONSE_MAX_LENGTH] + bytes([0x61, remaining])
+
+
+class _LoadedScp11Key:
+    """SCP11 key with the private key parsed on first use, so that creating an emulator stays cheap"""
+
+    def __init__(self, key: Scp11SdKey) -> None:
+        self.key_id = key.key_id
+        self.certificate_store = encode_tlv(_TAG_CERTIFICATE_STORE, b"".join(key.certificates))
+        self._private_key_bytes = bytes(key.private_key_bytes)
+        self._private_key: Optional[ec.EllipticCurvePrivateKey] = None
+
+    @property
+    def private_key(self) -> ec.EllipticCurvePrivateKey:
+        if self._private_key is None:
+            private_key = serialization.load_der_private_key(self._private_key_bytes, password=None)
+            if not isinstance(private_key, ec.EllipticCurvePrivateKey):
+                raise ValueError("SK.SD.ECKA must be an EC private key")
+            self._private_key = private_key
+        return self._private_key
+
+
+class _SecureChannel:
+    """Card side of secure messaging: C-MAC verification, C-DECRYPTION, R-ENCRYPTION and R-MAC"""
+
+    def __init__(self, senc: bytes, smac: bytes, srmac: bytes, mac_chain: bytes, mac_size: int, level: int) -> None:
+        self._senc = senc
+        self._smac = smac
+        self._srmac = srmac
+        self._mac_chain = mac_chain
+        self._mac_size = mac_size
+        self._level = level
+        self._counter = 0
+
+    def unwrap(self, command: Apdu, raw: bytes, decrypt: bool = True) -> Optional[bytes]:
+        mac_size = self._mac_size
+        if len(command.data) < mac_size:
+            return None
+        # The C-MAC covers the header and the data field up to the C-MAC, Le excluded
+        end = _data_offset(raw) + len(command.data)
+        self._mac_chain = _aes_cmac(self._smac, self._mac_chain + raw[:end - mac_size])
+        if not hmac.compare_digest(self._mac_chain[:mac_size], command.data[-mac_size:]):
+            return None
+        data = command.data[:-mac_size]
+        if not decrypt:
+            return data
+        self._counter += 1
+        if data and self._level & _LEVEL_C_DECRYPTION:
+            if len(data) % 16:
+                return None
+            icv = _aes_ecb(self._senc, self._counter.to_bytes(16, "big"))
+            unpadded = _aes_cbc_decrypt(self._senc, icv, data).rstrip(b"\x00")
+            if not unpadded or unpadded[-1] != 0x80:
+                return None
+            data = unpadded[:-1]
+        return data
+
+    def wrap(self, data: bytes, sw: int) -> bytes:
+        if sw != SW_OK:
+            return data
+        if data and self._level & _LEVEL_R_ENCRYPTION:
+            padded = data + b"\x80" + bytes(15 - len(data) % 16)
+            icv = _aes_ecb(self._senc, b"\x80" + self._counter.to_bytes(15, "big"))
+            data = _aes_cbc_encrypt(self._senc, icv, padded)
+        if self._level & _LEVEL_R_MAC:
+            data += _aes_cmac(self._srmac, self._mac_chain + data + _sw(sw))[:self._mac_size]
+        return data
+
+
+def _parse_command(apdu: bytes, extended_supported: bool) -> Apdu:
+    if not extended_supported and len(apdu) > 5 and apdu[4] == 0:
+        raise ValueError("Extended length is not supported")
+    return Apdu.from_bytes(apdu)
+
+
+def _data_offset(apdu: bytes) -> int:
+    return 7 if len(apdu) > 5 and apdu[4] == 0 else 5
+
+
+def _sw(sw: int) -> bytes:
+    return sw.to_bytes(2, "big")
+
+
+def _echo(command: Apdu) -> Tuple[bytes, int]:
+    return command.data, SW_OK
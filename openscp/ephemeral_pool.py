@@ -0,0 +1,211 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple, TypeVar
+
+from openscp.exceptions import BadResponseError
+from openscp.tlv import find_tlv
+
+T = TypeVar("T")
+
+# Backend and curve object identifier
+PoolKey = Tuple[str, str]
+
+_TAG_SEQUENCE = 0x30
+_TAG_OBJECT_IDENTIFIER = 0x06
+
+
+class EphemeralKeyPoolStats(NamedTuple):
+    """Snapshot of ephemeral key pool counters"""
+
+    hits: int
+    """SCP11 handshakes which took a pre-generated key pair"""
+
+    misses: int
+    """SCP11 handshakes which generated their key pair, the pool of the curve being empty"""
+
+    generated: int
+    """key pairs generated in the background"""
+
+    discarded: int
+    """key pairs dropped unused, when the capacity was lowered or the pool cleared"""
+
+    depth: Dict[str, int]
+    """key pairs ready, by backend and curve object identifier, e.g. "java 1.2.840.10045.3.1.7\""""
+
+    capacity: int
+    """key pairs kept per backend and curve"""
+
+
+class EphemeralKeyPool:
+    """
+    Thread-safe pool of ephemeral OCE key pairs (ePK.OCE.ECKA, eSK.OCE.ECKA) generated in the background, so that
+    SCP11 handshakes don't generate them while the card waits. A pool is kept per backend and curve of PK.SD.ECKA,
+    the first handshake with a curve is a miss and makes the pool generate pairs for it.
+
+    A pair is handed out once and dropped after the handshake. Neither the JVM nor ``cryptography`` can wipe key
+    material from memory: Java private keys are destroyed where the provider supports it, and ``capacity = 0``
+    or :meth:`clear` drops the pairs not used yet.
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        """
+        :param capacity: key pairs kept per backend and curve, 0 disables the pool
+        """
+        self._capacity = 0
+        self._condition = threading.Condition()
+        self._pairs: Dict[PoolKey, Deque[Any]] = {}
+        self._generators: Dict[PoolKey, Callable[[], Any]] = {}
+        # Best effort wiping of pairs which are dropped, for backends which support it
+        self._destroyers: Dict[PoolKey, Callable[[Any], None]] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._hits = 0
+        self._misses = 0
+        self._generated = 0
+        self._discarded = 0
+        self.capacity = capacity
+
+    @property
+    def capacity(self) -> int:
+        """key pairs kept per backend and curve, 0 disables the pool and drops the pairs"""
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, value: int) -> None:
+        with self._condition:
+            self._capacity = max(value, 0)
+            for key in self._pairs:
+                self._trim(key, self._capacity)
+            if self._capacity and self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="openscp-ephemeral-keys", daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+
+    def clear(self) -> None:
+        """
+        Drop all key pairs not used yet, counters are kept. The pool generates new ones while enabled.
+
+        :return: None
+        """
+        with self._condition:
+            for key in self._pairs:
+                self._trim(key, 0)
+            self._condition.notify_all()
+
+    def stats(self) -> EphemeralKeyPoolStats:
+        """
+        :return: current counters
+        """
+        with self._condition:
+            return EphemeralKeyPoolStats(self._hits, self._misses, self._generated, self._discarded,
+                                         {f"{backend} {curve}": len(pairs)
+                                          for (backend, curve), pairs in self._pairs.items()},
+                                         self._capacity)
+
+    def _take(self, key: PoolKey, generate: Callable[[], T],
+              destroy: Optional[Callable[[T], None]] = None) -> Optional[T]:
+        # Returns None if the pool is disabled or empty, the handshake then generates its own pair
+        with self._condition:
+            if not self._capacity:
+                return None
+            self._generators[key] = generate
+            if destroy is not None:
+                self._destroyers[key] = destroy
+            pairs = self._pairs.get(key)
+            if pairs:
+                self._hits += 1
+                pair = pairs.popleft()
+            else:
+                self._misses += 1
+                pair = None
+            self._condition.notify()
+            return pair
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._capacity:
+                        self._worker = None
+                        return
+                    key = next((key for key in self._generators
+                                if len(self._pairs.get(key, ())) < self._capacity), None)
+                    if key is not None:
+                        break
+                    self._condition.wait()
+                generate = self._generators[key]
+            try:
+                pair = generate()
+            except Exception:
+                # Registered again by the next handshake with the curve, instead of failing in a loop
+                with self._condition:
+                    if self._generators.get(key) is generate:
+                        del self._generators[key]
+                continue
+            with self._condition:
+                pairs = self._pairs.setdefault(key, deque())
+                if len(pairs) < self._capacity:
+                    pairs.append(pair)
+                    self._generated += 1
+                    continue
+                destroy = self._destroyers.get(key)
+            _destroy(destroy, pair)
+
+    def _trim(self, key: PoolKey, size: int) -> None:
+        # Called with the condition held
+        pairs = self._pairs[key]
+        while len(pairs) > size:
+            _destroy(self._destroyers.get(key), pairs.pop())
+            self._discarded += 1
+
+
+_ephemeral_key_pool = EphemeralKeyPool()
+
+
+def get_ephemeral_key_pool() -> EphemeralKeyPool:
+    """
+    :return: process-wide pool of ephemeral key pairs used by SCP11 authentication, disabled until its capacity is set
+    """
+    return _ephemeral_key_pool
+
+
+def _curve(pk_sd_ecka_bytes: bytes) -> Optional[str]:
+    # Named curve object identifier of a SubjectPublicKeyInfo, None if the key doesn't name its curve
+    try:
+        algorithm = find_tlv(pk_sd_ecka_bytes, _TAG_SEQUENCE, _TAG_SEQUENCE)
+        parameters = list(algorithm.children()) if algorithm is not None else []
+    except BadResponseError:
+        return None
+    if len(parameters) != 2 or parameters[1].tag != _TAG_OBJECT_IDENTIFIER:
+        return None
+    encoded = bytes(parameters[1].value)
+    arcs = [min(encoded[0] // 40, 2), encoded[0] - 40 * min(encoded[0] // 40, 2)] if encoded else []
+    value = 0
+    for byte in encoded[1:]:
+        value = value << 7 | byte & 0x7F
+        if not byte & 0x80:
+            arcs.append(value)
+            value = 0
+    return ".".join(str(arc) for arc in arcs)
+
+
+def _destroy(destroy: Optional[Callable[[Any], None]], pair: Any) -> None:
+    if destroy is None:
+        return
+    try:
+        destroy(pair)
+    except Exception:
+        pass
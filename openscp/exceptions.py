@@ -0,0 +1,80 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+from typing import Any, Optional, Tuple
+
+
+class ScpError(Exception):
+    """Base class of OpenSCP errors: failures of the native SCP backend and session errors raised for either backend"""
+
+
+class ApduError(ScpError):
+    """Smart card responded with an unexpected status word"""
+
+    def __init__(self, sw: int) -> None:
+        """
+        :param sw: status word (SW1 and SW2) returned by the smart card
+        """
+        super().__init__(f"Unexpected SW: {sw:04X}")
+        self.sw = sw
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return ApduError, (self.sw,)
+
+
+class BadResponseError(ScpError):
+    """Smart card response is malformed or failed verification"""
+
+
+class OperationCancelledError(ScpError):
+    """Session operation was cancelled while waiting for the smart card"""
+
+
+class ChannelLostError(ScpError):
+    """Secure channel was lost during a command which is not retried, the card may have executed the command"""
+
+
+class CertificateValidationError(ScpError):
+    """SD certificate bundle is malformed, not signed by a trust anchor, expired or has an unexpected key usage"""
+
+
+class WorkerLostError(ScpError):
+    """Worker process of a :class:`openscp.ProcessFarm` exited while running the job, the job may have been executed"""
+
+
+def _status_word(error: BaseException) -> Optional[int]:
+    # Status word of an error status word exception of either backend, None for other errors
+    if isinstance(error, ApduError):
+        return error.sw
+    java_exception = _java_exception("com.samsung.openscp.ApduException")
+    if java_exception is not None and isinstance(error, java_exception):
+        return error.getSw() & 0xFFFF
+    return None
+
+
+def _is_bad_response(error: BaseException) -> bool:
+    # Response verification failure (e.g. wrong R-MAC) of either backend
+    if isinstance(error, BadResponseError):
+        return True
+    java_exception = _java_exception("com.samsung.openscp.BadResponseException")
+    return java_exception is not None and isinstance(error, java_exception)
+
+
+def _java_exception(name: str) -> Optional[Any]:
+    # Java exceptions can only be raised once the Java backend has started the JVM
+    jpype = sys.modules.get("jpype")
+    if jpype is None or not jpype.isJVMStarted():
+        return None
+    return jpype.JClass(name)
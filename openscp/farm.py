@@ -0,0 +1,631 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import functools
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import os
+import pickle
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import openscp.apdu
+from openscp.backend import Backend
+from openscp.batch import CommandResult, ErrorPolicy
+from openscp.exceptions import ApduError, ScpError, WorkerLostError, _status_word
+from openscp.jvm import JvmConfig, configure_jvm, get_jvm_config, start_jvm, warm_up
+from openscp.metrics import MetricsSnapshot, get_metrics, merge_snapshots
+from openscp.pool import Authenticator, ConnectionFactory, SessionPool
+from openscp.session import SecurityDomainSession
+
+# Runs with the authenticated session of a card in a worker process, must be picklable, as must be its result
+Job = Callable[[SecurityDomainSession], Any]
+
+# Messages to workers
+_JOB = "job"
+_RESUME = "resume"
+_COLLECT = "collect"
+_STOP = "stop"
+# Messages from workers
+_READY = "ready"
+_FAILED = "failed"
+_RESULT = "result"
+_METRICS = "metrics"
+_EXIT = "exit"
+
+# Seconds between checks for worker processes which exited without notice
+_POLL_INTERVAL = 0.2
+
+
+class CommandScript(NamedTuple):
+    """Job sending a fixed sequence of commands, see :meth:`openscp.SecurityDomainSession.send_many`"""
+
+    commands: Tuple[openscp.apdu.Apdu, ...]
+    """Command APDUs"""
+
+    error_policy: ErrorPolicy = ErrorPolicy.STOP
+    """what to do after a command completes with an error status word"""
+
+    def __call__(self, session: SecurityDomainSession) -> List[CommandResult]:
+        return session.send_many(self.commands, self.error_policy)
+
+
+class FarmResult(NamedTuple):
+    """Outcome of a job run by :meth:`ProcessFarm.stream`"""
+
+    index: int
+    """position of the job in the stream"""
+
+    key: Hashable
+    """reader or card ID"""
+
+    value: Any
+    """job result, None if the job failed"""
+
+    error: Optional[BaseException]
+    """exception raised by the job or the session, None if the job succeeded"""
+
+    @property
+    def ok(self) -> bool:
+        """did the job succeed"""
+        return self.error is None
+
+
+class FarmMetrics(NamedTuple):
+    """Snapshot of :class:`ProcessFarm` counters"""
+
+    workers: int
+    """worker processes running, including recycled ones finishing their jobs"""
+
+    submitted: int
+    """jobs submitted since the farm creation"""
+
+    completed: int
+    """jobs which returned a result"""
+
+    failed: int
+    """jobs which raised an exception or were lost with their worker"""
+
+    pending: int
+    """jobs submitted and not finished yet"""
+
+    recycled: int
+    """workers replaced after ``max_jobs_per_worker`` jobs"""
+
+    lost: int
+    """workers which exited unexpectedly and were replaced"""
+
+    jobs_per_second: float
+    """finished jobs per second of the farm lifetime"""
+
+    average_warm_up: float
+    """seconds, average JVM start and warm-up time of a worker"""
+
+
+class _Worker:
+    __slots__ = ("worker_id", "slot", "process", "inbox", "outbox", "pending", "dispatched", "ready", "retiring",
+                 "after")
+
+    def __init__(self, worker_id: int, slot: "_Slot", process: Any, inbox: Any, outbox: Any,
+                 after: Optional["_Worker"]) -> None:
+        self.worker_id = worker_id
+        self.slot = slot
+        self.process = process
+        self.inbox = inbox
+        # Receiving end of the worker's own pipe: a worker dying while it sends can't block the others
+        self.outbox: Optional[Any] = outbox
+        self.pending: Dict[int, "concurrent.futures.Future[Any]"] = {}
+        self.dispatched = 0
+        self.ready = False
+        self.retiring = False
+        # Recycled worker which must exit before this one opens connections to the same readers
+        self.after = after
+
+
+class _Slot:
+    __slots__ = ("worker", "keys", "capacity")
+
+    def __init__(self, max_pending: int) -> None:
+        self.worker: Optional[_Worker] = None
+        self.keys = 0
+        self.capacity = threading.Semaphore(max_pending)
+
+
+class ProcessFarm:
+    """
+    Sessions spread over worker processes, each with its own JVM and GIL, so that throughput scales with CPU cores.
+
+    Every reader or card ID is owned by one worker, which keeps its authenticated session in a
+    :class:`openscp.SessionPool`. Jobs are pickled, run by the owning worker and their results are sent back.
+    Submission blocks while a worker has ``max_pending`` unfinished jobs. The connection factory, the authenticator,
+    jobs and their results must be picklable, e.g. module-level functions or :class:`CommandScript`.
+    """
+
+    def __init__(self,
+                 connection_factory: ConnectionFactory,
+                 authenticator: Authenticator,
+                 backend: Backend = Backend.JAVA,
+                 workers: Optional[int] = None,
+                 threads_per_worker: int = 4,
+                 max_pending: int = 16,
+                 max_jobs_per_worker: Optional[int] = None,
+                 warm_up_iterations: int = 3,
+                 jvm_config: Optional[JvmConfig] = None,
+                 enable_metrics: bool = False,
+                 start_method: str = "spawn") -> None:
+        """
+        :param connection_factory: creates the connection to the card with the given key in a worker
+        :param authenticator: authenticates a new session in a worker
+        :param backend: SCP implementation to use
+        :param workers: number of worker processes, the number of CPUs by default
+        :param threads_per_worker: threads of a worker running jobs for different readers
+        :param max_pending: unfinished jobs per worker before submission blocks
+        :param max_jobs_per_worker: jobs after which a worker is replaced by a fresh process. Never if absent.
+        :param warm_up_iterations: canned handshakes run by :func:`openscp.warm_up` at worker startup, 0 to skip
+        :param jvm_config: JVM configuration of workers, the current one by default
+        :param enable_metrics: enable :func:`openscp.get_metrics` in workers, see :meth:`collect_metrics`
+        :param start_method: multiprocessing start method, forking a process with a running JVM is unsafe
+        """
+        self._connection_factory = connection_factory
+        self._authenticator = authenticator
+        self._backend = backend
+        self._threads_per_worker = threads_per_worker
+        self._max_jobs_per_worker = max_jobs_per_worker
+        self._warm_up_iterations = warm_up_iterations
+        self._jvm_config = jvm_config if jvm_config is not None or backend is not Backend.JAVA else get_jvm_config()
+        self._enable_metrics = enable_metrics
+        self._context = multiprocessing.get_context(start_method)
+        self._condition = threading.Condition()
+        self._worker_ids = itertools.count()
+        self._job_ids = itertools.count()
+        self._request_ids = itertools.count()
+        self._workers: Dict[int, _Worker] = {}
+        self._owners: Dict[Hashable, _Slot] = {}
+        self._metric_requests: Dict[int, Dict[int, MetricsSnapshot]] = {}
+        self._retired_metrics: Dict[int, MetricsSnapshot] = {}
+        self._exited: List[Any] = []
+        self._failure: Optional[BaseException] = None
+        self._closed = False
+        self._created = time.monotonic()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._recycled = 0
+        self._lost = 0
+        self._warm_ups = 0
+        self._warm_up_time = 0.0
+        self._slots = [_Slot(max_pending) for _ in range(workers or os.cpu_count() or 1)]
+        with self._condition:
+            for slot in self._slots:
+                slot.worker = self._spawn(slot, None)
+        self._collector = threading.Thread(target=self._collect, name="openscp-farm", daemon=True)
+        self._collector.start()
+
+    def submit(self, key: Hashable, job: Job, timeout: Optional[float] = None) -> "concurrent.futures.Future[Any]":
+        """
+        Run a job with the authenticated session of a card in the worker owning the card
+
+        :param key: reader or card ID passed to the connection factory
+        :param job: called with the authenticated session
+        :param timeout: seconds to wait while the worker has ``max_pending`` unfinished jobs, forever if absent
+        :return: future of the job result
+
+        :raises: TimeoutError if the worker is still busy after timeout, RuntimeError if the farm is closed,
+                 ScpError if a worker failed to start, pickling errors of the key and the job
+        """
+        payload = pickle.dumps((key, job))
+        with self._condition:
+            self._check_open()
+            slot = self._owners.get(key)
+            if slot is None:
+                slot = self._owners[key] = min(self._slots, key=lambda candidate: candidate.keys)
+                slot.keys += 1
+        if not slot.capacity.acquire(timeout=timeout):
+            raise TimeoutError(f"Worker of {key!r} has too many pending jobs")
+        future: "concurrent.futures.Future[Any]" = concurrent.futures.Future()
+        with self._condition:
+            try:
+                self._check_open()
+            except BaseException:
+                slot.capacity.release()
+                raise
+            worker = slot.worker
+            assert worker is not None
+            job_id = next(self._job_ids)
+            worker.pending[job_id] = future
+            worker.dispatched += 1
+            self._submitted += 1
+            worker.inbox.put((_JOB, job_id, payload))
+            if self._max_jobs_per_worker is not None and worker.dispatched >= self._max_jobs_per_worker:
+                self._recycle(slot)
+        return future
+
+    def stream(self, jobs: Iterable[Tuple[Hashable, Job]]) -> Iterator[FarmResult]:
+        """
+        Submit jobs from a background thread, with back-pressure, and yield results as jobs finish.
+        Jobs are submitted to the end even if the iterator is abandoned.
+
+        :param jobs: reader or card ID and job, consumed lazily
+        :return: iterator over results in the order of completion
+        """
+        finished: "queue.Queue[Any]" = queue.Queue()
+
+        def feed() -> None:
+            count = 0
+            try:
+                for index, (key, job) in enumerate(jobs):
+                    future = self.submit(key, job)
+                    future.add_done_callback(functools.partial(_put_result, finished, index, key))
+                    count += 1
+            except BaseException as e:
+                finished.put(e)
+            finally:
+                finished.put(count)
+
+        threading.Thread(target=feed, name="openscp-farm-feed", daemon=True).start()
+        received = 0
+        total: Optional[int] = None
+        while total is None or received < total:
+            item = finished.get()
+            if isinstance(item, BaseException):
+                raise item
+            if isinstance(item, int):
+                total = item
+                continue
+            received += 1
+            yield item
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every worker has started its JVM and warmed up. Jobs may be submitted before.
+
+        :param timeout: seconds to wait, forever if absent
+        :return: are all workers ready
+
+        :raises: ScpError if a worker failed to start
+        """
+        with self._condition:
+            ready = self._condition.wait_for(lambda: self._failure is not None or all(
+                slot.worker is not None and slot.worker.ready for slot in self._slots), timeout)
+            if self._failure is not None:
+                raise ScpError("Worker process failed to start") from self._failure
+            return ready
+
+    def metrics(self) -> FarmMetrics:
+        """
+        :return: current farm counters
+        """
+        with self._condition:
+            lifetime = time.monotonic() - self._created
+            finished = self._completed + self._failed
+            return FarmMetrics(
+                workers=len(self._workers),
+                submitted=self._submitted,
+                completed=self._completed,
+                failed=self._failed,
+                pending=self._submitted - finished,
+                recycled=self._recycled,
+                lost=self._lost,
+                jobs_per_second=finished / lifetime if lifetime > 0 else 0.0,
+                average_warm_up=self._warm_up_time / self._warm_ups if self._warm_ups else 0.0
+            )
+
+    def collect_metrics(self, timeout: Optional[float] = 10.0) -> MetricsSnapshot:
+        """
+        Gather session metrics of all workers, including exited ones. Workers must be created with
+        ``enable_metrics``, otherwise the result is empty.
+
+        :param timeout: seconds to wait for the workers, forever if absent
+        :return: merged snapshot, see :func:`openscp.metrics.merge_snapshots`
+
+        :raises: TimeoutError if a worker didn't respond in time
+        """
+        with self._condition:
+            self._check_open()
+            request_id = next(self._request_ids)
+            replies = self._metric_requests[request_id] = {}
+            workers = list(self._workers.values())
+            for worker in workers:
+                worker.inbox.put((_COLLECT, request_id))
+            # A worker exiting in the meantime reports its final snapshot instead
+            try:
+                if not self._condition.wait_for(lambda: all(
+                        worker.worker_id in replies or worker.worker_id in self._retired_metrics for worker in workers),
+                        timeout):
+                    raise TimeoutError("Workers didn't report metrics in time")
+            finally:
+                del self._metric_requests[request_id]
+            return merge_snapshots({**replies, **self._retired_metrics}.values())
+
+    def close(self) -> None:
+        """
+        Wait for submitted jobs, close all sessions and stop the workers
+
+        :return: None
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            for worker in self._workers.values():
+                if not worker.retiring:
+                    worker.inbox.put((_STOP,))
+        self._collector.join()
+
+    def __enter__(self) -> "ProcessFarm":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Process farm is closed")
+        if self._failure is not None:
+            raise ScpError("Worker process failed to start") from self._failure
+
+    def _spawn(self, slot: _Slot, after: Optional[_Worker]) -> _Worker:
+        worker_id = next(self._worker_ids)
+        inbox = self._context.Queue()
+        outbox, results = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_worker_main, name=f"openscp-farm-{worker_id}", daemon=True,
+            args=(worker_id, self._connection_factory, self._authenticator, self._backend, self._threads_per_worker,
+                  self._jvm_config, self._warm_up_iterations, self._enable_metrics, after is not None, inbox,
+                  results))
+        process.start()
+        # Only the worker holds the sending end, the pipe reports end of file once the worker has exited
+        results.close()
+        worker = self._workers[worker_id] = _Worker(worker_id, slot, process, inbox, outbox, after)
+        return worker
+
+    def _recycle(self, slot: _Slot) -> None:
+        # The replacement starts its JVM right away, but opens connections only once the old worker has exited
+        worker = slot.worker
+        assert worker is not None
+        worker.retiring = True
+        worker.inbox.put((_STOP,))
+        slot.worker = self._spawn(slot, worker)
+        self._recycled += 1
+
+    def _collect(self) -> None:
+        while True:
+            with self._condition:
+                outboxes = [worker.outbox for worker in self._workers.values() if worker.outbox is not None]
+            if outboxes:
+                readable = multiprocessing.connection.wait(outboxes, _POLL_INTERVAL)
+            else:
+                readable = []
+                time.sleep(_POLL_INTERVAL)
+            with self._condition:
+                settled = []
+                for worker in list(self._workers.values()):
+                    # Whatever an exited process sent is already in its pipe
+                    if worker.outbox is not None and (worker.outbox in readable or worker.process.exitcode is not None):
+                        settled.extend(self._receive(worker))
+                settled.extend(self._check_processes())
+                self._condition.notify_all()
+                done = self._closed and not self._workers
+                exited, self._exited = self._exited, []
+            for process in exited:
+                process.join()
+            for future, ok, value in settled:
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            if done:
+                return
+
+    def _receive(self, worker: _Worker) -> List[Tuple["concurrent.futures.Future[Any]", bool, Any]]:
+        outbox = worker.outbox
+        settled = []
+        try:
+            # The pipe is closed once the worker is removed, on its exit or failure message
+            while worker.outbox is not None and outbox.poll():
+                settled.extend(self._handle(outbox.recv()))
+        except (EOFError, OSError):
+            # The worker exited, possibly in the middle of a message, which is noticed by _check_processes
+            outbox.close()
+            worker.outbox = None
+        return settled
+
+    def _handle(self, message: Tuple[Any, ...]) -> List[Tuple["concurrent.futures.Future[Any]", bool, Any]]:
+        kind, worker_id = message[:2]
+        worker = self._workers.get(worker_id)
+        if worker is None:
+            return []
+        if kind == _RESULT:
+            _, _, job_id, ok, payload = message
+            future = worker.pending.pop(job_id)
+            worker.slot.capacity.release()
+            try:
+                value = pickle.loads(payload)
+            except BaseException as e:
+                ok, value = False, e
+            if ok:
+                self._completed += 1
+            else:
+                self._failed += 1
+            return [(future, ok, value)]
+        if kind == _READY:
+            worker.ready = True
+            self._warm_ups += 1
+            self._warm_up_time += message[2]
+        elif kind == _METRICS:
+            replies = self._metric_requests.get(message[2])
+            if replies is not None:
+                replies[worker_id] = message[3]
+        elif kind == _EXIT:
+            self._retired_metrics[worker_id] = message[2]
+            return self._remove(worker, None)
+        elif kind == _FAILED:
+            self._failure = pickle.loads(message[2])
+            return self._remove(worker, self._failure)
+        return []
+
+    def _check_processes(self) -> List[Tuple["concurrent.futures.Future[Any]", bool, Any]]:
+        settled = []
+        for worker in [worker for worker in self._workers.values() if worker.process.exitcode is not None]:
+            error = WorkerLostError(f"Worker process {worker.process.pid} exited with code {worker.process.exitcode}")
+            settled.extend(self._remove(worker, error))
+            if not worker.ready:
+                # Crashed on startup, e.g. in the JVM, a replacement would crash the same way
+                self._failure = error
+            elif worker.slot.worker is worker and not self._closed:
+                self._lost += 1
+                worker.slot.worker = self._spawn(worker.slot, None)
+        return settled
+
+    def _remove(self, worker: _Worker,
+                error: Optional[BaseException]) -> List[Tuple["concurrent.futures.Future[Any]", bool, Any]]:
+        del self._workers[worker.worker_id]
+        self._exited.append(worker.process)
+        worker.inbox.close()
+        if worker.outbox is not None:
+            worker.outbox.close()
+            worker.outbox = None
+        for successor in self._workers.values():
+            if successor.after is worker:
+                successor.after = None
+                successor.inbox.put((_RESUME,))
+        if self._failure is not None:
+            # Nothing can run anymore: jobs of other workers are failed too and the workers stopped
+            for other in self._workers.values():
+                other.inbox.put((_STOP,))
+        settled = []
+        for future in worker.pending.values():
+            worker.slot.capacity.release()
+            self._failed += 1
+            settled.append((future, False, error or WorkerLostError("Worker process exited")))
+        worker.pending.clear()
+        return settled
+
+
+def _put_result(finished: "queue.Queue[Any]", index: int, key: Hashable,
+                future: "concurrent.futures.Future[Any]") -> None:
+    error = future.exception()
+    finished.put(FarmResult(index, key, None if error is not None else future.result(), error))
+
+
+class _Outbox:
+    """Sending end of the result pipe of a worker, shared by its threads"""
+
+    def __init__(self, connection: Any) -> None:
+        self._connection = connection
+        self._lock = threading.Lock()
+
+    def put(self, message: Tuple[Any, ...]) -> None:
+        with self._lock:
+            self._connection.send(message)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _worker_main(worker_id: int,
+                 connection_factory: ConnectionFactory,
+                 authenticator: Authenticator,
+                 backend: Backend,
+                 threads: int,
+                 jvm_config: Optional[JvmConfig],
+                 warm_up_iterations: int,
+                 enable_metrics: bool,
+                 gated: bool,
+                 inbox: Any,
+                 connection: Any) -> None:
+    results = _Outbox(connection)
+    try:
+        warm_up_time = 0.0
+        if backend is Backend.JAVA:
+            if jvm_config is not None:
+                configure_jvm(jvm_config)
+            start_jvm()
+            if warm_up_iterations:
+                warm_up_time = warm_up(warm_up_iterations)
+        if enable_metrics:
+            get_metrics().enable()
+        pool = SessionPool(connection_factory, authenticator, backend, max_workers=threads)
+    except BaseException as e:
+        results.put((_FAILED, worker_id, pickle.dumps(_portable_error(e))))
+        results.close()
+        return
+    results.put((_READY, worker_id, warm_up_time))
+    # Jobs of a replacement worker wait until the recycled worker has closed its connections
+    held: Optional[List[Tuple[Any, ...]]] = [] if gated else None
+    running: Set["concurrent.futures.Future[Any]"] = set()
+    stopping = False
+    while not stopping or held is not None:
+        message = inbox.get()
+        kind = message[0]
+        if kind == _JOB:
+            if held is not None:
+                held.append(message)
+            else:
+                _start_job(pool, results, worker_id, message, running)
+        elif kind == _RESUME:
+            for job in held or ():
+                _start_job(pool, results, worker_id, job, running)
+            held = None
+        elif kind == _COLLECT:
+            results.put((_METRICS, worker_id, message[1], get_metrics().snapshot()))
+        elif kind == _STOP:
+            stopping = True
+    # The pool rejects jobs still queued when it is closed
+    concurrent.futures.wait(list(running))
+    pool.close()
+    results.put((_EXIT, worker_id, get_metrics().snapshot()))
+    results.close()
+
+
+def _start_job(pool: SessionPool, results: _Outbox, worker_id: int, message: Tuple[Any, ...],
+               running: Set["concurrent.futures.Future[Any]"]) -> None:
+    _, job_id, payload = message
+    try:
+        key, job = pickle.loads(payload)
+    except BaseException as e:
+        results.put((_RESULT, worker_id, job_id, False, pickle.dumps(_portable_error(e))))
+        return
+    future = pool.submit(key, job)
+    running.add(future)
+    future.add_done_callback(running.discard)
+    future.add_done_callback(functools.partial(_send_result, results, worker_id, job_id))
+
+
+def _send_result(results: _Outbox, worker_id: int, job_id: int, future: "concurrent.futures.Future[Any]") -> None:
+    error = future.exception()
+    if error is None:
+        try:
+            results.put((_RESULT, worker_id, job_id, True, pickle.dumps(future.result())))
+            return
+        except BaseException as e:
+            error = e
+    results.put((_RESULT, worker_id, job_id, False, pickle.dumps(_portable_error(error))))
+
+
+def _portable_error(error: BaseException) -> BaseException:
+    # Java exceptions and others which can't be pickled are replaced, error status words are kept
+    sw = _status_word(error)
+    if sw is not None and not isinstance(error, ApduError):
+        return ApduError(sw)
+    try:
+        pickle.loads(pickle.dumps(error))
+    except Exception:
+        return ScpError(f"{type(error).__name__}: {error}")
+    return error
@@ -0,0 +1,95 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Union
+
+from openscp.apdu import SW1_HAS_MORE_DATA, SW1_WRONG_LE, Apdu, ResponseApdu
+from openscp.connection import SmartCardConnection
+from openscp.exceptions import BadResponseError
+
+_INS_GET_RESPONSE = 0xC0
+_CLA_FURTHER_INTERINDUSTRY = 0x40
+_CLA_BASIC_CHANNEL = 0x03
+_CLA_FURTHER_CHANNEL = 0x0F
+
+
+class GetResponseConnection(SmartCardConnection):
+    """
+    Connection which resolves SW 61XX with GET RESPONSE and repeats commands answered with SW 6CXX with the Le given
+    by the card, so that the session, or a caller of :meth:`transmit`, receives the complete response in one piece.
+
+    Commands are repeated unchanged except for Le. Secured commands should only be repeated if the card doesn't
+    advance the secure messaging state for a 6CXX response, which is the case for GlobalPlatform cards.
+    """
+
+    def __init__(self, connection: SmartCardConnection) -> None:
+        """
+        :param connection: underlying connection
+        """
+        self._connection = connection
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        """
+        :param apdu: Command APDU bytes
+        :return: Response APDU bytes, data of all GET RESPONSE fragments followed by the last status word
+        """
+        rapdu = self._exchange(apdu)
+        if rapdu[-2] != SW1_HAS_MORE_DATA:
+            return rapdu
+        # Fragments are kept as views and copied once, into the merged response
+        fragments: List[Union[bytes, memoryview]] = []
+        cla = _get_response_cla(apdu[0])
+        while rapdu[-2] == SW1_HAS_MORE_DATA:
+            fragments.append(memoryview(rapdu)[:-2])
+            rapdu = self._exchange(bytes((cla, _INS_GET_RESPONSE, 0x00, 0x00, rapdu[-1])))
+        fragments.append(rapdu)
+        return b"".join(fragments)
+
+    def transmit(self, capdu: Union[Apdu, bytes]) -> ResponseApdu:
+        """
+        Send a plain command and return the complete response without checking the status word.
+
+        :param capdu: command, encoded with extended length fields only if needed
+        :return: response
+        """
+        apdu = capdu.to_bytes() if isinstance(capdu, Apdu) else capdu
+        return ResponseApdu.from_bytes(self.send_and_receive(apdu))
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._connection.is_extended_length_apdu_supported()
+
+    def close_connection(self) -> None:
+        self._connection.close_connection()
+
+    def _exchange(self, apdu: bytes) -> bytes:
+        rapdu = self._connection.send_and_receive(apdu)
+        if len(rapdu) >= 2 and rapdu[-2] == SW1_WRONG_LE:
+            rapdu = self._connection.send_and_receive(_with_le(apdu, rapdu[-1]))
+        if len(rapdu) < 2:
+            raise BadResponseError("Invalid APDU response data")
+        return rapdu
+
+
+def _with_le(apdu: bytes, le: int) -> bytes:
+    command = Apdu.from_bytes(apdu)
+    extended = len(apdu) > 5 and apdu[4] == 0
+    return command._replace(le=le or 0x100, force_add_le=True).to_bytes(extended)
+
+
+def _get_response_cla(cla: int) -> int:
+    # Interindustry class on the logical channel of the command: channels 0-3 are coded in the two low bits,
+    # channels 4-19 in the low nibble of a further interindustry class (bit 0x40 set)
+    if cla & _CLA_FURTHER_INTERINDUSTRY:
+        return _CLA_FURTHER_INTERINDUSTRY | (cla & _CLA_FURTHER_CHANNEL)
+    return cla & _CLA_BASIC_CHANNEL
@@ -0,0 +1,318 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+from jpype import JArray, JByte, JImplements, JObject, JOverride
+
+import openscp.connection
+import openscp.jvm
+import openscp.scp_mode
+from openscp.scp_certificate import ScpCertificate
+import openscp.apdu
+from openscp.apdu import _SHORT_LE_MAX, _secured_apdu_extended
+from openscp.batch import SW_OK
+from openscp.credentials import Scp03KeySet, Scp11Credentials
+from openscp.ephemeral_pool import _curve, get_ephemeral_key_pool
+from openscp.key_cache import get_key_cache
+from openscp.metrics import PHASE_CONVERSION, PHASE_JAVA, get_metrics
+from openscp.utils import _start_jvm_if_needed, _java_bytes_to_python_bytes, _python_bytes_to_java_bytes
+
+_start_jvm_if_needed()
+import java.lang.reflect
+import java.security
+import java.util
+import javax.security.auth
+import org.bouncycastle.jce.provider
+import com.samsung.openscp
+
+# Providers are stateless and expensive to construct, one instance serves all sessions
+_security_provider = org.bouncycastle.jce.provider.BouncyCastleProvider()
+
+_metrics = get_metrics()
+
+# The overloads of SecurityDomainSession.authenticate taking the ephemeral key pair or the host challenge are
+# package-private, JPype resolves only public methods
+_authenticate_with_key_pair_method = com.samsung.openscp.SecurityDomainSession.class_.getDeclaredMethod(
+    "authenticate", com.samsung.openscp.ScpKeyParams, com.samsung.openscp.ScpMode, java.security.KeyPair)
+_authenticate_with_key_pair_method.setAccessible(True)
+_authenticate_with_host_challenge_method = com.samsung.openscp.SecurityDomainSession.class_.getDeclaredMethod(
+    "authenticate", com.samsung.openscp.ScpKeyParams, com.samsung.openscp.ScpMode, JArray(JByte))
+_authenticate_with_host_challenge_method.setAccessible(True)
+
+# JCA objects aren't guaranteed to be thread-safe, so KeyFactory instances are cached per thread
+_key_factories = threading.local()
+
+# Apdu is immutable, so repeated commands reuse the Java counterpart built for an equal command. Long data isn't
+# cached, hashing it would cost more than the conversion.
+_JAVA_APDU_CACHE_SIZE = 256
+_JAVA_APDU_CACHE_MAX_DATA = 0xFF
+_java_apdus: Dict[openscp.apdu.Apdu, Any] = {}
+_java_apdus_lock = threading.Lock()
+
+# SCP11b doesn't authenticate the OCE, its key parameters have no OCE key or certificates
+_KID_SCP11B = 0x13
+
+
+@JImplements(com.samsung.openscp.SmartCardConnection)
+class _JavaSmartCardConnection:
+    """Adapter exposing :class:`openscp.SmartCardConnection` to the Java library"""
+
+    def __init__(self, connection: openscp.connection.SmartCardConnection) -> None:
+        self._connection = connection
+
+    @JOverride  # type: ignore[misc]
+    # apdu: byte[] (Java primitive)
+    def sendAndReceive(self, apdu: Any) -> Any:  # -> byte[] (Java primitive)
+        if _metrics.enabled:
+            started = _metrics._start()
+            try:
+                rapdu = _metrics._transmit(self._connection.send_and_receive, _java_bytes_to_python_bytes(apdu))
+                return _python_bytes_to_java_bytes(rapdu)
+            finally:
+                _metrics._stop(PHASE_CONVERSION, started)
+        apdu_in_python_bytes = _java_bytes_to_python_bytes(apdu)
+        rapdu_in_python_bytes = self._connection.send_and_receive(apdu_in_python_bytes)
+        return _python_bytes_to_java_bytes(rapdu_in_python_bytes)
+
+    @JOverride  # type: ignore[misc]
+    def isExtendedLengthApduSupported(self) -> bool:
+        return self._connection.is_extended_length_apdu_supported()
+
+    @JOverride  # type: ignore[misc]
+    def close(self) -> None:
+        return self._connection.close_connection()
+
+
+class JavaSession:
+    """SCP03 and SCP11 session backed by the OpenSCP Java library"""
+
+    def __init__(self, connection: openscp.connection.SmartCardConnection) -> None:
+        """
+        :param connection: :class:`openscp.SmartCardConnection` interface implementation
+        """
+        openscp.jvm._warm_up_if_configured()
+        self._session = com.samsung.openscp.SecurityDomainSession(_JavaSmartCardConnection(connection),
+                                                                  _security_provider)
+        # MAC size of the open secure channel, whose commands are checked before the Java library advances its
+        # counters, None without a secure channel
+        self._mac_size: Optional[int] = None
+
+    def get_certificate_bundle(self, sd_key_id: int, sd_key_version: int) -> List[ScpCertificate]:
+        key_ref = com.samsung.openscp.KeyRef(sd_key_id, sd_key_version)
+        certs_list_java = self._session.getCertificateBundle(key_ref)
+        certs_list = []
+        for cert_java in certs_list_java:
+            certs_list.append(ScpCertificate(_java_bytes_to_python_bytes(cert_java.getEncoded()),
+                                             _java_bytes_to_python_bytes(cert_java.getPublicKey().getEncoded())))
+        return certs_list
+
+    def send_and_receive(self, capdu: openscp.apdu.Apdu) -> bytes:
+        if self._mac_size is not None:
+            _secured_apdu_extended(capdu, self._mac_size, True, False)  # The Java library secures short APDUs only
+        if _metrics.enabled:
+            return self._send_and_receive_timed(capdu)
+        java_rapdu_data = self._session.sendAndReceive(_java_apdu(capdu))
+        return _java_bytes_to_python_bytes(java_rapdu_data)
+
+    def exchange(self,
+                 capdus: Iterable[openscp.apdu.Apdu]) -> Generator[Tuple[openscp.apdu.Apdu, bytes, int], None, None]:
+        # Java lookups are resolved once per sequence instead of once per command
+        send_and_receive = self._session.sendAndReceive
+        apdu_exception = com.samsung.openscp.ApduException
+        for capdu in capdus:
+            if self._mac_size is not None:
+                _secured_apdu_extended(capdu, self._mac_size, True, False)
+            if _metrics.enabled:
+                try:
+                    data = self._send_and_receive_timed(capdu)
+                except apdu_exception as e:
+                    yield capdu, b"", e.getSw() & 0xFFFF
+                else:
+                    yield capdu, data, SW_OK
+                continue
+            try:
+                java_rapdu_data = send_and_receive(_java_apdu(capdu))
+            except apdu_exception as e:
+                yield capdu, b"", e.getSw() & 0xFFFF
+            else:
+                yield capdu, _java_bytes_to_python_bytes(java_rapdu_data), SW_OK
+
+    def _send_and_receive_timed(self, capdu: openscp.apdu.Apdu) -> bytes:
+        started = _metrics._start()
+        try:
+            java_capdu = _java_apdu(capdu)
+            java_started = _metrics._start()
+            try:
+                java_rapdu_data = self._session.sendAndReceive(java_capdu)
+            finally:
+                _metrics._stop(PHASE_JAVA, java_started)
+            return _java_bytes_to_python_bytes(java_rapdu_data)
+        finally:
+            _metrics._stop(PHASE_CONVERSION, started)
+
+    def _authenticate_scp03(self,
+                            key_set: Scp03KeySet,
+                            scp_mode: openscp.scp_mode.ScpMode,
+                            host_challenge: Optional[bytes] = None) -> None:
+        self._mac_size = None
+        key_params = key_set._prepare("java", lambda: self._create_java_scp03_key_params(key_set))
+        java_scp_mode = com.samsung.openscp.ScpMode.valueOf(scp_mode.name)
+        if host_challenge:  # API for testing
+            _authenticate_with_host_challenge(self._session, key_params, java_scp_mode,
+                                              _python_bytes_to_java_bytes(host_challenge))
+        else:
+            self._session.authenticate(key_params, java_scp_mode)
+        self._mac_size = scp_mode.value
+
+    def _authenticate_scp11(self,
+                            credentials: Scp11Credentials,
+                            scp_mode: openscp.scp_mode.ScpMode,
+                            epk_oce_ecka_bytes: Optional[bytes] = None,
+                            esk_oce_ecka_bytes: Optional[bytes] = None) -> None:
+        self._mac_size = None
+        key_params = credentials._prepare("java", lambda: self._create_java_scp11_key_params(credentials))
+        java_scp_mode = com.samsung.openscp.ScpMode.valueOf(scp_mode.name)
+        if epk_oce_ecka_bytes and esk_oce_ecka_bytes:  # API for testing
+            ephemeral_key_pair = self._create_java_key_pair(epk_oce_ecka_bytes, esk_oce_ecka_bytes)
+            _authenticate_with_key_pair(self._session, key_params, java_scp_mode, ephemeral_key_pair)
+        else:
+            ephemeral_key_pair = _take_ephemeral_key_pair(credentials)
+            if ephemeral_key_pair is None:
+                self._session.authenticate(key_params, java_scp_mode)
+            else:
+                try:
+                    _authenticate_with_key_pair(self._session, key_params, java_scp_mode, ephemeral_key_pair)
+                finally:
+                    _destroy_key_pair(ephemeral_key_pair)
+        self._mac_size = scp_mode.value
+
+    def _create_java_scp03_key_params(self, key_set: Scp03KeySet) -> Any:  # -> com.samsung.openscp.Scp03KeyParams
+        key_ref = com.samsung.openscp.KeyRef(key_set.key_id, key_set.key_version)
+        static_keys = com.samsung.openscp.StaticKeys(_python_bytes_to_java_bytes(key_set.enc_key),
+                                                     _python_bytes_to_java_bytes(key_set.mac_key),
+                                                     _python_bytes_to_java_bytes(key_set.dek_key))
+        return com.samsung.openscp.Scp03KeyParams(key_ref, static_keys)
+
+    def _create_java_scp11_key_params(self, credentials: Scp11Credentials) -> Any:
+        # -> com.samsung.openscp.Scp11KeyParams
+        pk_sd_ecka = self._create_java_ec_public_key(credentials.pk_sd_ecka_bytes)
+        sd_key_ref = com.samsung.openscp.KeyRef(credentials.sd_key_id, credentials.sd_key_version)
+        session_keys_alg = com.samsung.openscp.AesAlg.valueOf(credentials.session_keys_alg.name)
+        if credentials.sd_key_id == _KID_SCP11B:
+            return com.samsung.openscp.Scp11KeyParams(sd_key_ref, pk_sd_ecka, session_keys_alg)
+        oce_key_ref = com.samsung.openscp.KeyRef(credentials.oce_key_id, credentials.oce_key_version)
+        sk_oce_ecka = self._create_java_ec_private_key(credentials.sk_oce_ecka_bytes)
+        cert_chain_oce_ecka = credentials.cert_chain_oce_ecka
+        java_oce_cert_chain = get_key_cache().get_or_create(
+            "certificate-chain",
+            cert_chain_oce_ecka,
+            lambda: java.util.Arrays.asList(*[_python_bytes_to_java_bytes(cert) for cert in cert_chain_oce_ecka])
+        )
+        return com.samsung.openscp.Scp11KeyParams(
+            sd_key_ref,
+            pk_sd_ecka,
+            oce_key_ref,
+            sk_oce_ecka,
+            java_oce_cert_chain,
+            session_keys_alg
+        )
+
+    def _create_java_key_pair(self, public_key_bytes: bytes, private_key_bytes: bytes) -> Any:
+        # -> java.security.KeyPair
+        public_key = self._create_java_ec_public_key(public_key_bytes)
+        private_key = self._create_java_ec_private_key(private_key_bytes)
+        return java.security.KeyPair(public_key, private_key)
+
+    def _create_java_ec_public_key(self, key_bytes: bytes) -> Any:  # -> java.security.PublicKey
+        def parse() -> Any:
+            key_spec = java.security.spec.X509EncodedKeySpec(_python_bytes_to_java_bytes(key_bytes))
+            return _get_ec_key_factory().generatePublic(key_spec)
+        return get_key_cache().get_or_create("ec-public-key", [key_bytes], parse)
+
+    def _create_java_ec_private_key(self, key_bytes: bytes) -> Any:  # -> java.security.PrivateKey
+        def parse() -> Any:
+            key_spec = java.security.spec.PKCS8EncodedKeySpec(_python_bytes_to_java_bytes(key_bytes))
+            return _get_ec_key_factory().generatePrivate(key_spec)
+        return get_key_cache().get_or_create("ec-private-key", [key_bytes], parse)
+
+
+def _get_ec_key_factory() -> Any:  # -> java.security.KeyFactory
+    key_factory = getattr(_key_factories, "ec", None)
+    if key_factory is None:
+        key_factory = _key_factories.ec = java.security.KeyFactory.getInstance("EC")
+    return key_factory
+
+
+def _authenticate_with_key_pair(session: Any, key_params: Any, scp_mode: Any, key_pair: Any) -> None:
+    _invoke(_authenticate_with_key_pair_method, session, key_params, scp_mode, key_pair)
+
+
+def _authenticate_with_host_challenge(session: Any, key_params: Any, scp_mode: Any, host_challenge: Any) -> None:
+    _invoke(_authenticate_with_host_challenge_method, session, key_params, scp_mode, host_challenge)
+
+
+def _invoke(method: Any, session: Any, *arguments: Any) -> None:
+    try:
+        method.invoke(session, JArray(JObject)(list(arguments)))
+    except java.lang.reflect.InvocationTargetException as e:
+        raise e.getCause() from None
+
+
+def _take_ephemeral_key_pair(credentials: Scp11Credentials) -> Any:  # -> Optional[java.security.KeyPair]
+    pool = get_ephemeral_key_pool()
+    if not pool.capacity:
+        return None
+    curve = credentials._prepare("curve", lambda: _curve(credentials.pk_sd_ecka_bytes))
+    if curve is None:
+        return None
+    pk_sd_ecka_bytes = credentials.pk_sd_ecka_bytes
+    return pool._take(("java", curve), lambda: _generate_key_pair(pk_sd_ecka_bytes), _destroy_key_pair)
+
+
+def _generate_key_pair(pk_sd_ecka_bytes: bytes) -> Any:  # -> java.security.KeyPair
+    # Parameters are taken from PK.SD.ECKA, as the Java library does for the pairs it generates
+    key_spec = java.security.spec.X509EncodedKeySpec(_python_bytes_to_java_bytes(pk_sd_ecka_bytes))
+    generator = java.security.KeyPairGenerator.getInstance("EC", _security_provider)
+    generator.initialize(_get_ec_key_factory().generatePublic(key_spec).getParams())
+    return generator.generateKeyPair()
+
+
+def _destroy_key_pair(key_pair: Any) -> None:
+    private_key = key_pair.getPrivate()
+    if not private_key.isDestroyed():
+        try:
+            private_key.destroy()
+        except javax.security.auth.DestroyFailedException:
+            pass  # BouncyCastle keys can't be destroyed
+
+
+def _java_apdu(capdu: openscp.apdu.Apdu) -> Any:  # -> com.samsung.openscp.Apdu
+    cacheable = type(capdu.data) is bytes and len(capdu.data) <= _JAVA_APDU_CACHE_MAX_DATA
+    if cacheable:
+        java_capdu = _java_apdus.get(capdu)
+        if java_capdu is not None:
+            return java_capdu
+    le, force_add_le = capdu.le, capdu.force_add_le
+    if le == _SHORT_LE_MAX:  # The Java library encodes the maximum short Le as 0
+        le, force_add_le = 0, True
+    java_capdu = com.samsung.openscp.Apdu(capdu.cla, capdu.ins, capdu.p1, capdu.p2,
+                                          _python_bytes_to_java_bytes(capdu.data), le, force_add_le)
+    if cacheable:
+        with _java_apdus_lock:
+            if len(_java_apdus) >= _JAVA_APDU_CACHE_SIZE:
+                del _java_apdus[next(iter(_java_apdus))]
+            _java_apdus[capdu] = java_capdu
+    return java_capdu
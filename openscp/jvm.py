@@ -0,0 +1,368 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import glob
+import os
+import shlex
+import sys
+import threading
+import time
+from typing import Dict, List, Mapping, Optional
+# argparse, subprocess, tempfile and zipfile are imported by the tools using them: JVM configuration is imported
+# by applications at startup and must stay cheap
+
+import openscp.apdu
+from openscp.aes_alg import AesAlg
+from openscp.connection import SmartCardConnection
+from openscp.credentials import Scp03KeySet, Scp11Credentials
+from openscp.scp_mode import ScpMode
+
+ENV_JVM_PATH = "OPENSCP_JVM_PATH"
+ENV_JVM_INITIAL_HEAP = "OPENSCP_JVM_INITIAL_HEAP"
+ENV_JVM_MAX_HEAP = "OPENSCP_JVM_MAX_HEAP"
+ENV_JVM_JIT_OPTIONS = "OPENSCP_JVM_JIT_OPTIONS"
+ENV_JVM_CLASSPATH = "OPENSCP_JVM_CLASSPATH"
+ENV_JVM_CDS_ARCHIVE = "OPENSCP_JVM_CDS_ARCHIVE"
+ENV_JVM_OPTIONS = "OPENSCP_JVM_OPTIONS"
+ENV_JVM_WARM_UP = "OPENSCP_JVM_WARM_UP"
+
+# Directory with the bundled OpenSCP Java library and its dependencies
+LIB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.realpath(__file__))), "lib")
+OPENSCP_JAR = os.path.join(LIB_DIR, "openscp-1.0.0.jar")
+
+# JIT options trading peak performance for startup time, suitable for short-lived CLI jobs
+FAST_STARTUP_JIT_OPTIONS = ["-XX:TieredStopAtLevel=1", "-XX:+UseSerialGC"]
+
+
+class JvmConfig:
+    """JVM startup configuration, see :func:`configure_jvm`"""
+
+    jvm_path: Optional[str]
+    initial_heap: Optional[str]
+    max_heap: Optional[str]
+    jit_options: List[str]
+    classpath: List[str]
+    cds_archive: Optional[str]
+    options: List[str]
+    warm_up: bool
+
+    def __init__(self,
+                 jvm_path: Optional[str] = None,
+                 initial_heap: Optional[str] = None,
+                 max_heap: Optional[str] = None,
+                 jit_options: Optional[List[str]] = None,
+                 classpath: Optional[List[str]] = None,
+                 cds_archive: Optional[str] = None,
+                 options: Optional[List[str]] = None,
+                 warm_up: bool = False) -> None:
+        """
+        :param jvm_path: path to the JVM shared library, JPype default JVM is used if absent
+        :param initial_heap: initial heap size in the -Xms format (e.g. "32m")
+        :param max_heap: maximum heap size in the -Xmx format (e.g. "256m")
+        :param jit_options: JIT compiler and GC options (e.g. :data:`FAST_STARTUP_JIT_OPTIONS`)
+        :param classpath: extra classpath entries appended after the bundled library
+        :param cds_archive: class data sharing archive created by :func:`generate_cds_archive`, ignored by the JVM
+                            with a warning if it doesn't match the JVM or classpath
+        :param options: any other JVM options
+        :param warm_up: run :func:`warm_up` once the JVM is started, by :func:`start_jvm` or the first Java backend
+                        session
+        """
+        self.jvm_path = jvm_path
+        self.initial_heap = initial_heap
+        self.max_heap = max_heap
+        self.jit_options = list(jit_options or [])
+        self.classpath = list(classpath or [])
+        self.cds_archive = cds_archive
+        self.options = list(options or [])
+        self.warm_up = warm_up
+
+    @classmethod
+    def from_environment(cls, environ: Optional[Mapping[str, str]] = None) -> "JvmConfig":
+        """
+        :param environ: environment variables, :data:`os.environ` if absent
+        :return: configuration read from ``OPENSCP_JVM_*`` environment variables
+        """
+        environ = os.environ if environ is None else environ
+        classpath = environ.get(ENV_JVM_CLASSPATH, "")
+        return cls(jvm_path=environ.get(ENV_JVM_PATH) or None,
+                   initial_heap=environ.get(ENV_JVM_INITIAL_HEAP) or None,
+                   max_heap=environ.get(ENV_JVM_MAX_HEAP) or None,
+                   jit_options=shlex.split(environ.get(ENV_JVM_JIT_OPTIONS, "")),
+                   classpath=[entry for entry in classpath.split(os.pathsep) if entry],
+                   cds_archive=environ.get(ENV_JVM_CDS_ARCHIVE) or None,
+                   options=shlex.split(environ.get(ENV_JVM_OPTIONS, "")),
+                   warm_up=environ.get(ENV_JVM_WARM_UP, "").lower() in ("1", "true", "yes"))
+
+    def to_environment(self) -> Dict[str, str]:
+        """
+        :return: ``OPENSCP_JVM_*`` environment variables reproducing this configuration in a child process
+        """
+        return {ENV_JVM_PATH: self.jvm_path or "",
+                ENV_JVM_INITIAL_HEAP: self.initial_heap or "",
+                ENV_JVM_MAX_HEAP: self.max_heap or "",
+                ENV_JVM_JIT_OPTIONS: " ".join(shlex.quote(option) for option in self.jit_options),
+                ENV_JVM_CLASSPATH: os.pathsep.join(self.classpath),
+                ENV_JVM_CDS_ARCHIVE: self.cds_archive or "",
+                ENV_JVM_OPTIONS: " ".join(shlex.quote(option) for option in self.options),
+                ENV_JVM_WARM_UP: "1" if self.warm_up else ""}
+
+    def jvm_arguments(self) -> List[str]:
+        """
+        :return: JVM options passed to :func:`jpype.startJVM`
+        """
+        arguments = []
+        if self.initial_heap:
+            arguments.append("-Xms" + self.initial_heap)
+        if self.max_heap:
+            arguments.append("-Xmx" + self.max_heap)
+        if self.cds_archive:
+            arguments.append("-XX:SharedArchiveFile=" + self.cds_archive)
+        return arguments + self.jit_options + self.options
+
+    def full_classpath(self) -> List[str]:
+        """
+        :return: bundled library jars in a stable order, followed by extra entries
+        """
+        # Stable order keeps the classpath identical between runs, as required by class data sharing archives
+        return sorted(glob.glob(os.path.join(LIB_DIR, "*.jar"))) + self.classpath
+
+
+_config: Optional[JvmConfig] = None
+
+# The configured warm-up runs once, when the JVM is started by start_jvm() or the first Java session is created: it
+# creates Java sessions itself, so it can't run while the Java backend module is being imported
+_warm_up_done = False
+_warm_up_lock = threading.Lock()
+
+
+def configure_jvm(config: JvmConfig) -> None:
+    """
+    Set JVM startup configuration. Must be called before the first Java backend session is created, because
+    the JVM can be started only once per process.
+
+    :param config: JVM configuration, replaces ``OPENSCP_JVM_*`` environment variables
+    :return: None
+
+    :raises: RuntimeError if the JVM is already started
+    """
+    global _config
+    if is_jvm_started():
+        raise RuntimeError("JVM is already started, its configuration can't be changed")
+    _config = config
+
+
+def get_jvm_config() -> JvmConfig:
+    """
+    :return: configuration set by :func:`configure_jvm` or read from ``OPENSCP_JVM_*`` environment variables
+    """
+    return _config if _config is not None else JvmConfig.from_environment()
+
+
+def is_jvm_started() -> bool:
+    """
+    :return: is the JVM already started in this process
+    """
+    # openscp.utils imports JPype, which is needless if nothing has started the JVM yet
+    utils = sys.modules.get("openscp.utils")
+    return bool(utils and utils.is_jvm_started)
+
+
+def start_jvm() -> None:
+    """
+    Start the JVM with the current configuration in advance, e.g. at worker process startup.
+    Does nothing if the JVM is already started.
+
+    :return: None
+    """
+    from openscp.utils import _start_jvm_if_needed
+    _start_jvm_if_needed()
+    _warm_up_if_configured()
+
+
+def warm_up(iterations: int = 3) -> float:
+    """
+    Load all OpenSCP classes and run SCP03 and SCP11 handshakes against a canned connection, so that class loading,
+    security provider initialization and the first JIT compilations of the handshake code are done before the first
+    real session. The canned handshakes are expected to fail on cryptogram and receipt verification.
+
+    :param iterations: number of canned SCP03 and SCP11 handshakes
+    :return: warm-up duration in seconds
+    """
+    global _warm_up_done
+    import zipfile
+    start = time.perf_counter()
+    _warm_up_done = True  # Any warm-up stands for the configured one
+    start_jvm()
+    from openscp.java_session import JavaSession
+    import java.lang
+    import java.security
+    import java.security.spec
+    import jpype
+
+    class_loader = java.lang.ClassLoader.getSystemClassLoader()
+    with zipfile.ZipFile(OPENSCP_JAR) as jar:
+        for name in jar.namelist():
+            if name.startswith("com/samsung/openscp/") and name.endswith(".class"):
+                java.lang.Class.forName(name[:-len(".class")].replace("/", "."), True, class_loader)
+
+    key_pair_generator = java.security.KeyPairGenerator.getInstance("EC")
+    key_pair_generator.initialize(java.security.spec.ECGenParameterSpec("secp256r1"))
+    sd_key_pair = key_pair_generator.generateKeyPair()
+    oce_key_pair = key_pair_generator.generateKeyPair()
+    connection = _WarmUpConnection(bytes(sd_key_pair.getPublic().getEncoded()))
+    static_key = bytes(range(16))
+    for _ in range(iterations):
+        # Credentials are created per iteration, so that their conversion to Java objects is warmed up too
+        key_set = Scp03KeySet(0x01, 0x30, static_key, static_key, static_key)
+        credentials = Scp11Credentials(0x11, 0x01, 0x10, 0x01,
+                                       bytes(sd_key_pair.getPublic().getEncoded()),
+                                       [bytes(oce_key_pair.getPublic().getEncoded())],
+                                       bytes(oce_key_pair.getPrivate().getEncoded()),
+                                       AesAlg.AES_128)
+        session = JavaSession(connection)
+        session.send_and_receive(openscp.apdu.Apdu(0x80, 0xCA, 0x00, 0x66, b"", 0x00, True))
+        for scp_mode in ScpMode:
+            try:
+                session._authenticate_scp03(key_set, scp_mode)
+            except jpype.JException:
+                pass
+        try:
+            session._authenticate_scp11(credentials, ScpMode.S8)
+        except jpype.JException:
+            pass
+    return time.perf_counter() - start
+
+
+def _warm_up_if_configured() -> None:
+    global _warm_up_done
+    if _warm_up_done:
+        return
+    with _warm_up_lock:
+        if _warm_up_done:
+            return
+        _warm_up_done = True
+    if get_jvm_config().warm_up:
+        warm_up()
+
+
+def generate_cds_archive(archive_path: str, config: Optional[JvmConfig] = None) -> None:
+    """
+    Create an AppCDS archive with the classes loaded by :func:`warm_up` (OpenSCP, BouncyCastle, JPype and JDK
+    classes). The class list is recorded in a child process running the warm-up, then the archive is dumped by the
+    ``java`` launcher of the same JDK, so JDK 10 or newer is required. The archive is valid only for the same JVM and
+    classpath, so it must be used with the configuration it was created with.
+
+    :param archive_path: archive file to create
+    :param config: JVM configuration, current one is used if absent
+    :return: None
+
+    :raises: RuntimeError if the archive can't be created
+    """
+    import subprocess
+    import tempfile
+    import jpype
+    config = config or get_jvm_config()
+    archive_path = os.path.abspath(archive_path)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        class_list = os.path.join(temp_dir, "classes.lst")
+        classpath_file = os.path.join(temp_dir, "classpath.txt")
+        record_config = JvmConfig(jvm_path=config.jvm_path,
+                                  initial_heap=config.initial_heap,
+                                  max_heap=config.max_heap,
+                                  jit_options=config.jit_options,
+                                  classpath=config.classpath,
+                                  options=config.options + ["-XX:DumpLoadedClassList=" + class_list],
+                                  warm_up=True)
+        environ = dict(os.environ)
+        environ.update(record_config.to_environment())
+        # The child process must import this copy of the package
+        package_root = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+        environ["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, environ.get("PYTHONPATH")]))
+        # JPype appends its own support jar, so the effective classpath is taken from the running JVM
+        script = ("import openscp.jvm; openscp.jvm.start_jvm(); import java.lang; "
+                  f"open({classpath_file!r}, 'w').write(str(java.lang.System.getProperty('java.class.path')))")
+        subprocess.run([sys.executable, "-c", script], env=environ, check=True)
+        with open(classpath_file) as f:
+            classpath = f.read()
+
+        java = _find_java_executable(config.jvm_path or jpype.getDefaultJVMPath())
+        if os.path.exists(archive_path):
+            os.remove(archive_path)
+        command = [java, "-Xshare:dump", "-XX:SharedClassListFile=" + class_list,
+                   "-XX:SharedArchiveFile=" + archive_path, "-cp", classpath]
+        process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        if process.returncode != 0 or not os.path.isfile(archive_path):
+            raise RuntimeError("CDS archive dump failed:\n" + process.stdout.decode(errors="replace"))
+
+
+def _find_java_executable(jvm_path: str) -> str:
+    # libjvm lives in <java home>/lib/server (Linux, macOS) or <java home>/bin/server (Windows)
+    executable = "java.exe" if os.name == "nt" else "java"
+    directory = os.path.dirname(os.path.realpath(jvm_path))
+    while True:
+        candidate = os.path.join(directory, "bin", executable)
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            raise RuntimeError(f"java launcher isn't found for JVM {jvm_path}")
+        directory = parent
+
+
+class _WarmUpConnection(SmartCardConnection):
+    """Canned card responses taking the Java library through INITIALIZE UPDATE and MUTUAL AUTHENTICATE"""
+
+    def __init__(self, sd_public_key: bytes) -> None:
+        # Uncompressed P-256 point is the tail of SubjectPublicKeyInfo
+        point = sd_public_key[-65:]
+        self._scp11_response = b"\x5F\x49\x41" + point + b"\x86\x10" + bytes(16) + b"\x90\x00"
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        ins = apdu[1]
+        if ins == 0x50:
+            blob_size = apdu[4]
+            return bytes(10) + b"\x30\x03\x70" + bytes(2 * blob_size) + b"\x90\x00"
+        if ins == 0x82 and apdu[0] == 0x80:
+            return self._scp11_response
+        return b"\x90\x00"
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return False
+
+    def close_connection(self) -> None:
+        pass
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser("python -m openscp.jvm", description="OpenSCP JVM tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    cds_parser = subparsers.add_parser("generate-cds", help="create a class data sharing archive")
+    cds_parser.add_argument("archive", help="archive file to create, e.g. openscp.jsa")
+    warm_up_parser = subparsers.add_parser("warm-up", help="start the JVM, warm it up and report timings")
+    warm_up_parser.add_argument("--iterations", type=int, default=3, help="number of canned handshakes")
+    options = parser.parse_args()
+    if options.command == "generate-cds":
+        generate_cds_archive(options.archive)
+        print(f"CDS archive created: {options.archive}")
+        print(f"Use it with {ENV_JVM_CDS_ARCHIVE}={options.archive} or JvmConfig(cds_archive=...)")
+    else:
+        start = time.perf_counter()
+        start_jvm()
+        started = time.perf_counter() - start
+        print(f"JVM start: {started * 1000:.1f} ms, warm-up: {warm_up(options.iterations) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
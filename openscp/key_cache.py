@@ -0,0 +1,134 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, NamedTuple, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_SIZE = 64
+
+
+class CacheStats(NamedTuple):
+    """Snapshot of cache counters"""
+
+    hits: int
+    """lookups answered from the cache"""
+
+    misses: int
+    """lookups which had to create the value"""
+
+    evictions: int
+    """values dropped to respect the size limit"""
+
+    size: int
+    """values currently cached"""
+
+    max_size: int
+    """size limit"""
+
+
+class KeyCache:
+    """
+    Thread-safe LRU cache of parsed keys and certificate chains, keyed by the kind of the value and the SHA-256 digest
+    of the encoded content. Cached values include private keys, use :meth:`clear` or ``max_size=0`` where keeping
+    them in memory is not acceptable.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        """
+        :param max_size: maximum number of cached values, 0 disables caching
+        """
+        self._max_size = max_size
+        self._values: "OrderedDict[Tuple[str, bytes], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_size(self) -> int:
+        """maximum number of cached values"""
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value: int) -> None:
+        with self._lock:
+            self._max_size = value
+            self._evict()
+
+    def get_or_create(self, kind: str, content: Iterable[bytes], factory: Callable[[], T]) -> T:
+        """
+        :param kind: kind of the value, e.g. "ec-public-key", so that equal bytes parsed differently don't collide
+        :param content: encoded parts the value is created from
+        :param factory: creates the value on a cache miss
+        :return: cached or newly created value
+        """
+        key = (kind, _digest(content))
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return self._values[key]
+            self._misses += 1
+        # The lock isn't held while parsing, concurrent misses of the same content may each create the value
+        value = factory()
+        with self._lock:
+            if self._max_size > 0:
+                self._values[key] = value
+                self._values.move_to_end(key)
+                self._evict()
+        return value
+
+    def clear(self) -> None:
+        """
+        Drop all cached values, counters are kept
+
+        :return: None
+        """
+        with self._lock:
+            self._values.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        :return: current counters
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._values), self._max_size)
+
+    def _evict(self) -> None:
+        while len(self._values) > max(self._max_size, 0):
+            self._values.popitem(last=False)
+            self._evictions += 1
+
+
+_key_cache = KeyCache()
+
+
+def get_key_cache() -> KeyCache:
+    """
+    :return: process-wide cache of Java keys and OCE certificate chains used by SCP11 authentication
+    """
+    return _key_cache
+
+
+def _digest(content: Iterable[bytes]) -> bytes:
+    digest = hashlib.sha256()
+    for part in content:
+        # Length prefix keeps (b"ab", b"c") and (b"a", b"bc") apart
+        digest.update(len(part).to_bytes(4, "big"))
+        digest.update(part)
+    return digest.digest()
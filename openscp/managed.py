@@ -0,0 +1,252 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, FrozenSet, Iterable, NamedTuple, Optional, TypeVar, Union
+
+import openscp.apdu
+from openscp.backend import Backend
+from openscp.certificate_cache import CardId, CertificateCache
+from openscp.connection import SmartCardConnection
+from openscp.credentials import Scp03KeySet, Scp11Credentials
+from openscp.exceptions import ChannelLostError, _is_bad_response, _status_word
+from openscp.scp_mode import ScpMode
+from openscp.session import SecurityDomainSession
+
+if TYPE_CHECKING:
+    from openscp.certificate_validation import CertificateValidator
+    from openscp.trace import TraceRecorder
+
+T = TypeVar("T")
+
+Credentials = Union[Scp03KeySet, Scp11Credentials]
+
+# Security status not satisfied, incorrect secure messaging data objects
+DEFAULT_CHANNEL_LOST_SWS: FrozenSet[int] = frozenset({0x6982, 0x6988})
+
+# SELECT, READ BINARY, READ RECORD, GET DATA, GET STATUS
+DEFAULT_IDEMPOTENT_INS: FrozenSet[int] = frozenset({0xA4, 0xB0, 0xB1, 0xB2, 0xB3, 0xCA, 0xCB, 0xF2})
+
+
+class ManagedSessionStats(NamedTuple):
+    """Snapshot of :class:`ManagedSession` counters"""
+
+    session_age: float
+    """seconds since the current secure channel was established, 0 if there is none"""
+
+    handshakes: int
+    """successful authentications, the first one included"""
+
+    reauthentications: int
+    """successful authentications after a lost channel or an expired session"""
+
+    reconnections: int
+    """connections opened after a transport failure"""
+
+    retries: int
+    """commands sent again after re-authentication"""
+
+    last_handshake_time: float
+    """seconds, duration of the last successful authentication"""
+
+    reauthentication_time: float
+    """seconds spent in re-authentications, reconnections included"""
+
+
+class ManagedSession:
+    """
+    Secure channel kept open across jobs. The session is authenticated with stored credentials on first use and
+    authenticated again when the channel is lost - an error status word such as 6982 or 6988, a response which fails
+    verification or a transport error, after which the connection is opened again - or when it is older than the
+    maximum age. Idempotent commands are sent again on the new channel, others fail with
+    :class:`openscp.ChannelLostError`. Unlike :class:`openscp.SecurityDomainSession`, it is used by one thread at a
+    time.
+    """
+
+    def __init__(self,
+                 connection_factory: Callable[[], SmartCardConnection],
+                 credentials: Credentials,
+                 scp_mode: ScpMode,
+                 backend: Backend = Backend.JAVA,
+                 max_retries: int = 1,
+                 max_age: Optional[float] = None,
+                 channel_lost_sws: Iterable[int] = DEFAULT_CHANNEL_LOST_SWS,
+                 is_idempotent: Optional[Callable[[openscp.apdu.Apdu], bool]] = None,
+                 certificate_cache: Optional[CertificateCache] = None,
+                 card_id: Optional[CardId] = None,
+                 certificate_validator: Optional["CertificateValidator"] = None,
+                 trace_recorder: Optional["TraceRecorder"] = None) -> None:
+        """
+        :param connection_factory: opens the connection to the card, called again after a transport failure
+        :param credentials: keys to authenticate with, SCP03 or SCP11
+        :param scp_mode: SCP mode - S8 or S16
+        :param backend: SCP implementation to use
+        :param max_retries: how many times a command is sent again after re-authentication
+        :param max_age: seconds, a channel older than that is authenticated again before the next command
+        :param channel_lost_sws: status words meaning that the card has closed the secure channel
+        :param is_idempotent: tells whether a command may be sent again, by default the commands with instructions
+                              from :data:`DEFAULT_IDEMPOTENT_INS`
+        :param certificate_cache: see :class:`openscp.SecurityDomainSession`
+        :param card_id: see :class:`openscp.SecurityDomainSession`
+        :param certificate_validator: see :class:`openscp.SecurityDomainSession`
+        :param trace_recorder: see :class:`openscp.SecurityDomainSession`
+        """
+        self._connection_factory = connection_factory
+        self._credentials = credentials
+        self._scp_mode = scp_mode
+        self._backend = backend
+        self._max_retries = max_retries
+        self._max_age = max_age
+        self._channel_lost_sws = frozenset(channel_lost_sws)
+        self._is_idempotent = is_idempotent or _is_idempotent
+        self._certificate_cache = certificate_cache
+        self._card_id = card_id
+        self._certificate_validator = certificate_validator
+        self._trace_recorder = trace_recorder
+        self._connection: Optional[SmartCardConnection] = None
+        self._session: Optional[SecurityDomainSession] = None
+        self._authenticated_at = 0.0
+        self._handshakes = 0
+        self._reauthentications = 0
+        self._reconnections = 0
+        self._retries = 0
+        self._last_handshake_time = 0.0
+        self._reauthentication_time = 0.0
+
+    @property
+    def session(self) -> SecurityDomainSession:
+        """
+        Authenticated session, established if needed. Failures of commands sent through it directly are not
+        handled, use :meth:`run` for that.
+        """
+        return self._ensure_session()
+
+    def send_and_receive(self, capdu: openscp.apdu.Apdu) -> bytes:
+        """
+        Send Command APDU, re-establishing the secure channel if it was lost
+
+        :param capdu: Command APDU
+        :return: Response APDU data bytes
+
+        :raises: :class:`openscp.ChannelLostError` if the channel was lost and the command is not sent again,
+                 other exceptions as :meth:`openscp.SecurityDomainSession.send_and_receive`
+        """
+        return self.run(lambda session: session.send_and_receive(capdu), self._is_idempotent(capdu))
+
+    def run(self, operation: Callable[[SecurityDomainSession], T], idempotent: bool = False) -> T:
+        """
+        Run an operation with the authenticated session, re-establishing the secure channel if it was lost
+
+        :param operation: called with the session, again after re-authentication if idempotent
+        :param idempotent: may the operation be repeated
+        :return: operation result
+
+        :raises: :class:`openscp.ChannelLostError` if the channel was lost and the operation is not repeated,
+                 exceptions of the operation and of authentication
+        """
+        attempt = 0
+        while True:
+            session = self._ensure_session()
+            try:
+                return operation(session)
+            except Exception as error:
+                transport_lost = isinstance(error, OSError)
+                if not transport_lost and not self._is_channel_lost(error):
+                    raise
+                # The channel is established again on the next use, which may never come
+                self._drop(close_connection=transport_lost)
+                if not idempotent or attempt >= self._max_retries:
+                    raise ChannelLostError("Secure channel was lost, the command was not repeated") from error
+                attempt += 1
+                self._retries += 1
+
+    def authenticate(self) -> None:
+        """
+        Establish a new secure channel now, e.g. before the first job, instead of on first use
+
+        :return: None
+        """
+        self._drop(close_connection=False)
+        self._ensure_session()
+
+    def stats(self) -> ManagedSessionStats:
+        """
+        :return: current counters
+        """
+        age = time.monotonic() - self._authenticated_at if self._session is not None else 0.0
+        return ManagedSessionStats(age, self._handshakes, self._reauthentications, self._reconnections,
+                                   self._retries, self._last_handshake_time, self._reauthentication_time)
+
+    def close(self) -> None:
+        """
+        Close the connection
+
+        :return: None
+        """
+        self._drop(close_connection=True)
+
+    def __enter__(self) -> "ManagedSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _ensure_session(self) -> SecurityDomainSession:
+        session = self._session
+        if session is not None and (self._max_age is None
+                                    or time.monotonic() - self._authenticated_at <= self._max_age):
+            return session
+        reauthentication = self._handshakes > 0
+        start = time.perf_counter()
+        if self._connection is None:
+            self._connection = self._connection_factory()
+            if reauthentication:
+                self._reconnections += 1
+        # Always a new session: the previous one would wrap the handshake in the lost channel
+        session = SecurityDomainSession(self._connection, self._backend, self._certificate_cache, self._card_id,
+                                        certificate_validator=self._certificate_validator,
+                                        trace_recorder=self._trace_recorder)
+        try:
+            if isinstance(self._credentials, Scp03KeySet):
+                session.authenticate_scp03(self._credentials, self._scp_mode)
+            else:
+                session.authenticate_scp11(self._credentials, self._scp_mode)
+        except OSError:
+            self._drop(close_connection=True)
+            raise
+        duration = time.perf_counter() - start
+        self._session = session
+        self._authenticated_at = time.monotonic()
+        self._handshakes += 1
+        self._last_handshake_time = duration
+        if reauthentication:
+            self._reauthentications += 1
+            self._reauthentication_time += duration
+        return session
+
+    def _is_channel_lost(self, error: BaseException) -> bool:
+        return _status_word(error) in self._channel_lost_sws or _is_bad_response(error)
+
+    def _drop(self, close_connection: bool) -> None:
+        self._session = None
+        if close_connection and self._connection is not None:
+            connection, self._connection = self._connection, None
+            try:
+                connection.close_connection()
+            except OSError:
+                pass
+
+
+def _is_idempotent(capdu: openscp.apdu.Apdu) -> bool:
+    return capdu.ins in DEFAULT_IDEMPOTENT_INS
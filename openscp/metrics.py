@@ -0,0 +1,303 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+PHASE_CONVERSION = "conversion"
+"""Python-side conversion of APDUs and byte arrays between Python and Java objects"""
+
+PHASE_JAVA = "java"
+"""time inside the Java library: JPype crossings and Java secure messaging, which can't be told apart from Python"""
+
+PHASE_SECURE_MESSAGING = "secure_messaging"
+"""native backend secure messaging: encryption, MAC computation and verification, APDU formatting"""
+
+PHASE_TRANSPORT = "transport"
+"""card round trip inside :meth:`openscp.SmartCardConnection.send_and_receive`"""
+
+PHASE_CERTIFICATE_VALIDATION = "certificate_validation"
+"""SD certificate bundle validation by :class:`openscp.CertificateValidator`"""
+
+HANDSHAKE_TOTAL = "total"
+HANDSHAKE_COMPLETION = "completion"
+
+# Upper bounds, in seconds, of command latency histogram buckets, the last bucket is unbounded
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                                              0.1, 0.25, 0.5, 1.0)
+
+_INS_GET_RESPONSE = 0xC0
+
+_HANDSHAKE_STEPS = {
+    ("SCP03", 0x50): "INITIALIZE UPDATE",
+    ("SCP03", 0x82): "EXTERNAL AUTHENTICATE",
+    ("SCP11", 0x2A): "PERFORM SECURITY OPERATION",
+    ("SCP11", 0x82): "MUTUAL AUTHENTICATE",
+    ("SCP11", 0x88): "INTERNAL AUTHENTICATE",
+}
+
+
+class PhaseStats(NamedTuple):
+    """Durations of a phase, in seconds"""
+
+    count: int
+    total: float
+    min: float
+    max: float
+
+    @property
+    def average(self) -> float:
+        """mean duration, 0 if there were none"""
+        return self.total / self.count if self.count else 0.0
+
+
+class CommandStats(NamedTuple):
+    """Commands with the same instruction byte, as sent through :class:`openscp.SecurityDomainSession`"""
+
+    count: int
+    errors: int
+    """commands which completed with an error status word or raised an exception"""
+
+    total: float
+    """seconds, the whole command: wrapping, card round trip and unwrapping"""
+
+    bounds: Tuple[float, ...]
+    """upper bounds of histogram buckets, in seconds"""
+
+    buckets: Tuple[int, ...]
+    """commands per bucket, one more than bounds: the last one counts commands slower than all bounds"""
+
+
+class MetricsSnapshot(NamedTuple):
+    """Copy of all counters at one point in time"""
+
+    timestamp: float
+    """time.time() of the snapshot"""
+
+    phases: Dict[str, PhaseStats]
+    """exclusive time of ``PHASE_*`` phases"""
+
+    commands: Dict[int, CommandStats]
+    """by instruction byte"""
+
+    handshakes: Dict[str, Dict[str, PhaseStats]]
+    """by protocol ("SCP03", "SCP11"), then by step: the command name - the time from the previous response to its
+    response, including host-side computation - "completion" after the last response, and "total\""""
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        :return: JSON-serializable form, instruction bytes as two hexadecimal digits
+        """
+        return {
+            "timestamp": self.timestamp,
+            "phases": {name: _phase_dict(stats) for name, stats in self.phases.items()},
+            "commands": {f"{ins:02X}": stats._asdict() for ins, stats in self.commands.items()},
+            "handshakes": {protocol: {step: _phase_dict(stats) for step, stats in steps.items()}
+                           for protocol, steps in self.handshakes.items()},
+        }
+
+
+class Metrics:
+    """
+    Thread-safe timing of the command hot path, disabled by default. While disabled, instrumented code only checks
+    :attr:`enabled`.
+    """
+
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        """
+        :param latency_buckets: ascending upper bounds, in seconds, of command latency histogram buckets
+        """
+        self._bounds = tuple(latency_buckets)
+        # Read on every command, a plain attribute is several times cheaper than a property
+        self.enabled = False
+        """are timings recorded, changed with :meth:`enable` and :meth:`disable`"""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._phases: Dict[str, List[float]] = {}
+        self._commands: Dict[int, List[Any]] = {}
+        self._handshakes: Dict[str, Dict[str, List[float]]] = {}
+
+    def enable(self) -> None:
+        """
+        Start recording, counters recorded before are kept
+
+        :return: None
+        """
+        self.enabled = True
+
+    def disable(self) -> None:
+        """
+        Stop recording, counters are kept
+
+        :return: None
+        """
+        self.enabled = False
+
+    def reset(self) -> None:
+        """
+        Drop all counters
+
+        :return: None
+        """
+        with self._lock:
+            self._phases.clear()
+            self._commands.clear()
+            self._handshakes.clear()
+
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        :return: copy of current counters, cheap enough to be polled by a metrics exporter
+        """
+        with self._lock:
+            return MetricsSnapshot(
+                time.time(),
+                {name: PhaseStats(int(s[0]), *s[1:]) for name, s in self._phases.items()},
+                {ins: CommandStats(c[0], c[1], c[2], self._bounds, tuple(c[3])) for ins, c in self._commands.items()},
+                {protocol: {step: PhaseStats(int(s[0]), *s[1:]) for step, s in steps.items()}
+                 for protocol, steps in self._handshakes.items()},
+            )
+
+    def _start(self) -> Tuple[float, float]:
+        return time.perf_counter(), getattr(self._local, "nested", 0.0)
+
+    def _stop(self, phase: str, started: Tuple[float, float]) -> None:
+        # Phases are exclusive: time of phases measured inside this one is subtracted from it
+        start, nested_before = started
+        elapsed = time.perf_counter() - start
+        nested = getattr(self._local, "nested", 0.0) - nested_before
+        self._local.nested = nested_before + elapsed
+        self._record_phase(phase, elapsed - nested)
+
+    def _transmit(self, send: Callable[[bytes], bytes], apdu: bytes) -> bytes:
+        started = self._start()
+        try:
+            return send(apdu)
+        finally:
+            self._stop(PHASE_TRANSPORT, started)
+            trace: Optional[_HandshakeTrace] = getattr(self._local, "handshake", None)
+            if trace is not None and len(apdu) > 1:
+                trace.observe(apdu[1], time.perf_counter())
+
+    @contextmanager
+    def _handshake(self, protocol: str) -> Iterator[None]:
+        trace = _HandshakeTrace(protocol, time.perf_counter())
+        self._local.handshake = trace
+        try:
+            yield
+        finally:
+            self._local.handshake = None
+        # Only complete handshakes are recorded
+        end = time.perf_counter()
+        steps = trace.steps
+        steps[HANDSHAKE_COMPLETION] = end - trace.last
+        steps[HANDSHAKE_TOTAL] = end - trace.start
+        with self._lock:
+            recorded = self._handshakes.setdefault(protocol, {})
+            for step, duration in steps.items():
+                _add(recorded, step, duration)
+
+    def _record_phase(self, phase: str, duration: float) -> None:
+        with self._lock:
+            _add(self._phases, phase, duration)
+
+    def _record_command(self, ins: int, duration: float, failed: bool) -> None:
+        bucket = bisect.bisect_left(self._bounds, duration)
+        with self._lock:
+            stats = self._commands.get(ins)
+            if stats is None:
+                stats = self._commands[ins] = [0, 0, 0.0, [0] * (len(self._bounds) + 1)]
+            stats[0] += 1
+            stats[1] += failed
+            stats[2] += duration
+            stats[3][bucket] += 1
+
+
+class _HandshakeTrace:
+    """Splits a handshake into steps at the responses to its commands"""
+
+    def __init__(self, protocol: str, start: float) -> None:
+        self.protocol = protocol
+        self.start = start
+        self.last = start
+        self.step = ""
+        self.steps: Dict[str, float] = {}
+
+    def observe(self, ins: int, end: float) -> None:
+        # GET RESPONSE continues the command it retrieves data for
+        if ins != _INS_GET_RESPONSE or not self.step:
+            self.step = _HANDSHAKE_STEPS.get((self.protocol, ins), f"INS {ins:02X}")
+        self.steps[self.step] = self.steps.get(self.step, 0.0) + end - self.last
+        self.last = end
+
+
+def _add(phases: Dict[str, List[float]], name: str, duration: float) -> None:
+    stats = phases.get(name)
+    if stats is None:
+        phases[name] = [1, duration, duration, duration]
+    else:
+        stats[0] += 1
+        stats[1] += duration
+        if duration < stats[2]:
+            stats[2] = duration
+        if duration > stats[3]:
+            stats[3] = duration
+
+
+def _phase_dict(stats: PhaseStats) -> Dict[str, Any]:
+    return dict(stats._asdict(), average=stats.average)
+
+
+def merge_snapshots(snapshots: Iterable[MetricsSnapshot]) -> MetricsSnapshot:
+    """
+    Combine snapshots of several processes, e.g. of :class:`openscp.ProcessFarm` workers
+
+    :param snapshots: snapshots with the same latency buckets
+    :return: sums of all counters, with the latest timestamp
+    """
+    timestamp = 0.0
+    phases: Dict[str, PhaseStats] = {}
+    commands: Dict[int, CommandStats] = {}
+    handshakes: Dict[str, Dict[str, PhaseStats]] = {}
+    for snapshot in snapshots:
+        timestamp = max(timestamp, snapshot.timestamp)
+        _merge_phases(phases, snapshot.phases)
+        for ins, stats in snapshot.commands.items():
+            merged = commands.get(ins)
+            commands[ins] = stats if merged is None else CommandStats(
+                merged.count + stats.count, merged.errors + stats.errors, merged.total + stats.total, merged.bounds,
+                tuple(a + b for a, b in zip(merged.buckets, stats.buckets)))
+        for protocol, steps in snapshot.handshakes.items():
+            _merge_phases(handshakes.setdefault(protocol, {}), steps)
+    return MetricsSnapshot(timestamp, phases, commands, handshakes)
+
+
+def _merge_phases(merged: Dict[str, PhaseStats], phases: Dict[str, PhaseStats]) -> None:
+    for name, stats in phases.items():
+        current = merged.get(name)
+        merged[name] = stats if current is None else PhaseStats(
+            current.count + stats.count, current.total + stats.total, min(current.min, stats.min),
+            max(current.max, stats.max))
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """
+    :return: process-wide metrics of all sessions
+    """
+    return _metrics
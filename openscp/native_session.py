@@ -0,0 +1,270 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+from typing import Generator, Iterable, List, Optional, Tuple
+
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+import openscp.connection
+import openscp.scp_mode
+from openscp.apdu import Apdu, _encode_apdu, _secured_apdu_extended
+from openscp.credentials import Scp03KeySet, Scp11Credentials
+from openscp.ephemeral_pool import _curve, get_ephemeral_key_pool
+from openscp.exceptions import ApduError, BadResponseError, ScpError
+from openscp.metrics import PHASE_SECURE_MESSAGING, get_metrics
+from openscp.scp_certificate import ScpCertificate
+from openscp.scp_state import ApduResponse, ScpState, SW_OK, external_authenticate_apdu, scp03_init, scp11_init
+from openscp.tlv import decode_tlv_list, encode_tlv, unpack_tlv_value
+
+_SHORT_APDU_MAX_LENGTH = 0xFF
+_CLA_CHAINING = 0x10
+_CLA_SECURE_MESSAGING = 0x04
+_INS_GET_RESPONSE = 0xC0
+_INS_GET_DATA = 0xCA
+_SW1_HAS_MORE_DATA = 0x61
+_SW_INS_NOT_SUPPORTED = 0x6E00
+_SW_REFERENCE_NOT_FOUND = 0x6A88
+
+_TAG_CERTIFICATE_STORE = 0xBF21
+_TAG_CONTROL_REFERENCE = 0xA6
+_TAG_KEY_IDENTIFICATION = 0x83
+_TAG_GP_CERTIFICATE = 0x7F21
+_TAG_GP_PUBLIC_KEY = 0x7F49
+_TAG_GP_PUBLIC_KEY_Q = 0xB0
+_TAG_GP_KEY_PARAMETER_REFERENCE = 0xF0
+
+_metrics = get_metrics()
+
+_GP_KEY_PARAMETER_CURVES = {
+    0x00: ec.SECP256R1,
+    0x01: ec.SECP384R1,
+    0x02: ec.SECP521R1,
+    0x03: ec.BrainpoolP256R1,
+    0x05: ec.BrainpoolP384R1,
+}
+
+
+class _ApduTransport:
+    """ISO 7816 transport: command chaining for long data and GET RESPONSE for SW 61XX"""
+
+    def __init__(self, connection: openscp.connection.SmartCardConnection) -> None:
+        self._connection = connection
+        self._get_response = _encode_apdu(0x00, _INS_GET_RESPONSE, 0x00, 0x00, b"", 0, False, False)
+
+    def send_apdu(self, apdu: Apdu, extended: bool = False) -> ApduResponse:
+        data = bytes(apdu.data)
+        offset = 0
+        if not extended:
+            while len(data) - offset > _SHORT_APDU_MAX_LENGTH:
+                response = self._transmit(_encode_apdu(apdu.cla | _CLA_CHAINING, apdu.ins, apdu.p1, apdu.p2,
+                                                       data[offset:offset + _SHORT_APDU_MAX_LENGTH],
+                                                       apdu.le, apdu.force_add_le, False))
+                if response.sw != SW_OK:
+                    return response
+                offset += _SHORT_APDU_MAX_LENGTH
+        response = self._transmit(_encode_apdu(apdu.cla, apdu.ins, apdu.p1, apdu.p2, data[offset:],
+                                               apdu.le, apdu.force_add_le, extended))
+        if response.sw >> 8 != _SW1_HAS_MORE_DATA:
+            return response
+        chunks = []
+        while response.sw >> 8 == _SW1_HAS_MORE_DATA:
+            chunks.append(response.data)
+            response = self._transmit(self._get_response)
+        chunks.append(response.data)
+        return ApduResponse(b"".join(chunks), response.sw)
+
+    def _transmit(self, capdu: bytes) -> ApduResponse:
+        if _metrics.enabled:
+            rapdu = _metrics._transmit(self._connection.send_and_receive, capdu)
+        else:
+            rapdu = self._connection.send_and_receive(capdu)
+        if len(rapdu) < 2:
+            raise BadResponseError("Invalid APDU response data")
+        return ApduResponse(bytes(rapdu[:-2]), (rapdu[-2] << 8) | rapdu[-1])
+
+
+class _ScpProcessor:
+    """Secure messaging processor: C-DECRYPTION and C-MAC for commands, R-MAC and R-ENCRYPTION for responses"""
+
+    def __init__(self, transport: _ApduTransport, state: ScpState, extended_supported: bool) -> None:
+        self._transport = transport
+        self._state = state
+        self._extended_supported = extended_supported
+
+    def send_apdu(self, apdu: Apdu, encrypt: bool = True) -> ApduResponse:
+        if _metrics.enabled:
+            started = _metrics._start()
+            try:
+                return self._send_apdu(apdu, encrypt)
+            finally:
+                _metrics._stop(PHASE_SECURE_MESSAGING, started)
+        return self._send_apdu(apdu, encrypt)
+
+    def _send_apdu(self, apdu: Apdu, encrypt: bool) -> ApduResponse:
+        mac_size = self._state.mac_size
+        extended = _secured_apdu_extended(apdu, mac_size, encrypt, self._extended_supported)
+        data = bytes(apdu.data)
+        if encrypt:
+            data = self._state.encrypt(data)
+        cla = apdu.cla | _CLA_SECURE_MESSAGING
+
+        mac_input = _encode_apdu(cla, apdu.ins, apdu.p1, apdu.p2, data + bytes(mac_size), 0, False, extended)
+        data += self._state.mac(mac_input[:-mac_size])
+
+        response = self._transport.send_apdu(Apdu(cla, apdu.ins, apdu.p1, apdu.p2, data, apdu.le), extended)
+        response_data = response.data
+        if response_data:
+            response_data = self._state.unmac(response_data, response.sw)
+        if response_data:
+            response_data = self._state.decrypt(response_data)
+        return ApduResponse(response_data, response.sw)
+
+
+class NativeSession:
+    """SCP03 and SCP11 session implemented in Python on top of the ``cryptography`` package"""
+
+    def __init__(self, connection: openscp.connection.SmartCardConnection) -> None:
+        """
+        :param connection: :class:`openscp.SmartCardConnection` interface implementation
+        """
+        self._connection = connection
+        self._transport = _ApduTransport(connection)
+        self._scp_processor: Optional[_ScpProcessor] = None
+
+    def get_certificate_bundle(self, sd_key_id: int, sd_key_version: int) -> List[ScpCertificate]:
+        key_ref = encode_tlv(_TAG_CONTROL_REFERENCE, encode_tlv(_TAG_KEY_IDENTIFICATION,
+                                                                bytes([sd_key_id, sd_key_version])))
+        try:
+            response = self.send_and_receive(Apdu(0x00, _INS_GET_DATA, _TAG_CERTIFICATE_STORE >> 8,
+                                                  _TAG_CERTIFICATE_STORE & 0xFF, key_ref, 0x00, True))
+        except ApduError as e:
+            if e.sw == _SW_REFERENCE_NOT_FOUND:
+                return []
+            raise
+        certificates = unpack_tlv_value(_TAG_CERTIFICATE_STORE, response)
+        return [_parse_certificate(encoded) for _, _, encoded in decode_tlv_list(certificates)]
+
+    def send_and_receive(self, capdu: Apdu) -> bytes:
+        response = self._send_apdu(capdu)
+        if response.sw != SW_OK:
+            raise ApduError(response.sw)
+        return response.data
+
+    def exchange(self, capdus: Iterable[Apdu]) -> Generator[Tuple[Apdu, bytes, int], None, None]:
+        for capdu in capdus:
+            response = self._send_apdu(capdu)
+            # Same as the Java backend, which doesn't return data of failed commands
+            yield capdu, response.data if response.sw == SW_OK else b"", response.sw
+
+    def _send_apdu(self, capdu: Apdu) -> ApduResponse:
+        if self._scp_processor:
+            return self._scp_processor.send_apdu(capdu)
+        return self._transport.send_apdu(capdu)
+
+    def _authenticate_scp03(self,
+                            key_set: Scp03KeySet,
+                            scp_mode: openscp.scp_mode.ScpMode,
+                            host_challenge: Optional[bytes] = None) -> None:
+        # Key identifier isn't sent: INITIALIZE UPDATE always uses the key set selected by key version
+        self._scp_processor = None
+        try:
+            state, host_cryptogram = scp03_init(self._transport.send_apdu, key_set.key_version, key_set.enc_key,
+                                                key_set.mac_key, key_set.dek_key or None, scp_mode, host_challenge)
+        except ApduError as e:
+            if e.sw == _SW_INS_NOT_SUPPORTED:
+                raise ScpError("This smart card does not support secure messaging") from e
+            raise
+        processor = _ScpProcessor(self._transport, state, self._connection.is_extended_length_apdu_supported())
+        response = processor.send_apdu(external_authenticate_apdu(host_cryptogram), encrypt=False)
+        if response.sw != SW_OK:
+            raise ApduError(response.sw)
+        self._scp_processor = processor
+
+    def _authenticate_scp11(self,
+                            credentials: Scp11Credentials,
+                            scp_mode: openscp.scp_mode.ScpMode,
+                            epk_oce_ecka_bytes: Optional[bytes] = None,
+                            esk_oce_ecka_bytes: Optional[bytes] = None) -> None:
+        self._scp_processor = None
+        pk_sd_ecka, sk_oce_ecka = credentials._prepare("native", lambda: _load_scp11_keys(credentials))
+        if epk_oce_ecka_bytes and esk_oce_ecka_bytes:  # API for testing
+            esk_oce_ecka = _load_ec_private_key(esk_oce_ecka_bytes)
+        else:
+            esk_oce_ecka = _take_ephemeral_key(credentials, pk_sd_ecka)
+        try:
+            state = scp11_init(self._transport.send_apdu, credentials.sd_key_id, credentials.sd_key_version,
+                               credentials.oce_key_id, credentials.oce_key_version, pk_sd_ecka,
+                               list(credentials.cert_chain_oce_ecka), sk_oce_ecka, credentials.session_keys_alg,
+                               scp_mode, esk_oce_ecka)
+        except ApduError as e:
+            if e.sw == _SW_INS_NOT_SUPPORTED:
+                raise ScpError("This smart card does not support secure messaging") from e
+            raise
+        self._scp_processor = _ScpProcessor(self._transport, state,
+                                            self._connection.is_extended_length_apdu_supported())
+
+
+def _take_ephemeral_key(credentials: Scp11Credentials,
+                        pk_sd_ecka: ec.EllipticCurvePublicKey) -> Optional[ec.EllipticCurvePrivateKey]:
+    pool = get_ephemeral_key_pool()
+    if not pool.capacity:
+        return None
+    curve = credentials._prepare("curve", lambda: _curve(credentials.pk_sd_ecka_bytes))
+    if curve is None:
+        return None
+    return pool._take(("native", curve), functools.partial(ec.generate_private_key, pk_sd_ecka.curve))
+
+
+def _load_scp11_keys(
+        credentials: Scp11Credentials) -> Tuple[ec.EllipticCurvePublicKey, Optional[ec.EllipticCurvePrivateKey]]:
+    pk_sd_ecka = serialization.load_der_public_key(credentials.pk_sd_ecka_bytes)
+    if not isinstance(pk_sd_ecka, ec.EllipticCurvePublicKey):
+        raise ValueError("PK.SD.ECKA must be an EC public key")
+    sk_oce_ecka = _load_ec_private_key(credentials.sk_oce_ecka_bytes) if credentials.sk_oce_ecka_bytes else None
+    return pk_sd_ecka, sk_oce_ecka
+
+
+def _load_ec_private_key(key_bytes: bytes) -> ec.EllipticCurvePrivateKey:
+    private_key = serialization.load_der_private_key(bytes(key_bytes), password=None)
+    if not isinstance(private_key, ec.EllipticCurvePrivateKey):
+        raise ValueError("SCP11 requires EC private keys")
+    return private_key
+
+
+def _parse_certificate(encoded: bytes) -> ScpCertificate:
+    if encoded[:2] == _TAG_GP_CERTIFICATE.to_bytes(2, "big"):
+        public_key = _parse_gp_certificate_public_key(encoded)
+    else:
+        public_key = x509.load_der_x509_certificate(encoded).public_key()
+    return ScpCertificate(encoded, public_key.public_bytes(serialization.Encoding.DER,
+                                                           serialization.PublicFormat.SubjectPublicKeyInfo))
+
+
+def _parse_gp_certificate_public_key(encoded: bytes) -> ec.EllipticCurvePublicKey:
+    fields = {tag: value for tag, value, _ in decode_tlv_list(unpack_tlv_value(_TAG_GP_CERTIFICATE, encoded))}
+    if _TAG_GP_PUBLIC_KEY not in fields:
+        raise BadResponseError("Public key is absent")
+    public_key = {tag: value for tag, value, _ in decode_tlv_list(fields[_TAG_GP_PUBLIC_KEY])}
+    if _TAG_GP_PUBLIC_KEY_Q not in public_key:
+        raise BadResponseError("Public key Q value is absent")
+    if _TAG_GP_KEY_PARAMETER_REFERENCE not in public_key:
+        raise BadResponseError("Key Parameter Reference is absent")
+    key_parameter_reference = public_key[_TAG_GP_KEY_PARAMETER_REFERENCE]
+    curve = _GP_KEY_PARAMETER_CURVES.get(key_parameter_reference[0] if key_parameter_reference else -1)
+    if curve is None:
+        raise BadResponseError("Unsupported Key Parameter Reference")
+    return ec.EllipticCurvePublicKey.from_encoded_point(curve(), public_key[_TAG_GP_PUBLIC_KEY_Q])
@@ -0,0 +1,203 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import openscp.connection
+from openscp.connection import TransportStats, _TransportCounters
+
+try:
+    from smartcard import scard
+except ImportError:  # Optional dependency, required once readers are opened
+    scard = None
+
+
+class PcscReaders:
+    """
+    PC/SC readers of the host through one PC/SC context, established once and kept for the lifetime of the object.
+    Card handles are kept open too: :meth:`connect` hands out the connection of a reader, and closing that connection
+    gives it back instead of disconnecting the card, so that the next session of the reader doesn't wait for
+    SCardConnect and the card isn't reset. Requires the ``pyscard`` package.
+    """
+
+    def __init__(self,
+                 share_mode: Optional[int] = None,
+                 protocols: Optional[int] = None,
+                 extended_length: bool = False) -> None:
+        """
+        :param share_mode: ``smartcard.scard.SCARD_SHARE_*``, shared by default. ``SCARD_SHARE_EXCLUSIVE`` keeps other
+                           applications from sending commands between the ones of a secure channel.
+        :param protocols: acceptable protocols, ``smartcard.scard.SCARD_PROTOCOL_*`` flags, T=0 or T=1 by default
+        :param extended_length: do the readers and cards support extended length APDUs, PC/SC doesn't tell
+
+        :raises: ImportError if ``pyscard`` isn't installed, ConnectionError if the PC/SC service isn't available
+        """
+        if scard is None:
+            raise ImportError("PcscReaders requires the pyscard package")
+        self._share_mode = scard.SCARD_SHARE_SHARED if share_mode is None else share_mode
+        self._protocols = scard.SCARD_PROTOCOL_T0 | scard.SCARD_PROTOCOL_T1 if protocols is None else protocols
+        self._extended_length = extended_length
+        hresult, self._context = scard.SCardEstablishContext(scard.SCARD_SCOPE_USER)
+        _check(hresult, "SCardEstablishContext")
+        self._lock = threading.Lock()
+        self._connections: Dict[str, PcscConnection] = {}
+        self._closed = False
+
+    def list_readers(self) -> List[str]:
+        """
+        :return: names of the readers attached to the host
+        """
+        hresult, readers = scard.SCardListReaders(self._context, [])
+        if hresult == scard.SCARD_E_NO_READERS_AVAILABLE:
+            return []
+        _check(hresult, "SCardListReaders")
+        return list(readers)
+
+    def connect(self, reader: Optional[str] = None) -> "PcscConnection":
+        """
+        :param reader: reader name, the first reader of :meth:`list_readers` if absent
+        :return: connection to the card in the reader, for exclusive use until its ``close_connection``
+
+        :raises: ConnectionError if there is no reader or card, or the connection of the reader is in use
+        """
+        if reader is None:
+            readers = self.list_readers()
+            if not readers:
+                raise ConnectionError("No PC/SC reader available")
+            reader = readers[0]
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Readers are closed")
+            connection = self._connections.get(reader)
+            if connection is None:
+                connection = self._connections[reader] = PcscConnection(self, reader)
+            elif connection._in_use:
+                raise ConnectionError(f"Connection to {reader} is in use")
+            connection._in_use = True
+        try:
+            connection._ensure_card()
+        except BaseException:
+            connection.close_connection()
+            raise
+        return connection
+
+    def stats(self) -> Dict[str, TransportStats]:
+        """
+        :return: counters of the exchanges by reader name
+        """
+        with self._lock:
+            connections = dict(self._connections)
+        return {reader: connection.stats() for reader, connection in connections.items()}
+
+    def close(self) -> None:
+        """
+        Disconnect all cards, leaving them powered, and release the PC/SC context
+
+        :return: None
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            connections = list(self._connections.values())
+        for connection in connections:
+            connection._disconnect()
+        scard.SCardReleaseContext(self._context)
+
+    def __enter__(self) -> "PcscReaders":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class PcscConnection(openscp.connection.SmartCardConnection):
+    """
+    Connection to the card of a PC/SC reader, handed out by :meth:`PcscReaders.connect`. If the card was reset or
+    removed, the exchange fails, as the secure channel is lost, and the card is connected again before the next one.
+    Cards using T=0 answer some commands with SW 61XX, wrap the connection in :class:`openscp.GetResponseConnection`
+    for them. Not thread-safe, like a card.
+    """
+
+    def __init__(self, readers: PcscReaders, reader: str) -> None:
+        """
+        :param readers: readers the connection belongs to
+        :param reader: reader name
+        """
+        self._readers = readers
+        self._reader = reader
+        self._card: Optional[Any] = None
+        self._pci: Any = None
+        self._counters = _TransportCounters()
+        self._in_use = False
+
+    @property
+    def reader(self) -> str:
+        """reader name"""
+        return self._reader
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        self._ensure_card()
+        start = time.perf_counter()
+        hresult, response = scard.SCardTransmit(self._card, self._pci, list(apdu))
+        if hresult != scard.SCARD_S_SUCCESS:
+            self._counters.record_error(len(apdu))
+            # The card was reset or removed, or its handle is stale: it is connected again before the next exchange
+            if hresult in (scard.SCARD_W_RESET_CARD, scard.SCARD_W_REMOVED_CARD, scard.SCARD_E_NO_SMARTCARD,
+                           scard.SCARD_E_INVALID_HANDLE):
+                self._disconnect()
+            raise ConnectionError(_error_message(hresult, "SCardTransmit"))
+        response = bytes(response)
+        self._counters.record(start, len(apdu), len(response))
+        return response
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._readers._extended_length
+
+    def close_connection(self) -> None:
+        # The card handle is kept for the next connect() of the reader
+        with self._readers._lock:
+            self._in_use = False
+
+    def stats(self) -> TransportStats:
+        """
+        :return: counters of the exchanges with the reader, across all the sessions which used it
+        """
+        return self._counters.stats()
+
+    def _ensure_card(self) -> None:
+        if self._card is not None:
+            return
+        hresult, card, protocol = scard.SCardConnect(self._readers._context, self._reader, self._readers._share_mode,
+                                                     self._readers._protocols)
+        _check(hresult, "SCardConnect")
+        self._card = card
+        self._pci = {scard.SCARD_PROTOCOL_T0: scard.SCARD_PCI_T0, scard.SCARD_PROTOCOL_T1: scard.SCARD_PCI_T1,
+                     scard.SCARD_PROTOCOL_RAW: scard.SCARD_PCI_RAW}[protocol]
+
+    def _disconnect(self) -> None:
+        card, self._card = self._card, None
+        if card is not None:
+            scard.SCardDisconnect(card, scard.SCARD_LEAVE_CARD)
+
+
+def _check(hresult: int, function: str) -> None:
+    if hresult != scard.SCARD_S_SUCCESS:
+        raise ConnectionError(_error_message(hresult, function))
+
+
+def _error_message(hresult: int, function: str) -> str:
+    return f"{function} failed: {scard.SCardGetErrorMessage(hresult)}"
@@ -0,0 +1,368 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, NamedTuple, Optional, TypeVar
+
+from openscp.backend import Backend
+from openscp.connection import SmartCardConnection
+from openscp.exceptions import _status_word
+from openscp.session import SecurityDomainSession
+
+T = TypeVar("T")
+
+# Creates the connection to the card identified by a pool key
+ConnectionFactory = Callable[[Hashable], SmartCardConnection]
+
+# Authenticates a freshly created session, e.g. calls authenticate_scp03 with the card's keys
+Authenticator = Callable[[SecurityDomainSession], None]
+
+
+class PoolMetrics(NamedTuple):
+    """Snapshot of :class:`SessionPool` counters"""
+
+    sessions: int
+    """sessions owned by the pool, authenticated or being authenticated"""
+
+    active_leases: int
+    """sessions currently leased"""
+
+    leases: int
+    """leases granted since the pool creation"""
+
+    handshakes: int
+    """successful authentications since the pool creation"""
+
+    handshake_failures: int
+    """failed authentications since the pool creation"""
+
+    handshakes_per_second: float
+    """successful authentications per second of the pool lifetime"""
+
+    average_handshake_time: float
+    """seconds, average duration of a successful authentication"""
+
+    average_queue_wait: float
+    """seconds, average time from a lease request or a job submission until the lease is granted"""
+
+    max_queue_wait: float
+    """seconds, longest time from a lease request or a job submission until the lease is granted"""
+
+    evictions: int
+    """sessions dropped as broken, idle or on request"""
+
+
+class _Entry:
+    __slots__ = ("key", "connection", "session", "leased", "evict", "last_used")
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+        self.connection: Optional[SmartCardConnection] = None
+        self.session: Optional[SecurityDomainSession] = None
+        self.leased = False
+        self.evict = False
+        self.last_used = time.monotonic()
+
+
+class SessionLease:
+    """Exclusive use of an authenticated pooled session until :meth:`release`"""
+
+    def __init__(self, pool: "SessionPool", entry: _Entry) -> None:
+        self._pool = pool
+        self._entry = entry
+        self._broken = False
+        self._released = False
+
+    @property
+    def key(self) -> Hashable:
+        """pool key of the session"""
+        return self._entry.key
+
+    @property
+    def session(self) -> SecurityDomainSession:
+        """authenticated session"""
+        if self._released:
+            raise RuntimeError("Lease is released")
+        return self._entry.session
+
+    def invalidate(self) -> None:
+        """
+        Mark the session as broken, it will be evicted on release instead of being reused
+
+        :return: None
+        """
+        self._broken = True
+
+    def release(self) -> None:
+        """
+        Return the session to the pool. Does nothing if already released.
+
+        :return: None
+        """
+        if not self._released:
+            self._released = True
+            self._pool._release(self._entry, self._broken)
+
+    def __enter__(self) -> SecurityDomainSession:
+        return self.session
+
+    def __exit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        if exc is not None and not self._pool._is_status_word_error(exc):
+            self._broken = True
+        self.release()
+
+
+class SessionPool:
+    """
+    Authenticated sessions to many cards, keyed by reader or card ID.
+
+    A session is created and authenticated on its first lease and reused by later ones. A session is leased to one
+    thread at a time, while sessions of different keys are used concurrently, including JPype-backed ones. A session
+    whose lease ended with an exception other than an error status word from the card is closed, as its secure
+    channel state is unknown.
+    """
+
+    def __init__(self,
+                 connection_factory: ConnectionFactory,
+                 authenticator: Authenticator,
+                 backend: Backend = Backend.JAVA,
+                 max_workers: int = 8,
+                 idle_timeout: Optional[float] = None) -> None:
+        """
+        :param connection_factory: creates the connection to the card with the given key
+        :param authenticator: authenticates a new session
+        :param backend: SCP implementation to use
+        :param max_workers: number of threads running jobs and authentications submitted to the pool
+        :param idle_timeout: seconds, sessions not leased for longer are closed. Never if absent.
+        """
+        self._connection_factory = connection_factory
+        self._authenticator = authenticator
+        self._backend = backend
+        self._idle_timeout = idle_timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                               thread_name_prefix="openscp-pool")
+        self._condition = threading.Condition()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._closed = False
+        self._created = time.monotonic()
+        self._active_leases = 0
+        self._leases = 0
+        self._handshakes = 0
+        self._handshake_failures = 0
+        self._handshake_time = 0.0
+        self._queue_wait = 0.0
+        self._max_queue_wait = 0.0
+        self._evictions = 0
+
+    def lease(self, key: Hashable, timeout: Optional[float] = None) -> SessionLease:
+        """
+        Lease the session of a card, creating and authenticating it if needed. Blocks while the session is leased.
+
+        :param key: reader or card ID passed to the connection factory
+        :param timeout: seconds to wait for the session, forever if absent
+        :return: lease to use as a context manager or to release explicitly
+
+        :raises: TimeoutError if the session is still leased after timeout, RuntimeError if the pool is closed,
+                 exceptions of the connection factory and the authenticator
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Session pool is closed")
+        return self._lease(key, timeout, time.monotonic())
+
+    def submit(self, key: Hashable, job: Callable[[SecurityDomainSession], T]) -> "concurrent.futures.Future[T]":
+        """
+        Run a job with the leased session of a card on the pool threads
+
+        :param key: reader or card ID passed to the connection factory
+        :param job: called with the authenticated session
+        :return: future of the job result
+
+        :raises: RuntimeError if the pool is closed
+        """
+        submitted = time.monotonic()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Session pool is closed")
+            return self._executor.submit(self._run, key, job, submitted)
+
+    def authenticate(self, keys: Iterable[Hashable]) -> Dict[Hashable, "concurrent.futures.Future[None]"]:
+        """
+        Authenticate sessions of several cards concurrently on the pool threads, so that later leases reuse them
+
+        :param keys: reader or card IDs
+        :return: future per key, completes once the session is authenticated
+        """
+        return {key: self.submit(key, _nothing) for key in keys}
+
+    def evict(self, key: Hashable) -> None:
+        """
+        Close the session of a card. A leased session is closed on release.
+
+        :param key: reader or card ID
+        :return: None
+        """
+        with self._condition:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            if entry.leased:
+                entry.evict = True
+                return
+            self._remove(entry)
+        self._close(entry)
+
+    def evict_idle(self) -> int:
+        """
+        Close sessions which were not leased for longer than the idle timeout. Also done on every release.
+
+        :return: number of closed sessions
+        """
+        if self._idle_timeout is None:
+            return 0
+        deadline = time.monotonic() - self._idle_timeout
+        with self._condition:
+            idle = [entry for entry in self._entries.values() if not entry.leased and entry.last_used < deadline]
+            for entry in idle:
+                self._remove(entry)
+        for entry in idle:
+            self._close(entry)
+        return len(idle)
+
+    def metrics(self) -> PoolMetrics:
+        """
+        :return: current pool counters
+        """
+        with self._condition:
+            lifetime = time.monotonic() - self._created
+            return PoolMetrics(
+                sessions=len(self._entries),
+                active_leases=self._active_leases,
+                leases=self._leases,
+                handshakes=self._handshakes,
+                handshake_failures=self._handshake_failures,
+                handshakes_per_second=self._handshakes / lifetime if lifetime > 0 else 0.0,
+                average_handshake_time=self._handshake_time / self._handshakes if self._handshakes else 0.0,
+                average_queue_wait=self._queue_wait / self._leases if self._leases else 0.0,
+                max_queue_wait=self._max_queue_wait,
+                evictions=self._evictions
+            )
+
+    def close(self) -> None:
+        """
+        Wait for submitted jobs and close all sessions. Leased sessions are closed on release. New leases and jobs
+        are rejected, jobs submitted before still run.
+
+        :return: None
+        """
+        with self._condition:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        with self._condition:
+            idle = [entry for entry in self._entries.values() if not entry.leased]
+            for entry in idle:
+                self._remove(entry)
+            for entry in self._entries.values():
+                entry.evict = True
+        for entry in idle:
+            self._close(entry)
+
+    def __enter__(self) -> "SessionPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _run(self, key: Hashable, job: Callable[[SecurityDomainSession], T], submitted: float) -> T:
+        with self._lease(key, None, submitted) as session:
+            return job(session)
+
+    def _lease(self, key: Hashable, timeout: Optional[float], requested: float) -> SessionLease:
+        # Closing the pool rejects new leases only: jobs submitted before still lease their sessions
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = _Entry(key)
+                if not entry.leased:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Session {key!r} is leased")
+                self._condition.wait(remaining)
+            entry.leased = True
+            self._active_leases += 1
+            self._leases += 1
+            wait = time.monotonic() - requested
+            self._queue_wait += wait
+            self._max_queue_wait = max(self._max_queue_wait, wait)
+        if entry.session is None:
+            try:
+                self._handshake(entry)
+            except BaseException:
+                self._release(entry, broken=True)
+                raise
+        return SessionLease(self, entry)
+
+    def _handshake(self, entry: _Entry) -> None:
+        start = time.perf_counter()
+        try:
+            entry.connection = self._connection_factory(entry.key)
+            session = SecurityDomainSession(entry.connection, self._backend)
+            self._authenticator(session)
+        except BaseException:
+            with self._condition:
+                self._handshake_failures += 1
+            raise
+        duration = time.perf_counter() - start
+        entry.session = session
+        with self._condition:
+            self._handshakes += 1
+            self._handshake_time += duration
+
+    def _release(self, entry: _Entry, broken: bool) -> None:
+        with self._condition:
+            entry.leased = False
+            entry.last_used = time.monotonic()
+            self._active_leases -= 1
+            evict = broken or entry.evict
+            if evict:
+                self._remove(entry)
+            self._condition.notify_all()
+        if evict:
+            self._close(entry)
+        self.evict_idle()
+
+    def _remove(self, entry: _Entry) -> None:
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+            self._evictions += 1
+
+    @staticmethod
+    def _is_status_word_error(error: BaseException) -> bool:
+        return _status_word(error) is not None
+
+    @staticmethod
+    def _close(entry: _Entry) -> None:
+        entry.session = None
+        if entry.connection is not None:
+            entry.connection.close_connection()
+            entry.connection = None
+
+
+def _nothing(session: SecurityDomainSession) -> None:
+    pass
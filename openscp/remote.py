@@ -0,0 +1,441 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple, Union
+
+import openscp.connection
+from openscp.connection import TransportStats, _merge_transport_stats, _TransportCounters
+
+# Frames are a type byte, a 4-byte big-endian payload length and the payload. The server sends HELLO with the
+# extended length support flag once connected, then answers every COMMAND with a RESPONSE or an ERROR, in order.
+# Clients may send commands before the previous responses arrive.
+FRAME_HELLO = 0x01
+FRAME_COMMAND = 0x02
+FRAME_RESPONSE = 0x03
+FRAME_ERROR = 0x04
+
+DEFAULT_POOL_SIZE = 8
+
+# Host and port of a TCP server, or path of a Unix domain socket server
+Address = Union[Tuple[str, int], str]
+
+_HELLO_EXTENDED_LENGTH = 0x01
+_HEADER_SIZE = 5
+_MAX_PAYLOAD_SIZE = 0x10010
+
+
+class RemoteConnection(openscp.connection.SmartCardConnection):
+    """
+    Connection to a card served by :class:`ConnectionServer` over TCP or a Unix domain socket. The commands of
+    :meth:`transmit_many` are pipelined, so that a batch takes one round trip to the server instead of one per
+    command. Not thread-safe, like a card.
+    """
+
+    def __init__(self, address: Address, timeout: Optional[float] = None) -> None:
+        """
+        :param address: server host and port, or Unix domain socket path
+        :param timeout: seconds to wait for the connection and for every response, no limit if None
+
+        :raises: OSError if the server can't be reached
+        """
+        self._socket = _connect(address, timeout)
+        try:
+            frame_type, payload = _receive_frame(self._socket)
+            if frame_type != FRAME_HELLO or len(payload) != 1:
+                raise ConnectionError("Unexpected greeting from the server")
+        except BaseException:
+            self._socket.close()
+            raise
+        self._extended_length = bool(payload[0] & _HELLO_EXTENDED_LENGTH)
+        self._counters = _TransportCounters()
+        # Set by the pool the connection belongs to, closing the connection gives it back
+        self._pool: Optional["RemoteConnectionPool"] = None
+        self._broken = False
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        start = time.perf_counter()
+        self._send(_frame(FRAME_COMMAND, apdu), (apdu,))
+        return self._receive(apdu, start)
+
+    def transmit_many(self, apdus: Iterable[bytes]) -> List[bytes]:
+        """
+        Exchange plain APDUs pipelined: all commands are sent before the first response is awaited. The server still
+        sends every command to the card once the previous one is answered.
+
+        :param apdus: Command APDUs
+        :return: Response APDUs, in the order of the commands
+
+        :raises: ConnectionError for the first failed exchange, once the responses to the other commands are received
+        """
+        apdus = list(apdus)
+        start = time.perf_counter()
+        self._send(b"".join(_frame(FRAME_COMMAND, apdu) for apdu in apdus), apdus)
+        responses = []
+        error: Optional[ConnectionError] = None
+        for apdu in apdus:
+            try:
+                responses.append(self._receive(apdu, start))
+            except ConnectionError as e:
+                if self._broken:
+                    raise
+                # The server failed this command only, the responses to the following ones are still coming
+                error = error or e
+        if error is not None:
+            raise error
+        return responses
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._extended_length
+
+    def close_connection(self) -> None:
+        if self._pool is not None:
+            self._pool._release(self)
+        else:
+            self._socket.close()
+
+    def stats(self) -> TransportStats:
+        """
+        :return: counters of the exchanges, latencies of pipelined commands are measured from sending the batch
+        """
+        return self._counters.stats()
+
+    def _send(self, data: bytes, apdus: Iterable[bytes]) -> None:
+        try:
+            self._socket.sendall(data)
+        except OSError:
+            self._broken = True
+            for apdu in apdus:
+                self._counters.record_error(len(apdu))
+            raise
+
+    def _receive(self, apdu: bytes, start: float) -> bytes:
+        try:
+            frame_type, payload = _receive_frame(self._socket)
+        except OSError:
+            self._broken = True
+            self._counters.record_error(len(apdu))
+            raise
+        if frame_type == FRAME_RESPONSE:
+            self._counters.record(start, len(apdu), len(payload))
+            return payload
+        self._counters.record_error(len(apdu))
+        if frame_type == FRAME_ERROR:
+            raise ConnectionError(payload.decode("utf-8", "replace"))
+        self._broken = True
+        raise ConnectionError(f"Unexpected frame type {frame_type}")
+
+
+class RemoteConnectionPool:
+    """
+    Thread-safe pool of :class:`RemoteConnection` to one server. Connections are opened on demand, up to
+    ``max_size``, and kept open when given back, so that sessions don't wait for a new connection and the server
+    keeps the card connection it opened for it. A connection which failed in the transport is closed instead.
+    """
+
+    def __init__(self, address: Address, max_size: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = None) -> None:
+        """
+        :param address: server host and port, or Unix domain socket path
+        :param max_size: maximum number of open connections
+        :param timeout: see :class:`RemoteConnection`
+        """
+        self._address = address
+        self._max_size = max_size
+        self._timeout = timeout
+        self._condition = threading.Condition()
+        self._idle: Deque[RemoteConnection] = collections.deque()
+        self._connections: List[RemoteConnection] = []
+        self._opening = 0
+        self._closed = False
+        # Counters of the connections closed so far
+        self._retired = TransportStats(0, 0, 0.0, 0.0, 0.0, 0, 0)
+
+    def acquire(self, timeout: Optional[float] = None) -> RemoteConnection:
+        """
+        :param timeout: seconds to wait while ``max_size`` connections are in use, no limit if None
+        :return: connection for exclusive use, given back to the pool by its ``close_connection``
+
+        :raises: TimeoutError if no connection was given back in time, OSError if the server can't be reached
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._connections) + self._opening < self._max_size:
+                    self._opening += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No connection available")
+                self._condition.wait(remaining)
+        # Connecting is slow, other threads take idle connections meanwhile
+        try:
+            connection = RemoteConnection(self._address, self._timeout)
+        except BaseException:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+        connection._pool = self
+        with self._condition:
+            self._opening -= 1
+            self._connections.append(connection)
+        return connection
+
+    def stats(self) -> TransportStats:
+        """
+        :return: counters of the exchanges of all connections of the pool, including closed ones
+        """
+        with self._condition:
+            return _merge_transport_stats([self._retired] + [connection.stats() for connection in self._connections])
+
+    def close(self) -> None:
+        """
+        Close idle connections, connections in use are closed when given back
+
+        :return: None
+        """
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            for connection in idle:
+                self._retire(connection)
+            self._condition.notify_all()
+        for connection in idle:
+            connection._socket.close()
+
+    def __enter__(self) -> "RemoteConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _release(self, connection: RemoteConnection) -> None:
+        with self._condition:
+            if connection not in self._connections or connection in self._idle:
+                return
+            close = connection._broken or self._closed
+            if close:
+                self._retire(connection)
+            else:
+                self._idle.append(connection)
+            self._condition.notify()
+        if close:
+            connection._socket.close()
+
+    def _retire(self, connection: RemoteConnection) -> None:
+        self._connections.remove(connection)
+        self._retired = _merge_transport_stats([self._retired, connection.stats()])
+
+
+class ConnectionServer:
+    """
+    Serves connections over TCP or a Unix domain socket, one per client, e.g. an
+    :class:`openscp.emulator.SecurityDomainEmulator` for tests on another host or process, or a
+    :class:`openscp.PcscConnection` to drive a reader of another host. Clients use :class:`RemoteConnection`. Commands
+    are read while the card processes the previous ones, so that pipelined clients never block. The protocol has no
+    authentication, bind it to a loopback or otherwise trusted interface.
+    """
+
+    def __init__(self,
+                 connection_factory: Callable[[], openscp.connection.SmartCardConnection],
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 path: Optional[str] = None) -> None:
+        """
+        :param connection_factory: opens the connection served to a new client, closed when the client disconnects
+        :param host: interface to listen on
+        :param port: port to listen on, any free port if 0
+        :param path: Unix domain socket path to listen on instead of TCP, removed by :meth:`close`
+        """
+        self._path = path
+        self._server: Any
+        if path is None:
+            self._server = _ThreadingServer((host, port), _ConnectionHandler)
+        elif hasattr(socket, "AF_UNIX"):
+            self._server = _ThreadingUnixServer(path, _ConnectionHandler)
+        else:
+            raise OSError("Unix domain sockets aren't supported on this platform")
+        self._server.connection_factory = connection_factory
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        """host and port the server listens on, or the Unix domain socket path"""
+        if self._path is not None:
+            return self._path
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> "ConnectionServer":
+        """
+        Serve clients on a background thread
+
+        :return: self
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._server.serve_forever, name="openscp-connection-server",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serve clients on the calling thread until :meth:`close` is called from another thread
+
+        :return: None
+        """
+        self._server.serve_forever()
+
+    def close(self) -> None:
+        """
+        Stop serving and close the listening socket, connected clients are served until they disconnect
+
+        :return: None
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if self._path is not None:
+            _remove_socket_file(self._path)
+
+    def __enter__(self) -> "ConnectionServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    connection_factory: Callable[[], openscp.connection.SmartCardConnection]
+
+
+if hasattr(socket, "AF_UNIX"):  # Not on Windows
+    class _ThreadingUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        connection_factory: Callable[[], openscp.connection.SmartCardConnection]
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Serves one client: relays its commands to a connection of its own"""
+
+    server: "Union[_ThreadingServer, _ThreadingUnixServer]"
+
+    def handle(self) -> None:
+        sock = self.request
+        if sock.family != getattr(socket, "AF_UNIX", None):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = self.server.connection_factory()
+        # Frames are read on a thread of their own, so that a pipelining client never waits for the card to send more
+        frames: "queue.SimpleQueue[Optional[Tuple[int, bytes]]]" = queue.SimpleQueue()
+        reader = threading.Thread(target=_read_frames, args=(sock, frames), name="openscp-connection-reader",
+                                  daemon=True)
+        try:
+            flags = _HELLO_EXTENDED_LENGTH if connection.is_extended_length_apdu_supported() else 0
+            _send_frame(sock, FRAME_HELLO, bytes([flags]))
+            reader.start()
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    return  # The client has disconnected
+                frame_type, payload = frame
+                if frame_type != FRAME_COMMAND:
+                    _send_frame(sock, FRAME_ERROR, f"Unexpected frame type {frame_type}".encode())
+                    return
+                try:
+                    response = connection.send_and_receive(payload)
+                except Exception as e:
+                    # The client sees a transport error, as with a local reader
+                    _send_frame(sock, FRAME_ERROR, f"{type(e).__name__}: {e}".encode())
+                    continue
+                _send_frame(sock, FRAME_RESPONSE, response)
+        except OSError:
+            pass  # The client has disconnected
+        finally:
+            connection.close_connection()
+
+
+def _read_frames(sock: socket.socket, frames: "queue.SimpleQueue[Optional[Tuple[int, bytes]]]") -> None:
+    try:
+        while True:
+            frame = _receive_frame(sock)
+            frames.put(frame)
+            if frame[0] != FRAME_COMMAND:
+                break
+    except OSError:
+        pass
+    frames.put(None)
+
+
+def _connect(address: Address, timeout: Optional[float]) -> socket.socket:
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+    sock = socket.create_connection(address, timeout)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _remove_socket_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _frame(frame_type: int, payload: bytes) -> bytes:
+    return bytes([frame_type]) + len(payload).to_bytes(4, "big") + payload
+
+
+def _send_frame(sock: socket.socket, frame_type: int, payload: bytes) -> None:
+    sock.sendall(_frame(frame_type, payload))
+
+
+def _receive_frame(sock: socket.socket) -> Tuple[int, bytes]:
+    header = _receive_exactly(sock, _HEADER_SIZE)
+    length = int.from_bytes(header[1:], "big")
+    if length > _MAX_PAYLOAD_SIZE:
+        raise ConnectionError("Frame is too long")
+    return header[0], _receive_exactly(sock, length)
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Connection closed by the peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
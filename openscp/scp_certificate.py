@@ -12,34 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Any
-
-from openscp.utils import _start_jvm_if_needed, _java_bytes_to_python_bytes
-
-_start_jvm_if_needed()
-import com.samsung.openscp
+import warnings
+from typing import Any, Optional
 
 
 class ScpCertificate:
     """SCP certificate class for SCP11 v1.4 usage"""
 
-    # certificate com.samsung.openscp.ScpCertificate
-    def __init__(self, certificate: Any) -> None:
+    def __init__(self, encoded: Any, public_key: Optional[bytes] = None) -> None:
         """
-        :param certificate: Java SCP certificate instance
+        :param encoded: encoded certificate bytes (X.509 or GlobalPlatform SCP11 certificate). A Java
+                        ``com.samsung.openscp.ScpCertificate`` instance, without public_key, is still accepted but
+                        deprecated.
+        :param public_key: encoded certificate public key bytes (X.509 SubjectPublicKeyInfo)
         """
-        self._certificate = certificate
+        if public_key is None:
+            warnings.warn("ScpCertificate(java_certificate) is deprecated, pass the encoded certificate and public key",
+                          DeprecationWarning, stacklevel=2)
+            from openscp.utils import _java_bytes_to_python_bytes
+            public_key = _java_bytes_to_python_bytes(encoded.getPublicKey().getEncoded())
+            encoded = _java_bytes_to_python_bytes(encoded.getEncoded())
+        self._encoded = encoded
+        self._public_key = public_key
 
     def get_public_key(self) -> bytes:
         """
         :return: certificate public key bytes
         """
-        public_key_bytes = self._certificate.getPublicKey().getEncoded()
-        return _java_bytes_to_python_bytes(public_key_bytes)
+        return self._public_key
 
     def get_encoded(self) -> bytes:
         """
         :return: encoded certificate bytes
         """
-        certificate_bytes = self._certificate.getEncoded()
-        return _java_bytes_to_python_bytes(certificate_bytes)
+        return self._encoded
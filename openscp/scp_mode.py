@@ -12,15 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from openscp.utils import _start_jvm_if_needed
 from enum import Enum
 
-_start_jvm_if_needed()
-import com.samsung.openscp
-
 
 class ScpMode(Enum):
     """SCP mode, which defines size of challenges, cryptograms and MACs"""
 
-    S8 = com.samsung.openscp.ScpMode.S8
-    S16 = com.samsung.openscp.ScpMode.S16
+    S8 = 8
+    S16 = 16
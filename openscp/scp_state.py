@@ -0,0 +1,370 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import hmac
+import os
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from cryptography.hazmat.primitives import cmac, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from openscp.aes_alg import AesAlg
+from openscp.apdu import Apdu
+from openscp.exceptions import ApduError, BadResponseError, ScpError
+from openscp.scp_mode import ScpMode
+from openscp.tlv import decode_tlv_list, encode_tlv, unpack_tlv_value
+
+SW_OK = 0x9000
+
+INS_INITIALIZE_UPDATE = 0x50
+INS_EXTERNAL_AUTHENTICATE = 0x82
+INS_MUTUAL_AUTHENTICATE = 0x82
+INS_INTERNAL_AUTHENTICATE = 0x88
+INS_PERFORM_SECURITY_OPERATION = 0x2A
+
+KID_SCP11A = 0x11
+KID_SCP11B = 0x13
+KID_SCP11C = 0x15
+
+# Derivation constants, GP Amendment D, 4.1.5
+_DERIVATION_CARD_CRYPTOGRAM = 0x00
+_DERIVATION_HOST_CRYPTOGRAM = 0x01
+_DERIVATION_S_ENC = 0x04
+_DERIVATION_S_MAC = 0x06
+_DERIVATION_S_RMAC = 0x07
+
+# Maximum security level: C-DECRYPTION, R-ENCRYPTION, C-MAC and R-MAC
+_SECURITY_LEVEL = 0x33
+_I_PARAMETER_R_MAC = 0x40
+_I_PARAMETER_R_ENCRYPTION = 0x20
+
+_SCP11_KEY_USAGE = b"\x3C"
+_SCP11_KEY_TYPE_AES = b"\x88"
+_SCP11_SESSION_KEYS_NUM = 5
+_SCP11_PARAMS = {KID_SCP11A: 0x01, KID_SCP11B: 0x00, KID_SCP11C: 0x03}
+
+
+class ApduResponse(NamedTuple):
+    """Response APDU split into the data field and the status word"""
+
+    data: bytes
+    sw: int
+
+
+# Sends a Command APDU through the underlying processor and returns the unprocessed response
+ApduSender = Callable[[Apdu], ApduResponse]
+
+
+class SessionKeys(NamedTuple):
+    """Secure channel session keys"""
+
+    senc: bytes
+    smac: bytes
+    srmac: bytes
+    dek: Optional[bytes]
+
+
+class ScpState:
+    """Secure messaging state of an established secure channel: session keys, MAC chaining value, counter"""
+
+    def __init__(self, keys: SessionKeys, mac_chain: bytes, scp_mode: ScpMode) -> None:
+        """
+        :param keys: session keys
+        :param mac_chain: initial MAC chaining value
+        :param scp_mode: SCP mode - S8 or S16
+        """
+        self._keys = keys
+        self._mac_chain = mac_chain
+        self._mac_size = scp_mode.value
+        self._enc_counter = 1
+
+    @property
+    def mac_size(self) -> int:
+        """Size of C-MAC and R-MAC in bytes"""
+        return self._mac_size
+
+    def encrypt(self, data: bytes) -> bytes:
+        """
+        C-DECRYPTION: pad and encrypt command data with the ICV derived from the encryption counter
+
+        :param data: plain command data
+        :return: encrypted command data
+        """
+        counter = self._enc_counter
+        self._enc_counter += 1
+        if not data:
+            return data
+        padded = bytes(data) + b"\x80" + bytes(15 - len(data) % 16)
+        icv = _aes_ecb(self._keys.senc, counter.to_bytes(16, "big"))
+        return _aes_cbc_encrypt(self._keys.senc, icv, padded)
+
+    def decrypt(self, encrypted: bytes) -> bytes:
+        """
+        R-ENCRYPTION: decrypt response data and remove padding
+
+        :param encrypted: encrypted response data
+        :return: plain response data
+
+        :raises: :class:`openscp.exceptions.BadResponseError` on wrong padding
+        """
+        icv = _aes_ecb(self._keys.senc, b"\x80" + (self._enc_counter - 1).to_bytes(15, "big"))
+        decrypted = _aes_cbc_decrypt(self._keys.senc, icv, encrypted)
+        unpadded = decrypted.rstrip(b"\x00")
+        if not unpadded or unpadded[-1] != 0x80:
+            raise BadResponseError("Bad padding")
+        return unpadded[:-1]
+
+    def mac(self, data: bytes) -> bytes:
+        """
+        C-MAC: update the MAC chaining value with the command
+
+        :param data: command header and data field without C-MAC
+        :return: C-MAC
+        """
+        self._mac_chain = _aes_cmac(self._keys.smac, self._mac_chain + data)
+        return self._mac_chain[:self._mac_size]
+
+    def unmac(self, data: bytes, sw: int) -> bytes:
+        """
+        R-MAC: verify response data
+
+        :param data: response data with R-MAC
+        :param sw: response status word
+        :return: response data without R-MAC
+
+        :raises: :class:`openscp.exceptions.BadResponseError` on R-MAC mismatch
+        """
+        message = data[:-self._mac_size]
+        rmac = _aes_cmac(self._keys.srmac, self._mac_chain + message + sw.to_bytes(2, "big"))[:self._mac_size]
+        if not hmac.compare_digest(rmac, data[-self._mac_size:]):
+            raise BadResponseError("Wrong MAC")
+        return message
+
+
+def derive_key(key: bytes, constant: int, context: bytes, length_bits: int) -> bytes:
+    """
+    SCP03 key derivation function: NIST SP 800-108 KDF in counter mode with AES-CMAC as PRF
+
+    :param key: derivation key
+    :param constant: derivation constant
+    :param context: derivation context
+    :param length_bits: length of derived data in bits
+    :return: derived data
+    """
+    length = length_bits // 8
+    derived = b""
+    counter = 1
+    while len(derived) < length:
+        derivation_data = bytes(11) + bytes([constant, 0x00]) + length_bits.to_bytes(2, "big") + \
+            bytes([counter]) + context
+        derived += _aes_cmac(key, derivation_data)
+        counter += 1
+    return derived[:length]
+
+
+def derive_session_keys(enc_key: bytes, mac_key: bytes, dek_key: Optional[bytes], context: bytes) -> SessionKeys:
+    """
+    :param enc_key: static secure channel encryption key
+    :param mac_key: static secure channel message authentication code key
+    :param dek_key: static data encryption key
+    :param context: host challenge followed by card challenge
+    :return: SCP03 session keys
+    """
+    length_bits = len(enc_key) * 8
+    return SessionKeys(derive_key(enc_key, _DERIVATION_S_ENC, context, length_bits),
+                       derive_key(mac_key, _DERIVATION_S_MAC, context, length_bits),
+                       derive_key(mac_key, _DERIVATION_S_RMAC, context, length_bits),
+                       dek_key)
+
+
+def scp03_init(send_apdu: ApduSender,
+               key_version: int,
+               enc_key: bytes,
+               mac_key: bytes,
+               dek_key: Optional[bytes],
+               scp_mode: ScpMode,
+               host_challenge: Optional[bytes] = None) -> Tuple[ScpState, bytes]:
+    """
+    Execute INITIALIZE UPDATE and verify the card cryptogram
+
+    :param send_apdu: plain APDU processor
+    :param key_version: SCP key version number
+    :param enc_key: static secure channel encryption key
+    :param mac_key: static secure channel message authentication code key
+    :param dek_key: static data encryption key
+    :param scp_mode: SCP mode - S8 or S16
+    :param host_challenge: fixed host challenge, random one is generated if absent
+    :return: secure channel state and host cryptogram for EXTERNAL AUTHENTICATE
+    """
+    blob_size = scp_mode.value
+    if not host_challenge:
+        host_challenge = os.urandom(blob_size)
+    response = send_apdu(Apdu(0x80, INS_INITIALIZE_UPDATE, key_version, 0x00, host_challenge, 0x00, True))
+    if response.sw != SW_OK:
+        raise ApduError(response.sw)
+    if len(response.data) < 13 + 2 * blob_size:
+        raise BadResponseError("INITIALIZE UPDATE response is too short")
+    key_information = response.data[10:13]
+    _check_card_security_level(key_information[2])
+    card_challenge = response.data[13:13 + blob_size]
+    card_cryptogram = response.data[13 + blob_size:13 + 2 * blob_size]
+
+    context = bytes(host_challenge) + card_challenge
+    session_keys = derive_session_keys(enc_key, mac_key, dek_key, context)
+    derived_data_bits = blob_size * 8
+    expected_card_cryptogram = derive_key(session_keys.smac, _DERIVATION_CARD_CRYPTOGRAM, context, derived_data_bits)
+    if not hmac.compare_digest(expected_card_cryptogram, card_cryptogram):
+        raise BadResponseError("Wrong SCP03 key set")
+    host_cryptogram = derive_key(session_keys.smac, _DERIVATION_HOST_CRYPTOGRAM, context, derived_data_bits)
+    return ScpState(session_keys, bytes(16), scp_mode), host_cryptogram
+
+
+def external_authenticate_apdu(host_cryptogram: bytes) -> Apdu:
+    """
+    :param host_cryptogram: host cryptogram returned by :func:`scp03_init`
+    :return: EXTERNAL AUTHENTICATE command requesting the maximum security level
+    """
+    return Apdu(0x84, INS_EXTERNAL_AUTHENTICATE, _SECURITY_LEVEL, 0x00, host_cryptogram)
+
+
+def scp11_init(send_apdu: ApduSender,
+               sd_key_id: int,
+               sd_key_version: int,
+               oce_key_id: int,
+               oce_key_version: int,
+               pk_sd_ecka: ec.EllipticCurvePublicKey,
+               cert_chain_oce_ecka: List[bytes],
+               sk_oce_ecka: Optional[ec.EllipticCurvePrivateKey],
+               session_keys_alg: AesAlg,
+               scp_mode: ScpMode,
+               esk_oce_ecka: Optional[ec.EllipticCurvePrivateKey] = None) -> ScpState:
+    """
+    Execute PERFORM SECURITY OPERATION for every OCE certificate (SCP11a/c) and MUTUAL AUTHENTICATE
+    (INTERNAL AUTHENTICATE for SCP11b), then derive session keys and verify the receipt
+
+    :param send_apdu: plain APDU processor
+    :param sd_key_id: security domain SCP key identifier of associated SK.SD.ECKA
+    :param sd_key_version: security domain SCP key version number of associated SK.SD.ECKA
+    :param oce_key_id: off-card entity SCP key identifier of associated SK.OCE.ECKA
+    :param oce_key_version: off-card entity SCP key version number of associated SK.OCE.ECKA
+    :param pk_sd_ecka: public key of the SD used for key agreement (PK.SD.ECKA)
+    :param cert_chain_oce_ecka: encoded OCE certificate chain (CERT.OCE.ECKA is the last one)
+    :param sk_oce_ecka: private key of the OCE used for key agreement (SK.OCE.ECKA), absent for SCP11b
+    :param session_keys_alg: AES algorithm for session keys that will be generated
+    :param scp_mode: SCP mode - S8 or S16
+    :param esk_oce_ecka: fixed ephemeral OCE private key, random one is generated if absent
+    :return: secure channel state
+    """
+    if sd_key_id not in _SCP11_PARAMS:
+        raise ValueError("KID must be 0x11, 0x13, or 0x15 for SCP11")
+    if sd_key_id == KID_SCP11B:
+        if sk_oce_ecka is not None or cert_chain_oce_ecka:
+            raise ValueError("Cannot provide skOceEcka or certificates for SCP11b")
+    else:
+        if sk_oce_ecka is None or not cert_chain_oce_ecka:
+            raise ValueError("Must provide skOceEcka and certificates for SCP11a/c")
+        last = len(cert_chain_oce_ecka) - 1
+        for i, certificate in enumerate(cert_chain_oce_ecka):
+            p2 = oce_key_id | (0x80 if i < last else 0x00)
+            response = _send_perform_security_operation(
+                send_apdu, Apdu(0x80, INS_PERFORM_SECURITY_OPERATION, oce_key_version, p2, certificate, 0x00, True))
+            if response.sw != SW_OK:
+                raise ApduError(response.sw)
+
+    key_size = session_keys_alg.value
+    key_length = bytes([key_size])
+    if esk_oce_ecka is None:
+        esk_oce_ecka = ec.generate_private_key(pk_sd_ecka.curve)
+    epk_oce_ecka_point = esk_oce_ecka.public_key().public_bytes(serialization.Encoding.X962,
+                                                                serialization.PublicFormat.UncompressedPoint)
+    control_reference_template = encode_tlv(0x90, bytes([0x11, _SCP11_PARAMS[sd_key_id]])) + \
+        encode_tlv(0x95, _SCP11_KEY_USAGE) + \
+        encode_tlv(0x80, _SCP11_KEY_TYPE_AES) + \
+        encode_tlv(0x81, key_length)
+    data = encode_tlv(0xA6, control_reference_template) + encode_tlv(0x5F49, epk_oce_ecka_point)
+
+    ins = INS_INTERNAL_AUTHENTICATE if sd_key_id == KID_SCP11B else INS_MUTUAL_AUTHENTICATE
+    response = send_apdu(Apdu(0x80, ins, sd_key_version, sd_key_id, data, 0x00, True))
+    if response.sw != SW_OK:
+        raise ApduError(response.sw)
+    objects = decode_tlv_list(response.data)
+    if len(objects) < 2:
+        raise BadResponseError("Authentication response is incomplete")
+    epk_sd_ecka_tlv = objects[0][2]
+    epk_sd_ecka_point = unpack_tlv_value(0x5F49, epk_sd_ecka_tlv)
+    receipt = unpack_tlv_value(0x86, objects[1][2])
+    key_agreement_data = data + epk_sd_ecka_tlv
+    shared_info = _SCP11_KEY_USAGE + _SCP11_KEY_TYPE_AES + key_length
+
+    epk_sd_ecka = ec.EllipticCurvePublicKey.from_encoded_point(pk_sd_ecka.curve, epk_sd_ecka_point)
+    static_private_key = sk_oce_ecka if sk_oce_ecka is not None else esk_oce_ecka
+    key_material = esk_oce_ecka.exchange(ec.ECDH(), epk_sd_ecka) + static_private_key.exchange(ec.ECDH(), pk_sd_ecka)
+    keys = _x963_kdf(key_material, shared_info, key_size * _SCP11_SESSION_KEYS_NUM)
+    session_keys = [keys[i * key_size:(i + 1) * key_size] for i in range(_SCP11_SESSION_KEYS_NUM)]
+
+    if not hmac.compare_digest(_aes_cmac(session_keys[0], key_agreement_data), receipt):
+        raise BadResponseError("Receipt does not match")
+    return ScpState(SessionKeys(*session_keys[1:]), receipt, scp_mode)
+
+
+def _send_perform_security_operation(send_apdu: ApduSender, apdu: Apdu) -> ApduResponse:
+    # PSO data is chained manually: P1 b8 marks a non-final block in addition to the chaining CLA bit
+    data = apdu.data
+    chunk_size = 0xFF
+    offset = 0
+    while len(data) - offset > chunk_size:
+        response = send_apdu(Apdu(apdu.cla | 0x10, apdu.ins, apdu.p1 | 0x80, apdu.p2,
+                                  data[offset:offset + chunk_size], apdu.le, apdu.force_add_le))
+        if response.sw != SW_OK:
+            return response
+        offset += chunk_size
+    return send_apdu(Apdu(apdu.cla, apdu.ins, apdu.p1, apdu.p2, data[offset:], apdu.le, apdu.force_add_le))
+
+
+def _check_card_security_level(i_parameter: int) -> None:
+    if not (i_parameter & _I_PARAMETER_R_MAC and i_parameter & _I_PARAMETER_R_ENCRYPTION):
+        raise ScpError("Only maximum security level is supported: C-DECRYPTION, R-ENCRYPTION, C-MAC, and R-MAC. "
+                       "Card doesn't support R-MAC or R-ENCRYPTION")
+
+
+def _x963_kdf(shared_secret: bytes, shared_info: bytes, length: int) -> bytes:
+    output = b""
+    counter = 1
+    while len(output) < length:
+        output += hashlib.sha256(shared_secret + counter.to_bytes(4, "big") + shared_info).digest()
+        counter += 1
+    return output[:length]
+
+
+def _aes_cmac(key: bytes, data: bytes) -> bytes:
+    c = cmac.CMAC(algorithms.AES(key))
+    c.update(data)
+    return c.finalize()
+
+
+def _aes_ecb(key: bytes, block: bytes) -> bytes:
+    encryptor = Cipher(algorithms.AES(key), modes.ECB()).encryptor()
+    return encryptor.update(block) + encryptor.finalize()
+
+
+def _aes_cbc_encrypt(key: bytes, iv: bytes, data: bytes) -> bytes:
+    encryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+    return encryptor.update(data) + encryptor.finalize()
+
+
+def _aes_cbc_decrypt(key: bytes, iv: bytes, data: bytes) -> bytes:
+    decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+    return decryptor.update(data) + decryptor.finalize()
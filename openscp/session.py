@@ -12,32 +12,110 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Any, Optional
+import contextlib
+import functools
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Optional, TypeVar, Union, cast, overload
 
 import openscp.connection
 import openscp.scp_mode
+from openscp.backend import Backend
+from openscp.batch import CommandResult, ErrorPolicy, stream_results
+from openscp.certificate_cache import CardId, CertificateCache
+from openscp.concurrency import Concurrency, _SessionThread
+from openscp.credentials import Scp03KeySet, Scp11Credentials
+from openscp.exceptions import _is_bad_response, _status_word
+from openscp.metrics import get_metrics
 from openscp.scp_certificate import ScpCertificate
+from openscp.streaming import Chaining, StreamProgress, StreamResult, StreamSource, send_stream
+from openscp.trace import TraceLevel
 import openscp.aes_alg
 import openscp.apdu
-from openscp.utils import _start_jvm_if_needed, _java_bytes_to_python_bytes, _python_bytes_to_java_bytes
 
-_start_jvm_if_needed()
-import java.security
-import java.util
-import org.bouncycastle.jce.provider
-import com.samsung.openscp
+if TYPE_CHECKING:
+    from openscp.certificate_validation import CertificateValidator
+    from openscp.trace import TraceRecorder
+
+_metrics = get_metrics()
+
+_SHORT_APDU_MAX_LENGTH = 0xFF
+_EXTENDED_APDU_MAX_LENGTH = 0xFFFF
+_AES_BLOCK_SIZE = 16
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_END = object()
+
+
+def _exclusive(method: F) -> F:
+    @functools.wraps(method)
+    def wrapper(self: "SecurityDomainSession", *args: Any, **kwargs: Any) -> Any:
+        thread = self._thread
+        if thread is not None and threading.get_ident() != thread.ident:
+            return thread.call(functools.partial(method, self, *args, **kwargs))
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return cast(F, wrapper)
 
 
 class SecurityDomainSession:
-    """SCP03 and SCP11 session implementation"""
+    """
+    SCP03 and SCP11 session implementation.
+
+    A session may be shared by threads: its calls are serialized as chosen by :class:`openscp.Concurrency`, so that
+    the MAC chaining value and counters of the secure channel stay consistent. A batch of :meth:`send_many` and a
+    chain of :meth:`send_stream` are not interleaved with commands of other threads, :meth:`stream` holds the session
+    for one command at a time. Independent sessions don't share locks and run in parallel on separate threads: the
+    Java backend releases the GIL while the JVM computes cryptograms and wraps commands, and every session calls
+    back into its own connection.
+    """
 
-    def __init__(self, connection: openscp.connection.SmartCardConnection) -> None:
+    def __init__(self,
+                 connection: openscp.connection.SmartCardConnection,
+                 backend: Backend = Backend.JAVA,
+                 certificate_cache: Optional[CertificateCache] = None,
+                 card_id: Optional[CardId] = None,
+                 concurrency: Concurrency = Concurrency.LOCK,
+                 certificate_validator: Optional["CertificateValidator"] = None,
+                 trace_recorder: Optional["TraceRecorder"] = None) -> None:
         """
         :param connection: :class:`openscp.SmartCardConnection` interface implementation
+        :param backend: SCP implementation to use, :class:`openscp.Backend.NATIVE` doesn't start a JVM
+        :param certificate_cache: cache for :meth:`get_certificate_bundle`, used together with card_id
+        :param card_id: identity of the card, e.g. its CIN, the certificate cache is not used if absent
+        :param concurrency: how calls from several threads are serialized
+        :param certificate_validator: validates the certificates returned by :meth:`get_certificate_bundle`, they
+                                      are trusted as they are if absent
+        :param trace_recorder: records the plain commands and responses of the session, the session gets a channel
+                               of its own in the trace
         """
-        security_provider = org.bouncycastle.jce.provider.BouncyCastleProvider()
-        self._session = com.samsung.openscp.SecurityDomainSession(connection, security_provider)
+        self._certificate_cache = certificate_cache if card_id is not None else None
+        self._certificate_validator = certificate_validator
+        self._card_id = card_id
+        self._trace_recorder = trace_recorder
+        self._trace_channel = trace_recorder._new_channel() if trace_recorder is not None else 0
+        self._connection = connection
+        self._backend = backend
+        self._scp_mode: Optional[openscp.scp_mode.ScpMode] = None
+        self._lock: Any = threading.RLock() if concurrency is Concurrency.LOCK else contextlib.nullcontext()
+        self._thread: Optional[_SessionThread] = None
+        if concurrency is Concurrency.QUEUE:
+            self._thread = _SessionThread()
+            weakref.finalize(self, self._thread.stop)
+        if backend is Backend.NATIVE:
+            from openscp.native_session import NativeSession
+            self._session = NativeSession(connection)
+        else:
+            from openscp.java_session import JavaSession
+            self._session = JavaSession(connection)
+
+    @overload
+    def authenticate_scp03(self, key_id: Scp03KeySet, key_version: openscp.scp_mode.ScpMode) -> None:
+        ...
 
+    @overload
     def authenticate_scp03(self,
                            key_id: int,
                            key_version: int,
@@ -45,21 +123,44 @@ class SecurityDomainSession:
                            mac_key: bytes,
                            dek_key: bytes,
                            scp_mode: openscp.scp_mode.ScpMode) -> None:
+        ...
+
+    def authenticate_scp03(self,
+                           key_id: Union[int, Scp03KeySet],
+                           key_version: Union[int, openscp.scp_mode.ScpMode, None] = None,
+                           enc_key: Optional[bytes] = None,
+                           mac_key: Optional[bytes] = None,
+                           dek_key: Optional[bytes] = None,
+                           scp_mode: Optional[openscp.scp_mode.ScpMode] = None) -> None:
         """
-        Perform SCP03 authentication - execute INITIALIZE UPDATE & EXTERNAL AUTHENTICATE commands
+        Perform SCP03 authentication - execute INITIALIZE UPDATE & EXTERNAL AUTHENTICATE commands.
+        Keys are passed one by one or as a prepared key set: ``authenticate_scp03(key_set, scp_mode)``.
 
-        :param key_id: SCP key identifier
-        :param key_version: SCP key version number
+        :param key_id: SCP key identifier, or :class:`openscp.Scp03KeySet`
+        :param key_version: SCP key version number, or SCP mode if a key set is passed
         :param enc_key: static secure channel encryption key
         :param mac_key: static secure channel message authentication code key
         :param dek_key: static data encryption key
         :param scp_mode: SCP mode - S8 or S16
         :return: None
 
-        :raises: exceptions from underlying Java library
+        :raises: exceptions from underlying Java library or :class:`openscp.exceptions.ScpError` for native backend,
+                 TypeError if arguments of both forms are mixed
         """
-        self._authenticate_scp03(key_id, key_version, enc_key, mac_key, dek_key, scp_mode)
+        if isinstance(key_id, Scp03KeySet):
+            key_set = key_id
+            scp_mode = _prepared_scp_mode(key_version, scp_mode, enc_key, mac_key, dek_key)
+        else:
+            if key_version is None or enc_key is None or mac_key is None or dek_key is None or scp_mode is None:
+                raise TypeError("authenticate_scp03() requires a key set or all keys and SCP mode")
+            key_set = Scp03KeySet(key_id, key_version, enc_key, mac_key, dek_key)
+        self._authenticate_scp03_with(key_set, scp_mode)
+
+    @overload
+    def authenticate_scp11(self, sd_key_id: Scp11Credentials, sd_key_version: openscp.scp_mode.ScpMode) -> None:
+        ...
 
+    @overload
     def authenticate_scp11(self,
                            sd_key_id: int,
                            sd_key_version: int,
@@ -70,11 +171,26 @@ class SecurityDomainSession:
                            sk_oce_ecka_bytes: bytes,
                            session_keys_alg: openscp.aes_alg.AesAlg,
                            scp_mode: openscp.scp_mode.ScpMode) -> None:
+        ...
+
+    def authenticate_scp11(self,
+                           sd_key_id: Union[int, Scp11Credentials],
+                           sd_key_version: Union[int, openscp.scp_mode.ScpMode, None] = None,
+                           oce_key_id: Optional[int] = None,
+                           oce_key_version: Optional[int] = None,
+                           pk_sd_ecka_bytes: Optional[bytes] = None,
+                           cert_chain_oce_ecka: Optional[List[bytes]] = None,
+                           sk_oce_ecka_bytes: Optional[bytes] = None,
+                           session_keys_alg: Optional[openscp.aes_alg.AesAlg] = None,
+                           scp_mode: Optional[openscp.scp_mode.ScpMode] = None) -> None:
         """
-        Perform SCP11 authentication - execute PERFORM_SECURITY_OPERATION & MUTUAL_AUTHENTICATE commands
+        Perform SCP11 authentication - execute PERFORM_SECURITY_OPERATION & MUTUAL_AUTHENTICATE commands.
+        Keys are passed one by one or as prepared credentials: ``authenticate_scp11(credentials, scp_mode)``.
 
-        :param sd_key_id: security domain SCP key identifier of associated SK.SD.ECKA
-        :param sd_key_version: security domain SCP key version number of associated SK.SD.ECKA
+        :param sd_key_id: security domain SCP key identifier of associated SK.SD.ECKA, or
+                          :class:`openscp.Scp11Credentials`
+        :param sd_key_version: security domain SCP key version number of associated SK.SD.ECKA, or SCP mode if
+                               credentials are passed
         :param oce_key_id: off-card entity SCP key identifier of associated SK.OCE.ECKA
         :param oce_key_version: off-card entity SCP key version number of associated SK.OCE.ECKA
         :param pk_sd_ecka_bytes: public key of the SD used for key agreement in encoded form (PK.SD.ECKA)
@@ -85,35 +201,47 @@ class SecurityDomainSession:
         :param scp_mode: SCP mode - S8 or S16
         :return: None
 
-        :raises: exceptions from underlying Java library
+        :raises: exceptions from underlying Java library or :class:`openscp.exceptions.ScpError` for native backend,
+                 TypeError if arguments of both forms are mixed
         """
-        self._authenticate_scp11(sd_key_id,
-                                 sd_key_version,
-                                 oce_key_id,
-                                 oce_key_version,
-                                 pk_sd_ecka_bytes,
-                                 cert_chain_oce_ecka,
-                                 sk_oce_ecka_bytes,
-                                 session_keys_alg,
-                                 scp_mode)
+        if isinstance(sd_key_id, Scp11Credentials):
+            credentials = sd_key_id
+            scp_mode = _prepared_scp_mode(sd_key_version, scp_mode, oce_key_id, oce_key_version, pk_sd_ecka_bytes,
+                                          cert_chain_oce_ecka, sk_oce_ecka_bytes, session_keys_alg)
+        else:
+            if (sd_key_version is None or oce_key_id is None or oce_key_version is None or pk_sd_ecka_bytes is None
+                    or cert_chain_oce_ecka is None or session_keys_alg is None or scp_mode is None):
+                raise TypeError("authenticate_scp11() requires credentials or all keys and SCP mode")
+            credentials = Scp11Credentials(sd_key_id, sd_key_version, oce_key_id, oce_key_version, pk_sd_ecka_bytes,
+                                           cert_chain_oce_ecka, sk_oce_ecka_bytes, session_keys_alg)
+        self._authenticate_scp11_with(credentials, scp_mode)
 
+    @_exclusive
     def get_certificate_bundle(self, sd_key_id: int, sd_key_version: int) -> List[ScpCertificate]:
         """
-        Retrieve an SCP11 Certificate Store from smart card
+        Retrieve an SCP11 Certificate Store from smart card, or from the certificate cache if the session has one, and
+        validate it if the session has a certificate validator
 
         :param sd_key_id: security domain SCP key identifier of associated SK.SD.ECKA
         :param sd_key_version: security domain SCP key version number of associated SK.SD.ECKA
         :return: list of certificates from smart card
 
-        :raises: exceptions from underlying Java library
+        :raises: exceptions from underlying Java library or :class:`openscp.exceptions.ScpError` for native backend,
+                 :class:`openscp.exceptions.CertificateValidationError` if the certificates are not valid
         """
-        key_ref = com.samsung.openscp.KeyRef(sd_key_id, sd_key_version)
-        certs_list_java = self._session.getCertificateBundle(key_ref)
-        certs_list = []
-        for cert_java in certs_list_java:
-            certs_list.append(ScpCertificate(cert_java))
-        return certs_list
+        cache = self._certificate_cache
+        certificates = None if cache is None else cache.get(self._card_id, sd_key_id, sd_key_version)
+        fetched = certificates is None
+        if certificates is None:
+            certificates = self._session.get_certificate_bundle(sd_key_id, sd_key_version)
+        if self._certificate_validator is not None:
+            # Cached certificates are validated too, as they expire, memoized signature checks keep it cheap
+            self._certificate_validator.validate(certificates)
+        if fetched and cache is not None:
+            cache.put(self._card_id, sd_key_id, sd_key_version, certificates)
+        return certificates
 
+    @_exclusive
     def send_and_receive(self, capdu: openscp.apdu.Apdu) -> bytes:
         """
         Send Command APDU, wait for Response APDU from smart card
@@ -121,17 +249,112 @@ class SecurityDomainSession:
         :param capdu: Command APDU bytes
         :return: Response APDU data bytes
         """
-        java_capdu = com.samsung.openscp.Apdu(
-            capdu.cla,
-            capdu.ins,
-            capdu.p1,
-            capdu.p2,
-            capdu.data,
-            capdu.le,
-            capdu.force_add_le
-        )
-        java_rapdu_data = self._session.sendAndReceive(java_capdu)
-        return _java_bytes_to_python_bytes(java_rapdu_data)
+        recorder = self._trace_recorder
+        if not _metrics.enabled and recorder is None:
+            return self._session.send_and_receive(capdu)
+        start = time.perf_counter()
+        response = b""
+        sw: Optional[int] = None
+        try:
+            response = self._session.send_and_receive(capdu)
+            sw = openscp.apdu.SW_OK
+            return response
+        except BaseException as e:
+            sw = _status_word(e)
+            raise
+        finally:
+            end = time.perf_counter()
+            if _metrics.enabled:
+                _metrics._record_command(capdu.ins, end - start, sw != openscp.apdu.SW_OK)
+            if recorder is not None:
+                recorder._exchange(self._trace_channel, TraceLevel.SESSION, start, end,
+                                   bytes((capdu.cla, capdu.ins, capdu.p1, capdu.p2)), capdu.data, response, sw or 0)
+
+    def transmit(self, capdu: openscp.apdu.Apdu) -> openscp.apdu.ResponseApdu:
+        """
+        Send Command APDU and return the response, status words other than 9000 don't raise
+
+        :param capdu: Command APDU
+        :return: Response APDU, the data is empty if the status word isn't 9000
+        """
+        result = self.send_many((capdu,))[0]
+        return openscp.apdu.ResponseApdu(memoryview(result.data), result.sw)
+
+    @_exclusive
+    def send_many(self,
+                  capdus: Iterable[openscp.apdu.Apdu],
+                  error_policy: ErrorPolicy = ErrorPolicy.STOP) -> List[CommandResult]:
+        """
+        Send a sequence of Command APDUs. Status words other than 9000 are reported in results instead of raising
+        an exception, other errors (e.g. secure messaging verification failure) are raised.
+
+        :param capdus: Command APDUs
+        :param error_policy: what to do after a command completes with an error status word
+        :return: result of every sent command, with response data, status word and timing
+        """
+        return list(self.stream(capdus, error_policy))
+
+    def stream(self,
+               capdus: Iterable[openscp.apdu.Apdu],
+               error_policy: ErrorPolicy = ErrorPolicy.STOP) -> Iterator[CommandResult]:
+        """
+        Lazy version of :meth:`send_many`: every command is sent when the previous result has been consumed,
+        so commands may come from a generator and results are processed as they arrive.
+
+        :param capdus: Command APDUs, consumed lazily
+        :param error_policy: what to do after a command completes with an error status word
+        :return: iterator over results of sent commands
+        """
+        results = _exclusive_results(self, stream_results(self._session.exchange, capdus, error_policy))
+        if self._trace_recorder is not None:
+            results = _traced(results, self._trace_recorder, self._trace_channel)
+        return _recorded(results) if _metrics.enabled else results
+
+    @_exclusive
+    def send_stream(self,
+                    cla: int,
+                    ins: int,
+                    p1: int,
+                    p2: int,
+                    source: StreamSource,
+                    chaining: Chaining = Chaining.BLOCK_NUMBER,
+                    block_size: Optional[int] = None,
+                    progress: Optional[Callable[[StreamProgress], None]] = None) -> StreamResult:
+        """
+        Send a large payload as a chain of commands, e.g. LOAD or STORE DATA. Bytes-like sources, including
+        memory-mapped files, are split without copying.
+
+        :param cla: class byte
+        :param ins: instruction byte
+        :param p1: P1, the last block bit is added for :attr:`Chaining.BLOCK_NUMBER`
+        :param p2: P2, replaced by the block number for :attr:`Chaining.BLOCK_NUMBER`
+        :param source: payload: bytes-like object, binary file or iterable of chunks
+        :param chaining: how commands are linked
+        :param block_size: data bytes per command, :meth:`max_command_data_size` by default
+        :param progress: called after every block
+        :return: response of the last block and totals
+
+        :raises: ValueError if the payload needs more than 256 numbered blocks, exceptions of
+                 :meth:`send_and_receive`
+        """
+        if block_size is None:
+            block_size = self.max_command_data_size()
+        return send_stream(self.send_and_receive, source, cla, ins, p1, p2, block_size, chaining, progress)
+
+    def max_command_data_size(self) -> int:
+        """
+        :return: largest data field, in bytes, of a single command: leaves room for padding and C-MAC once a secure
+                 channel is established, and counts on extended length if the connection supports it and, for
+                 secured commands, the backend does too
+        """
+        extended = self._connection.is_extended_length_apdu_supported()
+        if self._scp_mode is None:
+            return _EXTENDED_APDU_MAX_LENGTH if extended else _SHORT_APDU_MAX_LENGTH
+        if self._backend is not Backend.NATIVE:
+            extended = False  # The Java library secures short APDUs only
+        available = (_EXTENDED_APDU_MAX_LENGTH if extended else _SHORT_APDU_MAX_LENGTH) - self._scp_mode.value
+        # C-DECRYPTION pads data to whole AES blocks with at least one byte
+        return available // _AES_BLOCK_SIZE * _AES_BLOCK_SIZE - 1
 
     def _authenticate_scp03(self,
                             key_id: int,
@@ -141,13 +364,8 @@ class SecurityDomainSession:
                             dek_key: bytes,
                             scp_mode: openscp.scp_mode.ScpMode,
                             host_challenge: Optional[bytes] = None) -> None:
-        key_ref = com.samsung.openscp.KeyRef(key_id, key_version)
-        static_keys = com.samsung.openscp.StaticKeys(enc_key, mac_key, dek_key)
-        key_params = com.samsung.openscp.Scp03KeyParams(key_ref, static_keys)
-        if host_challenge:  # API for testing
-            self._session.authenticate(key_params, scp_mode.value, host_challenge)
-        else:
-            self._session.authenticate(key_params, scp_mode.value)
+        key_set = Scp03KeySet(key_id, key_version, enc_key, mac_key, dek_key)
+        self._authenticate_scp03_with(key_set, scp_mode, host_challenge)
 
     def _authenticate_scp11(self,
                             sd_key_id: int,
@@ -161,57 +379,89 @@ class SecurityDomainSession:
                             scp_mode: openscp.scp_mode.ScpMode,
                             epk_oce_ecka_bytes: Optional[bytes] = None,
                             esk_oce_ecka_bytes: Optional[bytes] = None) -> None:
-        key_params = self._create_java_scp11_key_params(sd_key_id,
-                                                        sd_key_version,
-                                                        oce_key_id,
-                                                        oce_key_version,
-                                                        pk_sd_ecka_bytes,
-                                                        cert_chain_oce_ecka,
-                                                        sk_oce_ecka_bytes,
-                                                        session_keys_alg)
-        if epk_oce_ecka_bytes and esk_oce_ecka_bytes:  # API for testing
-            ephemeral_key_pair = self._create_java_key_pair(epk_oce_ecka_bytes, esk_oce_ecka_bytes)
-            self._session.authenticate(key_params, scp_mode.value, ephemeral_key_pair)
+        credentials = Scp11Credentials(sd_key_id, sd_key_version, oce_key_id, oce_key_version, pk_sd_ecka_bytes,
+                                       cert_chain_oce_ecka, sk_oce_ecka_bytes, session_keys_alg)
+        self._authenticate_scp11_with(credentials, scp_mode, epk_oce_ecka_bytes, esk_oce_ecka_bytes)
+
+    @_exclusive
+    def _authenticate_scp03_with(self,
+                                 key_set: Scp03KeySet,
+                                 scp_mode: openscp.scp_mode.ScpMode,
+                                 host_challenge: Optional[bytes] = None) -> None:
+        self._scp_mode = None
+        if not _metrics.enabled:
+            self._session._authenticate_scp03(key_set, scp_mode, host_challenge)
         else:
-            self._session.authenticate(key_params, scp_mode.value)
-
-    def _create_java_scp11_key_params(self,
-                                      sd_key_id: int,
-                                      sd_key_version: int,
-                                      oce_key_id: int,
-                                      oce_key_version: int,
-                                      pk_sd_ecka_bytes: bytes,
-                                      cert_chain_oce_ecka: List[bytes],
-                                      sk_oce_ecka_bytes: bytes,
-                                      session_keys_alg: openscp.aes_alg.AesAlg) -> Any:
-        # -> com.samsung.openscp.Scp11KeyParams
-        pk_sd_ecka = self._create_java_ec_public_key(pk_sd_ecka_bytes)
-        oce_key_ref = com.samsung.openscp.KeyRef(oce_key_id, oce_key_version)
-        sd_key_ref = com.samsung.openscp.KeyRef(sd_key_id, sd_key_version)
-        sk_oce_ecka = self._create_java_ec_private_key(sk_oce_ecka_bytes)
-        java_oce_cert_bytes_chain = [_python_bytes_to_java_bytes(cert_bytes) for cert_bytes in cert_chain_oce_ecka]
-        java_oce_cert_chain = java.util.Arrays.asList(*java_oce_cert_bytes_chain)
-        return com.samsung.openscp.Scp11KeyParams(
-            sd_key_ref,
-            pk_sd_ecka,
-            oce_key_ref,
-            sk_oce_ecka,
-            java_oce_cert_chain,
-            session_keys_alg.value
-        )
-
-    def _create_java_key_pair(self, public_key_bytes: bytes, private_key_bytes: bytes) -> Any:
-        # -> java.security.KeyPair
-        public_key = self._create_java_ec_public_key(public_key_bytes)
-        private_key = self._create_java_ec_private_key(private_key_bytes)
-        return java.security.KeyPair(public_key, private_key)
-
-    def _create_java_ec_public_key(self, key_bytes: bytes) -> Any:  # -> java.security.PublicKey
-        key_factory = java.security.KeyFactory.getInstance("EC")
-        key_spec = java.security.spec.X509EncodedKeySpec(key_bytes)
-        return key_factory.generatePublic(key_spec)
-
-    def _create_java_ec_private_key(self, key_bytes: bytes) -> Any:  # -> java.security.PrivateKey
-        key_factory = java.security.KeyFactory.getInstance("EC")
-        key_spec = java.security.spec.PKCS8EncodedKeySpec(key_bytes)
-        return key_factory.generatePrivate(key_spec)
+            with _metrics._handshake("SCP03"):
+                self._session._authenticate_scp03(key_set, scp_mode, host_challenge)
+        self._scp_mode = scp_mode
+
+    @_exclusive
+    def _authenticate_scp11_with(self,
+                                 credentials: Scp11Credentials,
+                                 scp_mode: openscp.scp_mode.ScpMode,
+                                 epk_oce_ecka_bytes: Optional[bytes] = None,
+                                 esk_oce_ecka_bytes: Optional[bytes] = None) -> None:
+        self._scp_mode = None
+        try:
+            if not _metrics.enabled:
+                self._session._authenticate_scp11(credentials, scp_mode, epk_oce_ecka_bytes, esk_oce_ecka_bytes)
+            else:
+                with _metrics._handshake("SCP11"):
+                    self._session._authenticate_scp11(credentials, scp_mode, epk_oce_ecka_bytes, esk_oce_ecka_bytes)
+            self._scp_mode = scp_mode
+        except Exception as e:
+            # The SD key may have been replaced since its certificate was cached: the card rejects PERFORM SECURITY
+            # OPERATION or MUTUAL / INTERNAL AUTHENTICATE, or the receipt doesn't verify. Transport failures say
+            # nothing about the key and keep the cache.
+            cache = self._certificate_cache
+            if (cache is not None and (_status_word(e) is not None or _is_bad_response(e))
+                    and cache.contains_public_key(self._card_id, credentials.sd_key_id, credentials.sd_key_version,
+                                                  credentials.pk_sd_ecka_bytes)):
+                cache.invalidate(self._card_id, credentials.sd_key_id, credentials.sd_key_version)
+            raise
+
+
+def _exclusive_results(session: SecurityDomainSession, results: Iterator[CommandResult]) -> Iterator[CommandResult]:
+    # Every command is exchanged under the session lock or on the session thread, other threads may send commands
+    # while the caller processes a result
+    advance = _exclusive(lambda session: next(results, _END))
+    try:
+        while True:
+            result = advance(session)
+            if result is _END:
+                return
+            yield result
+    finally:
+        results.close()  # type: ignore[attr-defined]
+
+
+def _recorded(results: Iterator[CommandResult]) -> Iterator[CommandResult]:
+    try:
+        for result in results:
+            _metrics._record_command(result.apdu.ins, result.duration, not result.ok)
+            yield result
+    finally:
+        results.close()  # type: ignore[attr-defined]
+
+
+def _traced(results: Iterator[CommandResult], recorder: "TraceRecorder", channel: int) -> Iterator[CommandResult]:
+    try:
+        for result in results:
+            end = time.perf_counter()
+            capdu = result.apdu
+            recorder._exchange(channel, TraceLevel.SESSION, end - result.duration, end,
+                               bytes((capdu.cla, capdu.ins, capdu.p1, capdu.p2)), capdu.data, result.data, result.sw)
+            yield result
+    finally:
+        results.close()  # type: ignore[attr-defined]
+
+
+def _prepared_scp_mode(positional_mode: Any, keyword_mode: Optional[openscp.scp_mode.ScpMode],
+                       *unused: Any) -> openscp.scp_mode.ScpMode:
+    if any(argument is not None for argument in unused) or (positional_mode is None) == (keyword_mode is None):
+        raise TypeError("Prepared credentials are passed only with SCP mode")
+    scp_mode = keyword_mode if positional_mode is None else positional_mode
+    if not isinstance(scp_mode, openscp.scp_mode.ScpMode):
+        raise TypeError("SCP mode must be an openscp.ScpMode")
+    return scp_mode
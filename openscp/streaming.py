@@ -0,0 +1,198 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+from enum import Enum
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional, Union
+
+from openscp.apdu import Apdu
+
+# Bytes-like objects, including memory-mapped files, are split without copying; binary files are read block by block
+# into two reused buffers; other iterables may yield chunks of any size
+StreamSource = Union[bytes, bytearray, memoryview, BinaryIO, Iterable[bytes]]
+
+_CLA_CHAINING = 0x10
+_P1_LAST_BLOCK = 0x80
+_MAX_BLOCK_NUMBER = 0xFF
+
+
+class Chaining(Enum):
+    """How the commands carrying the blocks of a stream are linked"""
+
+    CLA = "cla"
+    """ISO/IEC 7816-4 command chaining: CLA bit b5 set on every block but the last, P1 and P2 unchanged"""
+
+    BLOCK_NUMBER = "block-number"
+    """GlobalPlatform LOAD and STORE DATA: P1 bit b8 set on the last block, P2 is the block number (at most 256)"""
+
+
+class StreamProgress(NamedTuple):
+    """Progress of a stream, reported after every block"""
+
+    blocks: int
+    """commands sent"""
+
+    bytes_sent: int
+    """payload bytes sent"""
+
+    total_bytes: Optional[int]
+    """payload size, None if the source is an iterator"""
+
+    elapsed: float
+    """seconds since the first block was sent"""
+
+    @property
+    def throughput(self) -> float:
+        """payload bytes per second"""
+        return self.bytes_sent / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class StreamResult(NamedTuple):
+    """Outcome of a stream"""
+
+    data: bytes
+    """response data of the last block"""
+
+    blocks: int
+    """commands sent"""
+
+    bytes_sent: int
+    """payload bytes sent"""
+
+    elapsed: float
+    """seconds"""
+
+    @property
+    def throughput(self) -> float:
+        """payload bytes per second"""
+        return self.bytes_sent / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def send_stream(send_and_receive: Callable[[Apdu], bytes],
+                source: StreamSource,
+                cla: int,
+                ins: int,
+                p1: int,
+                p2: int,
+                block_size: int,
+                chaining: Chaining = Chaining.BLOCK_NUMBER,
+                progress: Optional[Callable[[StreamProgress], None]] = None) -> StreamResult:
+    """
+    Send a payload split into blocks, one command per block. An empty payload is sent as one empty block.
+
+    :param send_and_receive: sends a command and returns its response data, raises on error status words
+    :param source: payload
+    :param cla: class byte
+    :param ins: instruction byte
+    :param p1: P1, the last block bit is added for :attr:`Chaining.BLOCK_NUMBER`
+    :param p2: P2, replaced by the block number for :attr:`Chaining.BLOCK_NUMBER`
+    :param block_size: data bytes per command
+    :param chaining: how commands are linked
+    :param progress: called after every block
+    :return: response of the last block and totals
+
+    :raises: ValueError if the block size is not positive or block numbers run out, exceptions of send_and_receive
+    """
+    if block_size <= 0:
+        raise ValueError("Block size must be positive")
+    total_bytes = _source_size(source)
+    blocks = _blocks(source, block_size)
+    start = time.perf_counter()
+    bytes_sent = 0
+    index = 0
+    data = b""
+    current = next(blocks, None)
+    if current is None:
+        current = memoryview(b"")
+    while current is not None:
+        following = next(blocks, None)
+        last = following is None
+        if chaining is Chaining.CLA:
+            apdu = Apdu(cla if last else cla | _CLA_CHAINING, ins, p1, p2, current)  # type: ignore[arg-type]
+        else:
+            if index > _MAX_BLOCK_NUMBER:
+                raise ValueError("Payload needs more than 256 numbered blocks, use a larger block size")
+            apdu = Apdu(cla, ins, p1 | _P1_LAST_BLOCK if last else p1, index, current)  # type: ignore[arg-type]
+        data = send_and_receive(apdu)
+        index += 1
+        bytes_sent += len(current)
+        if progress is not None:
+            progress(StreamProgress(index, bytes_sent, total_bytes, time.perf_counter() - start))
+        current = following
+    return StreamResult(data, index, bytes_sent, time.perf_counter() - start)
+
+
+def _blocks(source: StreamSource, block_size: int) -> Iterator[memoryview]:
+    if hasattr(source, "readinto"):
+        yield from _file_blocks(source, block_size)  # type: ignore[arg-type]
+        return
+    try:
+        view = memoryview(source)  # type: ignore[arg-type]
+    except TypeError:
+        yield from _chunked_blocks(source, block_size)  # type: ignore[arg-type]
+        return
+    with view, view.cast("B") as octets:
+        for offset in range(0, len(octets), block_size):
+            yield octets[offset:offset + block_size]
+
+
+def _file_blocks(source: BinaryIO, block_size: int) -> Iterator[memoryview]:
+    # The caller looks one block ahead, so two buffers are alternated: the block being sent isn't overwritten by
+    # reading the next one
+    buffers = [memoryview(bytearray(block_size)), memoryview(bytearray(block_size))]
+    turn = 0
+    while True:
+        buffer = buffers[turn]
+        filled = 0
+        while filled < block_size:
+            count = source.readinto(buffer[filled:])  # type: ignore[attr-defined]
+            if not count:
+                break
+            filled += count
+        if not filled:
+            return
+        yield buffer[:filled]
+        if filled < block_size:
+            return
+        turn ^= 1
+
+
+def _chunked_blocks(source: Iterable[bytes], block_size: int) -> Iterator[memoryview]:
+    pending = bytearray()
+    for chunk in source:
+        if not pending and len(chunk) == block_size:
+            yield memoryview(chunk)
+            continue
+        pending += chunk
+        while len(pending) >= block_size:
+            yield memoryview(bytes(pending[:block_size]))
+            del pending[:block_size]
+    if pending:
+        yield memoryview(bytes(pending))
+
+
+def _source_size(source: StreamSource) -> Optional[int]:
+    if hasattr(source, "readinto"):
+        try:
+            if not source.seekable():  # type: ignore[union-attr]
+                return None
+            return os.fstat(source.fileno()).st_size - source.tell()  # type: ignore[union-attr]
+        except (AttributeError, OSError, ValueError):
+            return None
+    try:
+        with memoryview(source) as view:  # type: ignore[arg-type]
+            return view.nbytes
+    except TypeError:
+        return None
@@ -0,0 +1,321 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from openscp.exceptions import BadResponseError
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+_CONSTRUCTED = 0x20
+
+_new_tuple = tuple.__new__
+
+
+def encode_tlv(tag: int, value: bytes = b"") -> bytes:
+    """
+    Encode a single BER-TLV data object
+
+    :param tag: tag, multi-byte tags are given as a single integer (e.g. 0x5F49)
+    :param value: value bytes
+    :return: encoded data object
+    """
+    tag_bytes = tag.to_bytes(max(1, (tag.bit_length() + 7) // 8), "big")
+    length = len(value)
+    if length < 0x80:
+        length_bytes = bytes([length])
+    else:
+        length_size = (length.bit_length() + 7) // 8
+        length_bytes = bytes([0x80 | length_size]) + length.to_bytes(length_size, "big")
+    return tag_bytes + length_bytes + bytes(value)
+
+
+def parse_tlv(data: bytes, offset: int = 0) -> Tuple[int, int, int]:
+    """
+    Parse the header of a BER-TLV data object
+
+    :param data: encoded data
+    :param offset: offset of the data object within data
+    :return: tag, offset of the value and offset right after the value
+    """
+    try:
+        tag = data[offset]
+        offset += 1
+        if tag & 0x1F == 0x1F:
+            while True:
+                tag = (tag << 8) | data[offset]
+                offset += 1
+                if not data[offset - 1] & 0x80:
+                    break
+        length = data[offset]
+        offset += 1
+        if length > 0x80:
+            length_size = length & 0x7F
+            length = int.from_bytes(data[offset:offset + length_size], "big")
+            offset += length_size
+        elif length == 0x80:
+            raise BadResponseError("Indefinite length is not supported")
+    except IndexError as e:
+        raise BadResponseError("Truncated TLV header") from e
+    end = offset + length
+    if end > len(data):
+        raise BadResponseError("TLV value exceeds available data")
+    return tag, offset, end
+
+
+def decode_tlv_list(data: bytes) -> List[Tuple[int, bytes, bytes]]:
+    """
+    Decode a sequence of BER-TLV data objects
+
+    :param data: encoded data objects
+    :return: tag, value and full encoding of every data object
+    """
+    objects = []
+    offset = 0
+    while offset < len(data):
+        start = offset
+        tag, value_offset, offset = parse_tlv(data, offset)
+        objects.append((tag, data[value_offset:offset], data[start:offset]))
+    return objects
+
+
+def unpack_tlv_value(tag: int, data: bytes) -> bytes:
+    """
+    :param tag: expected tag
+    :param data: single encoded data object
+    :return: value of the data object
+
+    :raises: :class:`openscp.exceptions.BadResponseError` if the tag doesn't match or extra data is present
+    """
+    actual_tag, value_offset, end = parse_tlv(data)
+    if actual_tag != tag:
+        raise BadResponseError(f"Expected tag {tag:02X}, got {actual_tag:02X}")
+    if end != len(data):
+        raise BadResponseError("Extra data remaining")
+    return data[value_offset:end]
+
+
+class Tlv(NamedTuple):
+    """BER-TLV data object located in a parsed buffer, value and encoding are sliced from it only when requested"""
+
+    tag: int
+    """tag, multi-byte tags as a single integer (e.g. 0x5F49)"""
+
+    buffer: memoryview
+    """parsed buffer"""
+
+    offset: int
+    """offset of the data object in the buffer"""
+
+    value_offset: int
+    """offset of the value in the buffer"""
+
+    end: int
+    """offset right after the value in the buffer"""
+
+    @property
+    def value(self) -> memoryview:
+        """value bytes, a view over the buffer"""
+        return self.buffer[self.value_offset:self.end]
+
+    @property
+    def encoded(self) -> memoryview:
+        """tag, length and value bytes, a view over the buffer"""
+        return self.buffer[self.offset:self.end]
+
+    @property
+    def is_constructed(self) -> bool:
+        """
+        does the tag encoding mark the value as data objects, note that some GlobalPlatform tags (e.g. B0 of public
+        keys) are primitive nevertheless
+        """
+        return bool((self.tag >> 8 * max(0, (self.tag.bit_length() - 1) // 8)) & _CONSTRUCTED)
+
+    def children(self) -> Iterator["Tlv"]:
+        """
+        :return: lazy iterator over data objects of the value
+        """
+        return _iter_tlv(self.buffer, self.value_offset, self.end)
+
+    def find(self, *path: int) -> Optional["Tlv"]:
+        """
+        :param path: tags of nested data objects, starting with a child of this one
+        :return: first matching data object, None if there is none
+        """
+        return _find_tlv(self.buffer, self.value_offset, self.end, path)
+
+
+def iter_tlv(data: BytesLike) -> Iterator[Tlv]:
+    """
+    Lazily decode a sequence of BER-TLV data objects without copying: every data object is parsed when the iterator
+    reaches it, nested data objects only when iterated with :meth:`Tlv.children`
+
+    :param data: encoded data objects
+    :return: iterator over data objects
+
+    :raises: :class:`openscp.exceptions.BadResponseError` when a malformed data object is reached
+    """
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    return _iter_tlv(view, 0, len(view))
+
+
+def find_tlv(data: BytesLike, *path: int) -> Optional[Tlv]:
+    """
+    Find a nested data object, parsing only data objects which precede it at every level
+
+    :param data: encoded data objects
+    :param path: tags of nested data objects, starting at the top level
+    :return: first matching data object, None if there is none
+    """
+    view = data if isinstance(data, memoryview) else memoryview(data)
+    return _find_tlv(view, 0, len(view), path)
+
+
+class TlvBuilder:
+    """
+    Builds BER-TLV data objects into one buffer. Values are referenced until the data is built and then copied exactly
+    once, lengths of constructed data objects are filled in when they are closed.
+    """
+
+    def __init__(self) -> None:
+        # Headers and values in encoding order, None for headers of constructed data objects still open
+        self._pieces: List[Optional[BytesLike]] = []
+        # Tag, header index and value size of open constructed data objects, the first entry counts the total size
+        self._open: List[List[int]] = [[0, -1, 0]]
+
+    def add(self, tag: int, value: BytesLike = b"") -> "TlvBuilder":
+        """
+        :param tag: tag, multi-byte tags as a single integer
+        :param value: value bytes, referenced until the data is built
+        :return: self
+        """
+        header = _header(tag, len(value))
+        self._pieces += (header, value)
+        self._open[-1][2] += len(header) + len(value)
+        return self
+
+    def begin(self, tag: int) -> "TlvBuilder":
+        """
+        Open a constructed data object, data objects added until :meth:`end` make up its value
+
+        :param tag: tag, multi-byte tags as a single integer
+        :return: self
+        """
+        self._open.append([tag, len(self._pieces), 0])
+        self._pieces.append(None)
+        return self
+
+    def end(self) -> "TlvBuilder":
+        """
+        Close the innermost open constructed data object
+
+        :return: self
+
+        :raises: ValueError if no data object is open
+        """
+        if len(self._open) == 1:
+            raise ValueError("No constructed data object is open")
+        tag, index, size = self._open.pop()
+        header = _header(tag, size)
+        self._pieces[index] = header
+        self._open[-1][2] += len(header) + size
+        return self
+
+    @property
+    def size(self) -> int:
+        """encoded size of data objects added so far, open constructed data objects excluded"""
+        return self._open[0][2]
+
+    def build(self) -> bytes:
+        """
+        :return: encoded data objects
+
+        :raises: ValueError if a constructed data object is still open
+        """
+        self._check_closed()
+        return b"".join(self._pieces)  # type: ignore[arg-type]
+
+    def build_into(self, buffer: Union[bytearray, memoryview], offset: int = 0) -> int:
+        """
+        :param buffer: writable buffer
+        :param offset: where to write the data objects
+        :return: offset right after the data objects
+
+        :raises: ValueError if a constructed data object is still open or the buffer is too small
+        """
+        self._check_closed()
+        if offset + self.size > len(buffer):
+            raise ValueError("Buffer is too small")
+        with memoryview(buffer) as view:
+            for piece in self._pieces:
+                end = offset + len(piece)  # type: ignore[arg-type]
+                view[offset:end] = piece  # type: ignore[assignment]
+                offset = end
+        return offset
+
+    def _check_closed(self) -> None:
+        if len(self._open) > 1:
+            raise ValueError("Constructed data object is not closed")
+
+
+def _iter_tlv(view: memoryview, offset: int, end: int) -> Iterator[Tlv]:
+    while offset < end:
+        start = offset
+        # Tags of up to two bytes and lengths of up to 0x81 XX, almost every data object, are decoded inline
+        tag = view[offset]
+        offset += 1
+        if tag & 0x1F == 0x1F:
+            if offset >= end or view[offset] & 0x80:
+                tag, value_offset, offset = parse_tlv(view, start)
+                if offset > end:
+                    raise BadResponseError("TLV value exceeds available data")
+                yield _new_tuple(Tlv, (tag, view, start, value_offset, offset))
+                continue
+            tag = (tag << 8) | view[offset]
+            offset += 1
+        if offset >= end:
+            raise BadResponseError("Truncated TLV header")
+        length = view[offset]
+        if length < 0x80:
+            value_offset = offset + 1
+        elif length == 0x81 and offset + 1 < end:
+            length = view[offset + 1]
+            value_offset = offset + 2
+        else:
+            tag, value_offset, offset = parse_tlv(view, start)
+            length = offset - value_offset
+        offset = value_offset + length
+        if offset > end:
+            raise BadResponseError("TLV value exceeds available data")
+        yield _new_tuple(Tlv, (tag, view, start, value_offset, offset))
+
+
+def _find_tlv(view: memoryview, offset: int, end: int, path: Sequence[int]) -> Optional[Tlv]:
+    found = None
+    for tag in path:
+        found = next((tlv for tlv in _iter_tlv(view, offset, end) if tlv.tag == tag), None)
+        if found is None:
+            return None
+        offset, end = found.value_offset, found.end
+    return found
+
+
+def _header(tag: int, length: int) -> bytes:
+    if tag < 0x100 and length < 0x80:
+        return bytes((tag, length))
+    tag_bytes = tag.to_bytes(max(1, (tag.bit_length() + 7) // 8), "big")
+    if length < 0x80:
+        return tag_bytes + bytes((length,))
+    length_size = (length.bit_length() + 7) // 8
+    return tag_bytes + bytes((0x80 | length_size,)) + length.to_bytes(length_size, "big")
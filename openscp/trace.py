@@ -0,0 +1,426 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import contextlib
+import itertools
+import mmap
+import struct
+import threading
+import time
+from enum import Enum
+from typing import Any, Iterator, NamedTuple, Optional, Union
+
+from openscp.connection import SmartCardConnection
+
+# A file starts with the header: magic, format version, flags and the wall time the recording started, in
+# nanoseconds since the epoch. Records follow, each a fixed-size header and the stored payload, little-endian:
+# nanoseconds since the start, channel, level, direction, status word (responses), CLA INS P1 P2 (commands),
+# APDU length and stored payload length.
+_FILE_HEADER = struct.Struct("<8sHHIQ")
+_RECORD = struct.Struct("<QHBBH4sII")
+_MAGIC = b"OSCPTRCE"
+_FORMAT_VERSION = 1
+_FLAG_PAYLOADS = 0x0001
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+DEFAULT_FLUSH_INTERVAL = 0.2
+
+_NO_HEADER = bytes(4)
+
+
+class TraceLevel(Enum):
+    """Where an exchange was recorded"""
+
+    TRANSPORT = 0
+    """:class:`TracedConnection`: APDUs as sent to the card, secured if a secure channel is open"""
+
+    SESSION = 1
+    """:class:`openscp.SecurityDomainSession`: plain commands and responses of the secure channel"""
+
+
+class TraceDirection(Enum):
+    """Direction of a recorded APDU"""
+
+    COMMAND = 0
+    RESPONSE = 1
+
+
+class TraceRecord(NamedTuple):
+    """One recorded APDU, read by :class:`TraceReader`"""
+
+    timestamp: float
+    """seconds since the recording started"""
+
+    channel: int
+    """connection or session the APDU was exchanged on, numbered by the recorder"""
+
+    level: TraceLevel
+
+    direction: TraceDirection
+
+    sw: int
+    """status word of responses, 0 for commands and for exchanges that failed without a response"""
+
+    header: bytes
+    """CLA, INS, P1 and P2 of commands, zeros for responses"""
+
+    length: int
+    """whole APDU for transport commands, data field for session commands, response data without status word"""
+
+    payload: memoryview
+    """the APDU bytes counted by length if the recorder stored payloads, empty otherwise"""
+
+
+class TraceStats(NamedTuple):
+    """Counters of a :class:`TraceRecorder`"""
+
+    records: int
+    """records put in the buffer"""
+
+    dropped: int
+    """records lost because the buffer was full"""
+
+    bytes_written: int
+    """bytes written to the file, including its header"""
+
+
+class ReplayResult(NamedTuple):
+    """Outcome of :func:`replay_trace`"""
+
+    commands: int
+    """commands sent"""
+
+    mismatches: int
+    """responses whose status word differs from the recorded one"""
+
+    recorded: float
+    """seconds the recorded exchanges took, from command to response"""
+
+    replayed: float
+    """seconds the replayed exchanges took"""
+
+
+class TraceRecorder:
+    """
+    Records APDU exchanges to a compact binary file: fixed-size record headers, optionally followed by the APDU bytes.
+    Exchanges are appended to a ring buffer and written by a background thread, so that recording costs the caller
+    a few microseconds and no I/O. When the buffer is full, records are dropped and counted rather than waiting for
+    the file. Exchanges are recorded by :class:`TracedConnection` and by sessions given the recorder.
+
+    Payloads include secret data, e.g. the plain commands of a secure channel at :attr:`TraceLevel.SESSION`, only
+    record them where the trace file is protected accordingly.
+    """
+
+    def __init__(self,
+                 path: str,
+                 payloads: bool = False,
+                 buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL) -> None:
+        """
+        :param path: trace file, replaced if it exists
+        :param payloads: store APDU bytes, not only their lengths, status words and command headers
+        :param buffer_size: ring buffer bytes, records larger than that are dropped
+        :param flush_interval: seconds between writes of the buffer to the file, the buffer is also written once
+                               half full
+        """
+        self._payloads = payloads
+        self._flush_interval = flush_interval
+        self._buffer = bytearray(buffer_size)
+        self._capacity = buffer_size
+        self._head = 0
+        self._used = 0
+        self._condition = threading.Condition()
+        self._appended = 0
+        self._written = 0
+        self._flush_requested = False
+        self._closed = False
+        self._records = 0
+        self._dropped = 0
+        self._channels = itertools.count()
+        # Records are buffered by the recorder itself, the file is written in large chunks without buffering
+        self._file = open(path, "wb", buffering=0)
+        self._start = time.perf_counter()
+        header = _FILE_HEADER.pack(_MAGIC, _FORMAT_VERSION, _FLAG_PAYLOADS if payloads else 0, 0, time.time_ns())
+        self._file.write(header)
+        self._bytes_written = len(header)
+        self._thread = threading.Thread(target=self._run, name="openscp-trace", daemon=True)
+        self._thread.start()
+
+    def flush(self) -> None:
+        """
+        Write everything recorded so far to the file
+
+        :return: None
+        """
+        with self._condition:
+            target = self._appended
+            self._flush_requested = True
+            self._condition.notify_all()
+            self._condition.wait_for(lambda: self._written >= target or not self._thread.is_alive())
+
+    def close(self) -> None:
+        """
+        Write everything recorded so far and close the file, later exchanges aren't recorded
+
+        :return: None
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._file.close()
+
+    def stats(self) -> TraceStats:
+        """
+        :return: current counters
+        """
+        with self._condition:
+            return TraceStats(self._records, self._dropped, self._bytes_written)
+
+    def __enter__(self) -> "TraceRecorder":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _new_channel(self) -> int:
+        return next(self._channels) & 0xFFFF
+
+    def _exchange(self,
+                  channel: int,
+                  level: TraceLevel,
+                  start: float,
+                  end: float,
+                  header: bytes,
+                  command: Union[bytes, memoryview],
+                  response: Union[bytes, memoryview],
+                  sw: int) -> None:
+        # One command and its response, start and end are time.perf_counter() values
+        payloads = self._payloads
+        data = b"".join((
+            _RECORD.pack(int((start - self._start) * 1e9), channel, level.value, TraceDirection.COMMAND.value, 0,
+                         header, len(command), len(command) if payloads else 0),
+            command if payloads else b"",
+            _RECORD.pack(int((end - self._start) * 1e9), channel, level.value, TraceDirection.RESPONSE.value, sw,
+                         _NO_HEADER, len(response), len(response) if payloads else 0),
+            response if payloads else b""))
+        size = len(data)
+        with self._condition:
+            if self._closed or self._used + size > self._capacity:
+                self._dropped += 2
+                return
+            tail = (self._head + self._used) % self._capacity
+            first = min(size, self._capacity - tail)
+            self._buffer[tail:tail + first] = memoryview(data)[:first]
+            if first < size:
+                self._buffer[:size - first] = memoryview(data)[first:]
+            self._used += size
+            self._appended += size
+            self._records += 2
+            if (self._used - size) * 2 < self._capacity <= self._used * 2:
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        buffer = memoryview(self._buffer)
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or self._flush_requested
+                                         or self._used * 2 >= self._capacity, self._flush_interval)
+                self._flush_requested = False
+                closed = self._closed
+                head, used = self._head, self._used
+            # Recording only appends after head + used, the pending bytes are written without holding the lock and
+            # freed afterwards
+            first = min(used, self._capacity - head)
+            self._file.write(buffer[head:head + first])
+            if first < used:
+                self._file.write(buffer[:used - first])
+            with self._condition:
+                self._head = (head + used) % self._capacity
+                self._used -= used
+                self._written += used
+                self._bytes_written += used
+                self._condition.notify_all()
+            if closed and not self._used:
+                buffer.release()
+                return
+
+
+class TracedConnection(SmartCardConnection):
+    """Connection which records the APDUs exchanged through it, at :attr:`TraceLevel.TRANSPORT`"""
+
+    def __init__(self, connection: SmartCardConnection, recorder: TraceRecorder) -> None:
+        """
+        :param connection: underlying connection
+        :param recorder: recorder of the exchanges, the connection gets a channel of its own
+        """
+        self._connection = connection
+        self._recorder = recorder
+        self._channel = recorder._new_channel()
+
+    @property
+    def channel(self) -> int:
+        """channel of the connection in the trace"""
+        return self._channel
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        start = time.perf_counter()
+        try:
+            rapdu = self._connection.send_and_receive(apdu)
+        except BaseException:
+            self._recorder._exchange(self._channel, TraceLevel.TRANSPORT, start, time.perf_counter(), apdu[:4], apdu,
+                                     b"", 0)
+            raise
+        data = memoryview(rapdu)[:-2]
+        sw = int.from_bytes(rapdu[-2:], "big") if len(rapdu) >= 2 else 0
+        self._recorder._exchange(self._channel, TraceLevel.TRANSPORT, start, time.perf_counter(), apdu[:4], apdu, data,
+                                 sw)
+        return rapdu
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self._connection.is_extended_length_apdu_supported()
+
+    def close_connection(self) -> None:
+        self._connection.close_connection()
+
+
+class TraceReader:
+    """Reads a trace file written by :class:`TraceRecorder`, memory-mapped: payloads are views of the file"""
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: trace file
+
+        :raises: ValueError if the file isn't a trace
+        """
+        with open(path, "rb") as file:
+            size = file.seek(0, 2)
+            self._mapping: Optional[mmap.mmap] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._mapping is None or size < _FILE_HEADER.size:
+            self.close()
+            raise ValueError("Not a trace file")
+        magic, version, flags, _, started_at = _FILE_HEADER.unpack_from(self._mapping)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            self.close()
+            raise ValueError("Not a trace file or unsupported version")
+        self._payloads = bool(flags & _FLAG_PAYLOADS)
+        self._started_at = started_at / 1e9
+
+    @property
+    def payloads(self) -> bool:
+        """were payloads recorded"""
+        return self._payloads
+
+    @property
+    def started_at(self) -> float:
+        """time.time() when the recording started"""
+        return self._started_at
+
+    def __iter__(self) -> Iterator[TraceRecord]:
+        if self._mapping is None:
+            raise ValueError("Trace is closed")
+        view = memoryview(self._mapping)
+        offset = _FILE_HEADER.size
+        end = len(view)
+        try:
+            # A record cut short by a crash of the recording process ends the trace
+            while offset + _RECORD.size <= end:
+                timestamp, channel, level, direction, sw, header, length, stored = _RECORD.unpack_from(view, offset)
+                offset += _RECORD.size
+                if offset + stored > end:
+                    return
+                yield TraceRecord(timestamp / 1e9, channel, TraceLevel(level), TraceDirection(direction), sw, header,
+                                  length, view[offset:offset + stored])
+                offset += stored
+        finally:
+            view.release()
+
+    def close(self) -> None:
+        """
+        Unmap the file, once the payloads of records read before are no longer referenced
+
+        :return: None
+        """
+        if self._mapping is not None:
+            mapping, self._mapping = self._mapping, None
+            with contextlib.suppress(BufferError):
+                # Payloads still referenced keep the mapping, it is released with the last of them
+                mapping.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def replay_trace(trace: Union[str, TraceReader],
+                 connection: SmartCardConnection,
+                 channel: Optional[int] = None,
+                 pace: bool = False) -> ReplayResult:
+    """
+    Send the commands of a trace recorded with payloads to a connection, e.g. an emulator or a test card, and compare
+    the responses and timings with the recorded ones. Only :attr:`TraceLevel.TRANSPORT` records are replayed, the
+    commands of a secure channel are only accepted by a card which derives the same session keys.
+
+    :param trace: trace file or reader
+    :param connection: connection the commands are sent to, not closed
+    :param channel: channel to replay, the first one of the trace if absent
+    :param pace: wait between commands as long as the recording did, otherwise commands are sent back to back
+    :return: counters of the replay
+
+    :raises: ValueError if the trace has no payloads
+    """
+    reader = TraceReader(trace) if isinstance(trace, str) else trace
+    try:
+        if not reader.payloads:
+            raise ValueError("Trace was recorded without payloads")
+        commands = mismatches = 0
+        recorded = replayed = 0.0
+        command: Optional[TraceRecord] = None
+        replay_start = time.perf_counter()
+        first_timestamp: Optional[float] = None
+        for record in reader:
+            if record.level is not TraceLevel.TRANSPORT:
+                continue
+            if channel is None:
+                channel = record.channel
+            if record.channel != channel:
+                continue
+            if record.direction is TraceDirection.COMMAND:
+                command = record
+                continue
+            if command is None:
+                continue
+            if first_timestamp is None:
+                first_timestamp = command.timestamp
+            if pace:
+                delay = command.timestamp - first_timestamp - (time.perf_counter() - replay_start)
+                if delay > 0:
+                    time.sleep(delay)
+            start = time.perf_counter()
+            rapdu = connection.send_and_receive(bytes(command.payload))
+            replayed += time.perf_counter() - start
+            recorded += record.timestamp - command.timestamp
+            commands += 1
+            # Exchanges which failed without a response aren't compared
+            if record.sw and (len(rapdu) < 2 or int.from_bytes(rapdu[-2:], "big") != record.sw):
+                mismatches += 1
+            command = None
+        return ReplayResult(commands, mismatches, recorded, replayed)
+    finally:
+        if isinstance(trace, str):
+            reader.close()
@@ -12,42 +12,62 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import os
-from typing import Any
+import threading
+from typing import Any, Optional, Union
 
 import jpype.imports
 
+import openscp.connection
+import openscp.jvm
+
 # https://jpype.readthedocs.io/en/latest/install.html#known-bugs-limitations
 # Because of lack of JVM support, you cannot shutdown the JVM and then restart it. Nor can you start more than one
 # copy of the JVM.
 is_jvm_started = False
+_jvm_start_lock = threading.Lock()
+
+# Python-side handle of the Java byte[] type, resolved once the JVM is up
+_java_byte_array: Optional[Any] = None
+
+# Any Python object exposing the buffer protocol with byte items
+BytesLike = Union[bytes, bytearray, memoryview]
 
 
 def _start_jvm_if_needed() -> None:
     global is_jvm_started
     if is_jvm_started:
         return
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-    project_root = os.path.dirname(current_dir)
-    jpype.startJVM(classpath=[project_root + "/lib/*"])
-    is_jvm_started = True
+    with _jvm_start_lock:
+        if is_jvm_started:
+            return
+        config = openscp.jvm.get_jvm_config()
+        jpype.startJVM(*config.jvm_arguments(), jvmpath=config.jvm_path, classpath=config.full_classpath())
+        if threading.current_thread() is not threading.main_thread():
+            # The starting thread is attached as a user thread, and the JVM would wait for it forever at shutdown
+            jpype.java.lang.Thread.detach()
+            jpype.java.lang.Thread.attachAsDaemon()
+        is_jvm_started = True
 
 
-# java_bytes: byte[] (Java primitive)
-def _java_bytes_to_python_bytes(java_bytes: Any) -> bytes:
-    python_bytes_array = [_signed_to_unsigned_byte(java_bytes[i]) for i in range(java_bytes.length)]
-    python_bytes_str = ["{:02X}".format(python_bytes_array[i]) for i in range(len(python_bytes_array))]
-    return bytes.fromhex("".join(python_bytes_str))
+@jpype.JConversion("com.samsung.openscp.SmartCardConnection", instanceof=openscp.connection.SmartCardConnection)
+def _to_java_smart_card_connection(java_class: Any, connection: openscp.connection.SmartCardConnection) -> Any:
+    # SmartCardConnection no longer implements the Java interface itself, connections passed to Java APIs are
+    # adapted as before
+    from openscp.java_session import _JavaSmartCardConnection
+    return _JavaSmartCardConnection(connection)
 
 
 # java_bytes: byte[] (Java primitive)
-def _python_bytes_to_java_bytes(value: bytes) -> Any:  # -> java byte[]
-    _start_jvm_if_needed()
-    import java.io
-    baos = java.io.ByteArrayOutputStream()
-    baos.write(value, 0, len(value))
-    return baos.toByteArray()
+def _java_bytes_to_python_bytes(java_bytes: Any) -> bytes:
+    # JPype exposes primitive arrays through the buffer protocol, so the whole array is copied in one bulk
+    # operation instead of crossing the Python/Java boundary for every element
+    return bytes(java_bytes)
 
 
-def _signed_to_unsigned_byte(b: int) -> int:
-    return b & 0xFF
+def _python_bytes_to_java_bytes(value: BytesLike) -> Any:  # -> java byte[]
+    global _java_byte_array
+    if _java_byte_array is None:
+        _start_jvm_if_needed()
+        _java_byte_array = jpype.JArray(jpype.JByte)
+    # Single bulk copy from the Python buffer into a freshly allocated Java array
+    return _java_byte_array(value)
@@ -20,14 +20,21 @@ setup(
     name="openscp",
     version=VERSION,
     description="GlobalPlatform's SCP03 and SCP11 protocols implementation for off-card entity",
-    packages=find_packages(exclude=["*tests*"]),
+    packages=find_packages(exclude=["*tests*", "benchmarks*"]),
     python_requries=">=3.7",
     install_requries=[
         "JPype1"
     ],
     extras_require={
+        "native": [
+            "cryptography"
+        ],
+        "pcsc": [
+            "pyscard"
+        ],
         "test": [
             "JPype1",
+            "cryptography",
             "pytest"
         ],
         "docs": [
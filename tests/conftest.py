@@ -0,0 +1,41 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+
+import pytest
+
+from openscp import Backend
+
+
+@functools.lru_cache(maxsize=None)
+def java_available() -> bool:
+    try:
+        from openscp.jvm import start_jvm
+        start_jvm()
+    except Exception:  # JPype or a JVM is missing
+        return False
+    return True
+
+
+def require_java() -> None:
+    if not java_available():
+        pytest.skip("JVM is not available")
+
+
+@pytest.fixture(params=[Backend.NATIVE, Backend.JAVA], ids=["native", "java"])
+def backend(request: pytest.FixtureRequest) -> Backend:
+    if request.param is Backend.JAVA:
+        require_java()
+    return request.param
@@ -0,0 +1,140 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import concurrent.futures
+import threading
+from typing import Iterator
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import (Apdu, AsyncSecurityDomainSession, AsyncSmartCardConnection, Backend, Scp03KeySet, ScpError,
+                     ScpMode)
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+STORE_DATA = Apdu(0x80, 0xE2, 0x00, 0x00, b"data")
+# The card doesn't answer this one until the test lets it
+SLOW = Apdu(0x80, 0xE4, 0x00, 0x00, b"slow")
+
+_INS_SLOW = 0xE4
+
+
+class AsyncCard(AsyncSmartCardConnection):
+    """Simulated card answering on the event loop, holding back responses to :data:`SLOW`"""
+
+    def __init__(self) -> None:
+        self.card = SimulatedCard()
+        self.started = asyncio.Event()
+        self.answer = asyncio.Event()
+        self.closed = False
+
+    async def send_and_receive(self, apdu: bytes) -> bytes:
+        if apdu[1] == _INS_SLOW:
+            self.started.set()
+            await self.answer.wait()
+        return self.card.send_and_receive(apdu)
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return self.card.is_extended_length_apdu_supported()
+
+    async def close_connection(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def executor() -> Iterator[concurrent.futures.ThreadPoolExecutor]:
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_operations(backend: Backend, executor: concurrent.futures.Executor) -> None:
+    async def run() -> None:
+        card = AsyncCard()
+        async with AsyncSecurityDomainSession(card, backend, executor) as session:
+            await session.authenticate_scp03(KEY_SET, ScpMode.S8)
+            # Operations of one session are serialized
+            responses = await asyncio.gather(*[session.send_and_receive(STORE_DATA) for _ in range(10)])
+            assert responses == [b"data"] * 10
+            results = await session.send_many([STORE_DATA, STORE_DATA])
+            assert [result.data for result in results] == [b"data", b"data"]
+        assert card.closed
+
+    asyncio.run(run())
+
+
+def test_cancelling_mid_exchange_requires_authentication(backend: Backend,
+                                                         executor: concurrent.futures.Executor) -> None:
+    async def run() -> None:
+        card = AsyncCard()
+        session = AsyncSecurityDomainSession(card, backend, executor)
+        await session.authenticate_scp03(KEY_SET, ScpMode.S8)
+        task = asyncio.ensure_future(session.send_and_receive(SLOW))
+        await card.started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The secure channel state is unknown
+        with pytest.raises(ScpError, match="authenticated again"):
+            await session.send_and_receive(STORE_DATA)
+        with pytest.raises(ScpError, match="authenticated again"):
+            await session.get_certificate_bundle(0x11, 0x01)
+        await session.authenticate_scp03(KEY_SET, ScpMode.S8)
+        assert await session.send_and_receive(STORE_DATA) == b"data"
+        await session.close()
+
+    asyncio.run(run())
+
+
+def test_timeout_mid_exchange(executor: concurrent.futures.Executor) -> None:
+    async def run() -> None:
+        card = AsyncCard()
+        session = AsyncSecurityDomainSession(card, Backend.NATIVE, executor)
+        await session.authenticate_scp03(KEY_SET, ScpMode.S8)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(session.send_and_receive(SLOW), 0.1)
+        with pytest.raises(ScpError, match="authenticated again"):
+            await session.send_and_receive(STORE_DATA)
+        card.answer.set()
+        await session.authenticate_scp03(KEY_SET, ScpMode.S8)
+        assert await session.send_and_receive(SLOW) == b"slow"
+
+    asyncio.run(run())
+
+
+def test_cancelling_before_the_operation_started() -> None:
+    # The only worker thread is busy, the operation is still queued when it is cancelled
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    async def run() -> None:
+        card = AsyncCard()
+        session = AsyncSecurityDomainSession(card, Backend.NATIVE, executor)
+        task = asyncio.ensure_future(session.authenticate_scp03(KEY_SET, ScpMode.S8))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        # Nothing reached the card, the session isn't interrupted
+        await session.authenticate_scp03(KEY_SET, ScpMode.S8)
+        task = asyncio.ensure_future(session.send_and_receive(STORE_DATA))
+        assert await task == b"data"
+
+    try:
+        asyncio.run(run())
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,115 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from openscp import Apdu, ApduError, ApduTemplate, BadResponseError, ResponseApdu
+
+
+@pytest.mark.parametrize("apdu, encoded", [
+    (Apdu(0x80, 0xCA, 0x00, 0x66, b""), "80CA0066"),
+    (Apdu(0x80, 0xCA, 0x00, 0x66, b"", 0, True), "80CA006600"),
+    (Apdu(0x80, 0xCA, 0x00, 0x66, b"", 0x10), "80CA006610"),
+    (Apdu(0x80, 0xCA, 0x00, 0x66, b"", 256), "80CA006600"),
+    (Apdu(0x00, 0xA4, 0x04, 0x00, b"\xA0\x00"), "00A4040002A000"),
+    (Apdu(0x00, 0xA4, 0x04, 0x00, b"\xA0\x00", 256), "00A4040002A00000"),
+    (Apdu(0x80, 0xE2, 0x00, 0x00, bytes(255)), "80E20000FF" + "00" * 255),
+    (Apdu(0x80, 0xE2, 0x00, 0x00, bytes(256)), "80E20000000100" + "00" * 256),
+    (Apdu(0x80, 0xE2, 0x00, 0x00, bytes(256), 65536), "80E20000000100" + "00" * 256 + "0000"),
+    (Apdu(0x80, 0xCA, 0x00, 0x66, b"", 257), "80CA0066000101"),
+    (Apdu(0x80, 0xCA, 0x00, 0x66, b"", 65536), "80CA0066000000"),
+], ids=["case1", "case2-forced", "case2", "case2-max", "case3", "case4", "case3-max", "case3-extended",
+        "case4-extended", "case2-extended", "case2-extended-max"])
+def test_encode_decode(apdu: Apdu, encoded: str) -> None:
+    assert apdu.to_bytes().hex().upper() == encoded
+    decoded = Apdu.from_bytes(bytes.fromhex(encoded))
+    expected_le = 256 if apdu.force_add_le and not apdu.le else apdu.le
+    assert decoded == Apdu(apdu.cla, apdu.ins, apdu.p1, apdu.p2, apdu.data, expected_le)
+
+
+def test_forced_extended_length() -> None:
+    assert Apdu(0x80, 0xE2, 0x00, 0x00, b"\x01").to_bytes(extended=True) == bytes.fromhex("80E2000000000101")
+    assert Apdu(0x80, 0xCA, 0x00, 0x66, b"", 5).to_bytes(extended=True) == bytes.fromhex("80CA0066000005")
+    assert Apdu(0x80, 0xCA, 0x00, 0x66, b"").to_bytes(extended=True) == bytes.fromhex("80CA0066")
+    assert Apdu.from_bytes(bytes.fromhex("80E2000000000101")).data == b"\x01"
+
+
+@pytest.mark.parametrize("apdu, extended, message", [
+    (Apdu(0x80, 0xE2, 0x00, 0x00, bytes(256)), False, "Length must be no greater than 255"),
+    (Apdu(0x80, 0xE2, 0x00, 0x00, bytes(65536)), None, "Length must be no greater than 65535"),
+    (Apdu(0x80, 0xCA, 0x00, 0x00, b"", 257), False, "Le must be no greater than 256"),
+    (Apdu(0x80, 0xCA, 0x00, 0x00, b"", 65537), None, "Le must be no greater than 65536"),
+])
+def test_encode_too_long(apdu: Apdu, extended: bool, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        apdu.to_bytes(extended)
+
+
+@pytest.mark.parametrize("encoded", ["80CA00", "80E2000003AABB", "80E20000020102030405", "80E2000000000301",
+                                     "80E200000000"])
+def test_decode_wrong_length(encoded: str) -> None:
+    with pytest.raises(ValueError):
+        Apdu.from_bytes(bytes.fromhex(encoded))
+
+
+def test_repr() -> None:
+    assert repr(Apdu(0x80, 0xCA, 0x00, 0x66, b"\x01", 0x10)) == \
+        "Apdu(cla=0x80, ins=0xCA, p1=0x00, p2=0x66, data='01', le=16, force_add_le=False)"
+
+
+def test_response_apdu() -> None:
+    rapdu = bytearray(b"\x01\x02\x90\x00")
+    response = ResponseApdu.from_bytes(rapdu)
+    assert (bytes(response.data), response.sw, response.sw1, response.sw2) == (b"\x01\x02", 0x9000, 0x90, 0x00)
+    assert response.is_success and not response.is_warning
+    assert response.check() == b"\x01\x02"
+    assert response.to_bytes() == bytes(rapdu)
+    assert repr(response) == "ResponseApdu(data='0102', sw=0x9000)"
+    # The data is a view over the received bytes
+    rapdu[0] = 0xFF
+    assert response.data[0] == 0xFF
+
+
+@pytest.mark.parametrize("sw, warning, more_data, wrong_le", [
+    (0x6283, True, False, False),
+    (0x63C2, True, False, False),
+    (0x6110, False, True, False),
+    (0x6C20, False, False, True),
+    (0x6A82, False, False, False),
+])
+def test_response_status(sw: int, warning: bool, more_data: bool, wrong_le: bool) -> None:
+    response = ResponseApdu.from_bytes(sw.to_bytes(2, "big"))
+    assert not response.is_success
+    assert (response.is_warning, response.has_more_data, response.is_wrong_le) == (warning, more_data, wrong_le)
+    with pytest.raises(ApduError) as error:
+        response.check()
+    assert error.value.sw == sw
+
+
+def test_response_too_short() -> None:
+    with pytest.raises(BadResponseError):
+        ResponseApdu.from_bytes(b"\x90")
+
+
+def test_template_reuses_commands() -> None:
+    template = ApduTemplate(0x80, 0xE2, force_add_le=True, cache_size=2)
+    apdu = template(0x00, 0x01, b"\x01")
+    assert apdu == Apdu(0x80, 0xE2, 0x00, 0x01, b"\x01", 0, True)
+    assert template(0x00, 0x01, b"\x01") is apdu
+    template(0x00, 0x02)
+    template(0x00, 0x03)
+    assert template(0x00, 0x01, b"\x01") is not apdu
+    data = bytearray(b"\x02")
+    assert template(0x00, 0x01, data) is not template(0x00, 0x01, data)
+    assert ApduTemplate(0x80, 0xE2, cache_size=0)(0, 0) is not ApduTemplate(0x80, 0xE2, cache_size=0)(0, 0)
@@ -0,0 +1,121 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, Backend, ErrorPolicy, Scp03KeySet, ScpMode, SecurityDomainEmulator,
+                     SecurityDomainSession)
+from openscp.apdu import SW_OK
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+_INS_FAIL = 0x01
+_INS_CORRUPT = 0x02
+_SW_INS_NOT_SUPPORTED = 0x6D00
+
+
+def _handler(command: Apdu) -> Tuple[bytes, int]:
+    if command.ins == _INS_FAIL:
+        return b"", _SW_INS_NOT_SUPPORTED
+    return command.data, SW_OK
+
+
+class Card(SecurityDomainEmulator):
+    """Emulator that counts commands and corrupts the response MAC of :data:`_INS_CORRUPT` commands"""
+
+    def __init__(self) -> None:
+        super().__init__([KEY_SET], handler=_handler)
+        self.commands = 0
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        self.commands += 1
+        response = super().send_and_receive(apdu)
+        if apdu[1] == _INS_CORRUPT:
+            response = response[:-3] + bytes((response[-3] ^ 0x01,)) + response[-2:]
+        return response
+
+
+def command(ins: int, data: bytes) -> Apdu:
+    return Apdu(0x80, ins, 0x00, 0x00, data)
+
+
+COMMANDS = [command(0xE2, b"one"), command(_INS_FAIL, b"two"), command(0xE2, b"three")]
+
+
+def open_session(backend: Backend) -> Tuple[SecurityDomainSession, Card]:
+    card = Card()
+    session = SecurityDomainSession(card, backend)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    card.commands = 0
+    return session, card
+
+
+def test_stop(backend: Backend) -> None:
+    session, card = open_session(backend)
+    results = session.send_many(COMMANDS)
+    assert [(result.index, result.data, result.sw, result.ok) for result in results] == [
+        (0, b"one", SW_OK, True), (1, b"", _SW_INS_NOT_SUPPORTED, False)]
+    assert [result.apdu for result in results] == COMMANDS[:2]
+    assert all(result.duration >= 0 for result in results)
+    assert card.commands == 2
+    assert session.send_and_receive(command(0xE2, b"next")) == b"next"
+
+
+def test_continue(backend: Backend) -> None:
+    session, card = open_session(backend)
+    results = session.send_many(COMMANDS, ErrorPolicy.CONTINUE)
+    assert [(result.index, result.data, result.sw) for result in results] == [
+        (0, b"one", SW_OK), (1, b"", _SW_INS_NOT_SUPPORTED), (2, b"three", SW_OK)]
+    assert card.commands == 3
+    assert session.send_many([]) == []
+
+
+@pytest.mark.parametrize("error_policy", [ErrorPolicy.STOP, ErrorPolicy.CONTINUE])
+def test_other_errors_are_raised(backend: Backend, error_policy: ErrorPolicy) -> None:
+    session, card = open_session(backend)
+    results = session.stream([command(0xE2, b"one"), command(_INS_CORRUPT, b"two"), command(0xE2, b"three")],
+                             error_policy)
+    assert next(results).data == b"one"
+    # The Java backend doesn't translate its exceptions
+    with pytest.raises(Exception, match="Wrong MAC"):
+        next(results)
+    assert card.commands == 2
+
+
+def test_stream_is_lazy(backend: Backend) -> None:
+    session, card = open_session(backend)
+    consumed: List[int] = []
+
+    def commands() -> Iterator[Apdu]:
+        for index, data in enumerate((b"one", b"two", b"three", b"four")):
+            consumed.append(index)
+            yield command(_INS_FAIL if index == 2 else 0xE2, data)
+
+    results = session.stream(commands())
+    assert next(results).data == b"one"
+    assert consumed == [0] and card.commands == 1
+    assert [result.sw for result in results] == [SW_OK, _SW_INS_NOT_SUPPORTED]
+    # The command after the failed one is never generated
+    assert consumed == [0, 1, 2] and card.commands == 3
+
+
+def test_abandoned_stream_releases_the_session(backend: Backend) -> None:
+    session, card = open_session(backend)
+    results = session.stream(command(0xE2, bytes((index,))) for index in range(10))
+    assert next(results).data == b"\x00"
+    results.close()
+    assert card.commands == 1
+    assert session.send_and_receive(command(0xE2, b"next")) == b"next"
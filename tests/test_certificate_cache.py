@@ -0,0 +1,165 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import time
+from typing import List
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from benchmarks.simulated_card import (OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID, SD_KEY_VERSION, SimulatedCard,
+                                       oce_certificate, oce_private_key_bytes, sd_certificate, sd_public_key_bytes)
+from openscp import (AesAlg, Backend, CertificateCache, Scp11Credentials, ScpCertificate, ScpMode,
+                     SecurityDomainSession)
+
+CERTIFICATES = [ScpCertificate(b"\x30\x01\x00", b"\x01"), ScpCertificate(b"\x30\x01\x01", b"\x02")]
+
+
+def encoded(certificates: List[ScpCertificate]) -> List[tuple]:
+    return [(bytes(certificate.get_encoded()), bytes(certificate.get_public_key())) for certificate in certificates]
+
+
+def test_put_get() -> None:
+    cache = CertificateCache()
+    assert cache.get("card", 0x11, 1) is None
+    cache.put("card", 0x11, 1, CERTIFICATES)
+    assert encoded(cache.get("card", 0x11, 1)) == encoded(CERTIFICATES)
+    # str and bytes identities are distinct
+    assert cache.get(b"card", 0x11, 1) is None
+    assert cache.get("card", 0x11, 2) is None
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 3, 1)
+
+
+def test_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache = CertificateCache(ttl=10)
+    cache.put("card", 0x11, 1, CERTIFICATES)
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+    assert cache.get("card", 0x11, 1) is not None
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("card", 0x11, 1) is None
+    assert cache.stats().size == 0
+
+
+def test_least_recently_used_entries_are_dropped() -> None:
+    cache = CertificateCache(max_entries=2)
+    for card in ("a", "b"):
+        cache.put(card, 0x11, 1, CERTIFICATES)
+    cache.get("a", 0x11, 1)
+    cache.put("c", 0x11, 1, CERTIFICATES)
+    assert [cache.get(card, 0x11, 1) is not None for card in ("a", "b", "c")] == [True, False, True]
+    assert cache.stats().evictions == 1
+
+
+def test_invalidate() -> None:
+    cache = CertificateCache()
+    for key_version in (1, 2):
+        cache.put("card", 0x11, key_version, CERTIFICATES)
+    cache.put("other", 0x11, 1, CERTIFICATES)
+    assert cache.contains_public_key("card", 0x11, 1, b"\x02")
+    assert not cache.contains_public_key("card", 0x11, 1, b"\x03")
+    cache.invalidate("card", 0x11, 1)
+    assert cache.get("card", 0x11, 1) is None and cache.get("card", 0x11, 2) is not None
+    cache.invalidate("card")
+    assert cache.get("card", 0x11, 2) is None and cache.get("other", 0x11, 1) is not None
+    cache.clear()
+    assert cache.stats().size == 0
+
+
+def test_disk_tier(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    directory = str(tmp_path / "certificates")
+    CertificateCache(directory=directory).put("card", 0x11, 1, CERTIFICATES)
+    # Another process sees the entry
+    cache = CertificateCache(ttl=60, directory=directory)
+    assert encoded(cache.get("card", 0x11, 1)) == encoded(CERTIFICATES)
+    assert CertificateCache(directory=directory).contains_public_key("card", 0x11, 1, b"\x01")
+    CertificateCache(directory=directory).invalidate("card", 0x11, 1)
+    assert CertificateCache(directory=directory).get("card", 0x11, 1) is None
+    # Expired and corrupt entries are ignored
+    CertificateCache(directory=directory).put("card", 0x11, 2, CERTIFICATES)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert CertificateCache(ttl=60, directory=directory).get("card", 0x11, 2) is None
+    monkeypatch.undo()
+    CertificateCache(directory=directory).put("card", 0x11, 3, CERTIFICATES)
+    card_directory, = [name for name in os.listdir(directory)]
+    for name in os.listdir(os.path.join(directory, card_directory)):
+        with open(os.path.join(directory, card_directory, name), "w") as file:
+            file.write("{")
+    assert CertificateCache(directory=directory).get("card", 0x11, 3) is None
+    # Only card directories are cleared
+    (tmp_path / "certificates" / "notes.txt").write_text("kept")
+    cache = CertificateCache(directory=directory)
+    cache.put("card", 0x11, 1, CERTIFICATES)
+    cache.clear()
+    assert os.listdir(directory) == ["notes.txt"]
+
+
+class FlakyReader(SimulatedCard):
+    """Simulated card whose reader fails while ``fail`` is set"""
+
+    fail = False
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        if self.fail:
+            raise OSError("Reader is gone")
+        return super().send_and_receive(apdu)
+
+
+CREDENTIALS = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                               [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+
+
+def test_session_uses_cache(backend: Backend) -> None:
+    cache = CertificateCache()
+    card = FlakyReader()
+    session = SecurityDomainSession(card, backend, cache, b"card")
+    assert encoded(session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION))[0][0] == sd_certificate()
+    card.fail = True
+    assert encoded(session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION))[0][0] == sd_certificate()
+    assert cache.stats().hits == 1
+    # Without a card identity the cache isn't used
+    session = SecurityDomainSession(SimulatedCard(), backend, cache)
+    session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION)
+    assert cache.stats().hits == 1
+
+
+def test_transport_error_keeps_cached_certificates(backend: Backend) -> None:
+    cache = CertificateCache()
+    card = FlakyReader()
+    session = SecurityDomainSession(card, backend, cache, b"card")
+    session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION)
+    card.fail = True
+    with pytest.raises(Exception):
+        session.authenticate_scp11(CREDENTIALS, ScpMode.S8)
+    assert cache.get(b"card", SD_KEY_ID, SD_KEY_VERSION) is not None
+
+
+def test_replaced_sd_key_invalidates_cached_certificates(backend: Backend) -> None:
+    cache = CertificateCache()
+    SecurityDomainSession(SimulatedCard(), backend, cache, b"card").get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION)
+    # The card's SD key was replaced since its certificate was cached
+    card = SimulatedCard(sd_key=ec.derive_private_key(0x5D5D5D5E, ec.SECP256R1()))
+    session = SecurityDomainSession(card, backend, cache, b"card")
+    with pytest.raises(Exception):
+        session.authenticate_scp11(CREDENTIALS, ScpMode.S8)
+    assert cache.get(b"card", SD_KEY_ID, SD_KEY_VERSION) is None
+    # Certificates of another key are kept
+    cache.put(b"card", SD_KEY_ID, SD_KEY_VERSION, session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION))
+    with pytest.raises(Exception):
+        session.authenticate_scp11(CREDENTIALS, ScpMode.S8)
+    assert cache.get(b"card", SD_KEY_ID, SD_KEY_VERSION) is not None
@@ -0,0 +1,206 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+from typing import List, Optional
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+from openscp import (CertificateCache, CertificateValidationError, CertificateValidator, Scp11SdKey, ScpCertificate,
+                     SecurityDomainEmulator, SecurityDomainSession)
+from openscp.native_session import _parse_certificate
+from openscp.tlv import encode_tlv
+
+NOT_BEFORE = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+NOT_AFTER = datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+
+_GP_CURVES = {"secp256r1": 0x00, "secp384r1": 0x01, "brainpoolP256r1": 0x03}
+
+
+def x509_certificate(subject_key: ec.EllipticCurvePrivateKey,
+                     issuer_key: ec.EllipticCurvePrivateKey,
+                     ca: Optional[bool],
+                     key_agreement: bool = False,
+                     key_usage: bool = True) -> bytes:
+    # ca=None leaves basic constraints out
+    name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, "test")])
+    builder = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(subject_key.public_key())
+               .serial_number(x509.random_serial_number()).not_valid_before(NOT_BEFORE).not_valid_after(NOT_AFTER))
+    if ca is not None:
+        builder = builder.add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    if key_usage:
+        builder = builder.add_extension(x509.KeyUsage(digital_signature=False, content_commitment=False,
+                                                      key_encipherment=False, data_encipherment=False,
+                                                      key_agreement=key_agreement, key_cert_sign=bool(ca),
+                                                      crl_sign=bool(ca), encipher_only=False, decipher_only=False),
+                                        critical=True)
+    return builder.sign(issuer_key, hashes.SHA256()).public_bytes(serialization.Encoding.DER)
+
+
+def gp_certificate(subject_key: ec.EllipticCurvePrivateKey,
+                   issuer_key: ec.EllipticCurvePrivateKey,
+                   key_usage: bytes,
+                   expiration: Optional[bytes] = b"\x20\x29\x12\x31",
+                   corrupt: bool = False) -> bytes:
+    point = subject_key.public_key().public_bytes(serialization.Encoding.X962,
+                                                  serialization.PublicFormat.UncompressedPoint)
+    public_key = encode_tlv(0xB0, point) + encode_tlv(0xF0, bytes([_GP_CURVES[subject_key.curve.name]]))
+    body = (encode_tlv(0x93, b"\x01") + encode_tlv(0x42, b"\x02") + encode_tlv(0x5F20, b"\x03")
+            + encode_tlv(0x95, key_usage) + encode_tlv(0x5F25, b"\x20\x20\x01\x01")
+            + (encode_tlv(0x5F24, expiration) if expiration else b"")
+            + encode_tlv(0x7F49, public_key))
+    hash_algorithm = hashes.SHA256() if issuer_key.curve.key_size <= 256 else hashes.SHA384()
+    r, s = decode_dss_signature(issuer_key.sign(body, ec.ECDSA(hash_algorithm)))
+    size = (issuer_key.curve.key_size + 7) // 8
+    signature = r.to_bytes(size, "big") + s.to_bytes(size, "big")
+    if corrupt:
+        signature = signature[:-1] + bytes([signature[-1] ^ 1])
+    return encode_tlv(0x7F21, body + encode_tlv(0x5F37, signature))
+
+
+def bundle(*encoded: bytes) -> List[ScpCertificate]:
+    return [_parse_certificate(certificate) for certificate in encoded]
+
+
+def spki(key: ec.EllipticCurvePrivateKey) -> bytes:
+    return key.public_key().public_bytes(serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+ROOT_KEY = ec.generate_private_key(ec.SECP256R1())
+CA_KEY = ec.generate_private_key(ec.SECP384R1())
+SD_KEY = ec.generate_private_key(ec.SECP256R1())
+ROOT = x509_certificate(ROOT_KEY, ROOT_KEY, True)
+CA = x509_certificate(CA_KEY, ROOT_KEY, True)
+SD = x509_certificate(SD_KEY, CA_KEY, False, key_agreement=True)
+
+
+@pytest.fixture
+def validator() -> CertificateValidator:
+    return CertificateValidator([ROOT])
+
+
+def test_valid_chain(validator: CertificateValidator) -> None:
+    assert validator.validate(bundle(CA, SD)) == spki(SD_KEY)
+    assert validator.validate(bundle(ROOT, CA, SD)) == spki(SD_KEY)
+    stats = validator.stats()
+    assert (stats.misses, stats.hits) == (2, 2)
+
+
+def test_sd_certificate_without_extensions_is_accepted(validator: CertificateValidator) -> None:
+    plain = x509_certificate(SD_KEY, CA_KEY, None, key_usage=False)
+    assert validator.validate(bundle(CA, plain)) == spki(SD_KEY)
+
+
+@pytest.mark.parametrize("certificates, at, message", [
+    (lambda: bundle(SD), None, "not signed by a trusted issuer"),
+    (lambda: bundle(CA, SD), datetime.datetime(2031, 1, 1, tzinfo=datetime.timezone.utc), "has expired"),
+    (lambda: bundle(CA, SD), datetime.datetime(2019, 1, 1, tzinfo=datetime.timezone.utc), "not valid yet"),
+    (lambda: bundle(CA), None, "key agreement"),
+    (lambda: bundle(CA, x509_certificate(SD_KEY, CA_KEY, False)), None, "key agreement"),
+    (lambda: bundle(x509_certificate(CA_KEY, ROOT_KEY, False, key_agreement=True), SD), None, "may not sign"),
+    (lambda: [], None, "empty"),
+    (lambda: [ScpCertificate(b"\x30\x03\x02\x01\x00", b"")], None, "malformed"),
+], ids=["untrusted", "expired", "not-yet-valid", "ca-last", "no-key-agreement", "not-a-ca", "empty", "malformed"])
+def test_invalid_chain(validator: CertificateValidator, certificates, at, message) -> None:
+    with pytest.raises(CertificateValidationError, match=message):
+        validator.validate(certificates(), at)
+
+
+@pytest.mark.parametrize("issuer_key_usage", [False, True], ids=["no-key-usage", "key-agreement-usage"])
+def test_certificate_without_basic_constraints_may_not_sign(validator: CertificateValidator,
+                                                            issuer_key_usage: bool) -> None:
+    # An SD certificate without basic constraints must not issue a rogue certificate for another key
+    leaf_key = ec.generate_private_key(ec.SECP256R1())
+    rogue_key = ec.generate_private_key(ec.SECP256R1())
+    leaf = x509_certificate(leaf_key, CA_KEY, None, key_agreement=True, key_usage=issuer_key_usage)
+    rogue = x509_certificate(rogue_key, leaf_key, None, key_usage=False)
+    with pytest.raises(CertificateValidationError, match="Certificate 1 may not sign"):
+        validator.validate(bundle(CA, leaf, rogue))
+
+
+def test_ca_without_key_cert_sign_may_not_sign(validator: CertificateValidator) -> None:
+    name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, "ca")])
+    ca = (x509.CertificateBuilder().subject_name(name).issuer_name(name).public_key(CA_KEY.public_key())
+          .serial_number(1).not_valid_before(NOT_BEFORE).not_valid_after(NOT_AFTER)
+          .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+          .add_extension(x509.KeyUsage(digital_signature=True, content_commitment=False, key_encipherment=False,
+                                       data_encipherment=False, key_agreement=False, key_cert_sign=False,
+                                       crl_sign=False, encipher_only=False, decipher_only=False), critical=True)
+          .sign(ROOT_KEY, hashes.SHA256()).public_bytes(serialization.Encoding.DER))
+    with pytest.raises(CertificateValidationError, match="may not sign"):
+        validator.validate(bundle(ca, SD))
+
+
+def test_gp_chain(validator: CertificateValidator) -> None:
+    ca_key = ec.generate_private_key(ec.SECP384R1())
+    sd_key = ec.generate_private_key(ec.BrainpoolP256R1())
+    ca = gp_certificate(ca_key, ROOT_KEY, b"\x82")
+    sd = gp_certificate(sd_key, ca_key, b"\x00\x80")
+    assert validator.validate(bundle(ca, sd)) == spki(sd_key)
+    assert CertificateValidator([ca]).validate(bundle(sd)) == spki(sd_key)
+    with pytest.raises(CertificateValidationError, match="not signed"):
+        validator.validate(bundle(ca, gp_certificate(sd_key, ca_key, b"\x00\x80", corrupt=True)))
+    with pytest.raises(CertificateValidationError, match="key agreement"):
+        validator.validate(bundle(ca, gp_certificate(sd_key, ca_key, b"\x82")))
+    with pytest.raises(CertificateValidationError, match="may not sign"):
+        validator.validate(bundle(gp_certificate(ca_key, ROOT_KEY, b"\x00\x80"), sd))
+    with pytest.raises(CertificateValidationError, match="expired"):
+        validator.validate(bundle(ca, gp_certificate(sd_key, ca_key, b"\x00\x80", b"\x20\x21\x01\x01")))
+    with pytest.raises(CertificateValidationError, match="expired"):
+        validator.validate(bundle(ca, sd), datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc))
+
+
+def test_several_trust_anchors() -> None:
+    other_key = ec.generate_private_key(ec.SECP256R1())
+    validator = CertificateValidator([x509_certificate(other_key, other_key, True), ROOT])
+    assert validator.validate(bundle(CA, SD)) == spki(SD_KEY)
+    forged_ca = x509_certificate(CA_KEY, other_key, True)
+    assert validator.validate(bundle(forged_ca, SD)) == spki(SD_KEY)
+    assert CertificateValidator([ROOT], max_entries=0).validate(bundle(CA, SD)) == spki(SD_KEY)
+
+
+def test_malformed_trust_anchor() -> None:
+    with pytest.raises(CertificateValidationError):
+        CertificateValidator([b"junk"])
+
+
+def test_validate_many(validator: CertificateValidator) -> None:
+    bundles = [bundle(CA, x509_certificate(ec.generate_private_key(ec.SECP256R1()), CA_KEY, False, True))
+               for _ in range(5)] + [bundle(SD)]
+    results = validator.validate_many(bundles, max_workers=4)
+    assert [result.error is None for result in results] == [True] * 5 + [False]
+    assert results[-1].public_key is None
+    assert [result.public_key for result in validator.validate_many(bundles, max_workers=1)] == \
+        [result.public_key for result in results]
+    validator.clear()
+    assert validator.stats().size == 0
+
+
+def test_session_caches_valid_bundles_only(backend, validator: CertificateValidator) -> None:
+    private_key = SD_KEY.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                                       serialization.NoEncryption())
+    cache = CertificateCache()
+    card = SecurityDomainEmulator(scp11_keys=[Scp11SdKey(0x13, 1, private_key, [CA, SD])])
+    session = SecurityDomainSession(card, backend, cache, b"valid", certificate_validator=validator)
+    assert len(session.get_certificate_bundle(0x13, 1)) == 2
+    assert cache.get(b"valid", 0x13, 1) is not None
+    card = SecurityDomainEmulator(scp11_keys=[Scp11SdKey(0x13, 1, private_key, [SD])])
+    session = SecurityDomainSession(card, backend, cache, b"invalid", certificate_validator=validator)
+    with pytest.raises(CertificateValidationError):
+        session.get_certificate_bundle(0x13, 1)
+    assert cache.get(b"invalid", 0x13, 1) is None
@@ -0,0 +1,97 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import threading
+from typing import Callable, List, Set
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import Apdu, Backend, Concurrency, Scp03KeySet, ScpMode, SecurityDomainEmulator, SecurityDomainSession
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+
+class Card(SecurityDomainEmulator):
+    """Emulator detecting concurrent use and recording the threads that use it"""
+
+    def __init__(self) -> None:
+        super().__init__([KEY_SET], latency=0.0005)
+        self.threads: Set[int] = set()
+        self._in_use = threading.Lock()
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        if not self._in_use.acquire(blocking=False):
+            raise AssertionError("The card is used by two threads")
+        try:
+            self.threads.add(threading.get_ident())
+            return super().send_and_receive(apdu)
+        finally:
+            self._in_use.release()
+
+
+def exchange(session: SecurityDomainSession, step: int) -> None:
+    payload = os.urandom(1 + step % 200)
+    apdu = Apdu(0x80, 0xE2, 0x00, 0x00, payload)
+    if step % 10 == 3:
+        assert [bytes(result.data) for result in session.stream([apdu] * 3)] == [payload] * 3
+    elif step % 10 == 7:
+        assert [result.data for result in session.send_many([apdu] * 3)] == [payload] * 3
+    else:
+        assert session.send_and_receive(apdu) == payload
+
+
+def run_threads(threads: int, work: Callable[[int], None]) -> None:
+    errors: List[BaseException] = []
+
+    def target(index: int) -> None:
+        try:
+            work(index)
+        except BaseException as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=target, args=(index,)) for index in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if errors:
+        raise errors[0]
+
+
+@pytest.mark.parametrize("concurrency", [Concurrency.LOCK, Concurrency.QUEUE], ids=["lock", "queue"])
+def test_shared_session(backend: Backend, concurrency: Concurrency) -> None:
+    card = Card()
+    session = SecurityDomainSession(card, backend, concurrency=concurrency)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    run_threads(8, lambda index: [exchange(session, index + step) for step in range(40)])
+    exchange(session, 0)
+    if concurrency is Concurrency.QUEUE:
+        assert len(card.threads) == 1 and threading.get_ident() not in card.threads
+
+
+def test_independent_sessions(backend: Backend) -> None:
+    sessions = [SecurityDomainSession(Card(), backend) for _ in range(8)]
+    for session in sessions:
+        session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    run_threads(len(sessions), lambda index: [exchange(sessions[index], step) for step in range(40)])
+
+
+def test_queue_raises_in_caller(backend: Backend) -> None:
+    session = SecurityDomainSession(Card(), backend, concurrency=Concurrency.QUEUE)
+    with pytest.raises(Exception):
+        session.authenticate_scp03(Scp03KeySet(0x01, KEY_VERSION, MAC_KEY, ENC_KEY, DEK_KEY), ScpMode.S8)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    exchange(session, 1)
@@ -0,0 +1,133 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pickle
+from typing import Any, Callable
+
+import pytest
+
+from benchmarks.simulated_card import (DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID,
+                                       SD_KEY_VERSION, SimulatedCard, oce_certificate, oce_private_key_bytes,
+                                       sd_public_key_bytes)
+from openscp import AesAlg, Apdu, Backend, Scp03KeySet, Scp11Credentials, ScpMode, SecurityDomainSession
+
+STORE_DATA = Apdu(0x80, 0xE2, 0x00, 0x00, b"data")
+
+
+def key_set() -> Scp03KeySet:
+    return Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+
+def credentials() -> Scp11Credentials:
+    return Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                            [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+
+
+def fields(value: Any) -> Any:
+    if isinstance(value, Scp03KeySet):
+        return value.key_id, value.key_version, value.enc_key, value.mac_key, value.dek_key
+    return (value.sd_key_id, value.sd_key_version, value.oce_key_id, value.oce_key_version, value.pk_sd_ecka_bytes,
+            value.cert_chain_oce_ecka, value.sk_oce_ecka_bytes, value.session_keys_alg)
+
+
+@pytest.mark.parametrize("create, field", [(key_set, "enc_key"), (credentials, "pk_sd_ecka_bytes")],
+                         ids=["SCP03", "SCP11"])
+def test_immutable(create: Callable[[], Any], field: str) -> None:
+    value = create()
+    with pytest.raises(AttributeError):
+        setattr(value, field, b"")
+    with pytest.raises(AttributeError):
+        setattr(value, "_" + field, b"")
+    with pytest.raises(AttributeError):
+        delattr(value, "_" + field)
+    with pytest.raises(AttributeError):
+        value.other = 1
+    assert fields(value) == fields(create())
+
+
+def test_keys_are_copied() -> None:
+    enc_key = bytearray(ENC_KEY)
+    certificate = bytearray(oce_certificate())
+    value = Scp03KeySet(0x01, KEY_VERSION, enc_key, MAC_KEY, DEK_KEY)
+    chain = [certificate]
+    scp11 = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(), chain,
+                             oce_private_key_bytes(), AesAlg.AES_128)
+    enc_key[0] ^= 0xFF
+    certificate[0] ^= 0xFF
+    chain.append(b"")
+    assert value.enc_key == ENC_KEY
+    assert scp11.cert_chain_oce_ecka == (oce_certificate(),)
+
+
+@pytest.mark.parametrize("create", [key_set, credentials], ids=["SCP03", "SCP11"])
+def test_picklable(backend: Backend, create: Callable[[], Any]) -> None:
+    value = create()
+    session = SecurityDomainSession(SimulatedCard(), backend)
+    if isinstance(value, Scp03KeySet):
+        session.authenticate_scp03(value, ScpMode.S8)
+    else:
+        session.authenticate_scp11(value, ScpMode.S8)
+    # Prepared backend objects are left out
+    copy = pickle.loads(pickle.dumps(value))
+    assert type(copy) is type(value)
+    assert fields(copy) == fields(value)
+    assert repr(copy) == repr(value)
+    session = SecurityDomainSession(SimulatedCard(), backend)
+    if isinstance(copy, Scp03KeySet):
+        session.authenticate_scp03(copy, ScpMode.S8)
+    else:
+        session.authenticate_scp11(copy, ScpMode.S8)
+    assert session.send_and_receive(STORE_DATA) == b"data"
+
+
+def test_prepared_once() -> None:
+    value = key_set()
+    prepared = value._prepare("test", object)
+    assert value._prepare("test", object) is prepared
+    assert value._prepare("other", object) is not prepared
+
+
+def test_scp03_arguments_are_not_mixed() -> None:
+    session = SecurityDomainSession(SimulatedCard(), Backend.NATIVE)
+    with pytest.raises(TypeError):
+        session.authenticate_scp03(key_set(), ScpMode.S8, ENC_KEY)
+    with pytest.raises(TypeError):
+        session.authenticate_scp03(key_set(), ScpMode.S8, dek_key=DEK_KEY)
+    with pytest.raises(TypeError):
+        session.authenticate_scp03(key_set(), ScpMode.S8, scp_mode=ScpMode.S8)
+    with pytest.raises(TypeError):
+        session.authenticate_scp03(key_set())
+    with pytest.raises(TypeError):
+        session.authenticate_scp03(key_set(), KEY_VERSION)
+    with pytest.raises(TypeError):
+        session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+    session.authenticate_scp03(key_set(), scp_mode=ScpMode.S8)
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+    assert session.send_and_receive(STORE_DATA) == b"data"
+
+
+def test_scp11_arguments_are_not_mixed() -> None:
+    session = SecurityDomainSession(SimulatedCard(), Backend.NATIVE)
+    with pytest.raises(TypeError):
+        session.authenticate_scp11(credentials(), ScpMode.S8, OCE_KEY_ID)
+    with pytest.raises(TypeError):
+        session.authenticate_scp11(credentials(), ScpMode.S8, session_keys_alg=AesAlg.AES_128)
+    with pytest.raises(TypeError):
+        session.authenticate_scp11(credentials(), ScpMode.S8, scp_mode=ScpMode.S8)
+    with pytest.raises(TypeError):
+        session.authenticate_scp11(credentials())
+    with pytest.raises(TypeError):
+        session.authenticate_scp11(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                                   [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+    session.authenticate_scp11(credentials(), scp_mode=ScpMode.S8)
+    assert session.send_and_receive(STORE_DATA) == b"data"
@@ -0,0 +1,91 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+
+import pytest
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+import openscp.diversification
+from openscp import DiversificationMethod, Scp03KeySet, diversify_key_set, diversify_key_sets
+from openscp.scp_state import derive_key
+
+MASTER_128 = Scp03KeySet(0x01, 0x30, bytes(range(0x40, 0x50)), bytes(range(0x40, 0x50)), bytes(range(0x40, 0x50)))
+MASTER_256 = Scp03KeySet(0x02, 0x31, bytes(range(0x40, 0x60)), bytes(range(0x50, 0x70)), bytes(range(0x60, 0x80)))
+CIN = bytes.fromhex("0102030405060708090A")
+
+
+def key_hex(key_set: Scp03KeySet) -> tuple:
+    return key_set.enc_key.hex().upper(), key_set.mac_key.hex().upper(), key_set.dek_key.hex().upper()
+
+
+def test_kdf3_known_answer() -> None:
+    # Computed with the AES-CMAC of the cryptography package
+    assert key_hex(diversify_key_set(MASTER_128, CIN)) == (
+        "7698A7ED057B098998D9E88770528B13", "46E6C742A90A406C0BBA3CA0AEB69591", "E33DE864B971A69BD5BBC87516D7E907")
+    enc_key = diversify_key_set(Scp03KeySet(0x01, 0x30, MASTER_256.enc_key, MASTER_128.mac_key, MASTER_128.dek_key),
+                                CIN).enc_key
+    assert enc_key.hex().upper() == "7FA00BA80F8875396D74F6484B5D947ED3E6A51F6D48139E48EF82996D5654B0"
+
+
+def test_emv_cps_11_known_answer() -> None:
+    assert key_hex(diversify_key_set(MASTER_128, CIN, DiversificationMethod.EMV_CPS_11)) == (
+        "0725776A613AC9A1906657AACE230198", "0A8FFED1525807795A9024CD1A313608", "AAADAB807102FF3216CB2EDA8050A090")
+
+
+def emv_cps_11_key(master_key: bytes, constant: int, data: bytes) -> bytes:
+    encryptor = Cipher(algorithms.AES(master_key), modes.ECB()).encryptor()
+    block = data[-6:] + bytes((0xF0, constant)) + data[-6:] + bytes((0x0F, constant))
+    return encryptor.update(block) + encryptor.finalize()
+
+
+@pytest.mark.parametrize("master", [MASTER_128, MASTER_256], ids=["AES-128", "AES-256"])
+@pytest.mark.parametrize("method", list(DiversificationMethod), ids=lambda method: method.value)
+def test_batch_matches_per_card_derivation(monkeypatch: pytest.MonkeyPatch, master: Scp03KeySet,
+                                           method: DiversificationMethod) -> None:
+    # Several passes, with lengths which fill whole blocks, leave them partial or are empty
+    monkeypatch.setattr(openscp.diversification, "_CHUNK_SIZE", 7)
+    generator = random.Random(21)
+    minimum = 6 if method is DiversificationMethod.EMV_CPS_11 else 0
+    cards = [bytes(generator.getrandbits(8) for _ in range(generator.choice([minimum, 6, 10, 16, 17, 32, 40])))
+             for _ in range(50)]
+    key_sets = diversify_key_sets(master, cards, method)
+    assert len(key_sets) == len(cards)
+    master_keys = (master.enc_key, master.mac_key, master.dek_key)
+    for card, key_set in zip(cards, key_sets):
+        assert (key_set.key_id, key_set.key_version) == (master.key_id, master.key_version)
+        if method is DiversificationMethod.KDF3:
+            expected = tuple(derive_key(key, constant, card, len(key) * 8)
+                             for key, constant in zip(master_keys, (1, 2, 3)))
+        else:
+            expected = tuple(emv_cps_11_key(key, constant, card) for key, constant in zip(master_keys, (1, 2, 3)))
+        assert (key_set.enc_key, key_set.mac_key, key_set.dek_key) == expected
+
+
+def test_no_cards() -> None:
+    assert diversify_key_sets(MASTER_128, []) == []
+
+
+@pytest.mark.parametrize("length", [0, 15, 20, 33])
+def test_bad_master_key_length(length: int) -> None:
+    master = Scp03KeySet(0x01, 0x30, MASTER_128.enc_key, bytes(length), MASTER_128.dek_key)
+    for method in DiversificationMethod:
+        with pytest.raises(ValueError, match="Master keys"):
+            diversify_key_sets(master, [CIN], method)
+
+
+def test_emv_cps_11_card_data_too_short() -> None:
+    with pytest.raises(ValueError, match="at least 6 bytes"):
+        diversify_key_sets(MASTER_128, [CIN, CIN[:5]], DiversificationMethod.EMV_CPS_11)
+    # KDF3 takes any context
+    assert len(diversify_key_sets(MASTER_128, [CIN[:5], b""])) == 2
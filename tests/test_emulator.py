@@ -0,0 +1,119 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import List, Tuple
+
+import pytest
+
+from benchmarks.simulated_card import (DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID,
+                                       SD_KEY_VERSION, SimulatedCard, oce_certificate, oce_private_key_bytes,
+                                       sd_public_key_bytes)
+from openscp import AesAlg, Apdu, Backend, Scp03KeySet, Scp11Credentials, ScpMode, SecurityDomainEmulator, \
+    SecurityDomainSession
+from openscp.apdu import SW_OK
+from openscp.emulator import SW_REFERENCE_NOT_FOUND
+from openscp.exceptions import _status_word
+
+FIRST_KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+SECOND_KEY_SET = Scp03KeySet(0x01, KEY_VERSION + 1, DEK_KEY, ENC_KEY, MAC_KEY)
+
+
+def status_word(response: bytes) -> int:
+    return int.from_bytes(response[-2:], "big")
+
+
+def initialize_update(key_version: int) -> bytes:
+    return Apdu(0x80, 0x50, key_version, 0x00, bytes(8), 0x00, True).to_bytes()
+
+
+def test_key_version_zero_selects_the_first_key_set(backend: Backend) -> None:
+    card = SecurityDomainEmulator([FIRST_KEY_SET, SECOND_KEY_SET])
+    response = card.send_and_receive(initialize_update(0))
+    assert status_word(response) == SW_OK
+    # Key information: key version, SCP03, i parameter
+    assert response[10:12] == bytes((KEY_VERSION, 0x03))
+    assert card.send_and_receive(initialize_update(KEY_VERSION + 1))[10] == KEY_VERSION + 1
+    assert status_word(card.send_and_receive(initialize_update(0x7F))) == SW_REFERENCE_NOT_FOUND
+
+    SecurityDomainSession(card, backend).authenticate_scp03(0x01, 0, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+    assert card.secure_channel_open
+    card.reset()
+    # Keys of the second key set don't match the first one
+    with pytest.raises(Exception, match="Wrong SCP03 key set"):
+        SecurityDomainSession(card, backend).authenticate_scp03(0x01, 0, DEK_KEY, ENC_KEY, MAC_KEY, ScpMode.S8)
+    assert not card.secure_channel_open
+    SecurityDomainSession(card, backend).authenticate_scp03(SECOND_KEY_SET, ScpMode.S16)
+    assert card.secure_channel_open
+
+
+@pytest.mark.parametrize("length, parts", [
+    (255, [255]),
+    (256, [256]),
+    (257, [256, 1]),
+    (600, [256, 256, 88]),
+], ids=["255", "256", "257", "600"])
+def test_chaining_and_get_response(length: int, parts: List[int]) -> None:
+    card = SecurityDomainEmulator()
+    data = bytes(index & 0xFF for index in range(length))
+    # Chained plain commands, the handler echoes the data of the whole chain
+    for offset in range(0, length - 100, 100):
+        assert card.send_and_receive(Apdu(0x90, 0xE2, 0x00, 0x00, data[offset:offset + 100]).to_bytes()) == b"\x90\x00"
+    last = (length - 1) // 100 * 100
+    response = card.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, data[last:]).to_bytes())
+    received = b""
+    for index, part in enumerate(parts):
+        assert len(response) == part + 2
+        received += response[:-2]
+        if index == len(parts) - 1:
+            assert status_word(response) == SW_OK
+        else:
+            remaining = min(length - len(received), 256) & 0xFF
+            assert response[-2:] == bytes((0x61, remaining))
+            response = card.send_and_receive(bytes.fromhex("00C0000000"))
+    assert received == data
+
+
+def test_extended_length_response_is_not_split() -> None:
+    card = SecurityDomainEmulator(extended_length=True)
+    data = bytes(600)
+    command = Apdu(0x80, 0xE2, 0x00, 0x00, data, 0x00, True).to_bytes(extended=True)
+    assert card.send_and_receive(command) == data + b"\x90\x00"
+
+
+def _sized_response(command: Apdu) -> Tuple[bytes, int]:
+    # P1 P2 is the response length
+    length = command.p1 << 8 | command.p2
+    return bytes(index & 0xFF for index in range(length)), SW_OK
+
+
+@pytest.mark.parametrize("length", [200, 256, 300, 600])
+def test_long_secured_responses(backend: Backend, length: int) -> None:
+    card = SecurityDomainEmulator([FIRST_KEY_SET], handler=_sized_response)
+    session = SecurityDomainSession(card, backend)
+    session.authenticate_scp03(FIRST_KEY_SET, ScpMode.S8)
+    # Padded and MACed responses longer than 256 bytes are read with GET RESPONSE by the session
+    expected = bytes(index & 0xFF for index in range(length))
+    assert session.send_and_receive(Apdu(0x80, 0xE2, length >> 8, length & 0xFF, b"", 0x00, True)) == expected
+
+
+def test_unknown_scp11_key(backend: Backend) -> None:
+    card = SimulatedCard()
+    session = SecurityDomainSession(card, backend)
+    credentials = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION + 1, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                                   [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+    with pytest.raises(Exception) as error:
+        session.authenticate_scp11(credentials, ScpMode.S8)
+    assert _status_word(error.value) == SW_REFERENCE_NOT_FOUND
+    assert not card.secure_channel_open
+    assert session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION + 1) == []
+    assert len(session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION)) == 1
@@ -0,0 +1,140 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import itertools
+import threading
+import time
+from typing import Callable, Iterator, List
+
+import pytest
+
+from benchmarks.simulated_card import (OCE_KEY_ID, OCE_KEY_VERSION, SD_KEY_ID, SD_KEY_VERSION, SimulatedCard,
+                                       oce_certificate, oce_private_key_bytes, sd_public_key_bytes)
+from openscp import (AesAlg, Apdu, Backend, EphemeralKeyPool, Scp11Credentials, ScpMode, SecurityDomainSession,
+                     get_ephemeral_key_pool)
+
+KEY = ("test", "1.2.3")
+P256 = "1.2.840.10045.3.1.7"
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def pool() -> Iterator[EphemeralKeyPool]:
+    pool = EphemeralKeyPool()
+    yield pool
+    pool.capacity = 0
+
+
+def test_pairs_are_handed_out_once(pool: EphemeralKeyPool) -> None:
+    counter = itertools.count()
+    pool.capacity = 4
+    taken: List[int] = []
+    lock = threading.Lock()
+    # The first miss starts generation, the threads start with a full pool
+    assert pool._take(KEY, lambda: next(counter)) is None
+    wait_for(lambda: pool.stats().depth == {"test 1.2.3": 4})
+
+    def take() -> None:
+        for _ in range(200):
+            pair = pool._take(KEY, lambda: next(counter))
+            if pair is not None:
+                with lock:
+                    taken.append(pair)
+
+    threads = [threading.Thread(target=take) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert taken and len(set(taken)) == len(taken)
+    stats = pool.stats()
+    assert stats.hits == len(taken) and stats.hits + stats.misses == 801
+
+
+def test_hits_misses_and_depth(pool: EphemeralKeyPool) -> None:
+    assert pool._take(KEY, object) is None
+    assert pool.stats().misses == 0  # a disabled pool doesn't count
+    pool.capacity = 3
+    assert pool._take(KEY, object) is None
+    wait_for(lambda: pool.stats().depth == {"test 1.2.3": 3})
+    assert pool._take(KEY, object) is not None
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.capacity) == (1, 1, 3)
+    wait_for(lambda: pool.stats().generated == 4)
+    assert pool.stats().depth == {"test 1.2.3": 3}
+
+
+def test_lowering_capacity_destroys_pairs(pool: EphemeralKeyPool) -> None:
+    destroyed: List[object] = []
+    pool.capacity = 3
+    pool._take(KEY, object, destroyed.append)
+    wait_for(lambda: pool.stats().depth == {"test 1.2.3": 3})
+    pool.capacity = 1
+    stats = pool.stats()
+    assert (stats.depth, stats.discarded, len(destroyed)) == ({"test 1.2.3": 1}, 2, 2)
+    pool.clear()
+    assert len(destroyed) == 3
+    # Destroyer failures don't break the pool
+    pool._take(KEY, object, lambda pair: 1 / 0)
+    wait_for(lambda: pool.stats().depth == {"test 1.2.3": 1})
+    pool.clear()
+    assert pool.stats().discarded == 4
+
+
+def test_zero_capacity_disables_the_pool(pool: EphemeralKeyPool) -> None:
+    pool.capacity = 2
+    pool._take(KEY, object)
+    wait_for(lambda: pool.stats().depth == {"test 1.2.3": 2})
+    pool.capacity = 0
+    assert pool.stats().depth == {"test 1.2.3": 0}
+    assert pool._take(KEY, object) is None
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.capacity) == (0, 1, 0)
+    wait_for(lambda: pool._worker is None)
+    pool.capacity = -1
+    assert pool.capacity == 0
+
+
+def test_failing_generator_is_dropped(pool: EphemeralKeyPool) -> None:
+    pool.capacity = 2
+    pool._take(KEY, lambda: 1 / 0)
+    wait_for(lambda: KEY not in pool._generators)
+    assert pool.stats().generated == 0
+
+
+CREDENTIALS = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                               [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+
+
+def test_session_takes_pairs_from_the_pool(backend: Backend) -> None:
+    pool = get_ephemeral_key_pool()
+    pool.capacity = 2
+    try:
+        session = SecurityDomainSession(SimulatedCard(), backend)
+        session.authenticate_scp11(CREDENTIALS, ScpMode.S8)
+        key = f"{backend.value} {P256}"
+        wait_for(lambda: pool.stats().depth.get(key) == 2)
+        hits = pool.stats().hits
+        for _ in range(3):
+            session = SecurityDomainSession(SimulatedCard(), backend)
+            session.authenticate_scp11(CREDENTIALS, ScpMode.S8)
+            assert session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, b"data")) == b"data"
+        assert pool.stats().hits >= hits + 2
+    finally:
+        pool.capacity = 0
@@ -0,0 +1,180 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+import os
+import pickle
+import time
+from typing import Hashable
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import (Apdu, ApduError, Backend, CommandScript, ProcessFarm, Scp03KeySet, ScpError, ScpMode,
+                     SecurityDomainSession, SmartCardConnection, WorkerLostError)
+from openscp.farm import _portable_error
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+STORE_DATA = Apdu(0x80, 0xE2, 0x00, 0x00, b"data")
+
+# Jobs, factories and authenticators are pickled by reference: workers import them from this module
+
+
+class LockedReader(SimulatedCard):
+    """Simulated card behind a reader which only one process at a time may open"""
+
+    def __init__(self, lock_path: str) -> None:
+        super().__init__()
+        os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL))
+        self._lock_path = lock_path
+
+    def close_connection(self) -> None:
+        super().close_connection()
+        os.remove(self._lock_path)
+
+
+def open_card(key: Hashable) -> SmartCardConnection:
+    return SimulatedCard()
+
+
+def open_locked_reader(directory: str, key: Hashable) -> SmartCardConnection:
+    return LockedReader(os.path.join(directory, f"{key}.lock"))
+
+
+def authenticate(session: SecurityDomainSession) -> None:
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+
+
+def store_data(session: SecurityDomainSession) -> int:
+    assert session.send_and_receive(STORE_DATA) == b"data"
+    return os.getpid()
+
+
+def sleep(session: SecurityDomainSession) -> None:
+    time.sleep(0.5)
+
+
+def hold(session: SecurityDomainSession) -> int:
+    # Keeps the reader open until the replacement of the recycled worker is ready
+    time.sleep(3)
+    return store_data(session)
+
+
+def crash(session: SecurityDomainSession) -> None:
+    os._exit(3)
+
+
+class UnpicklableError(Exception):
+    """Exception carrying a lambda"""
+
+    def __init__(self) -> None:
+        super().__init__("can't be pickled")
+        self.callback = lambda: None
+
+
+def fail(session: SecurityDomainSession) -> None:
+    raise UnpicklableError()
+
+
+def farm(**kwargs) -> ProcessFarm:
+    arguments = dict(connection_factory=open_card, authenticator=authenticate, backend=Backend.NATIVE, workers=1,
+                     warm_up_iterations=0)
+    arguments.update(kwargs)
+    return ProcessFarm(**arguments)  # type: ignore[arg-type]
+
+
+def test_jobs_recycling_and_metrics(tmp_path) -> None:
+    # The replacement of a recycled worker opens the reader only once the recycled one has closed it
+    factory = functools.partial(open_locked_reader, str(tmp_path))
+    with farm(connection_factory=factory, workers=2, max_jobs_per_worker=1, enable_metrics=True) as process_farm:
+        assert process_farm.wait_ready(60)
+        futures = [process_farm.submit(key, store_data) for key in ("a", "b", "a", "a", "b")]
+        pids = [future.result(60) for future in futures]
+        script = process_farm.submit("a", CommandScript((STORE_DATA, STORE_DATA))).result(60)
+        assert [result.data for result in script] == [b"data", b"data"]
+        assert len(set(pids)) == 5
+        metrics = process_farm.metrics()
+        assert (metrics.submitted, metrics.completed, metrics.failed, metrics.pending) == (6, 6, 0, 0)
+        assert (metrics.recycled, metrics.lost) == (6, 0)
+        assert metrics.jobs_per_second > 0
+        snapshot = process_farm.collect_metrics(60)
+        # Retired workers reported their counters on exit
+        assert snapshot.commands[0xE2].count == 7
+        assert snapshot.handshakes["SCP03"]["total"].count == 6
+    assert process_farm.metrics().workers == 0
+    with pytest.raises(RuntimeError):
+        process_farm.submit("a", store_data)
+
+
+def test_replacement_waits_for_recycled_worker(tmp_path) -> None:
+    factory = functools.partial(open_locked_reader, str(tmp_path))
+    with farm(connection_factory=factory, max_jobs_per_worker=1) as process_farm:
+        assert process_farm.wait_ready(60)
+        held = process_farm.submit("a", hold)
+        # Sent to the replacement, which holds it until the recycled worker has closed the reader
+        following = process_farm.submit("a", store_data)
+        assert process_farm.wait_ready(60)
+        assert following.result(60) != held.result(60)
+        assert process_farm.metrics().completed == 2
+
+
+def test_stream_back_pressure() -> None:
+    with farm(max_pending=1) as process_farm:
+        results = []
+        for result in process_farm.stream((f"card{index % 3}", store_data) for index in range(12)):
+            assert process_farm.metrics().pending <= 1
+            results.append(result)
+        assert sorted(result.index for result in results) == list(range(12))
+        assert all(result.ok and result.key == f"card{result.index % 3}" for result in results)
+        process_farm.submit("card0", sleep)
+        with pytest.raises(TimeoutError):
+            process_farm.submit("card0", store_data, timeout=0.1)
+
+
+def test_job_errors() -> None:
+    with farm() as process_farm:
+        with pytest.raises(ScpError, match="UnpicklableError: can't be pickled"):
+            process_farm.submit("card", fail).result(60)
+        results = list(process_farm.stream([("card", store_data), ("card", fail)]))
+        assert sorted(result.ok for result in results) == [False, True]
+        assert process_farm.metrics().failed == 2
+
+
+def test_lost_worker_is_replaced() -> None:
+    with farm() as process_farm:
+        first = process_farm.submit("card", store_data).result(60)
+        with pytest.raises(WorkerLostError):
+            process_farm.submit("card", crash).result(60)
+        assert process_farm.submit("card", store_data).result(60) != first
+        metrics = process_farm.metrics()
+        assert (metrics.lost, metrics.failed, metrics.completed) == (1, 1, 2)
+
+
+def test_startup_failure() -> None:
+    # No threads to run jobs: the session pool of the worker can't be created
+    with farm(threads_per_worker=0) as process_farm:
+        with pytest.raises(ScpError) as error:
+            process_farm.wait_ready(60)
+        assert isinstance(error.value.__cause__, ValueError)
+        with pytest.raises(ScpError):
+            process_farm.submit("card", store_data)
+
+
+def test_portable_error() -> None:
+    error = ValueError("picklable")
+    assert _portable_error(error) is error
+    apdu_error = ApduError(0x6A80)
+    assert _portable_error(apdu_error) is apdu_error
+    replaced = _portable_error(UnpicklableError())
+    assert type(replaced) is ScpError and str(replaced) == "UnpicklableError: can't be pickled"
+    pickle.dumps(replaced)
@@ -0,0 +1,109 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List
+
+import pytest
+
+from benchmarks.simulated_card import (DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SD_KEY_ID, SD_KEY_VERSION, SimulatedCard,
+                                       sd_certificate)
+from openscp import (Apdu, Backend, BadResponseError, GetResponseConnection, ScpMode, SecurityDomainSession,
+                     SmartCardConnection)
+
+
+class ScriptedCard(SmartCardConnection):
+    """Answers commands with the given responses in order and records the commands"""
+
+    def __init__(self, *responses: str) -> None:
+        self.commands: List[bytes] = []
+        self._responses = [bytes.fromhex(response) for response in responses]
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        self.commands.append(bytes(apdu))
+        return self._responses.pop(0)
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return False
+
+    def close_connection(self) -> None:
+        pass
+
+
+def test_complete_response_is_passed_through() -> None:
+    card = ScriptedCard("01029000")
+    assert GetResponseConnection(card).send_and_receive(bytes.fromhex("80CA006600")) == bytes.fromhex("01029000")
+    assert len(card.commands) == 1
+
+
+def test_get_response_fragments_are_merged() -> None:
+    card = ScriptedCard("01026103", "0304056102", "06079000")
+    response = GetResponseConnection(card).transmit(Apdu(0x80, 0xCA, 0x00, 0x66, b""))
+    assert (bytes(response.data), response.sw) == (bytes(range(1, 8)), 0x9000)
+    assert card.commands[1:] == [bytes.fromhex("00C0000003"), bytes.fromhex("00C0000002")]
+
+
+def test_last_status_word_is_returned() -> None:
+    card = ScriptedCard("01026100", "6A82")
+    response = GetResponseConnection(card).transmit(bytes.fromhex("00B0000000"))
+    assert (bytes(response.data), response.sw) == (b"\x01\x02", 0x6A82)
+    assert card.commands[1] == bytes.fromhex("00C0000000")
+
+
+@pytest.mark.parametrize("cla, get_response_cla", [
+    (0x00, 0x00), (0x03, 0x03), (0x80, 0x00), (0x84, 0x00), (0x87, 0x03), (0x0D, 0x01),
+    (0x40, 0x40), (0x4F, 0x4F), (0x65, 0x45),
+], ids=["basic", "channel-3", "proprietary", "secured", "proprietary-channel-3", "secured-channel-1",
+        "channel-4", "channel-19", "secured-channel-9"])
+def test_get_response_class_keeps_logical_channel(cla: int, get_response_cla: int) -> None:
+    card = ScriptedCard("016101", "029000")
+    GetResponseConnection(card).send_and_receive(bytes((cla, 0xCA, 0x00, 0x66)))
+    assert card.commands[1] == bytes((get_response_cla, 0xC0, 0x00, 0x00, 0x01))
+
+
+@pytest.mark.parametrize("command, repeated", [
+    ("00B0000000", "00B0000010"),
+    ("00B00000", "00B0000010"),
+    ("80E2000002AABB", "80E2000002AABB10"),
+    ("80E20000000002AABB0000", "80E20000000002AABB0010"),
+])
+def test_wrong_le_repeats_command(command: str, repeated: str) -> None:
+    card = ScriptedCard("6C10", "01029000")
+    assert GetResponseConnection(card).send_and_receive(bytes.fromhex(command)) == bytes.fromhex("01029000")
+    assert card.commands == [bytes.fromhex(command), bytes.fromhex(repeated)]
+
+
+def test_wrong_le_zero_asks_for_256_bytes() -> None:
+    card = ScriptedCard("6C00", "9000")
+    GetResponseConnection(card).send_and_receive(bytes.fromhex("00B0000010"))
+    assert card.commands[1] == bytes.fromhex("00B0000000")
+
+
+def test_wrong_le_then_more_data() -> None:
+    card = ScriptedCard("6C02", "01026101", "039000")
+    assert GetResponseConnection(card).send_and_receive(bytes.fromhex("00B00000")) == bytes.fromhex("0102039000")
+
+
+def test_invalid_response() -> None:
+    with pytest.raises(BadResponseError):
+        GetResponseConnection(ScriptedCard("90")).send_and_receive(bytes.fromhex("00B00000"))
+
+
+def test_session_over_get_response_connection(backend: Backend) -> None:
+    card = SimulatedCard()
+    session = SecurityDomainSession(GetResponseConnection(card), backend)
+    # The certificate store is longer than a short response
+    certificates = session.get_certificate_bundle(SD_KEY_ID, SD_KEY_VERSION)
+    assert [certificate.get_encoded() for certificate in certificates] == [sd_certificate()]
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+    assert session.send_and_receive(Apdu(0x80, 0xE2, 0, 0, bytes(range(200)))) == bytes(range(200))
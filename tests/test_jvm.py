@@ -0,0 +1,138 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""JVM configuration, without starting the JVM"""
+
+import os
+import sys
+import types
+from typing import Any, Dict
+
+import pytest
+
+import openscp.jvm
+from openscp import JvmConfig, configure_jvm
+from openscp.jvm import FAST_STARTUP_JIT_OPTIONS, get_jvm_config
+
+ENVIRONMENT = {
+    "OPENSCP_JVM_PATH": "/opt/jdk/lib/server/libjvm.so",
+    "OPENSCP_JVM_INITIAL_HEAP": "32m",
+    "OPENSCP_JVM_MAX_HEAP": "256m",
+    "OPENSCP_JVM_JIT_OPTIONS": "-XX:TieredStopAtLevel=1 -XX:+UseSerialGC",
+    "OPENSCP_JVM_CLASSPATH": os.pathsep.join(["/opt/a.jar", "", "/opt/b.jar"]),
+    "OPENSCP_JVM_CDS_ARCHIVE": "/tmp/openscp.jsa",
+    "OPENSCP_JVM_OPTIONS": "-Dname='with space' -ea",
+    "OPENSCP_JVM_WARM_UP": "yes",
+}
+
+
+def fields(config: JvmConfig) -> Dict[str, Any]:
+    return dict(vars(config))
+
+
+@pytest.fixture
+def utils(monkeypatch: pytest.MonkeyPatch) -> types.SimpleNamespace:
+    # is_jvm_started() looks at openscp.utils only if it's imported
+    utils = types.SimpleNamespace(is_jvm_started=False)
+    monkeypatch.setitem(sys.modules, "openscp.utils", utils)
+    monkeypatch.setattr(openscp.jvm, "_config", None)
+    return utils
+
+
+def test_defaults() -> None:
+    assert fields(JvmConfig()) == {"jvm_path": None, "initial_heap": None, "max_heap": None, "jit_options": [],
+                                   "classpath": [], "cds_archive": None, "options": [], "warm_up": False}
+    assert JvmConfig().jvm_arguments() == []
+
+
+def test_lists_are_copied() -> None:
+    options = ["-ea"]
+    config = JvmConfig(jit_options=FAST_STARTUP_JIT_OPTIONS, options=options)
+    config.jit_options.append("-Xint")
+    options.append("-esa")
+    assert FAST_STARTUP_JIT_OPTIONS == ["-XX:TieredStopAtLevel=1", "-XX:+UseSerialGC"]
+    assert config.options == ["-ea"]
+
+
+def test_from_environment() -> None:
+    config = JvmConfig.from_environment(ENVIRONMENT)
+    assert fields(config) == {
+        "jvm_path": "/opt/jdk/lib/server/libjvm.so",
+        "initial_heap": "32m",
+        "max_heap": "256m",
+        "jit_options": FAST_STARTUP_JIT_OPTIONS,
+        "classpath": ["/opt/a.jar", "/opt/b.jar"],
+        "cds_archive": "/tmp/openscp.jsa",
+        "options": ["-Dname=with space", "-ea"],
+        "warm_up": True,
+    }
+    assert config.jvm_arguments() == ["-Xms32m", "-Xmx256m", "-XX:SharedArchiveFile=/tmp/openscp.jsa",
+                                      "-XX:TieredStopAtLevel=1", "-XX:+UseSerialGC", "-Dname=with space", "-ea"]
+
+
+def test_empty_environment() -> None:
+    empty = {name: "" for name in ENVIRONMENT}
+    assert fields(JvmConfig.from_environment(empty)) == fields(JvmConfig())
+    assert fields(JvmConfig.from_environment({})) == fields(JvmConfig())
+
+
+@pytest.mark.parametrize("value, warm_up", [("1", True), ("true", True), ("TRUE", True), ("Yes", True),
+                                            ("0", False), ("no", False), ("on", False), ("", False)])
+def test_warm_up_flag(value: str, warm_up: bool) -> None:
+    assert JvmConfig.from_environment({"OPENSCP_JVM_WARM_UP": value}).warm_up is warm_up
+
+
+def test_environment_round_trip() -> None:
+    config = JvmConfig.from_environment(ENVIRONMENT)
+    assert fields(JvmConfig.from_environment(config.to_environment())) == fields(config)
+    assert JvmConfig().to_environment() == {name: "" for name in ENVIRONMENT}
+
+
+def test_environment_is_read_if_not_configured(monkeypatch: pytest.MonkeyPatch,
+                                               utils: types.SimpleNamespace) -> None:
+    for name in ENVIRONMENT:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("OPENSCP_JVM_MAX_HEAP", "64m")
+    assert get_jvm_config().max_heap == "64m"
+
+
+def test_configure_jvm(monkeypatch: pytest.MonkeyPatch, utils: types.SimpleNamespace) -> None:
+    monkeypatch.setenv("OPENSCP_JVM_MAX_HEAP", "64m")
+    config = JvmConfig(max_heap="128m")
+    configure_jvm(config)
+    # Replaces the environment variables
+    assert get_jvm_config() is config
+    utils.is_jvm_started = True
+    with pytest.raises(RuntimeError):
+        configure_jvm(JvmConfig())
+    assert get_jvm_config() is config
+
+
+def test_full_classpath(monkeypatch: pytest.MonkeyPatch, tmp_path: Any) -> None:
+    for name in ("b.jar", "a.jar", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    monkeypatch.setattr(openscp.jvm, "LIB_DIR", str(tmp_path))
+    assert JvmConfig(classpath=["/opt/extra.jar"]).full_classpath() == [
+        str(tmp_path / "a.jar"), str(tmp_path / "b.jar"), "/opt/extra.jar"]
+
+
+def test_java_executable_is_found(tmp_path: Any) -> None:
+    (tmp_path / "lib" / "server").mkdir(parents=True)
+    (tmp_path / "bin").mkdir()
+    java = tmp_path / "bin" / ("java.exe" if os.name == "nt" else "java")
+    java.write_bytes(b"")
+    jvm_path = str(tmp_path / "lib" / "server" / "libjvm.so")
+    assert openscp.jvm._find_java_executable(jvm_path) == str(java)
+    java.unlink()
+    with pytest.raises(RuntimeError):
+        openscp.jvm._find_java_executable(jvm_path)
@@ -0,0 +1,94 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Callable, List
+
+from openscp import CacheStats, KeyCache
+
+
+class Factory:
+    """Creates numbered values, remembering how many it created"""
+
+    def __init__(self) -> None:
+        self.created = 0
+
+    def __call__(self) -> int:
+        self.created += 1
+        return self.created
+
+
+def lookup(cache: KeyCache, factory: Callable[[], int], *content: bytes) -> int:
+    return cache.get_or_create("test", content, factory)
+
+
+def test_hits_and_misses() -> None:
+    cache = KeyCache()
+    factory = Factory()
+    assert lookup(cache, factory, b"a") == 1
+    assert lookup(cache, factory, b"a") == 1
+    assert lookup(cache, factory, b"b") == 2
+    assert cache.stats() == CacheStats(hits=1, misses=2, evictions=0, size=2, max_size=64)
+
+
+def test_keys() -> None:
+    cache = KeyCache()
+    factory = Factory()
+    values = [lookup(cache, factory, b"ab", b"c"), lookup(cache, factory, b"a", b"bc"), lookup(cache, factory, b"abc"),
+              cache.get_or_create("other", [b"abc"], factory)]
+    assert values == [1, 2, 3, 4]
+
+
+def test_least_recently_used_value_is_evicted() -> None:
+    cache = KeyCache(2)
+    factory = Factory()
+    lookup(cache, factory, b"a")
+    lookup(cache, factory, b"b")
+    # A hit makes "a" the most recently used
+    lookup(cache, factory, b"a")
+    lookup(cache, factory, b"c")
+    assert cache.stats() == CacheStats(hits=1, misses=3, evictions=1, size=2, max_size=2)
+    assert lookup(cache, factory, b"a") == 1
+    assert lookup(cache, factory, b"c") == 3
+    assert lookup(cache, factory, b"b") == 4
+    assert cache.stats().evictions == 2
+
+
+def test_lowering_max_size_evicts() -> None:
+    cache = KeyCache()
+    factory = Factory()
+    for content in (b"a", b"b", b"c"):
+        lookup(cache, factory, content)
+    cache.max_size = 1
+    assert cache.stats() == CacheStats(hits=0, misses=3, evictions=2, size=1, max_size=1)
+    assert lookup(cache, factory, b"c") == 3
+
+
+def test_zero_max_size_disables_caching() -> None:
+    cache = KeyCache(0)
+    factory = Factory()
+    values: List[int] = [lookup(cache, factory, b"a") for _ in range(3)]
+    assert values == [1, 2, 3]
+    assert cache.stats() == CacheStats(hits=0, misses=3, evictions=0, size=0, max_size=0)
+    cache.max_size = 2
+    lookup(cache, factory, b"a")
+    assert lookup(cache, factory, b"a") == 4
+
+
+def test_clear_keeps_counters() -> None:
+    cache = KeyCache()
+    factory = Factory()
+    lookup(cache, factory, b"a")
+    lookup(cache, factory, b"a")
+    cache.clear()
+    assert cache.stats() == CacheStats(hits=1, misses=1, evictions=0, size=0, max_size=64)
+    assert lookup(cache, factory, b"a") == 2
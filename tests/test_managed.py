@@ -0,0 +1,183 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from typing import List, Tuple
+
+import pytest
+
+from benchmarks.simulated_card import (DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, OCE_KEY_ID, OCE_KEY_VERSION,
+                                       SD_KEY_ID, SD_KEY_VERSION, SimulatedCard, oce_certificate,
+                                       oce_private_key_bytes, sd_public_key_bytes)
+from openscp import (AesAlg, Apdu, Backend, ChannelLostError, ManagedSession, Scp03KeySet,
+                     Scp11Credentials, ScpMode, SecurityDomainEmulator, SecurityDomainSession)
+from openscp.apdu import SW_OK
+from openscp.exceptions import _status_word
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+GET_DATA = Apdu(0x80, 0xCA, 0x00, 0x66, b"\x01\x02")
+STORE_DATA = Apdu(0x80, 0xE2, 0x00, 0x00, b"\x03")
+
+_SW_WRONG_DATA = 0x6A80
+
+
+def _handler(command: Apdu) -> Tuple[bytes, int]:
+    if command.ins == 0xE6:
+        return b"", _SW_WRONG_DATA
+    return command.data, SW_OK
+
+
+class Reader(SecurityDomainEmulator):
+    """Emulated card whose next ``failures`` commands fail in the transport"""
+
+    def __init__(self) -> None:
+        super().__init__([KEY_SET], handler=_handler)
+        self.failures = 0
+        self.closed = False
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        if self.failures:
+            self.failures -= 1
+            raise OSError("Reader is gone")
+        return super().send_and_receive(apdu)
+
+    def close_connection(self) -> None:
+        self.closed = True
+        super().close_connection()
+
+
+@pytest.fixture
+def readers() -> List[Reader]:
+    return []
+
+
+@pytest.fixture
+def managed(backend: Backend, readers: List[Reader]) -> ManagedSession:
+    def connect() -> Reader:
+        readers.append(Reader())
+        return readers[-1]
+
+    return ManagedSession(connect, KEY_SET, ScpMode.S8, backend)
+
+
+def test_authenticates_on_first_use(managed: ManagedSession, readers: List[Reader]) -> None:
+    assert managed.stats().handshakes == 0
+    assert managed.send_and_receive(STORE_DATA) == b"\x03"
+    assert managed.send_and_receive(STORE_DATA) == b"\x03"
+    stats = managed.stats()
+    assert (stats.handshakes, stats.reauthentications, stats.reconnections, stats.retries) == (1, 0, 0, 0)
+    assert stats.session_age > 0 and stats.last_handshake_time > 0
+    assert len(readers) == 1 and readers[0].secure_channel_open
+
+
+def test_lost_channel_retries_idempotent_commands(managed: ManagedSession, readers: List[Reader]) -> None:
+    managed.authenticate()
+    # The card closes the channel, e.g. after a reset
+    readers[0].reset()
+    assert managed.send_and_receive(GET_DATA) == b"\x01\x02"
+    stats = managed.stats()
+    assert (stats.handshakes, stats.reauthentications, stats.reconnections, stats.retries) == (2, 1, 0, 1)
+    assert stats.reauthentication_time > 0
+    assert len(readers) == 1
+
+
+def test_lost_channel_fails_other_commands(managed: ManagedSession, readers: List[Reader]) -> None:
+    managed.authenticate()
+    readers[0].reset()
+    with pytest.raises(ChannelLostError) as error:
+        managed.send_and_receive(STORE_DATA)
+    assert isinstance(error.value.__cause__, Exception)
+    # The channel is established again on the next use
+    assert managed.send_and_receive(STORE_DATA) == b"\x03"
+    assert managed.stats().reauthentications == 1
+
+
+def test_transport_failure_reconnects(managed: ManagedSession, readers: List[Reader]) -> None:
+    managed.authenticate()
+    readers[0].failures = 1
+    assert managed.send_and_receive(GET_DATA) == b"\x01\x02"
+    assert readers[0].closed
+    assert len(readers) == 2
+    stats = managed.stats()
+    assert (stats.reauthentications, stats.reconnections, stats.retries) == (1, 1, 1)
+
+
+def test_transport_failure_during_authentication(backend: Backend) -> None:
+    reader = Reader()
+    readers = [reader, Reader(), Reader()]
+    readers[1].failures = 1
+    managed = ManagedSession(lambda: readers.pop(0), KEY_SET, ScpMode.S8, backend)
+    managed.authenticate()
+    reader.failures = 1
+    # The command fails, then the handshake on the next reader
+    with pytest.raises(OSError):
+        managed.send_and_receive(GET_DATA)
+    assert reader.closed
+    assert managed.send_and_receive(GET_DATA) == b"\x01\x02"
+    stats = managed.stats()
+    assert (stats.handshakes, stats.reconnections) == (2, 2)
+    assert not readers
+
+
+def test_error_status_words_keep_the_channel(managed: ManagedSession) -> None:
+    with pytest.raises(Exception) as error:
+        managed.send_and_receive(Apdu(0x80, 0xE6, 0x00, 0x00, b""))
+    assert _status_word(error.value) == _SW_WRONG_DATA
+    managed.send_and_receive(STORE_DATA)
+    assert managed.stats().handshakes == 1
+
+
+def test_retries_are_limited(backend: Backend) -> None:
+    reader = Reader()
+    managed = ManagedSession(lambda: reader, KEY_SET, ScpMode.S8, backend, max_retries=2)
+
+    def always_lost(session: SecurityDomainSession) -> None:
+        reader.reset()
+        session.send_and_receive(STORE_DATA)
+
+    with pytest.raises(ChannelLostError):
+        managed.run(always_lost, idempotent=True)
+    assert managed.stats().retries == 2
+    assert managed.stats().handshakes == 3
+
+
+def test_max_age(backend: Backend) -> None:
+    managed = ManagedSession(Reader, KEY_SET, ScpMode.S8, backend, max_age=0.01)
+    managed.send_and_receive(STORE_DATA)
+    managed.send_and_receive(STORE_DATA)
+    time.sleep(0.02)
+    managed.send_and_receive(STORE_DATA)
+    stats = managed.stats()
+    assert (stats.handshakes, stats.reauthentications, stats.retries) == (2, 1, 0)
+
+
+def test_custom_idempotent_commands_and_close(backend: Backend, readers: List[Reader]) -> None:
+    with ManagedSession(lambda: readers.append(Reader()) or readers[-1], KEY_SET, ScpMode.S8, backend,
+                        is_idempotent=lambda capdu: True) as managed:
+        managed.authenticate()
+        readers[0].reset()
+        assert managed.send_and_receive(STORE_DATA) == b"\x03"
+    assert readers[0].closed
+    assert managed.stats().session_age == 0
+
+
+def test_scp11(backend: Backend) -> None:
+    credentials = Scp11Credentials(SD_KEY_ID, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                                   [oce_certificate()], oce_private_key_bytes(), AesAlg.AES_128)
+    card = SimulatedCard()
+    managed = ManagedSession(lambda: card, credentials, ScpMode.S8, backend)
+    assert managed.session.send_and_receive(STORE_DATA) == b"\x03"
+    card.reset()
+    assert managed.send_and_receive(GET_DATA) == b"\x01\x02"
+    assert managed.stats().reauthentications == 1
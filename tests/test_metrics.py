@@ -0,0 +1,204 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import types
+from typing import Iterator, List, Tuple
+
+import pytest
+
+import openscp.metrics
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, Backend, CommandStats, Metrics, MetricsSnapshot, PhaseStats, Scp03KeySet, ScpMode,
+                     SecurityDomainEmulator, SecurityDomainSession, get_metrics)
+from openscp.apdu import SW_OK
+from openscp.metrics import (HANDSHAKE_COMPLETION, HANDSHAKE_TOTAL, PHASE_CONVERSION, PHASE_JAVA,
+                             PHASE_SECURE_MESSAGING, PHASE_TRANSPORT, merge_snapshots)
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+
+_INS_FAIL = 0x01
+_INS_INITIALIZE_UPDATE = 0x50
+_INS_GET_RESPONSE = 0xC0
+_SW_INS_NOT_SUPPORTED = 0x6D00
+
+
+def _handler(command: Apdu) -> Tuple[bytes, int]:
+    if command.ins == _INS_FAIL:
+        return b"", _SW_INS_NOT_SUPPORTED
+    return command.data, SW_OK
+
+
+class Card(SecurityDomainEmulator):
+    """Emulator returning the INITIALIZE UPDATE response in two parts, the second one with GET RESPONSE"""
+
+    def __init__(self) -> None:
+        super().__init__([KEY_SET], handler=_handler)
+        self.remaining = b""
+        self.commands: List[int] = []
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        self.commands.append(apdu[1])
+        if apdu[1] == _INS_GET_RESPONSE and self.remaining:
+            response, self.remaining = self.remaining, b""
+            return response
+        response = super().send_and_receive(apdu)
+        if apdu[1] == _INS_INITIALIZE_UPDATE:
+            self.remaining = response[8:]
+            return response[:8] + bytes((0x61, len(self.remaining) - 2))
+        return response
+
+
+class Clock:
+    """time.perf_counter replacement moved by tests"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def metrics() -> Iterator[Metrics]:
+    metrics = get_metrics()
+    metrics.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.reset()
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(openscp.metrics, "time", types.SimpleNamespace(perf_counter=clock, time=lambda: 0.0))
+    return clock
+
+
+def test_phases_are_exclusive(clock: Clock) -> None:
+    metrics = Metrics()
+    outer = metrics._start()
+    clock.now = 1.0
+    inner = metrics._start()
+    clock.now = 2.0
+    innermost = metrics._start()
+    clock.now = 2.5
+    metrics._stop("innermost", innermost)
+    clock.now = 4.0
+    metrics._stop("inner", inner)
+    clock.now = 5.0
+    sibling = metrics._start()
+    clock.now = 7.0
+    metrics._stop("inner", sibling)
+    clock.now = 10.0
+    metrics._stop("outer", outer)
+    assert metrics.snapshot().phases == {
+        "innermost": PhaseStats(1, 0.5, 0.5, 0.5),
+        "inner": PhaseStats(2, 4.5, 2.0, 2.5),
+        "outer": PhaseStats(1, 5.0, 5.0, 5.0),
+    }
+
+
+def test_handshake_steps(clock: Clock) -> None:
+    metrics = Metrics()
+
+    def send(step: float) -> bytes:
+        clock.now += step
+        return b"\x90\x00"
+
+    with metrics._handshake("SCP11"):
+        clock.now += 1.0
+        metrics._transmit(lambda apdu: send(2.0), bytes((0x80, 0x2A)))
+        metrics._transmit(lambda apdu: send(1.0), bytes((0x80, 0x82)))
+        # Attributed to MUTUAL AUTHENTICATE
+        metrics._transmit(lambda apdu: send(0.5), bytes((0x00, 0xC0)))
+        metrics._transmit(lambda apdu: send(0.25), bytes((0x80, 0xCA)))
+        clock.now += 4.0
+    snapshot = metrics.snapshot()
+    assert {step: stats.total for step, stats in snapshot.handshakes["SCP11"].items()} == {
+        "PERFORM SECURITY OPERATION": 3.0,
+        "MUTUAL AUTHENTICATE": 1.5,
+        "INS CA": 0.25,
+        HANDSHAKE_COMPLETION: 4.0,
+        HANDSHAKE_TOTAL: 8.75,
+    }
+    assert snapshot.phases[PHASE_TRANSPORT] == PhaseStats(4, 3.75, 0.25, 2.0)
+
+
+def test_failed_handshake_is_not_recorded(clock: Clock) -> None:
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        with metrics._handshake("SCP03"):
+            metrics._transmit(lambda apdu: b"\x90\x00", bytes((0x80, 0x50)))
+            raise ValueError()
+    assert metrics.snapshot().handshakes == {}
+    # Commands after the handshake aren't attributed to it
+    with metrics._handshake("SCP03"):
+        pass
+    metrics._transmit(lambda apdu: b"\x90\x00", bytes((0x80, 0x50)))
+    assert set(metrics.snapshot().handshakes["SCP03"]) == {HANDSHAKE_COMPLETION, HANDSHAKE_TOTAL}
+
+
+def test_session(backend: Backend, metrics: Metrics) -> None:
+    card = Card()
+    session = SecurityDomainSession(card, backend)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    assert card.commands == [_INS_INITIALIZE_UPDATE, _INS_GET_RESPONSE, 0x82]
+    assert session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, b"data")) == b"data"
+    session.send_many([Apdu(0x80, 0xE2, 0x00, 0x00, b"data"), Apdu(0x80, _INS_FAIL, 0x00, 0x00, b"")])
+    snapshot = metrics.snapshot()
+    steps = snapshot.handshakes["SCP03"]
+    assert set(steps) == {"INITIALIZE UPDATE", "EXTERNAL AUTHENTICATE", HANDSHAKE_COMPLETION, HANDSHAKE_TOTAL}
+    assert all(stats.count == 1 for stats in steps.values())
+    parts = sum(stats.total for step, stats in steps.items() if step != HANDSHAKE_TOTAL)
+    assert parts == pytest.approx(steps[HANDSHAKE_TOTAL].total)
+    assert snapshot.commands[0xE2].count == 2
+    assert snapshot.commands[0xE2].errors == 0
+    assert sum(snapshot.commands[0xE2].buckets) == 2
+    assert snapshot.commands[_INS_FAIL].errors == 1
+    assert snapshot.phases[PHASE_TRANSPORT].count == 6
+    expected = {PHASE_SECURE_MESSAGING} if backend is Backend.NATIVE else {PHASE_JAVA, PHASE_CONVERSION}
+    assert expected <= set(snapshot.phases)
+    assert snapshot.as_dict()["commands"]["E2"]["count"] == 2
+
+
+def test_disabled(metrics: Metrics) -> None:
+    metrics.disable()
+    session = SecurityDomainSession(Card(), Backend.NATIVE)
+    session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, b"data"))
+    snapshot = metrics.snapshot()
+    assert (snapshot.phases, snapshot.commands, snapshot.handshakes) == ({}, {}, {})
+
+
+def test_merge_snapshots() -> None:
+    bounds = (0.001, 0.01)
+    first = MetricsSnapshot(
+        1.0,
+        {PHASE_TRANSPORT: PhaseStats(2, 3.0, 1.0, 2.0)},
+        {0xE2: CommandStats(2, 1, 3.5, bounds, (1, 1, 0))},
+        {"SCP03": {HANDSHAKE_TOTAL: PhaseStats(1, 5.0, 5.0, 5.0)}})
+    second = MetricsSnapshot(
+        3.0,
+        {PHASE_TRANSPORT: PhaseStats(1, 4.0, 4.0, 4.0), PHASE_JAVA: PhaseStats(1, 1.0, 1.0, 1.0)},
+        {0xE2: CommandStats(1, 0, 0.5, bounds, (0, 0, 1)), 0xCA: CommandStats(1, 0, 0.1, bounds, (1, 0, 0))},
+        {"SCP03": {HANDSHAKE_TOTAL: PhaseStats(1, 2.0, 2.0, 2.0)},
+         "SCP11": {HANDSHAKE_TOTAL: PhaseStats(1, 9.0, 9.0, 9.0)}})
+    third = MetricsSnapshot(2.0, {}, {}, {})
+    assert merge_snapshots([first, second, third]) == MetricsSnapshot(
+        3.0,
+        {PHASE_TRANSPORT: PhaseStats(3, 7.0, 1.0, 4.0), PHASE_JAVA: PhaseStats(1, 1.0, 1.0, 1.0)},
+        {0xE2: CommandStats(3, 1, 4.0, bounds, (1, 1, 1)), 0xCA: CommandStats(1, 0, 0.1, bounds, (1, 0, 0))},
+        {"SCP03": {HANDSHAKE_TOTAL: PhaseStats(2, 7.0, 2.0, 5.0)},
+         "SCP11": {HANDSHAKE_TOTAL: PhaseStats(1, 9.0, 9.0, 9.0)}})
+    assert merge_snapshots([]) == MetricsSnapshot(0.0, {}, {}, {})
@@ -0,0 +1,195 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Java and native backends send the same commands and return the same results for fixed challenges and keys"""
+
+import types
+from typing import Any, List, Optional, Tuple
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+import openscp.emulator
+from benchmarks.simulated_card import (DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, OCE_KEY_ID, OCE_KEY_VERSION,
+                                       SD_KEY, SD_KEY_VERSION, oce_certificate, oce_private_key_bytes,
+                                       sd_certificate, sd_public_key_bytes)
+from openscp import AesAlg, Apdu, Backend, Scp03KeySet, Scp11SdKey, ScpMode, SecurityDomainEmulator, \
+    SecurityDomainSession
+from tests.conftest import require_java
+
+SD_EPHEMERAL_KEY = ec.derive_private_key(0xE5D0E5D0, ec.SECP256R1())
+OCE_EPHEMERAL_KEY = ec.derive_private_key(0xE0CEE0CE, ec.SECP256R1())
+HOST_CHALLENGE = bytes(range(0x10, 0x20))
+
+_SW_WRONG_DATA = 0x6A80
+
+
+def _handler(command: Apdu) -> Tuple[bytes, int]:
+    if command.ins == 0xE6:
+        return b"", _SW_WRONG_DATA
+    # Responses of commands with P1 > 0 need GET RESPONSE in short length mode
+    return command.data * (command.p1 + 1), openscp.apdu.SW_OK
+
+
+class _RecordingCard(SecurityDomainEmulator):
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.trace: List[bytes] = []
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        self.trace.append(bytes(apdu))
+        response = super().send_and_receive(apdu)
+        self.trace.append(response)
+        return response
+
+
+@pytest.fixture(autouse=True)
+def deterministic_card(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(openscp.emulator, "os", types.SimpleNamespace(urandom=lambda size: bytes(range(size))))
+    monkeypatch.setattr(openscp.emulator.ec, "generate_private_key", lambda curve: SD_EPHEMERAL_KEY)
+
+
+def _private_key_bytes(private_key: ec.EllipticCurvePrivateKey) -> bytes:
+    return private_key.private_bytes(serialization.Encoding.DER, serialization.PrivateFormat.PKCS8,
+                                     serialization.NoEncryption())
+
+
+def _public_key_bytes(private_key: ec.EllipticCurvePrivateKey) -> bytes:
+    return private_key.public_key().public_bytes(serialization.Encoding.DER,
+                                                 serialization.PublicFormat.SubjectPublicKeyInfo)
+
+
+# Secured short APDUs, which both backends send
+COMMANDS = [Apdu(0x80, 0xE2, 0, 0, b""),
+            Apdu(0x80, 0xE2, 0, 0, bytes(range(40))),
+            Apdu(0x80, 0xE4, 1, 0, bytes(200), 0, True),
+            Apdu(0x80, 0xE6, 0, 0, bytes(16)),
+            Apdu(0x80, 0xE8, 3, 0, bytes(range(223))),
+            Apdu(0x00, 0xEA, 0, 0, b"", 0xF0)]
+
+# Secured only in extended length by the native backend
+LONG_COMMANDS = [Apdu(0x80, 0xE8, 0, 0, bytes(240)),
+                 Apdu(0x80, 0xEA, 3, 0, bytes(range(256)) * 2)]
+
+
+def _run(backend: Backend,
+         key_id: Optional[int],
+         scp_mode: ScpMode,
+         session_keys_alg: AesAlg,
+         extended: bool,
+         commands: List[Apdu]) -> Any:
+    private_key = _private_key_bytes(SD_KEY)
+    card = _RecordingCard([Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)],
+                          [Scp11SdKey(sd_key_id, SD_KEY_VERSION, private_key, [sd_certificate()])
+                           for sd_key_id in (0x11, 0x13, 0x15)],
+                          scp_mode, extended, handler=_handler)
+    session = SecurityDomainSession(card, backend)
+    if key_id == 0x03:
+        session._authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, scp_mode,
+                                    HOST_CHALLENGE[:scp_mode.value])
+    elif key_id is not None:
+        # SCP11b doesn't authenticate the OCE
+        oce_certificates, sk_oce_ecka = ([], b"") if key_id == 0x13 else ([oce_certificate()], oce_private_key_bytes())
+        session._authenticate_scp11(key_id, SD_KEY_VERSION, OCE_KEY_ID, OCE_KEY_VERSION, sd_public_key_bytes(),
+                                    oce_certificates, sk_oce_ecka, session_keys_alg, scp_mode,
+                                    _public_key_bytes(OCE_EPHEMERAL_KEY), _private_key_bytes(OCE_EPHEMERAL_KEY))
+    results: List[Any] = []
+    for command in commands:
+        try:
+            results.append(session.send_and_receive(command))
+        except ValueError as e:  # too long for the secured command
+            results.append(type(e))
+        except Exception as e:
+            results.append(openscp.exceptions._status_word(e))
+    return card.trace, results
+
+
+SCHEMES = pytest.mark.parametrize("key_id, session_keys_alg", [
+    (0x03, AesAlg.AES_128),
+    (0x11, AesAlg.AES_128),
+    (0x11, AesAlg.AES_256),
+    (0x13, AesAlg.AES_128),
+    (0x15, AesAlg.AES_192),
+], ids=["SCP03", "SCP11a", "SCP11a-AES256", "SCP11b", "SCP11c"])
+
+
+@pytest.mark.parametrize("extended", [False, True], ids=["short", "extended"])
+@pytest.mark.parametrize("scp_mode", [ScpMode.S8, ScpMode.S16], ids=["S8", "S16"])
+@SCHEMES
+def test_backends_match(key_id: int, session_keys_alg: AesAlg, scp_mode: ScpMode, extended: bool) -> None:
+    require_java()
+    native_trace, native_results = _run(Backend.NATIVE, key_id, scp_mode, session_keys_alg, extended, COMMANDS)
+    java_trace, java_results = _run(Backend.JAVA, key_id, scp_mode, session_keys_alg, extended, COMMANDS)
+    assert native_results == java_results
+    assert native_trace == java_trace
+    assert native_results[1] == bytes(range(40))
+    assert native_results[3] == _SW_WRONG_DATA
+    assert native_results[4] == bytes(range(223)) * 4
+
+
+@pytest.mark.parametrize("extended", [False, True], ids=["short", "extended"])
+@pytest.mark.parametrize("scp_mode", [ScpMode.S8, ScpMode.S16], ids=["S8", "S16"])
+@SCHEMES
+def test_long_secured_commands(backend: Backend,
+                               key_id: int,
+                               session_keys_alg: AesAlg,
+                               scp_mode: ScpMode,
+                               extended: bool) -> None:
+    trace, results = _run(backend, key_id, scp_mode, session_keys_alg, extended,
+                          LONG_COMMANDS + [Apdu(0x80, 0xEC, 0, 0, bytes(70000))] + COMMANDS[:2])
+    if backend is Backend.NATIVE and extended:
+        assert results[:2] == [bytes(240), bytes(range(256)) * 8]
+    else:
+        assert results[:2] == [ValueError, ValueError]
+    # A rejected command leaves the session usable
+    assert results[2:] == [ValueError, b"", bytes(range(40))]
+
+
+@pytest.mark.parametrize("extended", [False, True], ids=["short", "extended"])
+def test_plain_commands_match(extended: bool) -> None:
+    require_java()
+    commands = COMMANDS + [Apdu.from_bytes(bytes.fromhex("00EA0000 03 010203 00")), Apdu(0x00, 0xEA, 0, 0, b"", 256)]
+    native_trace, native_results = _run(Backend.NATIVE, None, ScpMode.S8, AesAlg.AES_128, extended, commands)
+    java_trace, java_results = _run(Backend.JAVA, None, ScpMode.S8, AesAlg.AES_128, extended, commands)
+    assert native_results == java_results
+    assert native_trace == java_trace
+    assert native_trace[-4] == bytes.fromhex("00EA00000301020300")
+
+
+@pytest.mark.parametrize("scp_mode", [ScpMode.S8, ScpMode.S16], ids=["S8", "S16"])
+def test_fixed_challenge_is_sent(backend: Backend, scp_mode: ScpMode) -> None:
+    trace, _ = _run(backend, 0x03, scp_mode, AesAlg.AES_128, False, [])
+    initialize_update = bytes((0x80, 0x50, KEY_VERSION, 0x00, scp_mode.value)) + HOST_CHALLENGE[:scp_mode.value]
+    assert trace[0] == initialize_update + b"\x00"
+
+
+class _NoRmacCard(SecurityDomainEmulator):
+    """Card whose INITIALIZE UPDATE key information doesn't offer R-MAC"""
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        response = super().send_and_receive(apdu)
+        if apdu[1] == 0x50:
+            response = response[:12] + bytes((response[12] & ~0x40,)) + response[13:]
+        return response
+
+
+def test_lower_security_level_is_rejected(backend: Backend) -> None:
+    session = SecurityDomainSession(_NoRmacCard([Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)]), backend)
+    # The Java backend raises UnsupportedOperationException
+    with pytest.raises(Exception, match="Only maximum security level is supported") as error:
+        session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+    if backend is Backend.NATIVE:
+        assert type(error.value) is openscp.ScpError
@@ -0,0 +1,203 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import random
+import threading
+import time
+from typing import Dict, Hashable, List, Tuple
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, ApduError, Backend, Scp03KeySet, ScpMode, SecurityDomainEmulator, SecurityDomainSession,
+                     SessionPool)
+from openscp.apdu import SW_OK
+
+
+class InjectedFailure(Exception):
+    pass
+
+
+_SW_REFERENCE_NOT_FOUND = 0x6A88
+
+
+def _handler(command: Apdu) -> Tuple[bytes, int]:
+    if command.ins == 0xE4:
+        return b"", _SW_REFERENCE_NOT_FOUND
+    return command.data, SW_OK
+
+
+class Reader(SecurityDomainEmulator):
+    """Emulated card with an I/O delay, detecting concurrent use"""
+
+    def __init__(self, key: Hashable, latency: float = 0.0) -> None:
+        super().__init__([Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)], handler=_handler)
+        self.key = key
+        self.closed = False
+        self._latency = latency
+        self._in_use = threading.Lock()
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        if not self._in_use.acquire(blocking=False):
+            raise AssertionError(f"Reader {self.key} is used by two threads")
+        try:
+            time.sleep(self._latency)
+            return super().send_and_receive(apdu)
+        finally:
+            self._in_use.release()
+
+    def close_connection(self) -> None:
+        self.closed = True
+        super().close_connection()
+
+
+def authenticate(session: SecurityDomainSession) -> None:
+    session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+
+
+def echo(session: SecurityDomainSession, commands: int = 1, fail: bool = False) -> int:
+    for _ in range(commands):
+        payload = os.urandom(random.randint(0, 200))
+        assert session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, payload)) == payload
+    if fail:
+        raise InjectedFailure()
+    return commands
+
+
+def test_stress(backend: Backend) -> None:
+    random.seed(1)
+    with SessionPool(lambda key: Reader(key, 0.001), authenticate, backend, max_workers=8) as pool:
+        futures = [pool.submit(random.randrange(6), lambda session, fail=random.random() < 0.1: echo(session, 3, fail))
+                   for _ in range(120)]
+        failed = 0
+        for future in futures:
+            try:
+                assert future.result() == 3
+            except InjectedFailure:
+                failed += 1
+        metrics = pool.metrics()
+    assert failed
+    assert metrics.evictions == failed
+    assert metrics.handshakes == metrics.sessions + failed
+    assert metrics.leases == 120
+    assert metrics.active_leases == 0
+    assert metrics.handshake_failures == 0
+
+
+def test_lease_reuses_session() -> None:
+    readers: List[Reader] = []
+
+    def connect(key: Hashable) -> Reader:
+        readers.append(Reader(key))
+        return readers[-1]
+
+    with SessionPool(connect, authenticate, Backend.NATIVE) as pool:
+        with pool.lease("a") as session:
+            echo(session)
+        with pool.lease("a") as session:
+            echo(session)
+        assert len(readers) == 1
+        # An error status word keeps the session, other exceptions evict it
+        with pytest.raises(ApduError):
+            with pool.lease("a") as session:
+                session.send_and_receive(Apdu(0x80, 0xE4, 0x00, 0x00, b""))
+        assert pool.metrics().sessions == 1
+        with pytest.raises(InjectedFailure):
+            with pool.lease("a") as session:
+                echo(session, fail=True)
+        assert readers[0].closed
+        lease = pool.lease("a")
+        lease.invalidate()
+        lease.release()
+        lease.release()
+        with pytest.raises(RuntimeError):
+            lease.session
+        assert len(readers) == 2 and readers[1].closed
+        assert pool.metrics().evictions == 2
+
+
+def test_lease_timeout() -> None:
+    with SessionPool(Reader, authenticate, Backend.NATIVE) as pool:
+        lease = pool.lease("a")
+        with pytest.raises(TimeoutError):
+            pool.lease("a", timeout=0.01)
+        with pool.lease("b", timeout=0.01) as session:
+            echo(session)
+        lease.release()
+        pool.lease("a", timeout=0.01).release()
+
+
+def test_failed_authentication_is_not_pooled() -> None:
+    def authenticate_with_wrong_key(session: SecurityDomainSession) -> None:
+        session.authenticate_scp03(0x01, KEY_VERSION, MAC_KEY, ENC_KEY, DEK_KEY, ScpMode.S8)
+
+    with SessionPool(Reader, authenticate_with_wrong_key, Backend.NATIVE) as pool:
+        with pytest.raises(Exception):
+            pool.lease("a")
+        metrics = pool.metrics()
+        assert (metrics.sessions, metrics.active_leases, metrics.handshake_failures) == (0, 0, 1)
+
+
+def test_evict() -> None:
+    readers: Dict[Hashable, Reader] = {}
+
+    def connect(key: Hashable) -> Reader:
+        readers[key] = Reader(key)
+        return readers[key]
+
+    with SessionPool(connect, authenticate, Backend.NATIVE, idle_timeout=60) as pool:
+        assert all(future.result() is None for future in pool.authenticate(["a", "b"]).values())
+        pool.evict("a")
+        pool.evict("c")
+        assert (readers["a"].closed, readers["b"].closed) == (True, False)
+        lease = pool.lease("b")
+        pool.evict("b")
+        assert pool.metrics().sessions == 1
+        lease.release()
+        assert pool.metrics().sessions == 0
+        assert pool.evict_idle() == 0
+    assert all(reader.closed for reader in readers.values())
+
+
+def test_evict_idle() -> None:
+    with SessionPool(Reader, authenticate, Backend.NATIVE, idle_timeout=0.01) as pool:
+        pool.lease("a").release()
+        time.sleep(0.02)
+        assert pool.evict_idle() == 1
+        assert pool.metrics().sessions == 0
+
+
+def test_close_runs_submitted_jobs() -> None:
+    pool = SessionPool(Reader, authenticate, Backend.NATIVE, max_workers=1)
+    futures = [pool.submit("a", lambda session: (time.sleep(0.05), echo(session))[1]) for _ in range(3)]
+    time.sleep(0.01)
+    pool.close()
+    assert [future.result() for future in futures] == [1, 1, 1]
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.submit("a", echo)
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.lease("a")
+    assert pool.metrics().sessions == 0
+
+
+def test_close_with_leased_session() -> None:
+    reader = Reader("a")
+    pool = SessionPool(lambda key: reader, authenticate, Backend.NATIVE)
+    lease = pool.lease("a")
+    pool.close()
+    assert not reader.closed
+    echo(lease.session)
+    lease.release()
+    assert reader.closed
@@ -0,0 +1,209 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Iterator, List
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY, SimulatedCard
+from openscp import Apdu, Backend, ScpMode, SecurityDomainSession, SmartCardConnection
+from openscp.remote import (FRAME_ERROR, FRAME_HELLO, Address, ConnectionServer, RemoteConnection,
+                            RemoteConnectionPool)
+from openscp.remote import _frame, _receive_frame
+
+
+class Reverser(SmartCardConnection):
+    """Returns the command reversed, fails on b"fail" and sleeps on b"slow" """
+
+    opened: List["Reverser"] = []
+
+    def __init__(self) -> None:
+        self.closed = False
+        Reverser.opened.append(self)
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        if apdu == b"fail":
+            raise ValueError("failed on purpose")
+        if apdu == b"slow":
+            time.sleep(0.2)
+        return apdu[::-1] + b"\x90\x00"
+
+    def is_extended_length_apdu_supported(self) -> bool:
+        return True
+
+    def close_connection(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def address(request: pytest.FixtureRequest) -> Iterator[Address]:
+    if request.param == "unix" and not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets aren't supported")
+    path = os.path.join(tempfile.mkdtemp(), "card.sock") if request.param == "unix" else None
+    Reverser.opened = []
+    with ConnectionServer(Reverser, path=path) as server:
+        yield server.address
+    if path is not None:
+        assert not os.path.exists(path)
+
+
+def reversed_response(apdu: bytes) -> bytes:
+    return apdu[::-1] + b"\x90\x00"
+
+
+def test_exchange(address: Address) -> None:
+    connection = RemoteConnection(address, timeout=5)
+    assert connection.is_extended_length_apdu_supported()
+    assert connection.send_and_receive(b"\x01\x02") == b"\x02\x01\x90\x00"
+    connection.close_connection()
+    assert connection.stats().commands == 1
+
+
+def test_pipelining(address: Address) -> None:
+    connection = RemoteConnection(address, timeout=5)
+    commands = [bytes([i % 256]) * (1 + i % 300) for i in range(200)] + [os.urandom(60000) for _ in range(10)]
+    assert connection.transmit_many(commands) == [reversed_response(command) for command in commands]
+    assert connection.transmit_many([]) == []
+    stats = connection.stats()
+    assert (stats.commands, stats.errors) == (210, 0)
+    assert stats.bytes_sent == sum(map(len, commands))
+    connection.close_connection()
+
+
+def test_error_frames(address: Address) -> None:
+    connection = RemoteConnection(address, timeout=5)
+    with pytest.raises(ConnectionError, match="ValueError: failed on purpose"):
+        connection.send_and_receive(b"fail")
+    # The failed command of a batch is reported once all responses are read, the connection stays in sync
+    with pytest.raises(ConnectionError, match="failed on purpose"):
+        connection.transmit_many([b"a", b"fail", b"c", b"fail"])
+    assert connection.send_and_receive(b"xy") == b"yx\x90\x00"
+    stats = connection.stats()
+    assert (stats.commands, stats.errors) == (6, 3)
+    connection.close_connection()
+
+
+def test_failed_exchanges_are_left_out_of_the_average(address: Address) -> None:
+    connection = RemoteConnection(address, timeout=5)
+    connection.send_and_receive(b"slow")
+    with pytest.raises(ConnectionError):
+        connection.send_and_receive(b"fail")
+    stats = connection.stats()
+    assert (stats.commands, stats.errors) == (2, 1)
+    assert stats.average == stats.total >= 0.2
+    connection.close_connection()
+    unused = RemoteConnection(address, timeout=5)
+    assert unused.stats().average == 0.0
+    unused.close_connection()
+
+
+def test_unexpected_frame_from_client(address: Address) -> None:
+    sock = socket.socket(socket.AF_UNIX if isinstance(address, str) else socket.AF_INET, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    with sock:
+        sock.connect(address)
+        assert _receive_frame(sock) == (FRAME_HELLO, b"\x01")
+        sock.sendall(_frame(FRAME_HELLO, b""))
+        frame_type, payload = _receive_frame(sock)
+        assert frame_type == FRAME_ERROR and b"Unexpected frame type" in payload
+        with pytest.raises(ConnectionError):
+            _receive_frame(sock)
+    deadline = time.monotonic() + 5
+    while not Reverser.opened[-1].closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert Reverser.opened[-1].closed
+
+
+def test_timeout_breaks_connection(address: Address) -> None:
+    connection = RemoteConnection(address, timeout=0.05)
+    with pytest.raises(OSError):
+        connection.send_and_receive(b"slow")
+    assert connection.stats().errors == 1
+    connection.close_connection()
+
+
+def test_pool_reuses_connections(address: Address) -> None:
+    with RemoteConnectionPool(address, max_size=3, timeout=5) as pool:
+        def work() -> None:
+            for _ in range(20):
+                connection = pool.acquire()
+                try:
+                    assert connection.send_and_receive(b"ab") == b"ba\x90\x00"
+                finally:
+                    connection.close_connection()
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(Reverser.opened) <= 3
+        assert pool.stats().commands == 120
+        connections = [pool.acquire() for _ in range(3)]
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.05)
+        connections[0].close_connection()
+        connections[0].close_connection()
+        assert pool.acquire(timeout=0.05) is connections[0]
+        for connection in connections:
+            connection.close_connection()
+    assert pool.stats().commands == 120
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_pool_evicts_broken_connections(address: Address) -> None:
+    with RemoteConnectionPool(address, max_size=1, timeout=0.05) as pool:
+        connection = pool.acquire()
+        with pytest.raises(OSError):
+            connection.send_and_receive(b"slow")
+        connection.close_connection()
+        replacement = pool.acquire(timeout=1)
+        assert replacement is not connection
+        assert replacement.send_and_receive(b"ab") == b"ba\x90\x00"
+        # An error frame fails the command only
+        with pytest.raises(ConnectionError):
+            replacement.send_and_receive(b"fail")
+        replacement.close_connection()
+        assert pool.acquire(timeout=1) is replacement
+        replacement.close_connection()
+        stats = pool.stats()
+        assert (stats.commands, stats.errors) == (3, 2)
+    assert len(Reverser.opened) == 2
+
+
+def test_pool_unreachable_server() -> None:
+    server = ConnectionServer(Reverser)
+    address = server.address
+    server.close()
+    with RemoteConnectionPool(address, max_size=1, timeout=1) as pool:
+        with pytest.raises(OSError):
+            pool.acquire()
+        with pytest.raises(OSError):
+            pool.acquire(timeout=0.05)
+
+
+def test_session_over_remote_connection(backend: Backend) -> None:
+    with ConnectionServer(SimulatedCard) as server:
+        with RemoteConnectionPool(server.address, timeout=5) as pool:
+            connection = pool.acquire()
+            session = SecurityDomainSession(connection, backend)
+            session.authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8)
+            assert session.send_and_receive(Apdu(0x80, 0xE2, 0, 0, b"hello")) == b"hello"
+            connection.close_connection()
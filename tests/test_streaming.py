@@ -0,0 +1,193 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+from typing import Callable, Iterator, List, Tuple
+
+import pytest
+
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, Backend, Chaining, Scp03KeySet, ScpMode, SecurityDomainEmulator, SecurityDomainSession,
+                     StreamProgress)
+from openscp.apdu import SW_OK
+from openscp.streaming import StreamSource, send_stream
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+PAYLOAD = bytes(range(256)) * 4 + b"tail"
+
+
+class Recorder:
+    """Sends commands to nowhere, keeping a copy of each"""
+
+    def __init__(self) -> None:
+        self.commands: List[Tuple[int, int, int, bytes]] = []
+
+    def __call__(self, apdu: Apdu) -> bytes:
+        self.commands.append((apdu.cla, apdu.p1, apdu.p2, bytes(apdu.data)))
+        return len(self.commands).to_bytes(2, "big")
+
+
+def chunks(data: bytes, sizes: Tuple[int, ...]) -> Iterator[bytes]:
+    offset = 0
+    index = 0
+    while offset < len(data):
+        size = sizes[index % len(sizes)]
+        yield data[offset:offset + size]
+        offset += size
+        index += 1
+
+
+@pytest.mark.parametrize("source", [
+    lambda: PAYLOAD,
+    lambda: bytearray(PAYLOAD),
+    lambda: memoryview(PAYLOAD),
+    lambda: io.BytesIO(PAYLOAD),
+    lambda: chunks(PAYLOAD, (100,)),
+    lambda: chunks(PAYLOAD, (1, 250, 7, 500)),
+], ids=["bytes", "bytearray", "memoryview", "file", "chunks", "uneven-chunks"])
+def test_sources_are_split_alike(source: Callable[[], StreamSource]) -> None:
+    recorder = Recorder()
+    result = send_stream(recorder, source(), 0x80, 0xE2, 0x00, 0x00, 100)
+    assert [data for _, _, _, data in recorder.commands] == [PAYLOAD[i:i + 100] for i in range(0, len(PAYLOAD), 100)]
+    assert result.data == b"\x00\x0b"
+    assert (result.blocks, result.bytes_sent) == (11, len(PAYLOAD))
+
+
+def test_block_number_chaining() -> None:
+    recorder = Recorder()
+    send_stream(recorder, PAYLOAD, 0x80, 0xE8, 0x02, 0x55, 300)
+    assert [(cla, p1, p2) for cla, p1, p2, _ in recorder.commands] == [
+        (0x80, 0x02, 0), (0x80, 0x02, 1), (0x80, 0x02, 2), (0x80, 0x82, 3)]
+
+
+def test_cla_chaining() -> None:
+    recorder = Recorder()
+    send_stream(recorder, PAYLOAD, 0x84, 0xE2, 0x90, 0x01, 300, Chaining.CLA)
+    assert [(cla, p1, p2) for cla, p1, p2, _ in recorder.commands] == [
+        (0x94, 0x90, 0x01), (0x94, 0x90, 0x01), (0x94, 0x90, 0x01), (0x84, 0x90, 0x01)]
+
+
+def test_empty_payload_is_one_block() -> None:
+    for source in (b"", io.BytesIO(), iter([])):
+        recorder = Recorder()
+        result = send_stream(recorder, source, 0x80, 0xE2, 0x00, 0x00, 100)
+        assert recorder.commands == [(0x80, 0x80, 0, b"")]
+        assert (result.blocks, result.bytes_sent) == (1, 0)
+
+
+def test_file_block_is_not_overwritten_by_the_next_one(tmp_path) -> None:
+    path = tmp_path / "payload"
+    path.write_bytes(PAYLOAD)
+    sent: List[int] = []
+
+    def check(apdu: Apdu) -> bytes:
+        # The next block was already read to tell whether this one is the last
+        offset = len(sent) * 64
+        assert bytes(apdu.data) == PAYLOAD[offset:offset + 64]
+        sent.append(apdu.p1)
+        return b""
+
+    with open(path, "rb") as file:
+        send_stream(check, file, 0x80, 0xE2, 0x00, 0x00, 64)
+    assert sent == [0x00] * 16 + [0x80]
+
+
+def test_progress(tmp_path) -> None:
+    path = tmp_path / "payload"
+    path.write_bytes(PAYLOAD)
+    for source, total_bytes in ((PAYLOAD, len(PAYLOAD)), (chunks(PAYLOAD, (10,)), None)):
+        reports: List[StreamProgress] = []
+        send_stream(Recorder(), source, 0x80, 0xE2, 0x00, 0x00, 400, progress=reports.append)
+        assert [(report.blocks, report.bytes_sent, report.total_bytes) for report in reports] == [
+            (1, 400, total_bytes), (2, 800, total_bytes), (3, len(PAYLOAD), total_bytes)]
+        assert all(report.elapsed >= 0 and report.throughput >= 0 for report in reports)
+    with open(path, "rb") as file:
+        file.read(28)
+        reports = []
+        send_stream(Recorder(), file, 0x80, 0xE2, 0x00, 0x00, 400, progress=reports.append)
+    assert [report.total_bytes for report in reports] == [len(PAYLOAD) - 28] * 3
+
+
+def test_invalid_block_size() -> None:
+    with pytest.raises(ValueError):
+        send_stream(Recorder(), PAYLOAD, 0x80, 0xE2, 0x00, 0x00, 0)
+
+
+def test_block_numbers_run_out() -> None:
+    recorder = Recorder()
+    with pytest.raises(ValueError):
+        send_stream(recorder, bytes(257), 0x80, 0xE2, 0x00, 0x00, 1)
+    assert len(recorder.commands) == 256
+    # 256 blocks fit, command chaining isn't numbered
+    assert send_stream(Recorder(), bytes(256), 0x80, 0xE2, 0x00, 0x00, 1).blocks == 256
+    assert send_stream(Recorder(), bytes(300), 0x80, 0xE2, 0x00, 0x00, 1, Chaining.CLA).blocks == 300
+
+
+def test_errors_stop_the_stream() -> None:
+    sent: List[Apdu] = []
+
+    def fail_second(apdu: Apdu) -> bytes:
+        sent.append(apdu)
+        if len(sent) == 2:
+            raise OSError("Reader is gone")
+        return b""
+
+    with pytest.raises(OSError):
+        send_stream(fail_second, PAYLOAD, 0x80, 0xE2, 0x00, 0x00, 100)
+    assert len(sent) == 2
+
+
+class Card(SecurityDomainEmulator):
+    """Emulated card recording the application commands it receives, after command chaining"""
+
+    def __init__(self, extended: bool) -> None:
+        super().__init__([KEY_SET], extended_length=extended, handler=self._record)
+        self.received: List[Apdu] = []
+
+    def _record(self, command: Apdu) -> Tuple[bytes, int]:
+        self.received.append(command)
+        return bytes(command.data[-4:]), SW_OK
+
+
+@pytest.mark.parametrize("extended", [False, True], ids=["short", "extended"])
+@pytest.mark.parametrize("secured", [False, True], ids=["plain", "secured"])
+def test_session_block_number_chaining(backend: Backend, extended: bool, secured: bool) -> None:
+    card = Card(extended)
+    session = SecurityDomainSession(card, backend)
+    if secured:
+        session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    payload = bytes(range(256)) * 20
+    block_size = session.max_command_data_size()
+    result = session.send_stream(0x80, 0xE8, 0x00, 0x00, payload)
+    blocks = [payload[i:i + block_size] for i in range(0, len(payload), block_size)]
+    assert [bytes(command.data) for command in card.received] == blocks
+    assert [command.p2 for command in card.received] == list(range(len(blocks)))
+    assert [command.p1 for command in card.received] == [0x00] * (len(blocks) - 1) + [0x80]
+    assert (result.data, result.blocks, result.bytes_sent) == (payload[-4:], len(blocks), len(payload))
+
+
+@pytest.mark.parametrize("extended", [False, True], ids=["short", "extended"])
+@pytest.mark.parametrize("secured", [False, True], ids=["plain", "secured"])
+def test_session_cla_chaining(backend: Backend, extended: bool, secured: bool) -> None:
+    card = Card(extended)
+    session = SecurityDomainSession(card, backend)
+    if secured:
+        session.authenticate_scp03(KEY_SET, ScpMode.S8)
+    payload = bytes(range(256)) * 3
+    reports: List[StreamProgress] = []
+    result = session.send_stream(0x80, 0xE2, 0x90, 0x00, payload, Chaining.CLA, 200, reports.append)
+    # The card reassembles the chain into one command
+    command, = card.received
+    assert (command.cla, command.p1, bytes(command.data)) == (0x80, 0x90, payload)
+    assert result.data == payload[-4:]
+    assert [report.bytes_sent for report in reports] == [200, 400, 600, 768]
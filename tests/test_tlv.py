@@ -0,0 +1,141 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from openscp import BadResponseError
+from openscp.tlv import Tlv, TlvBuilder, decode_tlv_list, encode_tlv, find_tlv, iter_tlv, parse_tlv, unpack_tlv_value
+
+# Primitive and constructed tags of one to three bytes
+PRIMITIVE_TAGS = [0x42, 0x93, 0xB0, 0x5F20, 0x5F8137, 0x9F70]
+CONSTRUCTED_TAGS = [0x7F21, 0xBF21, 0xE3, 0xBF8121]
+
+
+def random_tlv(rng: random.Random, depth: int) -> Tuple[bytes, TlvBuilder]:
+    # Encodes the same random data objects with the legacy encoder and the builder
+    builder = TlvBuilder()
+
+    def build(level: int) -> bytes:
+        encoded = []
+        for _ in range(rng.randint(1, 4)):
+            if level < depth and rng.random() < 0.5:
+                tag = rng.choice(CONSTRUCTED_TAGS)
+                builder.begin(tag)
+                value = build(level + 1)
+                builder.end()
+            else:
+                tag = rng.choice(PRIMITIVE_TAGS)
+                value = rng.randbytes(rng.choice([0, 1, 0x7F, 0x80, 0xFF, 0x100, 0x10000]))
+                builder.add(tag, value)
+            encoded.append(encode_tlv(tag, value))
+        return b"".join(encoded)
+
+    return build(0), builder
+
+
+def walk_legacy(data: bytes) -> List[Tuple[int, bytes, bytes]]:
+    objects = []
+    for tag, value, encoded in decode_tlv_list(data):
+        objects.append((tag, value, encoded))
+        if tag in CONSTRUCTED_TAGS:
+            objects += walk_legacy(value)
+    return objects
+
+
+def walk(data: Iterator[Tlv]) -> List[Tuple[int, bytes, bytes]]:
+    objects = []
+    for tlv in data:
+        objects.append((tlv.tag, bytes(tlv.value), bytes(tlv.encoded)))
+        if tlv.tag in CONSTRUCTED_TAGS:
+            assert tlv.is_constructed
+            objects += walk(tlv.children())
+    return objects
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_lazy_parser_matches_legacy_decoder(seed: int) -> None:
+    rng = random.Random(seed)
+    encoded, builder = random_tlv(rng, 3)
+    assert builder.build() == encoded
+    assert builder.size == len(encoded)
+    buffer = bytearray(len(encoded) + 3)
+    assert builder.build_into(buffer, 3) == len(buffer)
+    assert buffer[3:] == encoded
+    for data in (encoded, bytearray(encoded), memoryview(encoded)):
+        assert walk(iter_tlv(data)) == walk_legacy(encoded)
+
+
+def test_find() -> None:
+    store = encode_tlv(0xBF21, encode_tlv(0x7F21, encode_tlv(0x93, b"\x01") + encode_tlv(0x7F49, encode_tlv(
+        0xB0, b"\x04" * 65) + encode_tlv(0xF0, b"\x00"))) + encode_tlv(0x7F21, encode_tlv(0x93, b"\x02")))
+    assert bytes(find_tlv(store, 0xBF21, 0x7F21, 0x7F49, 0xF0).value) == b"\x00"
+    certificate = find_tlv(store, 0xBF21, 0x7F21)
+    assert certificate is not None
+    assert bytes(certificate.find(0x93).value) == b"\x01"
+    assert find_tlv(store, 0xBF21, 0x42) is None
+    assert find_tlv(store, 0x7F21) is None
+    assert find_tlv(store) is None
+    assert [bytes(tlv.find(0x93).value) for tlv in find_tlv(store, 0xBF21).children()] == [b"\x01", b"\x02"]
+
+
+def test_primitive_gp_tags_are_not_constructed() -> None:
+    assert [tlv.is_constructed for tlv in iter_tlv(encode_tlv(0xB0) + encode_tlv(0x7F49) + encode_tlv(0x5F20))] == \
+        [True, True, False]
+
+
+def test_padding_tag() -> None:
+    tlv, = iter_tlv(b"\x00\x00")
+    assert (tlv.tag, bytes(tlv.value), tlv.is_constructed) == (0x00, b"", False)
+
+
+@pytest.mark.parametrize("encoded", [
+    "5F", "5F20", "9F7F", "42", "4203AABB", "42810201", "4282000201", "4280", "7F2103420201",
+])
+def test_malformed_data_is_rejected_by_both_parsers(encoded: str) -> None:
+    data = bytes.fromhex(encoded)
+    with pytest.raises(BadResponseError):
+        walk_legacy(data)
+    with pytest.raises(BadResponseError):
+        walk(iter_tlv(data))
+
+
+def test_lazy_parser_stops_at_malformed_data() -> None:
+    objects = iter_tlv(encode_tlv(0x42, b"\x01") + bytes.fromhex("4205"))
+    assert next(objects).tag == 0x42
+    with pytest.raises(BadResponseError):
+        next(objects)
+
+
+def test_parse_and_unpack() -> None:
+    assert parse_tlv(bytes.fromhex("005F208180") + bytes(0x80), 1) == (0x5F20, 5, 0x85)
+    assert unpack_tlv_value(0x86, encode_tlv(0x86, b"\x01\x02")) == b"\x01\x02"
+    with pytest.raises(BadResponseError, match="Expected tag 86"):
+        unpack_tlv_value(0x86, encode_tlv(0x87, b""))
+    with pytest.raises(BadResponseError, match="Extra data"):
+        unpack_tlv_value(0x86, encode_tlv(0x86, b"") + b"\x00")
+
+
+def test_builder_errors() -> None:
+    with pytest.raises(ValueError):
+        TlvBuilder().end()
+    builder = TlvBuilder().begin(0x7F21).add(0x93, b"\x01")
+    with pytest.raises(ValueError):
+        builder.build()
+    builder.end()
+    with pytest.raises(ValueError):
+        builder.build_into(bytearray(4))
+    assert builder.build() == bytes.fromhex("7F2103930101")
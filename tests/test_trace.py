@@ -0,0 +1,204 @@
+# Copyright 2025 Samsung Electronics Co, Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import types
+from typing import List, Tuple
+
+import pytest
+
+import openscp.emulator
+from benchmarks.simulated_card import DEK_KEY, ENC_KEY, KEY_VERSION, MAC_KEY
+from openscp import (Apdu, Backend, Scp03KeySet, ScpMode, SecurityDomainEmulator, SecurityDomainSession,
+                     TraceDirection, TraceLevel, TraceReader, TraceRecorder, TracedConnection, replay_trace)
+from openscp.apdu import SW_OK
+
+KEY_SET = Scp03KeySet(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY)
+HOST_CHALLENGE = bytes(range(0x10, 0x18))
+SELECT = bytes((0x00, 0xA4, 0x04, 0x00, 0x00))
+
+_SW_INS_NOT_SUPPORTED = 0x6D00
+
+
+def _handler(command: Apdu) -> Tuple[bytes, int]:
+    if command.ins == 0x01:
+        return b"", _SW_INS_NOT_SUPPORTED
+    return command.data, SW_OK
+
+
+def card() -> SecurityDomainEmulator:
+    return SecurityDomainEmulator([KEY_SET], handler=_handler)
+
+
+def test_session_and_transport_levels(tmp_path, backend: Backend) -> None:
+    path = str(tmp_path / "session.trace")
+    with TraceRecorder(path, payloads=True) as recorder:
+        connection = TracedConnection(card(), recorder)
+        session = SecurityDomainSession(connection, backend, trace_recorder=recorder)
+        session.authenticate_scp03(KEY_SET, ScpMode.S8)
+        assert session.send_and_receive(Apdu(0x80, 0xE2, 0x01, 0x02, b"hello")) == b"hello"
+        session.send_many([Apdu(0x80, 0xE2, 0x00, 0x00, b"x" * 10), Apdu(0x80, 0xE2, 0x00, 0x00, b"")])
+        with pytest.raises(Exception):
+            session.send_and_receive(Apdu(0x80, 0x01, 0x00, 0x00, b""))
+        recorder.flush()
+        assert recorder.stats().bytes_written == os.path.getsize(path)
+    with TraceReader(path) as reader:
+        assert reader.payloads
+        records = list(reader)
+        plain = [record for record in records if record.level is TraceLevel.SESSION]
+        secured = [record for record in records if record.level is TraceLevel.TRANSPORT]
+        assert [record.direction for record in plain] == [TraceDirection.COMMAND, TraceDirection.RESPONSE] * 4
+        assert plain[0].header == bytes((0x80, 0xE2, 0x01, 0x02)) and bytes(plain[0].payload) == b"hello"
+        assert (plain[1].sw, bytes(plain[1].payload)) == (SW_OK, b"hello")
+        assert bytes(plain[2].payload) == b"x" * 10 and plain[2].length == 10
+        assert plain[-1].sw == _SW_INS_NOT_SUPPORTED
+        assert all(command.timestamp <= response.timestamp for command, response in zip(plain[::2], plain[1::2]))
+        # INITIALIZE UPDATE, EXTERNAL AUTHENTICATE and the four commands, secured on the wire
+        assert len(secured) == 12 and secured[0].channel != plain[0].channel
+        assert secured[4].header == bytes((0x84, 0xE2, 0x01, 0x02)) and b"hello" not in bytes(secured[4].payload)
+        assert secured[4].length == len(secured[4].payload)
+
+
+def test_replay(tmp_path) -> None:
+    path = str(tmp_path / "plain.trace")
+    with TraceRecorder(path, payloads=True) as recorder:
+        connection = TracedConnection(card(), recorder)
+        for _ in range(20):
+            connection.send_and_receive(SELECT)
+        connection.send_and_receive(bytes((0x80, 0x01, 0x00, 0x00)))
+    result = replay_trace(path, card())
+    assert (result.commands, result.mismatches) == (21, 0)
+    assert result.recorded >= 0 and result.replayed > 0
+    # Another card answering differently
+    other = SecurityDomainEmulator([KEY_SET])
+    with TraceReader(path) as reader:
+        assert replay_trace(reader, other, pace=True).mismatches == 1
+
+
+def test_replay_of_a_channel(tmp_path) -> None:
+    path = str(tmp_path / "channels.trace")
+    with TraceRecorder(path, payloads=True) as recorder:
+        first = TracedConnection(card(), recorder)
+        second = TracedConnection(card(), recorder)
+        first.send_and_receive(SELECT)
+        second.send_and_receive(SELECT)
+        second.send_and_receive(bytes((0x80, 0x01, 0x00, 0x00)))
+    assert replay_trace(path, card()).commands == 1
+    assert replay_trace(path, card(), second.channel).commands == 2
+
+
+def test_secured_replay(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # A card with the same challenges derives the same session keys
+    monkeypatch.setattr(openscp.emulator, "os", types.SimpleNamespace(urandom=lambda size: bytes(range(size))))
+    path = str(tmp_path / "secured.trace")
+    with TraceRecorder(path, payloads=True) as recorder:
+        session = SecurityDomainSession(TracedConnection(card(), recorder), Backend.NATIVE)
+        session._authenticate_scp03(0x01, KEY_VERSION, ENC_KEY, MAC_KEY, DEK_KEY, ScpMode.S8, HOST_CHALLENGE)
+        for length in (0, 16, 200):
+            session.send_and_receive(Apdu(0x80, 0xE2, 0x00, 0x00, bytes(length)))
+    replayed = card()
+    result = replay_trace(path, replayed)
+    assert (result.commands, result.mismatches) == (5, 0)
+    assert replayed.secure_channel_open
+    # A card with other challenges rejects the host cryptogram
+    monkeypatch.setattr(openscp.emulator, "os", types.SimpleNamespace(urandom=lambda size: bytes(size)))
+    assert replay_trace(path, card()).mismatches == 4
+
+
+def test_without_payloads(tmp_path) -> None:
+    path = str(tmp_path / "lengths.trace")
+    with TraceRecorder(path) as recorder:
+        TracedConnection(card(), recorder).send_and_receive(SELECT)
+    with TraceReader(path) as reader:
+        assert not reader.payloads
+        command, response = reader
+        assert (command.length, len(command.payload), command.header) == (5, 0, SELECT[:4])
+        assert (response.sw, response.length, response.header) == (SW_OK, 0, bytes(4))
+    with pytest.raises(ValueError):
+        replay_trace(path, card())
+
+
+class Broken(SecurityDomainEmulator):
+    """Emulated card whose reader is gone"""
+
+    def send_and_receive(self, apdu: bytes) -> bytes:
+        raise OSError("Reader is gone")
+
+
+def test_transport_errors_are_recorded(tmp_path) -> None:
+    path = str(tmp_path / "broken.trace")
+    with TraceRecorder(path, payloads=True) as recorder:
+        with pytest.raises(OSError):
+            TracedConnection(Broken(), recorder).send_and_receive(SELECT)
+    with TraceReader(path) as reader:
+        assert [(record.direction, record.sw, record.length) for record in reader] == [
+            (TraceDirection.COMMAND, 0, 5), (TraceDirection.RESPONSE, 0, 0)]
+    # Exchanges without a response aren't compared
+    assert replay_trace(path, card())[:2] == (1, 0)
+
+
+def test_full_buffer_drops_records(tmp_path) -> None:
+    path = str(tmp_path / "full.trace")
+    recorder = TraceRecorder(path, payloads=True, buffer_size=4096, flush_interval=10)
+    connection = TracedConnection(card(), recorder)
+    for _ in range(500):
+        connection.send_and_receive(SELECT[:4] + b"\x64" + bytes(100))
+    recorder.close()
+    recorder.close()
+    stats = recorder.stats()
+    assert stats.dropped > 0 and stats.records + stats.dropped == 1000
+    assert stats.bytes_written == os.path.getsize(path)
+    with TraceReader(path) as reader:
+        assert sum(1 for _ in reader) == stats.records
+    # Exchanges after closing aren't recorded
+    connection.send_and_receive(SELECT)
+    assert recorder.stats().records == stats.records
+
+
+def test_ring_buffer_wraps_around(tmp_path) -> None:
+    path = str(tmp_path / "wrap.trace")
+    recorder = TraceRecorder(path, payloads=True, buffer_size=1000, flush_interval=0.001)
+    connection = TracedConnection(card(), recorder)
+    commands: List[bytes] = []
+    for index in range(300):
+        data = bytes([index % 256]) * (index % 37)
+        command = bytes((0x80, 0xE2, 0x00, 0x00, len(data))) + data if data else bytes((0x80, 0xE2, 0x00, 0x00))
+        connection.send_and_receive(command)
+        commands.append(command)
+    recorder.close()
+    stats = recorder.stats()
+    with TraceReader(path) as reader:
+        recorded = [bytes(record.payload) for record in reader if record.direction is TraceDirection.COMMAND]
+    assert stats.records == 2 * len(recorded)
+    # Records are whole and in order, even where the buffer wrapped around
+    assert all(command in commands for command in recorded)
+    assert sorted(recorded, key=commands.index) == recorded
+
+
+def test_not_a_trace(tmp_path) -> None:
+    path = tmp_path / "other"
+    for content in (b"", b"OSCP", b"hello world 12345678901234"):
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            TraceReader(str(path))
+
+
+def test_truncated_trace(tmp_path) -> None:
+    path = tmp_path / "cut.trace"
+    with TraceRecorder(str(path), payloads=True) as recorder:
+        connection = TracedConnection(card(), recorder)
+        for _ in range(3):
+            connection.send_and_receive(SELECT)
+    path.write_bytes(path.read_bytes()[:-3])
+    with TraceReader(str(path)) as reader:
+        assert sum(1 for _ in reader) == 5